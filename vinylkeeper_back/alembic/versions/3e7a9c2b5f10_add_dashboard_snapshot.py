@@ -0,0 +1,44 @@
+"""add_dashboard_snapshot
+
+Revision ID: 3e7a9c2b5f10
+Revises: 9b3f0c6d1a7e
+Create Date: 2026-10-17 14:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7a9c2b5f10'
+down_revision: Union[str, None] = '9b3f0c6d1a7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Single-row table holding the global dashboard statistics."""
+    op.create_table(
+        'dashboard_snapshot',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('global_albums_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('global_artists_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('global_places_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('moderated_places_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('public_collections_total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('latest_album', sa.JSON(), nullable=True),
+        sa.Column('latest_artist', sa.JSON(), nullable=True),
+        sa.Column('recent_albums', sa.JSON(), server_default='[]', nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Pre-created so refreshing workers only ever contend on the row lock;
+    # refreshed_at stays NULL until the first refresh
+    op.execute("INSERT INTO dashboard_snapshot (id) VALUES (1)")
+
+
+def downgrade() -> None:
+    """Drop the dashboard snapshot table."""
+    op.drop_table('dashboard_snapshot')
@@ -0,0 +1,97 @@
+"""keyset_pagination_indexes
+
+Revision ID: 5d1c8e7a2f4b
+Revises: b222fb2e3d98
+Create Date: 2026-10-17 09:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c8e7a2f4b'
+down_revision: Union[str, None] = 'b222fb2e3d98'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Extend the listing indexes with the id tie-breaker used by keyset pagination.
+
+    Each index matches the ORDER BY of its listing (newest first), so a cursor
+    page is a single index range scan. The narrower indexes they replace are
+    prefixes of the new ones.
+    """
+    # Albums / artists of a collection: ORDER BY created_at DESC NULLS LAST, <entity>_id DESC
+    op.create_index(
+        'ix_collection_album_collection_id_created_at',
+        'collection_album',
+        ['collection_id', 'created_at', 'album_id'],
+        unique=False,
+        postgresql_ops={'created_at': 'DESC NULLS LAST', 'album_id': 'DESC'}
+    )
+    op.drop_index('ix_collection_album_collection_id', table_name='collection_album', if_exists=True)
+
+    op.create_index(
+        'ix_collection_artist_collection_id_created_at',
+        'collection_artist',
+        ['collection_id', 'created_at', 'artist_id'],
+        unique=False,
+        postgresql_ops={'created_at': 'DESC NULLS LAST', 'artist_id': 'DESC'}
+    )
+    op.drop_index('ix_collection_artist_collection_id', table_name='collection_artist', if_exists=True)
+
+    # Wishlist of a user: ORDER BY created_at DESC NULLS LAST, id DESC
+    op.create_index(
+        'ix_wishlist_user_id_created_at',
+        'wishlist',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+        postgresql_ops={'created_at': 'DESC NULLS LAST', 'id': 'DESC'}
+    )
+
+    # Explore page: ORDER BY updated_at|created_at DESC NULLS LAST, id DESC on public collections
+    op.create_index(
+        'ix_collections_is_public_updated_at_id',
+        'collections',
+        ['is_public', 'updated_at', 'id'],
+        unique=False,
+        postgresql_ops={'updated_at': 'DESC NULLS LAST', 'id': 'DESC'}
+    )
+    op.drop_index('ix_collections_is_public_updated_at', table_name='collections', if_exists=True)
+
+    op.create_index(
+        'ix_collections_is_public_created_at_id',
+        'collections',
+        ['is_public', 'created_at', 'id'],
+        unique=False,
+        postgresql_ops={'created_at': 'DESC NULLS LAST', 'id': 'DESC'}
+    )
+    op.drop_index('ix_collections_is_public_created_at', table_name='collections', if_exists=True)
+
+
+def downgrade() -> None:
+    """Restore the single-column listing indexes."""
+    op.create_index(
+        'ix_collections_is_public_created_at',
+        'collections',
+        ['is_public', 'created_at'],
+        unique=False,
+        postgresql_ops={'created_at': 'DESC'}
+    )
+    op.drop_index('ix_collections_is_public_created_at_id', table_name='collections')
+    op.create_index(
+        'ix_collections_is_public_updated_at',
+        'collections',
+        ['is_public', 'updated_at'],
+        unique=False,
+        postgresql_ops={'updated_at': 'DESC'}
+    )
+    op.drop_index('ix_collections_is_public_updated_at_id', table_name='collections')
+    op.drop_index('ix_wishlist_user_id_created_at', table_name='wishlist')
+    op.create_index('ix_collection_artist_collection_id', 'collection_artist', ['collection_id'], unique=False)
+    op.drop_index('ix_collection_artist_collection_id_created_at', table_name='collection_artist')
+    op.create_index('ix_collection_album_collection_id', 'collection_album', ['collection_id'], unique=False)
+    op.drop_index('ix_collection_album_collection_id_created_at', table_name='collection_album')
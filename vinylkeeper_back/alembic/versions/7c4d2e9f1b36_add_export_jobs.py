@@ -0,0 +1,56 @@
+"""add_export_jobs
+
+Revision ID: 7c4d2e9f1b36
+Revises: 3e7a9c2b5f10
+Create Date: 2026-10-17 18:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4d2e9f1b36'
+down_revision: Union[str, None] = '3e7a9c2b5f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Queue of the background exports."""
+    op.create_table(
+        'export_jobs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('collection_id', sa.Integer(), nullable=True),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('format', sa.String(length=8), nullable=False),
+        sa.Column('status', sa.String(length=16), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rows_written', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('file_size', sa.BigInteger(), nullable=True),
+        sa.Column('error', sa.String(length=512), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['collection_id'], ['collections.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_export_jobs_status_created_at', 'export_jobs', ['status', 'created_at'])
+    op.create_index('idx_export_jobs_user_id_status', 'export_jobs', ['user_id', 'status'])
+    op.create_index('idx_export_jobs_expires_at', 'export_jobs', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Drop the export job queue."""
+    op.drop_index('idx_export_jobs_expires_at', table_name='export_jobs')
+    op.drop_index('idx_export_jobs_user_id_status', table_name='export_jobs')
+    op.drop_index('idx_export_jobs_status_created_at', table_name='export_jobs')
+    op.drop_table('export_jobs')
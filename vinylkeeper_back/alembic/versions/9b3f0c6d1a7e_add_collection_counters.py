@@ -0,0 +1,89 @@
+"""add_collection_counters
+
+Revision ID: 9b3f0c6d1a7e
+Revises: 5d1c8e7a2f4b
+Create Date: 2026-10-17 10:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f0c6d1a7e'
+down_revision: Union[str, None] = '5d1c8e7a2f4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (source table, counter column on collections)
+COUNTERS = [
+    ('collection_album', 'albums_count'),
+    ('collection_artist', 'artists_count'),
+    ('likes', 'likes_count'),
+]
+
+
+def upgrade() -> None:
+    """Denormalised album/artist/like counters on collections, kept exact by triggers."""
+    for _, column in COUNTERS:
+        op.add_column(
+            'collections',
+            sa.Column(column, sa.Integer(), server_default='0', nullable=False)
+        )
+
+    # Row-level triggers run in the writing transaction, so the counters follow
+    # ORM writes, bulk deletes and ON DELETE CASCADE alike
+    for table, column in COUNTERS:
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION collections_count_{table}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE' AND NEW.collection_id IS NOT DISTINCT FROM OLD.collection_id THEN
+                    RETURN NULL;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    UPDATE collections SET {column} = {column} + 1 WHERE id = NEW.collection_id;
+                END IF;
+                IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                    UPDATE collections SET {column} = {column} - 1 WHERE id = OLD.collection_id;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_collection_count
+            AFTER INSERT OR DELETE OR UPDATE OF collection_id ON {table}
+            FOR EACH ROW
+            EXECUTE FUNCTION collections_count_{table}()
+        """)
+
+    # ADD COLUMN holds an exclusive lock on collections until commit: writers to the
+    # source tables wait on their foreign key check, so the backfill is exact
+    for table, column in COUNTERS:
+        op.execute(f"""
+            UPDATE collections c
+            SET {column} = sub.total
+            FROM (SELECT collection_id, COUNT(*) AS total FROM {table} GROUP BY collection_id) sub
+            WHERE sub.collection_id = c.id
+        """)
+
+    # Explore page sorted by likes: ORDER BY likes_count DESC NULLS LAST, id DESC
+    op.create_index(
+        'ix_collections_is_public_likes_count_id',
+        'collections',
+        ['is_public', 'likes_count', 'id'],
+        unique=False,
+        postgresql_ops={'likes_count': 'DESC NULLS LAST', 'id': 'DESC'}
+    )
+
+
+def downgrade() -> None:
+    """Remove the counters and their triggers."""
+    op.drop_index('ix_collections_is_public_likes_count_id', table_name='collections')
+    for table, column in reversed(COUNTERS):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_collection_count ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS collections_count_{table}()")
+        op.drop_column('collections', column)
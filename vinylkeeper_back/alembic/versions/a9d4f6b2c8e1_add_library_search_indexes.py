@@ -0,0 +1,40 @@
+"""add_library_search_indexes
+
+Revision ID: a9d4f6b2c8e1
+Revises: 5f8e1d3c7a92
+Create Date: 2026-10-17 22:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'a9d4f6b2c8e1'
+down_revision: Union[str, None] = '5f8e1d3c7a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same expression as LibrarySearchRepository, so the planner can use the indexes
+TITLE_DOCUMENT = "to_tsvector('simple', coalesce(title, ''))"
+
+
+def upgrade() -> None:
+    """Full-text indexes on the titles searched by /api/library/search, and the missing wishlist trigram index."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in ('albums', 'artists', 'wishlist'):
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_title_tsv "
+            f"ON {table} USING GIN ({TITLE_DOCUMENT})"
+        )
+    # albums and artists already have theirs (e1a2b3c4d5e6)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_wishlist_title_trgm "
+        "ON wishlist USING GIN (title gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_wishlist_title_trgm")
+    for table in ('albums', 'artists', 'wishlist'):
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_title_tsv")
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,6 +22,12 @@ class Settings(BaseSettings):
     DB_POOL_RECYCLE: int
     DB_STATEMENT_TIMEOUT: int
     DB_LOCK_TIMEOUT: int
+    # Extra sessions per worker for concurrent read-only queries (keep below DB_POOL_SIZE)
+    DB_PARALLEL_READ_SESSIONS: int = 4
+    # Prepared statements kept per asyncpg connection (driver default: 100)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # Compiled SQL strings kept by the engine, shared by all connections (SQLAlchemy default: 500)
+    DB_QUERY_CACHE_SIZE: int = 1200
 
     # Tokens configuration
     ACCESS_TOKEN_EXPIRE_MINUTES: int
@@ -49,6 +56,65 @@ class Settings(BaseSettings):
     # external API
     DISCOGS_API_URL: str
     DISCOGS_API_KEY: str
+    DISCOGS_IMAGE_CONCURRENCY: int = 5
+    DISCOGS_IMAGE_TIMEOUT: float = 5.0
+    DISCOGS_CACHE_DIR: Optional[str] = None
+    DISCOGS_CACHE_MAX_ENTRIES: int = 512
+    DISCOGS_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    DISCOGS_CACHE_JANITOR_INTERVAL: float = 300.0
+    DISCOGS_RATE_LIMIT_PER_MINUTE: int = 60
+
+    # Image proxy cache
+    IMAGE_CACHE_DIR: Optional[str] = None
+    IMAGE_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    IMAGE_CACHE_JANITOR_INTERVAL: float = 300.0
+
+    # Image transcoding pool
+    IMAGE_TRANSCODE_WORKERS: int = 1
+    IMAGE_TRANSCODE_MAX_QUEUE: int = 16
+    IMAGE_WEBP_METHOD: int = 6
+    IMAGE_WEBP_METHOD_UNDER_LOAD: int = 2
+    IMAGE_AVIF_ENABLED: bool = True
+    IMAGE_AVIF_SPEED: int = 6
+    IMAGE_AVIF_SPEED_UNDER_LOAD: int = 9
+
+    # Collection counters reconciliation (seconds, 0 disables)
+    COLLECTION_COUNTERS_RECONCILE_INTERVAL: float = 3600.0
+
+    # Global dashboard snapshot refresh (seconds, 0 disables: stats computed per request)
+    DASHBOARD_SNAPSHOT_INTERVAL: float = 60.0
+
+    # Per-user dashboard response cache
+    DASHBOARD_CACHE_TTL: float = 30.0
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 1024
+
+    # Authenticated-user principal cache, keyed by user UUID
+    PRINCIPAL_CACHE_TTL: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 4096
+
+    # Place search: minimum pg_trgm word similarity of a fuzzy match (0-1, lower tolerates more typos)
+    PLACE_SEARCH_SIMILARITY_THRESHOLD: float = 0.5
+
+    # Library search (a user's collections and wishlist): minimum pg_trgm word similarity
+    # of a fuzzy match (0-1) and maximum hits per search
+    LIBRARY_SEARCH_SIMILARITY_THRESHOLD: float = 0.5
+    LIBRARY_SEARCH_MAX_HITS: int = 50
+
+    # Rows fetched per server-side cursor round-trip by the streamed exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Background export jobs: jobs running at once across all workers (0 disables the runners),
+    # queue polling interval and file lifetime (seconds), heartbeat age after which a running job
+    # is taken over, jobs a user may have queued or running, spool directory (defaults to cache/exports)
+    EXPORT_JOB_CONCURRENCY: int = 2
+    EXPORT_JOB_POLL_INTERVAL: float = 2.0
+    EXPORT_JOB_TTL: float = 3600.0
+    EXPORT_JOB_STALE_AFTER: float = 300.0
+    EXPORT_JOB_MAX_ACTIVE_PER_USER: int = 3
+    EXPORT_SPOOL_DIR: Optional[str] = None
+
+    # Directory of the caches shared by all workers (defaults to cache/shared)
+    SHARED_CACHE_DIR: Optional[str] = None
 
     # User-Agent
     USER_AGENT: str
@@ -0,0 +1,182 @@
+"""
+Shared gateway for outbound Discogs API traffic.
+
+Wraps the application-wide httpx client, throttles requests through the
+shared RequestScheduler, and serves release/artist lookups from a
+ResponseCache with stale-while-revalidate semantics.
+"""
+import asyncio
+import random
+import re
+from typing import Any, Dict, Optional, Set, Tuple
+
+import httpx
+
+from app.core.config_env import settings
+from app.core.enums import RequestPriorityEnum
+from app.core.exceptions import ServerError, ErrorCode
+from app.core.logging import logger
+from app.core.rate_limiter import RequestScheduler
+from app.core.response_cache import ResponseCache
+from app.core.single_flight import SingleFlight
+
+DAY = 24 * 60 * 60
+
+
+class DiscogsClient:
+    # (pattern, ttl, stale_ttl) - the first matching pattern wins
+    CACHE_POLICIES: Tuple[Tuple[re.Pattern, float, float], ...] = (
+        (re.compile(r"/releases/\d+$"), 7 * DAY, 30 * DAY),
+        (re.compile(r"/artists/\d+$"), 7 * DAY, 30 * DAY),
+        (re.compile(r"/artists/\d+/releases$"), 1 * DAY, 7 * DAY),
+    )
+
+    RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRIES = 3
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 8.0
+
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient],
+        cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RequestScheduler] = None
+    ):
+        self.http_client = http_client
+        self.cache = cache
+        self.scheduler = scheduler
+        self.headers = {"Authorization": f"Discogs token={settings.DISCOGS_API_KEY}"}
+        self.single_flight = SingleFlight()
+        self._revalidating: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    def _cache_policy(self, url: str, params: Optional[Dict[str, Any]]) -> Optional[Tuple[float, float]]:
+        if self.cache is None or params:
+            return None
+        path = httpx.URL(url).path
+        for pattern, ttl, stale_ttl in self.CACHE_POLICIES:
+            if pattern.search(path):
+                return ttl, stale_ttl
+        return None
+
+    def _backoff_delay(self, attempt: int, response: httpx.Response) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        delay = random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** attempt))
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.BACKOFF_MAX))
+            except ValueError:
+                pass
+        return delay
+
+    async def _fetch(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        priority: RequestPriorityEnum = RequestPriorityEnum.INTERACTIVE
+    ) -> Any:
+        client_to_use = client or self.http_client
+        if not client_to_use:
+            raise ServerError(
+                error_code=ErrorCode.SERVER_ERROR,
+                message="HTTP client not available"
+            )
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            if self.scheduler:
+                await self.scheduler.acquire(priority)
+            response = await client_to_use.get(url, params=params, headers=self.headers)
+            if self.scheduler:
+                await self.scheduler.observe(response.headers)
+
+            if response.status_code not in self.RETRYABLE_STATUS_CODES or attempt == self.MAX_RETRIES:
+                break
+
+            delay = self._backoff_delay(attempt, response)
+            logger.warning(
+                f"Discogs returned {response.status_code} for {url}, "
+                f"retrying in {delay:.2f}s (attempt {attempt + 1}/{self.MAX_RETRIES})")
+            if response.status_code == 429 and self.scheduler:
+                await self.scheduler.block_for(delay)
+            await asyncio.sleep(delay)
+
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch_and_store(
+        self,
+        url: str,
+        ttl: float,
+        stale_ttl: float,
+        client: Optional[httpx.AsyncClient] = None,
+        priority: RequestPriorityEnum = RequestPriorityEnum.INTERACTIVE
+    ) -> Any:
+        data = await self._fetch(url, client=client, priority=priority)
+        if data:
+            await self.cache.set(url, data, ttl, stale_ttl)
+        return data
+
+    async def _revalidate(self, url: str, ttl: float, stale_ttl: float) -> None:
+        try:
+            # Own flight key: an interactive miss for the same URL must not join it and wait at BACKGROUND priority
+            await self.single_flight.do(f"revalidate:{url}", lambda: self._fetch_and_store(
+                url, ttl, stale_ttl, priority=RequestPriorityEnum.BACKGROUND))
+        except Exception as e:
+            logger.warning(f"Background revalidation failed for {url}: {str(e)}")
+        finally:
+            self._revalidating.discard(url)
+
+    def _schedule_revalidation(self, url: str, ttl: float, stale_ttl: float) -> None:
+        if url in self._revalidating:
+            return
+        self._revalidating.add(url)
+        task = asyncio.create_task(self._revalidate(url, ttl, stale_ttl))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        priority: RequestPriorityEnum = RequestPriorityEnum.INTERACTIVE
+    ) -> Any:
+        """
+        GET a Discogs resource and return its decoded JSON body.
+
+        Release and artist lookups are served from cache when possible; a stale
+        entry is returned immediately while a background task refreshes it.
+        Concurrent identical requests share a single in-flight call. Requests
+        that reach Discogs wait for a rate-limit token by priority and are
+        retried with jittered backoff on 429/5xx.
+
+        Raises:
+            httpx.HTTPStatusError: If Discogs answers with an error status
+            httpx.HTTPError: If the request fails
+            ServerError: If no HTTP client is available
+        """
+        key = str(httpx.URL(url, params=params))
+        policy = self._cache_policy(url, params)
+        if policy is None:
+            return await self.single_flight.do(key, lambda: self._fetch(url, params, client, priority))
+
+        ttl, stale_ttl = policy
+        entry = await self.cache.get(url)
+        if entry is not None:
+            if not entry.is_fresh:
+                self._schedule_revalidation(url, ttl, stale_ttl)
+            return entry.value
+
+        return await self.single_flight.do(key, lambda: self._fetch_and_store(
+            url, ttl, stale_ttl, client, priority))
+
+    async def aclose(self) -> None:
+        """Cancel pending background revalidations and stop the scheduler."""
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self.scheduler:
+            await self.scheduler.aclose()
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class ModerationStatusEnum(str, Enum):
@@ -53,3 +53,39 @@ class MoodEnum(str, Enum):
 class ExternalSourceEnum(str, Enum):
     DISCOGS = "discogs"
     MUSICBRAINZ = "musicbrainz"
+
+
+class RequestPriorityEnum(IntEnum):
+    """Outbound request priority; lower values are dispatched first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class LoadProfileEnum(str, Enum):
+    LIST_CARD = "list_card"
+    DETAIL = "detail"
+    EXPORT = "export"
+
+
+class ExportKindEnum(str, Enum):
+    COLLECTION_ALBUMS = "collection_albums"
+    COLLECTION_ARTISTS = "collection_artists"
+    WISHLIST = "wishlist"
+
+
+class ExportFormatEnum(str, Enum):
+    CSV = "csv"
+    ODS = "ods"
+
+
+class ExportJobStatusEnum(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class LibrarySourceEnum(str, Enum):
+    """Where a library search hit lives."""
+    COLLECTION = "collection"
+    WISHLIST = "wishlist"
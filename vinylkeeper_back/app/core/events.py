@@ -0,0 +1,39 @@
+"""
+In-process domain events.
+
+Services publish after their transaction; subscribers (cache invalidation,
+mostly) are registered from lifespan. A failing subscriber is logged and
+never fails the publishing request.
+"""
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.core.logging import logger
+
+EventHandler = Callable[..., Awaitable[None]]
+
+# Albums or artists added to / removed from a user's collections, or collections
+# created, deleted or made public/private. Payload: user_id
+USER_COLLECTIONS_CHANGED = "user_collections_changed"
+
+# User updated, deleted, or password or role changed. Payload: user_uuid
+USER_CHANGED = "user_changed"
+
+_subscribers: Dict[str, List[EventHandler]] = defaultdict(list)
+
+
+def subscribe(event: str, handler: EventHandler) -> None:
+    _subscribers[event].append(handler)
+
+
+def unsubscribe(event: str, handler: EventHandler) -> None:
+    if handler in _subscribers[event]:
+        _subscribers[event].remove(handler)
+
+
+async def publish(event: str, **payload: Any) -> None:
+    for handler in list(_subscribers[event]):
+        try:
+            await handler(**payload)
+        except Exception as e:
+            logger.error(f"Handler for event '{event}' failed: {str(e)}", exc_info=True)
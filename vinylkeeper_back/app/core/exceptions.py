@@ -33,6 +33,7 @@ class ErrorCode:
     SERVER_ERROR = 5000
     DATABASE_ERROR = 5001
     EXTERNAL_SERVICE_ERROR = 5002
+    SERVICE_UNAVAILABLE = 5003
 
 
 class AppException(Exception):
@@ -42,7 +43,8 @@ class AppException(Exception):
         message: str,
         status_code: int,
         details: Optional[Dict[str, Any]] = None,
-        should_log: bool = True
+        should_log: bool = True,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.status_code = status_code
         self.detail = {
@@ -51,6 +53,7 @@ class AppException(Exception):
             "details": details or {}
         }
         self.should_log = should_log
+        self.headers = headers
         super().__init__(message)
 
 
@@ -77,6 +80,18 @@ class ServerError(AppException):
         )
 
 
+class ServiceUnavailableError(AppException):
+    def __init__(self, message: str, retry_after: int, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            error_code=ErrorCode.SERVICE_UNAVAILABLE,
+            message=message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details=details,
+            should_log=False,
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
 class InvalidCredentialsError(AuthenticationError):
     def __init__(self):
         super().__init__(
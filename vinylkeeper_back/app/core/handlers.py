@@ -24,7 +24,7 @@ def register_exception_handlers(app):
             if exc.detail.get('details'):
                 error_details += f" - Details: {exc.detail['details']}"
             logger.error(error_details)
-        return JSONResponse(status_code=exc.status_code, content=exc.detail)
+        return JSONResponse(status_code=exc.status_code, content=exc.detail, headers=exc.headers)
 
     @app.exception_handler(RequestValidationError)
     def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -0,0 +1,238 @@
+"""
+Size-bounded on-disk cache for proxied images.
+
+Files are sharded by key prefix (ab/cd/<key>.<ext>) and written with
+write-then-rename. A SQLite index shared by every worker records size and
+last access of each entry; a janitor task evicts least recently used
+entries once the byte budget is exceeded.
+"""
+import asyncio
+import fcntl
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.core.logging import logger
+
+
+class ImageCache:
+    INDEX_FILENAME = "index.sqlite3"
+    JANITOR_LOCK_FILENAME = "janitor.lock"
+    # Evict down to this fraction of the budget so the janitor does not run on every write
+    LOW_WATERMARK = 0.9
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.index_path = self.root / self.INDEX_FILENAME
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._init_index()
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_index(self) -> None:
+        self._connection().execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                name TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._connection().execute(
+            "CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access)"
+        )
+
+    def _index_execute(self, sql: str, params: Tuple = ()) -> None:
+        try:
+            self._connection().execute(sql, params)
+        except sqlite3.Error as e:
+            # The index only drives eviction; never fail a request because of it
+            logger.warning(f"Image cache index update failed: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _filename(key: str, ext: str) -> str:
+        return f"{key}.{ext.lower()}"
+
+    def path_for(self, key: str, ext: str) -> Path:
+        return self.root / key[:2] / key[2:4] / self._filename(key, ext)
+
+    def lookup(self, key: str, ext: str) -> Optional[Path]:
+        """Return the cached file path and record the access, or None on miss."""
+        path = self.path_for(key, ext)
+        if not path.is_file():
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._index_execute(
+            "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE name = ?",
+            (time.time(), self._filename(key, ext))
+        )
+        return path
+
+    def read(self, key: str, ext: str) -> Optional[bytes]:
+        path = self.lookup(key, ext)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            # Evicted between lookup and read
+            return None
+
+    def write(self, key: str, ext: str, data: bytes) -> Path:
+        path = self.path_for(key, ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self.writes += 1
+        self._index_execute(
+            """
+            INSERT INTO entries (name, size, last_access) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET size = excluded.size, last_access = excluded.last_access
+            """,
+            (self._filename(key, ext), len(data), time.time())
+        )
+        return path
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _shard_path(self, name: str) -> Path:
+        return self.root / name[:2] / name[2:4] / name
+
+    def _iter_unindexed_files(self) -> Iterator[Path]:
+        """Files on disk that the index does not know about, including the legacy flat layout."""
+        indexed = {row[0] for row in self._connection().execute("SELECT name FROM entries")}
+        for path in self.root.rglob("*"):
+            if not path.is_file() or path.name in indexed:
+                continue
+            if path.name.startswith((self.INDEX_FILENAME, self.JANITOR_LOCK_FILENAME)):
+                continue
+            yield path
+
+    def reindex(self) -> int:
+        """Adopt files missing from the index, moving flat-layout files into their shard."""
+        adopted = 0
+        for path in list(self._iter_unindexed_files()):
+            try:
+                if path.suffix == ".tmp":
+                    # Leftover of an interrupted write
+                    if time.time() - path.stat().st_mtime > 3600:
+                        path.unlink(missing_ok=True)
+                    continue
+                target = self._shard_path(path.name)
+                if path != target:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(path, target)
+                stat = target.stat()
+            except FileNotFoundError:
+                continue
+            self._index_execute(
+                "INSERT OR IGNORE INTO entries (name, size, last_access) VALUES (?, ?, ?)",
+                (path.name, stat.st_size, stat.st_mtime)
+            )
+            adopted += 1
+        return adopted
+
+    def total_bytes(self) -> int:
+        row = self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(row[0])
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits under the low watermark."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return 0
+
+        target = int(self.max_bytes * self.LOW_WATERMARK)
+        evicted = 0
+        rows = self._connection().execute(
+            "SELECT name, size FROM entries ORDER BY last_access ASC"
+        ).fetchall()
+        for name, size in rows:
+            if total <= target:
+                break
+            self._shard_path(name).unlink(missing_ok=True)
+            self._index_execute("DELETE FROM entries WHERE name = ?", (name,))
+            total -= size
+            evicted += 1
+
+        self.evictions += evicted
+        return evicted
+
+    def run_maintenance(self, reindex: bool = False) -> None:
+        """One janitor pass; only one worker at a time performs it."""
+        lock_fd = os.open(self.root / self.JANITOR_LOCK_FILENAME, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+            if reindex:
+                adopted = self.reindex()
+                if adopted:
+                    logger.info(f"Image cache: indexed {adopted} existing files")
+            evicted = self.evict()
+            if evicted:
+                logger.info(f"Image cache: evicted {evicted} entries")
+        finally:
+            os.close(lock_fd)
+
+    async def run_janitor(self, interval: float) -> None:
+        """Background task started from lifespan: periodic eviction down to the byte budget."""
+        reindex = True
+        while True:
+            try:
+                await asyncio.to_thread(self.run_maintenance, reindex)
+                reindex = False
+            except Exception as e:
+                logger.error(f"Image cache janitor failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            total = self.total_bytes()
+        except sqlite3.Error:
+            total = None
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
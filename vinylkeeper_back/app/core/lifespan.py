@@ -1,10 +1,25 @@
+import asyncio
 from contextlib import asynccontextmanager
+from pathlib import Path
 from fastapi import FastAPI
 import httpx
 
-from app.db.session import AsyncSessionLocal, engine
+from app.core.config_env import settings
+from app.core.discogs_client import DiscogsClient
+from app.core.events import USER_CHANGED, USER_COLLECTIONS_CHANGED, subscribe, unsubscribe
+from app.core.image_cache import ImageCache
+from app.core.metrics import register_metrics
+from app.core.principal import create_principal_cache
+from app.core.rate_limiter import RequestScheduler, SharedTokenBucket
+from app.core.response_cache import ResponseCache
+from app.core.transcode_pool import TranscodePool
+from app.db.session import AsyncSessionLocal, engine, parallel_reader
 from app.db.init_references_data_db import insert_reference_values, check_reference_data_exists
 from app.core.logging import logger
+from app.services.counter_reconciler import CounterReconciler
+from app.services.dashboard_service import DashboardService, DashboardSnapshotRefresher
+from app.services.export_job_service import ExportJobRunner, default_spool_dir
+from app.services.image_proxy_service import ImageProxyService
 
 
 @asynccontextmanager
@@ -27,8 +42,120 @@ async def lifespan(app: FastAPI):
     )
     logger.info("✅ Shared HTTP client initialized.")
 
+    # Startup: Discogs gateway with a response cache and rate-limit budget shared by all workers
+    discogs_cache_dir = (
+        Path(settings.DISCOGS_CACHE_DIR) if settings.DISCOGS_CACHE_DIR
+        else Path(__file__).parent.parent.parent / "cache" / "discogs"
+    )
+    discogs_bucket = SharedTokenBucket(
+        discogs_cache_dir / "ratelimit.state", settings.DISCOGS_RATE_LIMIT_PER_MINUTE
+    )
+    discogs_cache = ResponseCache(
+        discogs_cache_dir, settings.DISCOGS_CACHE_MAX_ENTRIES, settings.DISCOGS_CACHE_MAX_BYTES
+    )
+    app.state.discogs_client = DiscogsClient(
+        app.state.http_client,
+        discogs_cache,
+        RequestScheduler(discogs_bucket)
+    )
+    register_metrics("discogs_requests", app.state.discogs_client.single_flight.stats)
+    register_metrics("discogs_cache", discogs_cache.stats)
+    discogs_cache_janitor = asyncio.create_task(
+        discogs_cache.run_janitor(settings.DISCOGS_CACHE_JANITOR_INTERVAL)
+    )
+    logger.info("✅ Discogs client initialized.")
+
+    # Startup: size-bounded image cache and its eviction janitor
+    app.state.image_cache = ImageCache(
+        ImageProxyService.default_cache_dir(), settings.IMAGE_CACHE_MAX_BYTES
+    )
+    register_metrics("image_cache", app.state.image_cache.stats)
+    image_cache_janitor = asyncio.create_task(
+        app.state.image_cache.run_janitor(settings.IMAGE_CACHE_JANITOR_INTERVAL)
+    )
+    logger.info("✅ Image cache initialized.")
+
+    # Startup: dedicated process pool for image transcoding
+    app.state.transcode_pool = TranscodePool(
+        settings.IMAGE_TRANSCODE_WORKERS, settings.IMAGE_TRANSCODE_MAX_QUEUE
+    )
+    register_metrics("image_transcode_pool", app.state.transcode_pool.stats)
+    logger.info("✅ Image transcoding pool initialized.")
+
+    # Startup: periodic repair of the denormalised collection counters
+    counter_reconciler = CounterReconciler(AsyncSessionLocal)
+    register_metrics("collection_counters", counter_reconciler.stats)
+    background_tasks = [discogs_cache_janitor, image_cache_janitor]
+    if settings.COLLECTION_COUNTERS_RECONCILE_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(
+            counter_reconciler.run(settings.COLLECTION_COUNTERS_RECONCILE_INTERVAL)
+        ))
+
+    # Startup: sessions used for concurrent read-only queries
+    register_metrics("parallel_reads", parallel_reader.stats)
+
+    # Startup: global dashboard statistics snapshot, refreshed by one worker at a time
+    if settings.DASHBOARD_SNAPSHOT_INTERVAL > 0:
+        dashboard_refresher = DashboardSnapshotRefresher(
+            AsyncSessionLocal, settings.DASHBOARD_SNAPSHOT_INTERVAL, parallel_reader
+        )
+        register_metrics("dashboard_snapshot", dashboard_refresher.stats)
+        background_tasks.append(asyncio.create_task(dashboard_refresher.run()))
+
+    # Startup: background export jobs, EXPORT_JOB_CONCURRENCY at a time across all workers
+    if settings.EXPORT_JOB_CONCURRENCY > 0:
+        export_job_runner = ExportJobRunner(
+            AsyncSessionLocal,
+            default_spool_dir(),
+            settings.EXPORT_JOB_CONCURRENCY,
+            settings.EXPORT_JOB_POLL_INTERVAL,
+            settings.EXPORT_JOB_TTL,
+            settings.EXPORT_JOB_STALE_AFTER,
+        )
+        register_metrics("export_jobs", export_job_runner.stats)
+        background_tasks.append(asyncio.create_task(export_job_runner.run()))
+
+    # Startup: per-user dashboard cache, shared by the workers and dropped when the user's collections change
+    shared_cache_dir = (
+        Path(settings.SHARED_CACHE_DIR) if settings.SHARED_CACHE_DIR
+        else Path(__file__).parent.parent.parent / "cache" / "shared"
+    )
+    app.state.dashboard_cache = DashboardService.create_cache(shared_cache_dir)
+    register_metrics("dashboard_cache", app.state.dashboard_cache.stats)
+
+    async def invalidate_dashboard(user_id: int) -> None:
+        await app.state.dashboard_cache.invalidate(user_id)
+
+    subscribe(USER_COLLECTIONS_CHANGED, invalidate_dashboard)
+    logger.info("✅ Dashboard cache initialized.")
+
+    # Startup: authenticated-user principals, shared by the workers and dropped when the user changes
+    app.state.principal_cache = create_principal_cache(shared_cache_dir)
+    register_metrics("principal_cache", app.state.principal_cache.stats)
+
+    async def invalidate_principal(user_uuid: str) -> None:
+        await app.state.principal_cache.invalidate(user_uuid)
+
+    subscribe(USER_CHANGED, invalidate_principal)
+    logger.info("✅ Principal cache initialized.")
+
     yield
 
+    unsubscribe(USER_COLLECTIONS_CHANGED, invalidate_dashboard)
+    unsubscribe(USER_CHANGED, invalidate_principal)
+
+    # Shutdown: stop image transcoding pool and background tasks
+    app.state.transcode_pool.shutdown()
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    # Shutdown: stop background Discogs revalidations
+    try:
+        await app.state.discogs_client.aclose()
+    except Exception as e:
+        logger.error(f"Error closing Discogs client: {e}")
+
     # Shutdown: close HTTP client
     try:
         await app.state.http_client.aclose()
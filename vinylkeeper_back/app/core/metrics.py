@@ -0,0 +1,23 @@
+"""
+Registry of in-process runtime counters.
+
+Components register a provider returning a dict of counters; the admin
+runtime-metrics endpoint collects them. Values are per gunicorn worker.
+"""
+import os
+from typing import Any, Callable, Dict
+
+MetricsProvider = Callable[[], Dict[str, Any]]
+
+_providers: Dict[str, MetricsProvider] = {}
+
+
+def register_metrics(name: str, provider: MetricsProvider) -> None:
+    _providers[name] = provider
+
+
+def collect_metrics() -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {"worker_pid": os.getpid()}
+    for name, provider in _providers.items():
+        metrics[name] = provider()
+    return metrics
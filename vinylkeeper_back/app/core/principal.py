@@ -0,0 +1,53 @@
+"""
+Authenticated-user principal.
+
+The few user attributes most endpoints need (ids, username, role), kept in
+a short-TTL cache keyed by user UUID so that resolving the caller does not
+query the database on every request. Services publish USER_CHANGED when
+one of these attributes (or the password) changes; lifespan drops the
+cached principal in every worker. A principal whose load started before
+such a change is not cached (see TTLCache.set loaded_at).
+"""
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from app.core.config_env import settings
+from app.core.enums import RoleEnum
+from app.core.ttl_cache import TTLCache
+from app.models.user_model import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    user_uuid: str
+    username: str
+    role: Optional[str]
+    is_superuser: bool
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == RoleEnum.ADMIN.value and self.is_superuser
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            user_uuid=str(user.user_uuid),
+            username=user.username,
+            role=user.role.name if user.role else None,
+            is_superuser=bool(user.is_superuser),
+        )
+
+
+def create_principal_cache(shared_dir: Optional[Path] = None) -> TTLCache:
+    """Principal cache, shared by the workers when shared_dir is given."""
+    return TTLCache(
+        "principals",
+        settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        settings.PRINCIPAL_CACHE_TTL,
+        shared_dir,
+        encode=asdict,
+        decode=lambda fields: Principal(**fields),
+    )
@@ -0,0 +1,182 @@
+"""
+Outbound request budget shared by every gunicorn worker.
+
+The token bucket state lives in a small JSON file guarded by an exclusive
+flock, so all workers of a container draw from the same per-token budget.
+The scheduler sits on top of it and hands out tokens by priority.
+"""
+import asyncio
+import fcntl
+import heapq
+import itertools
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Mapping, Optional, Tuple
+
+from app.core.enums import RequestPriorityEnum
+from app.core.logging import logger
+
+
+class SharedTokenBucket:
+    """Token bucket refilled continuously over a moving window, persisted in a locked file."""
+
+    def __init__(self, state_path: Path, capacity: int, window: float = 60.0):
+        self.state_path = state_path
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.default_capacity = max(1, capacity)
+        self.window = window
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[dict]:
+        fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = b""
+            while chunk := os.read(fd, 4096):
+                raw += chunk
+            now = time.time()
+            try:
+                state = json.loads(raw) if raw else {}
+            except ValueError:
+                state = {}
+            capacity = state.get("capacity", self.default_capacity)
+            state.setdefault("capacity", capacity)
+            state.setdefault("tokens", float(capacity))
+            state.setdefault("updated_at", now)
+            state.setdefault("blocked_until", 0.0)
+
+            # Refill proportionally to the time elapsed since the last update
+            elapsed = max(0.0, now - state["updated_at"])
+            state["tokens"] = min(
+                float(state["capacity"]),
+                state["tokens"] + elapsed * state["capacity"] / self.window
+            )
+            state["updated_at"] = now
+
+            yield state
+
+            payload = json.dumps(state).encode()
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+    def try_acquire(self) -> float:
+        """Take one token. Returns 0 on success, otherwise the seconds to wait before retrying."""
+        with self._locked_state() as state:
+            now = state["updated_at"]
+            if now < state["blocked_until"]:
+                return state["blocked_until"] - now
+            if state["tokens"] >= 1.0:
+                state["tokens"] -= 1.0
+                return 0.0
+            return (1.0 - state["tokens"]) * self.window / state["capacity"]
+
+    def refund(self) -> None:
+        with self._locked_state() as state:
+            state["tokens"] = min(float(state["capacity"]), state["tokens"] + 1.0)
+
+    def observe(self, limit: Optional[int], remaining: Optional[int]) -> None:
+        """Align the local budget with the limits reported by the remote API."""
+        with self._locked_state() as state:
+            if limit and limit > 0:
+                state["capacity"] = limit
+                state["tokens"] = min(state["tokens"], float(limit))
+            if remaining is not None:
+                state["tokens"] = min(state["tokens"], float(max(0, remaining)))
+
+    def block_for(self, seconds: float) -> None:
+        """Drain the budget and stop dispatching for `seconds` (e.g. after a 429)."""
+        with self._locked_state() as state:
+            state["tokens"] = 0.0
+            state["blocked_until"] = max(state["blocked_until"], state["updated_at"] + seconds)
+
+
+class RequestScheduler:
+    """Grants bucket tokens to waiting requests, highest priority first."""
+
+    MAX_POLL_INTERVAL = 1.0
+
+    def __init__(self, bucket: SharedTokenBucket):
+        self.bucket = bucket
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _parse_int(value: Optional[str]) -> Optional[int]:
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+    async def acquire(self, priority: RequestPriorityEnum = RequestPriorityEnum.INTERACTIVE) -> None:
+        """Wait until a token is granted to this request."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        self._wakeup.set()
+        await future
+
+    async def observe(self, headers: Mapping[str, str]) -> None:
+        limit = self._parse_int(headers.get("x-discogs-ratelimit"))
+        remaining = self._parse_int(headers.get("x-discogs-ratelimit-remaining"))
+        if limit is None and remaining is None:
+            return
+        await asyncio.to_thread(self.bucket.observe, limit, remaining)
+
+    async def block_for(self, seconds: float) -> None:
+        await asyncio.to_thread(self.bucket.block_for, seconds)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                return future
+        return None
+
+    async def _dispatch(self) -> None:
+        while True:
+            # Drop requests cancelled while queued
+            while self._waiters and self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+            if not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            try:
+                wait = await asyncio.to_thread(self.bucket.try_acquire)
+            except OSError as e:
+                # Never stall outbound traffic on a broken state file
+                logger.warning(f"Rate limit state unavailable, dispatching unthrottled: {str(e)}")
+                wait = 0.0
+
+            if wait <= 0:
+                future = self._next_waiter()
+                if future is None:
+                    await asyncio.to_thread(self.bucket.refund)
+                else:
+                    future.set_result(None)
+                continue
+
+            # Sleep in short slices so newly queued high-priority requests are served first
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(wait, self.MAX_POLL_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+
+    async def aclose(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        while (future := self._next_waiter()) is not None:
+            future.cancel()
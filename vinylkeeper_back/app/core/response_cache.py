@@ -0,0 +1,202 @@
+"""
+Two-tier cache for external API responses.
+
+The memory tier is a per-worker LRU; the disk tier is a directory of JSON
+files shared by every gunicorn worker, so a lookup warmed by one worker is
+reused by the others. The disk tier is bounded in bytes: a janitor drops
+expired files and then the files closest to expiry once the budget is
+exceeded, one worker at a time.
+"""
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.logging import logger
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: Any
+    expires_at: float
+    stale_until: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def is_usable(self) -> bool:
+        """True while the entry may still be served, even if it needs revalidation."""
+        return time.time() < self.stale_until
+
+
+class ResponseCache:
+    """LRU memory tier in front of a sharded, size-bounded on-disk tier, keyed by request URL."""
+
+    JANITOR_LOCK_FILENAME = "janitor.lock"
+    # Evict down to this fraction of the budget so the janitor does not evict on every pass
+    LOW_WATERMARK = 0.9
+    # Leftovers of interrupted writes older than this are removed
+    TMP_MAX_AGE = 3600.0
+
+    def __init__(self, cache_dir: Path, max_entries: int = 512, max_disk_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.expired = 0
+        self.evictions = 0
+
+    def _path_for(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            entry = CacheEntry(
+                value=raw["value"],
+                expires_at=raw["expires_at"],
+                stale_until=raw["stale_until"],
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable cache file {path}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return None
+
+        if not entry.is_usable:
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> None:
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "key": key,
+            "value": entry.value,
+            "expires_at": entry.expires_at,
+            "stale_until": entry.stale_until,
+        }
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            # The janitor reads the end of usability from the mtime instead of opening every file
+            os.utime(tmp_path, (entry.stale_until, entry.stale_until))
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry.is_usable:
+                self._memory.move_to_end(key)
+                return entry
+            del self._memory[key]
+
+        entry = await asyncio.to_thread(self._read_disk, key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    async def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0.0) -> None:
+        now = time.time()
+        entry = CacheEntry(value=value, expires_at=now + ttl, stale_until=now + ttl + stale_ttl)
+        self._remember(key, entry)
+        try:
+            await asyncio.to_thread(self._write_disk, key, entry)
+        except OSError as e:
+            logger.warning(f"Failed to persist cache entry: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def sweep(self) -> None:
+        """Drop unusable files, then the files closest to expiry until the disk tier fits its budget."""
+        now = time.time()
+        files = []
+        total = 0
+        for path in self.cache_dir.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.suffix == ".tmp":
+                # Still carries its creation time: the mtime is only set right before the rename
+                if now - stat.st_mtime > self.TMP_MAX_AGE:
+                    path.unlink(missing_ok=True)
+                continue
+            if path.suffix != ".json":
+                continue
+            if stat.st_mtime <= now:
+                path.unlink(missing_ok=True)
+                self.expired += 1
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_disk_bytes:
+            return
+        target = int(self.max_disk_bytes * self.LOW_WATERMARK)
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    def run_maintenance(self) -> None:
+        """One janitor pass; only one worker at a time performs it."""
+        lock_fd = os.open(self.cache_dir / self.JANITOR_LOCK_FILENAME, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+            evictions = self.evictions
+            self.sweep()
+            if self.evictions > evictions:
+                logger.info(f"Response cache: evicted {self.evictions - evictions} entries")
+        finally:
+            os.close(lock_fd)
+
+    async def run_janitor(self, interval: float) -> None:
+        """Background task started from lifespan: periodic sweep of the disk tier."""
+        while True:
+            try:
+                await asyncio.to_thread(self.run_maintenance)
+            except Exception as e:
+                logger.error(f"Response cache janitor failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "max_disk_bytes": self.max_disk_bytes,
+        }
@@ -0,0 +1,48 @@
+"""
+Request coalescing: concurrent callers asking for the same key share one
+in-flight call instead of each issuing their own.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-worker single-flight group keyed by an arbitrary string (usually the outbound URL)."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.issued = 0
+        self.coalesced = 0
+
+    def _forget(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Mark the outcome as retrieved even if every caller went away
+        if not future.cancelled():
+            future.exception()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` for `key`, or join the call already in flight for it.
+
+        The shared call runs as its own task, so a caller being cancelled does
+        not abort the work the other callers are waiting for.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.issued += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "issued": self.issued,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,98 @@
+"""
+Bounded worker pool for CPU-bound image transcoding.
+
+Runs jobs in dedicated processes so resizing and encoding neither hold the
+event loop's GIL nor compete with other asyncio.to_thread users. When more
+jobs are in flight than the pool can absorb, new jobs are shed with a 503.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.core.exceptions import ServerError, ServiceUnavailableError, ErrorCode
+from app.core.logging import logger
+
+
+class TranscodePool:
+    RETRY_AFTER = 2
+
+    def __init__(self, max_workers: int, max_queue_depth: int):
+        """
+        Args:
+            max_workers: Worker processes; 0 runs jobs on the default thread pool instead
+            max_queue_depth: Jobs allowed to wait for a worker before new ones are rejected
+        """
+        self.max_workers = max(0, max_workers)
+        self.capacity = max(1, self.max_workers) + max(0, max_queue_depth)
+        self._executor: Optional[ProcessPoolExecutor] = self._create_executor()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _create_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers == 0:
+            return None
+        # spawn: never fork a worker that already runs an event loop and threads
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @property
+    def load(self) -> float:
+        """Fraction of the pool capacity currently in use."""
+        return self._in_flight / self.capacity
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run `fn(*args)` in the pool.
+
+        Raises:
+            ServiceUnavailableError: If the pool and its queue are full
+            ServerError: If a worker process died while running the job
+        """
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            raise ServiceUnavailableError(
+                message="Image processing is overloaded, please retry later",
+                retry_after=self.RETRY_AFTER,
+                details={"in_flight": self._in_flight, "capacity": self.capacity}
+            )
+
+        self._in_flight += 1
+        if self._executor is None:
+            job = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        else:
+            job = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        # A cancelled caller cannot stop a job already running: the slot is released when it finishes
+        job.add_done_callback(self._release)
+        try:
+            return await asyncio.shield(job)
+        except BrokenProcessPool:
+            logger.error("Transcoding worker died, restarting the pool")
+            self._executor = self._create_executor()
+            raise ServerError(
+                error_code=ErrorCode.SERVER_ERROR,
+                message="Failed to process image"
+            )
+
+    def _release(self, job: "asyncio.Future[Any]") -> None:
+        self._in_flight -= 1
+        # exception() also marks the error of a job whose caller is gone as retrieved
+        if not job.cancelled() and job.exception() is None:
+            self.completed += 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,331 @@
+"""
+Bounded in-process cache with per-entry TTL, optionally shared by workers.
+
+The memory tier is a per-worker LRU. With a shared store, every entry is
+also written to a SQLite database (WAL) in a directory shared by all
+gunicorn workers: a value computed by one worker is reused by the others,
+and invalidate() in one worker reaches them all, since each memory hit is
+checked against the version stored in the shared tier.
+
+A value loaded from the database can be stored conditionally: set() with the
+time the load started (time.time_ns()) skips the write when the key was
+invalidated since then, so a load racing an invalidation cannot put the old
+value back. Invalidations are remembered for one TTL for that purpose.
+
+An invalidation the shared tier refuses (locked or unreadable database) is
+retried, then kept pending in this worker and written again before each of
+its later shared-tier accesses, until it succeeds or one TTL has passed.
+
+Values stored in the shared tier must be JSON-serialisable after `encode`;
+`decode` turns them back into the cached object.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.logging import logger
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    expires_at: float
+    version: Optional[int] = None
+
+
+class TTLCache:
+    # Shared-tier rows are trimmed back to max_entries once every TRIM_EVERY writes
+    TRIM_EVERY = 64
+    # A failed shared invalidation is retried this many times, backing off from INVALIDATE_RETRY_DELAY seconds
+    INVALIDATE_ATTEMPTS = 3
+    INVALIDATE_RETRY_DELAY = 0.05
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl: float,
+        shared_dir: Optional[Path] = None,
+        encode: Callable[[Any], Any] = _identity,
+        decode: Callable[[Any], Any] = _identity,
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.encode = encode
+        self.decode = decode
+        self._memory: OrderedDict[str, _Entry] = OrderedDict()
+        # key -> time.time_ns() of its last invalidation, oldest first
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        # key -> time.time_ns() of an invalidation not yet written to the shared tier
+        self._pending_invalidations: Dict[str, int] = {}
+        self._local = threading.local()
+        self._writes_since_trim = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_writes = 0
+        self.shared_path: Optional[Path] = None
+        if shared_dir is not None:
+            shared_dir.mkdir(parents=True, exist_ok=True)
+            self.shared_path = shared_dir / f"{name}.sqlite3"
+            self._connection().execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    version INTEGER NOT NULL
+                )
+                """
+            )
+            self._connection().execute(
+                "CREATE INDEX IF NOT EXISTS ix_entries_expires_at ON entries (expires_at)"
+            )
+            self._connection().execute(
+                """
+                CREATE TABLE IF NOT EXISTS invalidations (
+                    key TEXT PRIMARY KEY,
+                    invalidated_at INTEGER NOT NULL
+                )
+                """
+            )
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _invalidation_horizon(self) -> int:
+        """Invalidations older than this (time.time_ns()) are forgotten."""
+        return time.time_ns() - int(self.ttl * 1e9)
+
+    def _invalidated_since(self, key: str, loaded_at: Optional[int]) -> bool:
+        if loaded_at is None:
+            return False
+        invalidated_at = self._invalidated.get(key)
+        return invalidated_at is not None and invalidated_at >= loaded_at
+
+    def _record_invalidation(self, key: str, invalidated_at: int) -> None:
+        self._invalidated[key] = invalidated_at
+        self._invalidated.move_to_end(key)
+        horizon = self._invalidation_horizon()
+        while self._invalidated and next(iter(self._invalidated.values())) < horizon:
+            self._invalidated.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Shared tier (runs in a worker thread)
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.shared_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def _shared_get(self, key: str, known_version: Optional[int]) -> Optional[Tuple[int, float, Optional[str]]]:
+        """(version, expires_at, payload); payload is None when known_version is current."""
+        return self._connection().execute(
+            """
+            SELECT version, expires_at, CASE WHEN version = ? THEN NULL ELSE value END
+            FROM entries WHERE key = ? AND expires_at > ?
+            """,
+            (known_version, key, time.time())
+        ).fetchone()
+
+    def _shared_set(
+        self, key: str, payload: str, expires_at: float, version: int, loaded_at: Optional[int]
+    ) -> bool:
+        """Store the entry unless the key was invalidated at or after loaded_at; True when stored."""
+        conn = self._connection()
+        # One statement: an invalidation committed before it is seen, one committed after deletes the row.
+        # Without loaded_at the write is unconditional: any tombstone would otherwise refuse it
+        stored = conn.execute(
+            """
+            INSERT INTO entries (key, value, expires_at, version)
+            SELECT ?, ?, ?, ?
+            WHERE ? IS NULL
+                OR NOT EXISTS (SELECT 1 FROM invalidations WHERE key = ? AND invalidated_at >= ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = excluded.value, expires_at = excluded.expires_at, version = excluded.version
+            """,
+            (key, payload, expires_at, version, loaded_at, key, loaded_at)
+        ).rowcount > 0
+        self._writes_since_trim += 1
+        if self._writes_since_trim >= self.TRIM_EVERY:
+            self._writes_since_trim = 0
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            conn.execute("DELETE FROM invalidations WHERE invalidated_at < ?", (self._invalidation_horizon(),))
+        return stored
+
+    def _shared_delete(self, key: str, invalidated_at: int) -> None:
+        conn = self._connection()
+        # Recorded first: a conditional set running in between is refused rather than re-inserted
+        conn.execute(
+            """
+            INSERT INTO invalidations (key, invalidated_at) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET invalidated_at = MAX(invalidated_at, excluded.invalidated_at)
+            """,
+            (key, invalidated_at)
+        )
+        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    async def _propagate_invalidation(self, key: str, invalidated_at: int, attempts: int) -> bool:
+        """Write the invalidation to the shared tier; on failure it stays pending. True when written."""
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(self.INVALIDATE_RETRY_DELAY * 2 ** (attempt - 1))
+            try:
+                await asyncio.to_thread(self._shared_delete, key, invalidated_at)
+            except sqlite3.Error as e:
+                error = e
+                continue
+            if self._pending_invalidations.get(key, invalidated_at) <= invalidated_at:
+                self._pending_invalidations.pop(key, None)
+            return True
+        self._pending_invalidations[key] = max(invalidated_at, self._pending_invalidations.get(key, 0))
+        logger.error(f"Shared cache '{self.name}' invalidation of {key} failed, kept pending: {str(error)}")
+        return False
+
+    async def _retry_pending_invalidations(self) -> None:
+        horizon = self._invalidation_horizon()
+        for key, invalidated_at in list(self._pending_invalidations.items()):
+            if invalidated_at < horizon:
+                # Every entry written before it has expired by now
+                del self._pending_invalidations[key]
+            elif not await self._propagate_invalidation(key, invalidated_at, attempts=1):
+                return
+
+    async def _shared(self, operation: Callable[..., Any], *args: Any) -> Any:
+        """Run a read or a write of the shared tier; None when it is unavailable."""
+        try:
+            return await asyncio.to_thread(operation, *args)
+        except sqlite3.Error as e:
+            # A failed get is a miss and a failed set only costs a recomputation
+            # elsewhere: never fail a request because of them
+            logger.warning(f"Shared cache '{self.name}' unavailable: {str(e)}")
+            return None
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        key = str(key)
+        entry = self._memory.get(key)
+        if entry is not None and entry.expires_at <= time.time():
+            del self._memory[key]
+            entry = None
+
+        if self.shared_path is None:
+            if entry is None:
+                self.misses += 1
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+        if self._pending_invalidations:
+            await self._retry_pending_invalidations()
+            if key in self._pending_invalidations:
+                # The shared row may be the value invalidated here
+                self.misses += 1
+                return None
+        row = await self._shared(self._shared_get, key, entry.version if entry else None)
+        if row is None:
+            # Expired, invalidated by another worker, or never cached
+            self._memory.pop(key, None)
+            self.misses += 1
+            return None
+        version, expires_at, payload = row
+        if payload is None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry.value
+        value = self.decode(json.loads(payload))
+        self._remember(key, _Entry(value, expires_at, version))
+        self.shared_hits += 1
+        return value
+
+    async def set(
+        self, key: Hashable, value: Any, ttl: Optional[float] = None, loaded_at: Optional[int] = None
+    ) -> bool:
+        """
+        Store value; returns False when it was not stored.
+
+        loaded_at is the time.time_ns() taken before value was loaded: the
+        value is dropped if the key was invalidated since, in any worker.
+        """
+        key = str(key)
+        if self._invalidated_since(key, loaded_at):
+            self.stale_writes += 1
+            return False
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        version = None
+        if self.shared_path is not None:
+            if self._pending_invalidations:
+                await self._retry_pending_invalidations()
+            version = time.time_ns()
+            payload = json.dumps(self.encode(value))
+            if await self._shared(self._shared_set, key, payload, expires_at, version, loaded_at) is False:
+                self.stale_writes += 1
+                return False
+            if self._invalidated_since(key, loaded_at):
+                # Invalidated in this worker while the shared write was running
+                self.stale_writes += 1
+                return False
+        self._remember(key, _Entry(value, expires_at, version))
+        return True
+
+    async def invalidate(self, key: Hashable) -> None:
+        """Drop the entry in every worker; a shared-tier failure is retried, then kept pending."""
+        key = str(key)
+        invalidated_at = time.time_ns()
+        self._memory.pop(key, None)
+        self._record_invalidation(key, invalidated_at)
+        self.invalidations += 1
+        if self.shared_path is not None:
+            # Unlike a failed get or set, a failure is not dropped: the other workers would keep serving the old value
+            await self._propagate_invalidation(key, invalidated_at, self.INVALIDATE_ATTEMPTS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_writes": self.stale_writes,
+            "pending_invalidations": len(self._pending_invalidations),
+        }
@@ -0,0 +1,58 @@
+"""
+Concurrent read-only queries on separate sessions.
+
+An AsyncSession runs one statement at a time, so independent reads awaited
+on the request session add up their round-trips. ParallelReader runs them
+on short-lived sessions of their own, bounded by a per-worker number of
+slots kept well below the connection pool size. When every slot is busy
+the reads fall back to running one after the other on the caller's
+session instead of queueing for connections, so a loaded worker never
+starves its own pool.
+
+Reads must not write: their sessions are closed (rolled back) right after.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+T = TypeVar("T")
+
+Read = Callable[[AsyncSession], Awaitable[T]]
+
+
+class ParallelReader:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], max_sessions: int):
+        self.session_factory = session_factory
+        self.max_sessions = max(1, max_sessions)
+        self._slots = asyncio.Semaphore(self.max_sessions)
+        self.in_use = 0
+        self.parallel_reads = 0
+        self.fallback_reads = 0
+
+    async def _run(self, read: Read, fallback: Optional[AsyncSession], fallback_lock: asyncio.Lock) -> Any:
+        if fallback is not None and self._slots.locked():
+            async with fallback_lock:
+                self.fallback_reads += 1
+                return await read(fallback)
+        async with self._slots:
+            self.in_use += 1
+            try:
+                async with self.session_factory() as session:
+                    self.parallel_reads += 1
+                    return await read(session)
+            finally:
+                self.in_use -= 1
+
+    async def gather(self, *reads: Read, fallback: Optional[AsyncSession] = None) -> List[Any]:
+        """Run the reads concurrently and return their results in order."""
+        fallback_lock = asyncio.Lock()
+        return list(await asyncio.gather(*(self._run(read, fallback, fallback_lock) for read in reads)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_sessions": self.max_sessions,
+            "in_use": self.in_use,
+            "parallel_reads": self.parallel_reads,
+            "fallback_reads": self.fallback_reads,
+        }
@@ -1,11 +1,18 @@
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.core.config_env import settings
+from app.db.parallel import ParallelReader
 
-async_database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+# The asyncpg dialect prepares every statement and keeps them per connection
+# in an LRU sized from the URL; sized so the hot queries are never evicted.
+async_database_url = make_url(
+    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+).update_query_dict({"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)})
 
 engine = create_async_engine(
     async_database_url,
     echo=False,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=True,
@@ -30,6 +37,8 @@ AsyncSessionLocal = async_sessionmaker(
     autocommit=False
 )
 
+parallel_reader = ParallelReader(AsyncSessionLocal, settings.DB_PARALLEL_READ_SESSIONS)
+
 
 async def get_db():
     async with AsyncSessionLocal() as session:
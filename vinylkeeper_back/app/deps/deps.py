@@ -1,8 +1,8 @@
 from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.user_model import User
 from app.core.exceptions import ForbiddenError, ErrorCode
-from app.utils.auth_utils.auth import get_current_user
+from app.core.principal import Principal
+from app.utils.auth_utils.auth import get_current_principal
 
 # Repositories
 from app.repositories.user_repository import UserRepository
@@ -16,6 +16,8 @@ from app.repositories.collection_album_repository import CollectionAlbumReposito
 from app.repositories.dashboard_repository import DashboardRepository
 from app.repositories.place_repository import PlaceRepository
 from app.repositories.moderation_request_repository import ModerationRequestRepository
+from app.repositories.export_job_repository import ExportJobRepository
+from app.repositories.library_search_repository import LibrarySearchRepository
 
 # Services
 from app.services.user_service import UserService
@@ -28,13 +30,15 @@ from app.services.place_service import PlaceService
 from app.services.moderation_service import ModerationService
 from app.services.export_service import ExportService
 from app.services.wishlist_export_service import WishlistExportService
+from app.services.export_job_service import ExportJobService, default_spool_dir
+from app.services.library_search_service import LibrarySearchService
 
 # Database
-from app.db.session import get_db
+from app.db.session import get_db, parallel_reader
 
 
-def require_admin(user: User = Depends(get_current_user)) -> User:
-    if not (user.role and user.role.name == "admin" and user.is_superuser):
+def require_admin(user: Principal = Depends(get_current_principal)) -> Principal:
+    if not user.is_admin:
         raise ForbiddenError(error_code=ErrorCode.FORBIDDEN, message="Admin access required")
     return user
 
@@ -91,6 +95,14 @@ def get_moderation_request_repository(db: AsyncSession = Depends(get_db)) -> Mod
     return ModerationRequestRepository(db)
 
 
+def get_export_job_repository(db: AsyncSession = Depends(get_db)) -> ExportJobRepository:
+    return ExportJobRepository(db)
+
+
+def get_library_search_repository(db: AsyncSession = Depends(get_db)) -> LibrarySearchRepository:
+    return LibrarySearchRepository(db)
+
+
 # Service Dependencies
 def get_collection_service(
     repository: CollectionRepository = Depends(get_collection_repository),
@@ -105,9 +117,10 @@ def get_collection_service(
 
 
 def get_search_service(request: Request) -> SearchService:
-    """Get SearchService with shared HTTP client from app state."""
+    """Get SearchService with shared HTTP and Discogs clients from app state."""
     http_client = request.app.state.http_client
-    return SearchService(http_client)
+    discogs_client = request.app.state.discogs_client
+    return SearchService(http_client, discogs_client)
 
 
 def get_external_reference_service(
@@ -141,10 +154,12 @@ def get_user_service(
 
 
 def get_dashboard_service(
+    request: Request,
     dashboard_repository: DashboardRepository = Depends(
         get_dashboard_repository),
 ) -> DashboardService:
-    return DashboardService(dashboard_repository)
+    """Get DashboardService with the shared per-user cache from app state and parallel reads."""
+    return DashboardService(dashboard_repository, request.app.state.dashboard_cache, parallel_reader)
 
 
 def get_moderation_service(
@@ -169,3 +184,16 @@ def get_wishlist_export_service(
     wishlist_repository: WishlistRepository = Depends(get_wishlist_repository),
 ) -> WishlistExportService:
     return WishlistExportService(wishlist_repository)
+
+
+def get_export_job_service(
+    export_job_repository: ExportJobRepository = Depends(get_export_job_repository),
+    export_service: ExportService = Depends(get_export_service),
+) -> ExportJobService:
+    return ExportJobService(export_job_repository, export_service, default_spool_dir())
+
+
+def get_library_search_service(
+    repository: LibrarySearchRepository = Depends(get_library_search_repository),
+) -> LibrarySearchService:
+    return LibrarySearchService(repository)
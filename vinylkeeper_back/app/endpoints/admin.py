@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, status, Path, Query
 
+from app.core.metrics import collect_metrics
 from app.schemas.moderation_request_schema import (
     ModerationRequestResponse,
     ModerationRequestListResponse,
@@ -9,7 +10,7 @@ from app.schemas.moderation_request_schema import (
 )
 from app.services.moderation_service import ModerationService
 from app.deps.deps import get_moderation_service, require_admin
-from app.models.user_model import User
+from app.core.principal import Principal
 from app.utils.endpoint_utils import handle_app_exceptions
 
 router = APIRouter()
@@ -18,7 +19,7 @@ router = APIRouter()
 @router.get("/moderation-requests", response_model=ModerationRequestListResponse, status_code=status.HTTP_200_OK)
 @handle_app_exceptions
 async def get_moderation_requests(
-    user: User = Depends(require_admin),
+    user: Principal = Depends(require_admin),
     service: ModerationService = Depends(get_moderation_service),
     page: int = Query(1, gt=0, description="Page number"),
     limit: int = Query(MODERATION_DEFAULT_LIMIT, gt=0, le=MODERATION_MAX_LIMIT, description="Items per page"),
@@ -34,7 +35,7 @@ async def get_moderation_requests(
 )
 @handle_app_exceptions
 async def get_pending_moderation_requests(
-    user: User = Depends(require_admin),
+    user: Principal = Depends(require_admin),
     service: ModerationService = Depends(get_moderation_service),
     page: int = Query(1, gt=0, description="Page number"),
     limit: int = Query(MODERATION_DEFAULT_LIMIT, gt=0, le=MODERATION_MAX_LIMIT, description="Items per page"),
@@ -51,7 +52,7 @@ async def get_pending_moderation_requests(
 @handle_app_exceptions
 async def get_moderation_request_by_id(
     request_id: int = Path(..., gt=0, title="Moderation Request ID"),
-    user: User = Depends(require_admin),
+    user: Principal = Depends(require_admin),
     service: ModerationService = Depends(get_moderation_service)
 ):
     """Get a specific moderation request (admin only)"""
@@ -67,7 +68,7 @@ async def get_moderation_request_by_id(
 @handle_app_exceptions
 async def approve_moderation_request(
     request_id: int = Path(..., gt=0, title="Moderation Request ID"),
-    user: User = Depends(require_admin),
+    user: Principal = Depends(require_admin),
     service: ModerationService = Depends(get_moderation_service)
 ):
     """Approve a moderation request (admin only)"""
@@ -83,7 +84,7 @@ async def approve_moderation_request(
 @handle_app_exceptions
 async def reject_moderation_request(
     request_id: int = Path(..., gt=0, title="Moderation Request ID"),
-    user: User = Depends(require_admin),
+    user: Principal = Depends(require_admin),
     service: ModerationService = Depends(get_moderation_service)
 ):
     """Reject a moderation request (admin only)"""
@@ -94,9 +95,18 @@ async def reject_moderation_request(
 @router.get("/moderation-stats", response_model=dict, status_code=status.HTTP_200_OK)
 @handle_app_exceptions
 async def get_moderation_stats(
-    user: User = Depends(require_admin),
+    user: Principal = Depends(require_admin),
     service: ModerationService = Depends(get_moderation_service)
 ):
     """Get moderation statistics (admin only)"""
     stats = await service.get_moderation_stats()
     return stats
+
+
+@router.get("/runtime-metrics", response_model=dict, status_code=status.HTTP_200_OK)
+@handle_app_exceptions
+async def get_runtime_metrics(
+    user: Principal = Depends(require_admin)
+):
+    """Get in-process runtime counters of the worker serving the request (admin only)"""
+    return collect_metrics()
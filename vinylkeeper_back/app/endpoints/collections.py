@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, status, Path, Query, Body
 from app.schemas.collection_schema import (
     CollectionCreate,
@@ -16,13 +18,14 @@ from app.schemas.collection_schema import (
 from app.schemas.like_schema import LikeStatusResponse
 from app.services.collection_service import CollectionService
 from app.deps.deps import get_collection_service, get_export_service
-from app.utils.auth_utils.auth import get_current_user
-from app.models.user_model import User
+from app.utils.auth_utils.auth import get_current_principal
+from app.core.principal import Principal
 from app.services.export_service import ExportService
 from app.schemas.collection_album_schema import CollectionAlbumUpdate
 from app.utils.endpoint_utils import handle_app_exceptions
 from app.core.exceptions import ValidationError
 from app.core.logging import logger
+from app.utils.pagination import total_pages
 
 router = APIRouter()
 
@@ -31,7 +34,7 @@ router = APIRouter()
 @handle_app_exceptions
 async def create_collection(
     data: CollectionCreate,
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service)
 ):
     collection = await service.create_collection(data, user.id)
@@ -45,7 +48,7 @@ async def create_collection(
 @router.get("/", status_code=status.HTTP_200_OK, response_model=PaginatedCollectionListResponse)
 @handle_app_exceptions
 async def get_user_collections(
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
     page: int = Query(1, gt=0),
     limit: int = Query(10, gt=0, le=100)
@@ -64,23 +67,25 @@ async def get_user_collections(
 @router.get("/public", status_code=status.HTTP_200_OK, response_model=PaginatedCollectionListResponse)
 @handle_app_exceptions
 async def get_public_collections(
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
     page: int = Query(1, gt=0),
     limit: int = Query(10, gt=0, le=100),
     sort_by: str = Query(
-        "updated_at", description="Sort by: updated_at, created_at, or likes_count")
+        "updated_at", description="Sort by: updated_at, created_at, or likes_count"),
+    cursor: Optional[str] = Query(None, max_length=512, description="next_cursor of the previous page"),
 ):
     """Get public collections (optimized list view with lightweight response)."""
-    collections, total = await service.get_public_collections(
-        page, limit, exclude_user_id=user.id, user_id=user.id, sort_by=sort_by
+    collections, total, next_cursor = await service.get_public_collections(
+        page, limit, exclude_user_id=user.id, user_id=user.id, sort_by=sort_by, cursor=cursor
     )
     return PaginatedCollectionListResponse(
         items=collections,
         total=total,
-        page=page,
+        page=None if cursor else page,
         limit=limit,
-        total_pages=(total + limit - 1) // limit
+        total_pages=total_pages(total, limit),
+        next_cursor=next_cursor
     )
 
 
@@ -88,7 +93,7 @@ async def get_public_collections(
 @handle_app_exceptions
 async def get_collection_by_id(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     collection = await service.get_collection_by_id(collection_id, user.id)
@@ -100,7 +105,7 @@ async def get_collection_by_id(
 async def switch_area_collection(
     collection_id: int = Path(..., gt=0),
     data: CollectionVisibilityUpdate = Body(...),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     updated = await service.update_collection(
@@ -121,7 +126,7 @@ async def switch_area_collection(
 async def update_collection(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
     data: CollectionUpdate = Body(...),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     updated = await service.update_collection(user.id, collection_id, data)
@@ -137,7 +142,7 @@ async def update_collection(
 @handle_app_exceptions
 async def delete_collection(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     await service.delete_collection(user.id, collection_id)
@@ -148,7 +153,7 @@ async def delete_collection(
 @handle_app_exceptions
 async def get_collection_details(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     """Get lightweight collection details (optimized - no albums/artists loaded)."""
@@ -164,10 +169,11 @@ async def get_collection_albums_paginated(
     limit: int = Query(
         12, gt=0, le=50, description="Number of items per page"),
     sort_order: str = Query("newest", description="Sort order: 'newest' or 'oldest'"),
-    user=Depends(get_current_user),
+    cursor: Optional[str] = Query(None, max_length=512, description="next_cursor of the previous page"),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
-    return await service.get_collection_albums_paginated(collection_id, user.id, page, limit, sort_order)
+    return await service.get_collection_albums_paginated(collection_id, user.id, page, limit, sort_order, cursor)
 
 
 @router.get("/{collection_id}/artists", status_code=status.HTTP_200_OK, response_model=PaginatedArtistsResponse)
@@ -178,10 +184,11 @@ async def get_collection_artists_paginated(
     limit: int = Query(
         12, gt=0, le=50, description="Number of items per page"),
     sort_order: str = Query("newest", description="Sort order: 'newest' or 'oldest'"),
-    user=Depends(get_current_user),
+    cursor: Optional[str] = Query(None, max_length=512, description="next_cursor of the previous page"),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
-    return await service.get_collection_artists_paginated(collection_id, user.id, page, limit, sort_order)
+    return await service.get_collection_artists_paginated(collection_id, user.id, page, limit, sort_order, cursor)
 
 
 @router.delete("/{collection_id}/albums/{album_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -189,7 +196,7 @@ async def get_collection_artists_paginated(
 async def remove_album_from_collection(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
     album_id: int = Path(..., gt=0, title="Album ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     await service.remove_album_from_collection(user.id, collection_id, album_id)
@@ -201,7 +208,7 @@ async def remove_album_from_collection(
 async def remove_artist_from_collection(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
     artist_id: int = Path(..., gt=0, title="Artist ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     await service.remove_artist_from_collection(user.id, collection_id, artist_id)
@@ -212,7 +219,7 @@ async def remove_artist_from_collection(
 @handle_app_exceptions
 async def like_collection(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     result = await service.like_collection(user.id, collection_id)
@@ -228,7 +235,7 @@ async def like_collection(
 @handle_app_exceptions
 async def unlike_collection(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ):
     result = await service.unlike_collection(user.id, collection_id)
@@ -246,7 +253,7 @@ async def update_album_metadata(
     collection_id: int,
     album_id: int,
     data: CollectionAlbumUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service)
 ) -> CollectionAlbumResponse:
     updated_metadata = await service.update_album_metadata(
@@ -262,7 +269,7 @@ async def search_collection_items(
     q: str = Query(..., min_length=1, description="Search term"),
     search_type: str = Query(
         "both", description="Search type: 'album', 'artist', 'albums', 'artists', or 'both'"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     service: CollectionService = Depends(get_collection_service),
 ) -> CollectionSearchResponse:
     return await service.search_collection_items(collection_id, user.id, q, search_type)
@@ -272,7 +279,7 @@ async def search_collection_items(
 @handle_app_exceptions
 async def export_collection_albums_csv(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     export_service: ExportService = Depends(get_export_service),
 ):
     return await export_service.export_collection_albums_csv(collection_id, user.id)
@@ -282,7 +289,7 @@ async def export_collection_albums_csv(
 @handle_app_exceptions
 async def export_collection_artists_csv(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     export_service: ExportService = Depends(get_export_service),
 ):
     return await export_service.export_collection_artists_csv(collection_id, user.id)
@@ -292,7 +299,7 @@ async def export_collection_artists_csv(
 @handle_app_exceptions
 async def export_collection_albums_ods(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     export_service: ExportService = Depends(get_export_service),
 ):
     return await export_service.export_collection_albums_ods(collection_id, user.id)
@@ -302,7 +309,7 @@ async def export_collection_albums_ods(
 @handle_app_exceptions
 async def export_collection_artists_ods(
     collection_id: int = Path(..., gt=0, title="Collection ID"),
-    user=Depends(get_current_user),
+    user=Depends(get_current_principal),
     export_service: ExportService = Depends(get_export_service),
 ):
     return await export_service.export_collection_artists_ods(collection_id, user.id)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from app.schemas.dashboard_schema import DashboardStatsResponse
 from app.services.dashboard_service import DashboardService
 from app.deps.deps import get_dashboard_service
-from app.utils.auth_utils.auth import get_current_user
+from app.utils.auth_utils.auth import get_current_principal
 from app.utils.endpoint_utils import handle_app_exceptions
 
 router = APIRouter()
@@ -12,6 +12,6 @@ router = APIRouter()
 @handle_app_exceptions
 async def get_dashboard_stats(
     dashboard_service: DashboardService = Depends(get_dashboard_service),
-    user=Depends(get_current_user)
+    user=Depends(get_current_principal)
 ):
     return await dashboard_service.get_dashboard_stats(user)
@@ -0,0 +1,42 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Path, status
+
+from app.core.principal import Principal
+from app.deps.deps import get_export_job_service
+from app.schemas.export_job_schema import ExportJobCreate, ExportJobResponse
+from app.services.export_job_service import ExportJobService
+from app.utils.auth_utils.auth import get_current_principal
+from app.utils.endpoint_utils import handle_app_exceptions
+
+router = APIRouter()
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED, response_model=ExportJobResponse)
+@handle_app_exceptions
+async def create_export_job(
+    data: ExportJobCreate,
+    user: Principal = Depends(get_current_principal),
+    service: ExportJobService = Depends(get_export_job_service),
+):
+    return await service.create_job(data, user.id)
+
+
+@router.get("/{job_id}", response_model=ExportJobResponse)
+@handle_app_exceptions
+async def get_export_job(
+    job_id: uuid.UUID = Path(..., title="Export job ID"),
+    user: Principal = Depends(get_current_principal),
+    service: ExportJobService = Depends(get_export_job_service),
+):
+    return await service.get_job(job_id, user.id)
+
+
+@router.get("/{job_id}/download")
+@handle_app_exceptions
+async def download_export(
+    job_id: uuid.UUID = Path(..., title="Export job ID"),
+    user: Principal = Depends(get_current_principal),
+    service: ExportJobService = Depends(get_export_job_service),
+):
+    return await service.download(job_id, user.id)
@@ -1,8 +1,8 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Response
 from fastapi import status as http_status
-from app.utils.auth_utils.auth import get_current_user
-from app.models.user_model import User
+from app.utils.auth_utils.auth import get_current_principal
+from app.core.principal import Principal
 from app.services.external_reference_service import ExternalReferenceService
 from app.services.wishlist_service import WishlistService
 from app.services.user_service import UserService
@@ -39,7 +39,7 @@ router = APIRouter()
 @handle_app_exceptions
 async def add_to_wishlist(
     request: AddToWishlistRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     service: WishlistService = Depends(get_wishlist_service)
 ):
     """Add an item to user's wishlist"""
@@ -51,7 +51,7 @@ async def add_to_wishlist(
 @handle_app_exceptions
 async def remove_from_wishlist(
     wishlist_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     service: WishlistService = Depends(get_wishlist_service)
 ):
     """Remove an item from user's wishlist"""
@@ -64,7 +64,7 @@ async def remove_from_wishlist(
 async def add_to_collection(
     request: AddToCollectionRequest,
     collection_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     service: ExternalReferenceService = Depends(get_external_reference_service)
 ):
     """Add an item to user's collection"""
@@ -79,7 +79,7 @@ async def remove_from_collection(
     collection_id: int,
     external_id: str,
     entity_type: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     service: ExternalReferenceService = Depends(get_external_reference_service)
 ):
     """Remove an item from user's collection"""
@@ -104,7 +104,8 @@ async def get_user_wishlist_paginated(
         None, description="User UUID to get wishlist for (defaults to current user)"),
     search: Optional[str] = Query(None, max_length=255, description="Search by title"),
     sort_order: str = Query("newest", pattern="^(newest|oldest)$", description="Sort order"),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, max_length=512, description="next_cursor of the previous page"),
+    current_user: Principal = Depends(get_current_principal),
     service: WishlistService = Depends(get_wishlist_service),
     user_service: UserService = Depends(get_user_service),
     collection_service: CollectionService = Depends(get_collection_service)
@@ -133,13 +134,13 @@ async def get_user_wishlist_paginated(
     else:
         target_user_id = current_user.id
 
-    return await service.get_user_wishlist_paginated(target_user_id, page, limit, search, sort_order)
+    return await service.get_user_wishlist_paginated(target_user_id, page, limit, search, sort_order, cursor)
 
 
 @router.get("/wishlist/export/csv")
 @handle_app_exceptions
 async def export_my_wishlist_csv(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     export_service: WishlistExportService = Depends(get_wishlist_export_service),
 ):
     return await export_service.export_my_wishlist_csv(current_user.id, current_user.username)
@@ -148,7 +149,7 @@ async def export_my_wishlist_csv(
 @router.get("/wishlist/export/ods")
 @handle_app_exceptions
 async def export_my_wishlist_ods(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     export_service: WishlistExportService = Depends(get_wishlist_export_service),
 ):
     return await export_service.export_my_wishlist_ods(current_user.id, current_user.username)
@@ -158,7 +159,7 @@ async def export_my_wishlist_ods(
 @handle_app_exceptions
 async def get_wishlist_item_detail(
     wishlist_id: int = Path(..., gt=0, title="Wishlist Item ID"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     service: WishlistService = Depends(get_wishlist_service)
 ):
     """Get detailed wishlist item by ID (public - any authenticated user can view)"""
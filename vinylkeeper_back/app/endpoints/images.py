@@ -1,17 +1,39 @@
+from collections import Counter
+from typing import Optional
 from fastapi import APIRouter, Query, Request, Depends
-from fastapi.responses import StreamingResponse
-from io import BytesIO
-import hashlib
+from fastapi.responses import FileResponse, Response
+from app.core.metrics import register_metrics
 from app.services.image_proxy_service import ImageProxyService
 from app.utils.endpoint_utils import handle_app_exceptions
 
 router = APIRouter()
 
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Negotiated output format of every proxy request
+_negotiated_formats: Counter = Counter()
+register_metrics("image_formats", lambda: dict(_negotiated_formats))
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag` (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
 
 def get_image_proxy_service(request: Request) -> ImageProxyService:
-    """Get ImageProxyService with shared HTTP client from app state."""
+    """Get ImageProxyService with shared HTTP client, image cache and transcoding pool from app state."""
     http_client = request.app.state.http_client
-    return ImageProxyService(http_client)
+    image_cache = request.app.state.image_cache
+    transcode_pool = request.app.state.transcode_pool
+    return ImageProxyService(http_client, image_cache, transcode_pool)
 
 
 @router.get("/proxy")
@@ -31,7 +53,8 @@ async def proxy_image(
     Proxy endpoint for Discogs images with resizing and optimization.
 
     Fetches images from Discogs CDN, resizes them to requested dimensions,
-    converts to WebP by default (with JPEG fallback), and optionally caches results on disk.
+    negotiates the output format from the Accept header (AVIF > WebP > JPEG),
+    and optionally caches results on disk.
 
     Args:
         src: Source image URL (must be from i.discogs.com)
@@ -39,39 +62,40 @@ async def proxy_image(
         h: Target height in pixels
         q: Quality (1-100, default 85)
         cache: Whether to cache the image on disk (default False)
-        request: FastAPI request object (for Accept header)
+        request: FastAPI request object (for Accept and If-None-Match headers)
         service: Injected image proxy service
 
     Returns:
-        StreamingResponse: Optimized image with appropriate content-type
+        Response: 304 when If-None-Match matches, else the optimized image
+            (sent from the cache file when it is cached)
 
     Raises:
         ValidationError: If domain not allowed, invalid dimensions, or invalid quality
         ServerError: If image fetch or processing fails
     """
-    accept_header = request.headers.get("accept", "")
-    accept_webp = "image/webp" in accept_header.lower()
+    format = service.negotiate_format(request.headers.get("accept"))
+    _negotiated_formats[format] += 1
 
-    image_data, content_type = await service.get_proxy_image(
+    etag = service.variant_etag(src, w, h, q, format)
+    headers = {
+        "Cache-Control": CACHE_CONTROL,
+        "ETag": etag,
+        "Vary": "Accept"
+    }
+
+    # The ETag depends only on the request, so revalidation skips fetch and transcoding
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    image = await service.get_proxy_image(
         src=src,
         width=w,
         height=h,
         quality=q,
-        accept_webp=accept_webp,
+        format=format,
         cacheable=cache
     )
 
-    etag = hashlib.md5(image_data).hexdigest()
-
-    response = StreamingResponse(
-        BytesIO(image_data),
-        media_type=content_type,
-        headers={
-            "Cache-Control": "public, max-age=31536000, immutable",
-            "Content-Length": str(len(image_data)),
-            "ETag": f'"{etag}"',
-            "Vary": "Accept"
-        }
-    )
-
-    return response
+    if image.path is not None:
+        return FileResponse(image.path, media_type=image.content_type, headers=headers)
+    return Response(content=image.data, media_type=image.content_type, headers=headers)
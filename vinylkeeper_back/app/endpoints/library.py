@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core.config_env import settings
+from app.core.principal import Principal
+from app.deps.deps import get_library_search_service
+from app.schemas.library_search_schema import LibrarySearchResponse
+from app.services.library_search_service import LibrarySearchService
+from app.utils.auth_utils.auth import get_current_principal
+from app.utils.endpoint_utils import handle_app_exceptions
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=LibrarySearchResponse)
+@handle_app_exceptions
+async def search_library(
+    q: str = Query(..., min_length=1, max_length=100, description="Search term, matched as typed so far"),
+    limit: int = Query(20, gt=0, le=settings.LIBRARY_SEARCH_MAX_HITS, description="Maximum hits"),
+    user: Principal = Depends(get_current_principal),
+    service: LibrarySearchService = Depends(get_library_search_service),
+):
+    """Albums and artists of all the user's collections and items of their wishlist matching q, best first."""
+    return await service.search(q, user.id, limit)
@@ -12,7 +12,8 @@ from app.schemas.place_schema import (
 from app.schemas.place_like_schema import PlaceLikeStatusResponse
 from app.services.place_service import PlaceService
 from app.deps.deps import get_place_service
-from app.utils.auth_utils.auth import get_current_user
+from app.utils.auth_utils.auth import get_current_principal, get_current_user
+from app.core.principal import Principal
 from app.models.user_model import User
 from app.utils.endpoint_utils import handle_app_exceptions
 
@@ -34,7 +35,7 @@ async def create_place(
 @router.get("/", response_model=PaginatedPlaceResponse, status_code=status.HTTP_200_OK)
 @handle_app_exceptions
 async def get_places(
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service),
     page: int = Query(1, gt=0, description="Page number"),
     limit: int = Query(20, gt=0, le=100, description="Items per page"),
@@ -46,7 +47,7 @@ async def get_places(
 @router.get("/map", status_code=status.HTTP_200_OK, response_model=List[PlaceMapResponse])
 @handle_app_exceptions
 async def get_map_places(
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service)
 ):
     """Get all moderated places with coordinates for map markers (ultra-lightweight response)."""
@@ -59,7 +60,7 @@ async def get_map_places(
 async def get_places_by_location(
     country: str = Query(..., min_length=1, description="Country name"),
     city: str = Query(..., min_length=1, description="City name"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service)
 ):
     """Get all moderated places in the given country and city (for map popup)."""
@@ -81,7 +82,7 @@ async def get_place_types(
 @handle_app_exceptions
 async def search_places(
     q: str = Query(..., min_length=1, description="Search term"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service),
     page: int = Query(1, gt=0, description="Page number"),
     limit: int = Query(20, gt=0, le=100, description="Items per page"),
@@ -94,7 +95,7 @@ async def search_places(
 @handle_app_exceptions
 async def get_places_by_type(
     place_type_id: int = Path(..., gt=0, title="Place Type ID"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service),
     page: int = Query(1, gt=0, description="Page number"),
     limit: int = Query(20, gt=0, le=100, description="Items per page"),
@@ -110,7 +111,7 @@ async def get_places_in_region(
     max_lat: float = Query(..., ge=-90, le=90, description="Maximum latitude"),
     min_lng: float = Query(..., ge=-180, le=180, description="Minimum longitude"),
     max_lng: float = Query(..., ge=-180, le=180, description="Maximum longitude"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service),
     page: int = Query(1, gt=0, description="Page number"),
     limit: int = Query(20, gt=0, le=100, description="Items per page"),
@@ -123,7 +124,7 @@ async def get_places_in_region(
 @handle_app_exceptions
 async def get_place_by_id(
     place_id: int = Path(..., gt=0, title="Place ID"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service)
 ):
     """Get a place by ID (only moderated places)"""
@@ -136,7 +137,7 @@ async def get_place_by_id(
 async def update_place(
     place_id: int = Path(..., gt=0, title="Place ID"),
     data: PlaceUpdate = Body(...),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service)
 ):
     """Update a place"""
@@ -148,7 +149,7 @@ async def update_place(
 @handle_app_exceptions
 async def delete_place(
     place_id: int = Path(..., gt=0, title="Place ID"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service)
 ):
     """Delete a place"""
@@ -159,7 +160,7 @@ async def delete_place(
 @handle_app_exceptions
 async def like_place(
     place_id: int = Path(..., gt=0, title="Place ID"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service)
 ):
     """Like a place"""
@@ -176,7 +177,7 @@ async def like_place(
 @handle_app_exceptions
 async def unlike_place(
     place_id: int = Path(..., gt=0, title="Place ID"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     service: PlaceService = Depends(get_place_service)
 ):
     """Unlike a place"""
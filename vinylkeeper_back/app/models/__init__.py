@@ -10,6 +10,8 @@ from .like_model import Like
 from .moderation_request_model import ModerationRequest
 from .association_tables import CollectionArtist, collection_artist
 from .place_like_model import PlaceLike
+from .dashboard_snapshot_model import DashboardSnapshot
+from .export_job_model import ExportJob
 
 from .reference_data.external_sources import ExternalSource
 from .reference_data.entity_types import EntityType
@@ -40,4 +42,6 @@ __all__ = [
     "Mood",
     "PlaceType",
     "PlaceLike",
+    "DashboardSnapshot",
+    "ExportJob",
 ]
@@ -54,13 +54,13 @@ class Album(Base):
         "CollectionAlbum",
         back_populates="album",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="raise"
     )
 
     loans = relationship(
         "Loan",
         back_populates="album",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan"
     )
 
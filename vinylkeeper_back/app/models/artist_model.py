@@ -57,14 +57,14 @@ class Artist(Base):
         "CollectionArtist",
         back_populates="artist",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="raise"
     )
 
     collections = relationship(
         "Collection",
         secondary="collection_artist",
         back_populates="artists",
-        lazy="selectin",
+        lazy="raise",
         overlaps="collection_artists"
     )
 
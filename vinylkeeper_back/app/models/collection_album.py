@@ -23,9 +23,9 @@ class CollectionAlbum(Base):
                         nullable=True)
 
     collection = relationship(
-        "Collection", back_populates="collection_albums", lazy="selectin")
+        "Collection", back_populates="collection_albums", lazy="raise")
     album = relationship(
-        "Album", back_populates="album_collections", lazy="selectin")
+        "Album", back_populates="album_collections", lazy="raise")
     state_record_ref = relationship("VinylState", foreign_keys=[
                                     state_record], lazy="selectin")
     state_cover_ref = relationship("VinylState", foreign_keys=[
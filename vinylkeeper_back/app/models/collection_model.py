@@ -33,14 +33,14 @@ class Collection(Base):
         "CollectionAlbum",
         back_populates="collection",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="raise"
     )
 
     collection_artists = relationship(
         "CollectionArtist",
         back_populates="collection",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="raise"
     )
 
     artists = relationship(
@@ -65,9 +65,11 @@ class Collection(Base):
                         server_default=func.now(),
                         onupdate=func.now(), nullable=False)
 
-    # Non-mapped aggregated counts, populated by repository queries
-    albums_count = 0
-    artists_count = 0
+    # Denormalised counters maintained by database triggers on collection_album,
+    # collection_artist and likes; CollectionRepository.reconcile_counters repairs drift
+    albums_count = Column(Integer, default=0, server_default="0", nullable=False)
+    artists_count = Column(Integer, default=0, server_default="0", nullable=False)
+    likes_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     __table_args__ = (
         CheckConstraint(
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, DateTime, JSON
+
+from app.models.base import Base
+
+
+class DashboardSnapshot(Base):
+    """Single-row snapshot of the global dashboard statistics, shared by all workers."""
+
+    __tablename__ = "dashboard_snapshot"
+
+    SINGLETON_ID = 1
+
+    id = Column(Integer, primary_key=True, default=SINGLETON_ID)
+    global_albums_total = Column(Integer, default=0, server_default="0", nullable=False)
+    global_artists_total = Column(Integer, default=0, server_default="0", nullable=False)
+    global_places_total = Column(Integer, default=0, server_default="0", nullable=False)
+    moderated_places_total = Column(Integer, default=0, server_default="0", nullable=False)
+    public_collections_total = Column(Integer, default=0, server_default="0", nullable=False)
+    # LatestAddition payloads, usernames kept raw ("You" is applied per request)
+    latest_album = Column(JSON, nullable=True)
+    latest_artist = Column(JSON, nullable=True)
+    recent_albums = Column(JSON, nullable=False, default=list)
+    # NULL until the first refresh
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<DashboardSnapshot(refreshed_at={self.refreshed_at})>"
@@ -0,0 +1,56 @@
+import uuid
+
+from sqlalchemy import (
+    UUID as SQLUUID,
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
+
+from app.core.enums import ExportJobStatusEnum
+from app.models.base import Base
+
+
+class ExportJob(Base):
+    """Export queued by a user, generated in the background and kept on disk until expires_at."""
+
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        # Queue scan of the runners: oldest pending (or abandoned running) job first
+        Index("idx_export_jobs_status_created_at", "status", "created_at"),
+        Index("idx_export_jobs_user_id_status", "user_id", "status"),
+        Index("idx_export_jobs_expires_at", "expires_at"),
+    )
+
+    id = Column(SQLUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # NULL for the wishlist export
+    collection_id = Column(Integer, ForeignKey("collections.id", ondelete="CASCADE"), nullable=True)
+    kind = Column(String(32), nullable=False)
+    format = Column(String(8), nullable=False)
+    status = Column(
+        String(16), nullable=False, default=ExportJobStatusEnum.PENDING.value,
+        server_default=ExportJobStatusEnum.PENDING.value
+    )
+    # Runs started, including the ones interrupted by a worker shutdown
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    rows_written = Column(Integer, nullable=False, default=0, server_default="0")
+    total_rows = Column(Integer, nullable=True)
+    filename = Column(String(255), nullable=True)
+    file_size = Column(BigInteger, nullable=True)
+    error = Column(String(512), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    # Refreshed after every batch while running; a stale heartbeat means the worker is gone
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    # Set once finished: the row and its file are deleted after this
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<ExportJob(id={self.id}, kind={self.kind}, format={self.format}, status={self.status})>"
@@ -1,7 +1,9 @@
 from sqlalchemy import (
     Column,
+    Computed,
     Integer,
     String,
+    Text,
     Float,
     Boolean,
     DateTime,
@@ -9,7 +11,7 @@ from sqlalchemy import (
     func,
     CheckConstraint
 )
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import deferred, relationship, validates
 
 from app.models.base import Base
 
@@ -25,6 +27,8 @@ class Place(Base):
     address = Column(String(255), nullable=False)
     city = Column(String(100), nullable=False, index=True)
     country = Column(String(100), nullable=False, index=True)
+    # Searched text of the place search, under a GIN trigram index (migration 5f8e1d3c7a92)
+    search_text = deferred(Column(Text, Computed("name || ' ' || city || ' ' || country", persisted=True)))
 
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
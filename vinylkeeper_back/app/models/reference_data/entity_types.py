@@ -10,7 +10,7 @@ class EntityType(Base):
     name = Column(String(50), unique=True, nullable=False)
 
     wishlist_items = relationship(
-        "Wishlist", back_populates="entity_type", lazy="selectin")
+        "Wishlist", back_populates="entity_type", lazy="raise")
 
     def __repr__(self):
         return f"<EntityType(name={self.name})>"
@@ -10,11 +10,11 @@ class ExternalSource(Base):
     name = Column(String(100), unique=True, nullable=False)
 
     albums = relationship(
-        "Album", back_populates="external_source", lazy="selectin")
+        "Album", back_populates="external_source", lazy="raise")
     artists = relationship(
-        "Artist", back_populates="external_source", lazy="selectin")
+        "Artist", back_populates="external_source", lazy="raise")
     wishlist_items = relationship(
-        "Wishlist", back_populates="external_source", lazy="selectin")
+        "Wishlist", back_populates="external_source", lazy="raise")
 
     def __repr__(self):
         return f"<ExternalSource(name={self.name})>"
@@ -11,7 +11,7 @@ class ModerationStatus(Base):
     name = Column(String(50), unique=True, nullable=False)
 
     moderation_requests = relationship(
-        "ModerationRequest", back_populates="status", lazy="selectin")
+        "ModerationRequest", back_populates="status", lazy="raise")
 
     def __repr__(self):
         return f"<ModerationStatus(name={self.name})>"
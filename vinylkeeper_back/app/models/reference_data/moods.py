@@ -10,7 +10,7 @@ class Mood(Base):
     name = Column(String(100), unique=True, nullable=False)
 
     collections = relationship(
-        "Collection", back_populates="mood", lazy="selectin")
+        "Collection", back_populates="mood", lazy="raise")
 
     def __repr__(self):
         return f"<Mood(name={self.name})>"
@@ -10,7 +10,7 @@ class PlaceType(Base):
     name = Column(String(150), unique=True, nullable=False)
 
     places = relationship(
-        "Place", back_populates="place_type", lazy="selectin")
+        "Place", back_populates="place_type", lazy="raise")
 
     def __repr__(self):
         return f"<PlaceType(name={self.name})>"
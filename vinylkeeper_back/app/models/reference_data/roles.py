@@ -9,7 +9,7 @@ class Role(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String(50), unique=True, nullable=False)
 
-    users = relationship("User", back_populates="role", lazy="selectin")
+    users = relationship("User", back_populates="role", lazy="raise")
 
     def __repr__(self):
         return f"<Role(name={self.name})>"
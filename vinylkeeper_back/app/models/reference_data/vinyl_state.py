@@ -16,13 +16,13 @@ class VinylState(Base):
         "CollectionAlbum",
         foreign_keys="CollectionAlbum.state_record",
         back_populates="state_record_ref",
-        lazy="selectin"
+        lazy="raise"
     )
     cover_collections = relationship(
         "CollectionAlbum",
         foreign_keys="CollectionAlbum.state_cover",
         back_populates="state_cover_ref",
-        lazy="selectin"
+        lazy="raise"
     )
 
     def __repr__(self):
@@ -1,12 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.album_model import Album
 from typing import Optional
+from app.core.enums import LoadProfileEnum
 from app.core.exceptions import ServerError
 from app.core.logging import logger
 from app.core.transaction import TransactionalMixin
+from app.repositories.loading_profiles import load_options
 
 
 class AlbumRepository(TransactionalMixin):
@@ -15,10 +16,14 @@ class AlbumRepository(TransactionalMixin):
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_by_id(self, album_id: int) -> Optional[Album]:
-        """Get an album by ID"""
+    async def get_by_id(
+        self, album_id: int, profile: LoadProfileEnum = LoadProfileEnum.LIST_CARD
+    ) -> Optional[Album]:
+        """Get an album by ID with the relations of the given loading profile"""
         try:
-            query = select(Album).filter(Album.id == album_id)
+            query = select(Album).options(
+                *load_options(Album, profile)
+            ).filter(Album.id == album_id)
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
         except SQLAlchemyError as e:
@@ -29,11 +34,16 @@ class AlbumRepository(TransactionalMixin):
                 details={}
             )
 
-    async def get_by_external_id(self, external_album_id: str, external_source_id: int) -> Optional[Album]:
-        """Get an album by external ID and source with relations loaded"""
+    async def get_by_external_id(
+        self,
+        external_album_id: str,
+        external_source_id: int,
+        profile: LoadProfileEnum = LoadProfileEnum.LIST_CARD
+    ) -> Optional[Album]:
+        """Get an album by external ID and source with the relations of the given loading profile"""
         try:
             query = select(Album).options(
-                selectinload(Album.external_source)
+                *load_options(Album, profile)
             ).filter(
                 Album.external_album_id == external_album_id,
                 Album.external_source_id == external_source_id
@@ -1,12 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.artist_model import Artist
 from typing import Optional
+from app.core.enums import LoadProfileEnum
 from app.core.exceptions import ServerError
 from app.core.logging import logger
 from app.core.transaction import TransactionalMixin
+from app.repositories.loading_profiles import load_options
 
 
 class ArtistRepository(TransactionalMixin):
@@ -15,11 +16,13 @@ class ArtistRepository(TransactionalMixin):
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_by_id(self, artist_id: int) -> Optional[Artist]:
-        """Get an artist by ID"""
+    async def get_by_id(
+        self, artist_id: int, profile: LoadProfileEnum = LoadProfileEnum.LIST_CARD
+    ) -> Optional[Artist]:
+        """Get an artist by ID with the relations of the given loading profile"""
         try:
             query = select(Artist).options(
-                selectinload(Artist.external_source)
+                *load_options(Artist, profile)
             ).filter(Artist.id == artist_id)
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
@@ -31,11 +34,16 @@ class ArtistRepository(TransactionalMixin):
                 details={}
             )
 
-    async def get_by_external_id(self, external_artist_id: str, external_source_id: int) -> Optional[Artist]:
-        """Get an artist by external ID and source with relations loaded"""
+    async def get_by_external_id(
+        self,
+        external_artist_id: str,
+        external_source_id: int,
+        profile: LoadProfileEnum = LoadProfileEnum.LIST_CARD
+    ) -> Optional[Artist]:
+        """Get an artist by external ID and source with the relations of the given loading profile"""
         try:
             query = select(Artist).options(
-                selectinload(Artist.external_source)
+                *load_options(Artist, profile)
             ).filter(
                 Artist.external_artist_id == external_artist_id,
                 Artist.external_source_id == external_source_id
@@ -1,19 +1,26 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, select, update, func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased
 from app.models.collection_album import CollectionAlbum
 from app.models.album_model import Album
+from app.models.reference_data.external_sources import ExternalSource
+from app.models.reference_data.vinyl_state import VinylState
 from app.utils.vinyl_state_mapping import VinylStateMapping
 from app.core.exceptions import (
     ResourceNotFoundError,
     ServerError,
     DuplicateFieldError
 )
+from app.core.enums import LoadProfileEnum
 from app.core.logging import logger
 from app.core.transaction import TransactionalMixin
+from app.repositories.loading_profiles import load_options
+from app.utils.pagination import (
+    KeysetPage, build_page, decode_cursor, fetch_page_with_total, keyset_after, keyset_order
+)
 
 
 class CollectionAlbumRepository(TransactionalMixin):
@@ -127,44 +134,47 @@ class CollectionAlbumRepository(TransactionalMixin):
         return VinylStateMapping.get_name_from_id(state_id)
 
     async def get_collection_albums_paginated(
-        self, collection_id: int, page: int = 1, limit: int = 12, sort_order: str = "newest"
-    ) -> tuple[List[tuple], int]:
-        """Get paginated albums for a collection with metadata, sorted by collection_album.created_at"""
+        self, collection_id: int, page: int = 1, limit: int = 12, sort_order: str = "newest",
+        cursor: Optional[str] = None
+    ) -> KeysetPage:
+        """Get paginated albums for a collection with metadata, sorted by collection_album.created_at.
+
+        With a cursor the page is read by keyset on (created_at, album_id) and the
+        total count is skipped; otherwise the page number is used and counted in
+        the same statement.
+        """
         try:
-            # Calculate offset
-            offset = (page - 1) * limit
-
-            # Determine sort order
-            if sort_order == "oldest":
-                order_clause = CollectionAlbum.created_at.asc().nullslast()
-            else:  # default to newest
-                order_clause = CollectionAlbum.created_at.desc().nullslast()
+            descending = sort_order != "oldest"
 
             # Query to get albums with collection metadata, sorted by collection_album.created_at
             query = (
                 select(Album, CollectionAlbum)
                 .join(CollectionAlbum, Album.id == CollectionAlbum.album_id)
                 .options(
-                    selectinload(CollectionAlbum.state_record_ref),
-                    selectinload(CollectionAlbum.state_cover_ref)
+                    *load_options(Album, LoadProfileEnum.LIST_CARD),
+                    *load_options(CollectionAlbum, LoadProfileEnum.LIST_CARD)
                 )
                 .filter(CollectionAlbum.collection_id == collection_id)
-                .order_by(order_clause)
-                .offset(offset)
-                .limit(limit)
+                .order_by(*keyset_order(CollectionAlbum.created_at, CollectionAlbum.album_id, descending))
             )
 
-            result = await self.db.execute(query)
-            albums_with_metadata = result.all()
+            total = None
+            if cursor:
+                query = query.filter(keyset_after(
+                    CollectionAlbum.created_at, CollectionAlbum.album_id,
+                    decode_cursor(cursor, sort_order), descending, nullable=True
+                ))
+                rows = (await self.db.execute(query.limit(limit + 1))).all()
+            else:
+                rows, total = await fetch_page_with_total(
+                    self.db, query, (page - 1) * limit, limit + 1, scalars=False
+                )
 
-            # Get total count
-            count_query = select(func.count(CollectionAlbum.album_id)).filter(
-                CollectionAlbum.collection_id == collection_id
+            return build_page(
+                rows, limit, sort_order,
+                lambda row: (row[1].created_at, row[1].album_id),
+                total
             )
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            return albums_with_metadata, total
 
         except SQLAlchemyError as e:
             logger.error(
@@ -180,6 +190,8 @@ class CollectionAlbumRepository(TransactionalMixin):
         try:
             query = select(Album).join(
                 CollectionAlbum, Album.id == CollectionAlbum.album_id
+            ).options(
+                *load_options(Album, LoadProfileEnum.LIST_CARD)
             ).filter(
                 CollectionAlbum.collection_id == collection_id,
                 Album.id == album_id
@@ -331,26 +343,44 @@ class CollectionAlbumRepository(TransactionalMixin):
                 details={}
             )
 
-    async def get_collection_albums(self, collection_id: int) -> List[tuple]:
-        """Get all albums in a collection with metadata"""
-        try:
-            query = (
-                select(Album, CollectionAlbum)
-                .join(CollectionAlbum, Album.id == CollectionAlbum.album_id)
-                .options(
-                    selectinload(Album.external_source),
-                    selectinload(CollectionAlbum.state_record_ref),
-                    selectinload(CollectionAlbum.state_cover_ref)
-                )
-                .filter(CollectionAlbum.collection_id == collection_id)
+    async def stream_collection_album_rows(
+        self, collection_id: int, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream the albums of a collection for export, in batches of column tuples.
+
+        Rows are read through a server-side cursor, batch_size at a time, so
+        memory does not grow with the collection. Each row carries album_id,
+        external_album_id, external_source, title, image_url, state_record,
+        state_cover, acquisition_month_year, created_at and updated_at.
+        """
+        state_record = aliased(VinylState)
+        state_cover = aliased(VinylState)
+        query = (
+            select(
+                Album.id.label("album_id"),
+                Album.external_album_id,
+                ExternalSource.name.label("external_source"),
+                Album.title,
+                Album.image_url,
+                state_record.name.label("state_record"),
+                state_cover.name.label("state_cover"),
+                CollectionAlbum.acquisition_month_year,
+                CollectionAlbum.created_at,
+                CollectionAlbum.updated_at,
             )
-
-            result = await self.db.execute(query)
-            albums = result.all()
-            return albums
-
+            .join(Album, Album.id == CollectionAlbum.album_id)
+            .outerjoin(ExternalSource, ExternalSource.id == Album.external_source_id)
+            .outerjoin(state_record, state_record.id == CollectionAlbum.state_record)
+            .outerjoin(state_cover, state_cover.id == CollectionAlbum.state_cover)
+            .filter(CollectionAlbum.collection_id == collection_id)
+        )
+        try:
+            result = await self.db.stream(query, execution_options={"yield_per": batch_size})
+            async for batch in result.partitions():
+                yield batch
         except SQLAlchemyError as e:
-            logger.error(f"Error getting collection albums: {str(e)}")
+            logger.error(f"Error streaming collection albums: {str(e)}")
             raise ServerError(
                 error_code=5000,
                 message="Failed to get collection albums",
@@ -362,10 +392,7 @@ class CollectionAlbumRepository(TransactionalMixin):
         try:
             query = (
                 select(CollectionAlbum)
-                .options(
-                    selectinload(CollectionAlbum.state_record_ref),
-                    selectinload(CollectionAlbum.state_cover_ref)
-                )
+                .options(*load_options(CollectionAlbum, LoadProfileEnum.LIST_CARD))
                 .filter(
                     CollectionAlbum.collection_id == collection_id,
                     CollectionAlbum.album_id == album_id
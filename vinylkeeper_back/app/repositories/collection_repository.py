@@ -1,6 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select, func, and_, case, delete
+from sqlalchemy import Row, select, func, and_, or_, delete
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.models.collection_model import Collection
 from app.models.album_model import Album
@@ -8,16 +7,24 @@ from app.models.artist_model import Artist
 from app.models.collection_album import CollectionAlbum
 from app.models.association_tables import CollectionArtist
 from app.models.like_model import Like
+from app.models.reference_data.external_sources import ExternalSource
 from app.core.exceptions import (
     ResourceNotFoundError,
     DuplicateFieldError,
     ServerError,
     ErrorCode
 )
+from app.core.enums import LoadProfileEnum
 from app.core.logging import logger
 from app.core.transaction import TransactionalMixin
+from app.repositories.loading_profiles import load_options
+from app.utils.pagination import (
+    KeysetPage, build_page, decode_cursor, fetch_page_with_total, keyset_after, keyset_order
+)
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple, Dict
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Dict
+
+COUNTER_RECONCILE_LOCK_KEY = 0x76_6B_63_63  # "vkcc"
 
 
 class CollectionRepository(TransactionalMixin):
@@ -44,34 +51,19 @@ class CollectionRepository(TransactionalMixin):
             )
 
     async def get_by_id(
-        self, collection_id: int, load_relations: bool = True, load_minimal: bool = False
+        self, collection_id: int, profile: LoadProfileEnum = LoadProfileEnum.DETAIL
     ) -> Collection:
         """
-        Get a collection by its ID with optimized relation loading.
+        Get a collection by its ID.
 
         Args:
-            load_relations: If True, load all relations (albums, artists, likes, etc.)
-            load_minimal: If True, load only owner (optimized for lightweight responses)
+            profile: Relations to load; LIST_CARD for access checks and
+                lightweight responses, DETAIL for the full collection page
         """
         try:
-            query = select(Collection).filter(Collection.id == collection_id)
-
-            if load_minimal:
-                # Only load owner for lightweight responses
-                query = query.options(selectinload(Collection.owner))
-            elif load_relations:
-                query = query.options(
-                    selectinload(Collection.owner),
-                    selectinload(Collection.collection_albums).selectinload(
-                        CollectionAlbum.album),
-                    selectinload(Collection.collection_albums).selectinload(
-                        CollectionAlbum.state_record_ref),
-                    selectinload(Collection.collection_albums).selectinload(
-                        CollectionAlbum.state_cover_ref),
-                    selectinload(Collection.artists),
-                    selectinload(Collection.mood),
-                    selectinload(Collection.likes)
-                )
+            query = select(Collection).filter(
+                Collection.id == collection_id
+            ).options(*load_options(Collection, profile))
 
             result = await self.db.execute(query)
             collection = result.scalar_one_or_none()
@@ -332,112 +324,49 @@ class CollectionRepository(TransactionalMixin):
             )
 
     async def get_public_collections(
-        self, page: int = 1, limit: int = 10, exclude_user_id: int | None = None, sort_by: str = "updated_at"
-    ) -> Tuple[List[Collection], int]:
+        self, page: int = 1, limit: int = 10, exclude_user_id: int | None = None, sort_by: str = "updated_at",
+        cursor: Optional[str] = None
+    ) -> KeysetPage:
         """Get all public collections with pagination and sorting.
-        Only returns collections with at least one album, artist, or wishlist item."""
+        Only returns collections with at least one album, artist, or wishlist item.
+
+        With a cursor the page is read by keyset on (sort key, id) and the total
+        count is skipped; otherwise the page number is used and counted in the
+        same statement.
+        Every sort key is a column of collections, so pages are index range scans."""
         try:
-            from app.models.like_model import Like
+            if sort_by not in ("updated_at", "created_at", "likes_count"):
+                sort_by = "updated_at"
 
-            # Build base query
-            query = select(Collection).filter(Collection.is_public.is_(True))
+            # Collections must have at least one album or artist; the counters make
+            # this a plain column filter instead of two EXISTS subqueries
+            query = select(Collection).filter(
+                Collection.is_public.is_(True),
+                or_(Collection.albums_count > 0, Collection.artists_count > 0)
+            )
 
             if exclude_user_id:
                 query = query.filter(Collection.owner_id != exclude_user_id)
 
-            # Add subqueries for filtering collections with content
-            # Collections must have at least one album, artist, or wishlist item
-            has_albums = select(1).where(
-                CollectionAlbum.collection_id == Collection.id
-            ).exists()
-
-            has_artists = select(1).where(
-                CollectionArtist.collection_id == Collection.id
-            ).exists()
-
-            # For wishlist, we need to check if the owner has any wishlist items
-            # This is more complex as wishlist is user-scoped, not collection-scoped
-            # We'll simplify by checking if collection has albums or artists
-
-            # Combine filters: collection must have albums OR artists
-            query = query.filter(has_albums | has_artists)
-
-            # Get total count BEFORE applying grouping for likes_count
-            from sqlalchemy import distinct
-            count_query = select(func.count(distinct(Collection.id)))
-            count_query = count_query.filter(Collection.is_public.is_(True))
-            if exclude_user_id:
-                count_query = count_query.filter(
-                    Collection.owner_id != exclude_user_id)
-            count_query = count_query.filter(has_albums | has_artists)
-
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            # Add subqueries for counting albums and artists (optimized for list view)
-            albums_count_subq = (
-                select(func.count(CollectionAlbum.album_id))
-                .where(CollectionAlbum.collection_id == Collection.id)
-                .scalar_subquery()
-            )
-
-            artists_count_subq = (
-                select(func.count(CollectionArtist.artist_id))
-                .where(CollectionArtist.collection_id == Collection.id)
-                .scalar_subquery()
-            )
-
-            # Add counts to query (only for list view, not loading full relations)
-            query = query.add_columns(
-                albums_count_subq.label('albums_count'),
-                artists_count_subq.label('artists_count')
-            )
-
-            # Apply sorting based on sort_by parameter
-            if sort_by == "likes_count":
-                # Use LEFT JOIN with likes and COUNT to get all collections (even with 0 likes)
-                query = query.outerjoin(
-                    Like,
-                    Collection.id == Like.collection_id
-                )
-                # Group by collection id and scalar subqueries (required by PostgreSQL when using add_columns)
-                # Scalar subqueries depend only on Collection.id, so they're functionally dependent
-                query = query.group_by(
-                    Collection.id,
-                    albums_count_subq,
-                    artists_count_subq
-                ).order_by(
-                    func.coalesce(func.count(Like.id), 0).desc()
-                )
-            elif sort_by == "created_at":
-                query = query.order_by(Collection.created_at.desc())
-            else:  # default to updated_at
-                query = query.order_by(Collection.updated_at.desc())
-
-            # Apply pagination
-            offset = (page - 1) * limit
-            query = query.offset(offset).limit(limit)
+            # Sort on the counter or timestamp column; the id breaks ties so pages never overlap
+            sort_key = getattr(Collection, sort_by)
+            query = query.order_by(*keyset_order(sort_key, Collection.id))
 
             # Only preload owner (not albums/artists for list view performance)
-            query = query.options(
-                selectinload(Collection.owner)
-            )
-
-            result = await self.db.execute(query)
-            # Handle result with counts: result is a list of tuples (Collection, albums_count, artists_count)
-            rows = result.all()
+            query = query.options(*load_options(Collection, LoadProfileEnum.LIST_CARD))
 
-            if not rows:
-                return [], total
-
-            collections = [row[0] for row in rows]
-
-            # Attach counts to collection objects for easy access
-            for collection, albums_count, artists_count in rows:
-                collection.albums_count = albums_count or 0
-                collection.artists_count = artists_count or 0
+            total = None
+            if cursor:
+                query = query.filter(keyset_after(sort_key, Collection.id, decode_cursor(cursor, sort_by)))
+                collections = (await self.db.execute(query.limit(limit + 1))).scalars().all()
+            else:
+                collections, total = await fetch_page_with_total(self.db, query, (page - 1) * limit, limit + 1)
 
-            return collections, total
+            return build_page(
+                collections, limit, sort_by,
+                lambda collection: (getattr(collection, sort_by), collection.id),
+                total
+            )
         except SQLAlchemyError as e:
             logger.error(f"Error retrieving public collections: {str(e)}", exc_info=True)
             raise ServerError(
@@ -449,9 +378,9 @@ class CollectionRepository(TransactionalMixin):
     async def get_collections_likes_counts(self, collection_ids: List[int]) -> dict:
         """Get likes counts for multiple collections in one query."""
 
-        query = select(Like.collection_id, func.count(Like.id)).filter(
-            Like.collection_id.in_(collection_ids)
-        ).group_by(Like.collection_id)
+        query = select(Collection.id, Collection.likes_count).filter(
+            Collection.id.in_(collection_ids)
+        )
 
         result = await self.db.execute(query)
         likes_counts = {collection_id: count for collection_id,
@@ -466,29 +395,20 @@ class CollectionRepository(TransactionalMixin):
 
     async def get_collection_counts(self, collection_id: int) -> Dict[str, int]:
         """
-        Get albums_count and artists_count for a single collection (optimized with aggregation).
+        Get albums_count and artists_count for a single collection from its counters.
 
         Returns:
             dict: {"albums_count": int, "artists_count": int}
         """
         try:
-            # Albums count (CollectionAlbum uses composite primary key, so count album_id)
-            albums_count_query = select(func.count(CollectionAlbum.album_id)).filter(
-                CollectionAlbum.collection_id == collection_id
-            )
-            albums_result = await self.db.execute(albums_count_query)
-            albums_count = albums_result.scalar() or 0
-
-            # Artists count
-            artists_count_query = select(func.count(CollectionArtist.artist_id)).filter(
-                CollectionArtist.collection_id == collection_id
+            query = select(Collection.albums_count, Collection.artists_count).filter(
+                Collection.id == collection_id
             )
-            artists_result = await self.db.execute(artists_count_query)
-            artists_count = artists_result.scalar() or 0
+            row = (await self.db.execute(query)).one_or_none()
 
             return {
-                "albums_count": albums_count,
-                "artists_count": artists_count
+                "albums_count": row.albums_count if row else 0,
+                "artists_count": row.artists_count if row else 0
             }
         except SQLAlchemyError as e:
             logger.error(
@@ -512,98 +432,87 @@ class CollectionRepository(TransactionalMixin):
         # Create a dict mapping collection_id to is_liked boolean
         return {collection_id: collection_id in liked_collection_ids for collection_id in collection_ids}
 
-    async def get_collections_likes_info_batch(self, user_id: int | None, collection_ids: List[int]) -> dict:
-        """Get both likes counts and user likes status in a single optimized query."""
-        if not collection_ids:
-            return {'counts': {}, 'user_likes': {}}
-
-        # Single query with aggregation: counts and user like status
-        query = select(
-            Like.collection_id,
-            func.count(Like.id).label('count'),
-            func.max(case((Like.user_id == user_id, 1), else_=0)
-                     ).label('is_liked')
-        ).filter(
-            Like.collection_id.in_(collection_ids)
-        ).group_by(Like.collection_id)
-
-        result = await self.db.execute(query)
-        rows = result.all()
-
-        # Build dictionaries
-        counts = {}
-        user_likes = {}
+    async def try_lock_counter_reconciliation(self) -> bool:
+        """Take the reconciliation lock for this transaction, False when another worker holds it."""
+        try:
+            result = await self.db.execute(select(func.pg_try_advisory_xact_lock(COUNTER_RECONCILE_LOCK_KEY)))
+            return bool(result.scalar())
+        except SQLAlchemyError as e:
+            logger.error(f"Error acquiring the counter reconciliation lock: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=ErrorCode.DATABASE_ERROR,
+                message="Failed to acquire the counter reconciliation lock",
+                details={}
+            )
 
-        for row in rows:
-            collection_id = row.collection_id
-            counts[collection_id] = row.count
-            user_likes[collection_id] = bool(
-                row.is_liked) if user_id else False
+    async def reconcile_counters(self) -> int:
+        """Recompute the denormalised counters of collections that drifted.
 
-        # Ensure all collection_ids have entries (even if 0)
-        for collection_id in collection_ids:
-            if collection_id not in counts:
-                counts[collection_id] = 0
-            if collection_id not in user_likes:
-                user_likes[collection_id] = False
+        Triggers keep albums_count, artists_count and likes_count exact; this repairs
+        rows written while they were disabled. updated_at is left untouched so the
+        explore page order does not move.
 
-        return {'counts': counts, 'user_likes': user_likes}
+        The drifted collections are locked FOR UPDATE before being recounted: a
+        concurrent add, remove or like either committed its trigger update before
+        the lock was granted, and the recount (a new statement, hence a new
+        snapshot) sees it, or waits on the lock until the recount is written.
+        A single correlated UPDATE would instead overwrite a counter updated
+        while it waited with a count from its older snapshot.
 
-    async def get_user_collections(self, user_id: int, page: int = 1, limit: int = 10) -> Tuple[List[Collection], int]:
-        """Get user's collections with pagination and optimized relation loading (list view)."""
+        Returns:
+            int: Number of collections corrected
+        """
         try:
-            # Build base query
-            query = select(Collection).filter(Collection.owner_id == user_id)
-
-            # Get total count
-            count_query = select(func.count()).select_from(query.subquery())
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
-
-            # Add subqueries for counting albums and artists (optimized for list view)
-            albums_count_subq = (
-                select(func.count(CollectionAlbum.album_id))
-                .where(CollectionAlbum.collection_id == Collection.id)
-                .scalar_subquery()
-            )
-
-            artists_count_subq = (
-                select(func.count(CollectionArtist.artist_id))
-                .where(CollectionArtist.collection_id == Collection.id)
-                .scalar_subquery()
+            table = Collection.__table__
+            albums = select(func.count()).where(CollectionAlbum.collection_id == table.c.id).scalar_subquery()
+            artists = select(func.count()).where(CollectionArtist.collection_id == table.c.id).scalar_subquery()
+            likes = select(func.count()).where(Like.collection_id == table.c.id).scalar_subquery()
+            drifted = or_(
+                table.c.albums_count != albums,
+                table.c.artists_count != artists,
+                table.c.likes_count != likes
+            )
+
+            candidates = (await self.db.execute(select(table.c.id).where(drifted))).scalars().all()
+            if not candidates:
+                return 0
+            locked = (await self.db.execute(
+                select(table.c.id).where(table.c.id.in_(candidates)).order_by(table.c.id).with_for_update()
+            )).scalars().all()
+
+            statement = (
+                table.update()
+                .where(table.c.id.in_(locked), drifted)
+                .values(
+                    albums_count=albums,
+                    artists_count=artists,
+                    likes_count=likes,
+                    updated_at=table.c.updated_at
+                )
             )
-
-            # Add counts to query (only for list view, not loading full relations)
-            query = query.add_columns(
-                albums_count_subq.label('albums_count'),
-                artists_count_subq.label('artists_count')
+            result = await self.db.execute(statement)
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Error reconciling collection counters: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=ErrorCode.DATABASE_ERROR,
+                message="Failed to reconcile collection counters",
+                details={}
             )
 
-            # Apply pagination
-            offset = (page - 1) * limit
-            query = query.order_by(Collection.created_at.desc()).offset(
-                offset).limit(limit)
-
-            # Only preload owner (not albums/artists for list view performance)
-            query = query.options(
-                selectinload(Collection.owner)
+    async def get_user_collections(self, user_id: int, page: int = 1, limit: int = 10) -> Tuple[List[Collection], int]:
+        """Get user's collections with pagination and optimized relation loading (list view)."""
+        try:
+            query = (
+                select(Collection)
+                .filter(Collection.owner_id == user_id)
+                .order_by(Collection.created_at.desc())
+                # Only preload owner (not albums/artists for list view performance)
+                .options(*load_options(Collection, LoadProfileEnum.LIST_CARD))
             )
 
-            result = await self.db.execute(query)
-            # Handle result with counts: result is a list of tuples (Collection, albums_count, artists_count)
-            rows = result.all()
-
-            if not rows:
-                return [], total
-
-            collections = [row[0] for row in rows]
-
-            # Attach counts to collection objects for easy access
-            for collection, albums_count, artists_count in rows:
-                collection.albums_count = albums_count or 0
-                collection.artists_count = artists_count or 0
-
-            return collections, total
+            # Page and total count in one statement
+            return await fetch_page_with_total(self.db, query, (page - 1) * limit, limit)
         except SQLAlchemyError as e:
             logger.error(f"Error retrieving user collections: {str(e)}", exc_info=True)
             raise ServerError(
@@ -627,42 +536,44 @@ class CollectionRepository(TransactionalMixin):
             )
 
     async def get_collection_artists_paginated(
-        self, collection_id: int, page: int = 1, limit: int = 12, sort_order: str = "newest"
-    ) -> Tuple[List[tuple], int]:
-        """Get paginated artists from a collection with optimized relation loading."""
+        self, collection_id: int, page: int = 1, limit: int = 12, sort_order: str = "newest",
+        cursor: Optional[str] = None
+    ) -> KeysetPage:
+        """Get paginated artists from a collection with optimized relation loading.
+
+        With a cursor the page is read by keyset on (created_at, artist_id) and the
+        total count is skipped; otherwise the page number is used and counted in
+        the same statement.
+        """
         try:
-            # Determine sort order
-            if sort_order == "oldest":
-                order_clause = CollectionArtist.created_at.asc().nullslast()
-            else:  # default to newest
-                order_clause = CollectionArtist.created_at.desc().nullslast()
+            descending = sort_order != "oldest"
 
             # Query to get artists with collection_artist metadata, sorted by collection_artist.created_at
             query = (
                 select(Artist, CollectionArtist)
                 .join(CollectionArtist, Artist.id == CollectionArtist.artist_id)
                 .filter(CollectionArtist.collection_id == collection_id)
-                .options(
-                    selectinload(Artist.external_source),
-                )
-                .order_by(order_clause)
-            )
-
-            # Get total count
-            count_query = select(func.count(CollectionArtist.artist_id)).filter(
-                CollectionArtist.collection_id == collection_id
+                .options(*load_options(Artist, LoadProfileEnum.LIST_CARD))
+                .order_by(*keyset_order(CollectionArtist.created_at, CollectionArtist.artist_id, descending))
             )
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar()
 
-            # Apply pagination
-            offset = (page - 1) * limit
-            query = query.offset(offset).limit(limit)
-
-            result = await self.db.execute(query)
-            artists_with_association = result.all()
+            total = None
+            if cursor:
+                query = query.filter(keyset_after(
+                    CollectionArtist.created_at, CollectionArtist.artist_id,
+                    decode_cursor(cursor, sort_order), descending, nullable=True
+                ))
+                rows = (await self.db.execute(query.limit(limit + 1))).all()
+            else:
+                rows, total = await fetch_page_with_total(
+                    self.db, query, (page - 1) * limit, limit + 1, scalars=False
+                )
 
-            return artists_with_association, total
+            return build_page(
+                rows, limit, sort_order,
+                lambda row: (row[1].created_at, row[1].artist_id),
+                total
+            )
         except SQLAlchemyError as e:
             logger.error(
                 f"Error getting collection artists paginated for collection {collection_id}: {str(e)}",
@@ -674,28 +585,37 @@ class CollectionRepository(TransactionalMixin):
                 details={},
             )
 
-    async def get_collection_artists(self, collection_id: int, sort_order: str = "newest") -> List[tuple]:
-        """Get all artists from a collection with association metadata (for exports)."""
-        try:
-            if sort_order == "oldest":
-                order_clause = CollectionArtist.created_at.asc().nullslast()
-            else:
-                order_clause = CollectionArtist.created_at.desc().nullslast()
-
-            query = (
-                select(Artist, CollectionArtist)
-                .join(CollectionArtist, Artist.id == CollectionArtist.artist_id)
-                .filter(CollectionArtist.collection_id == collection_id)
-                .options(
-                    selectinload(Artist.external_source),
-                )
-                .order_by(order_clause)
-            )
+    async def stream_collection_artist_rows(
+        self, collection_id: int, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream the artists of a collection for export, newest first, in batches of column tuples.
 
-            result = await self.db.execute(query)
-            return result.all()
+        Read through a server-side cursor, batch_size rows at a time. Each row
+        carries artist_id, external_artist_id, external_source, title,
+        image_url, created_at and updated_at.
+        """
+        query = (
+            select(
+                Artist.id.label("artist_id"),
+                Artist.external_artist_id,
+                ExternalSource.name.label("external_source"),
+                Artist.title,
+                Artist.image_url,
+                CollectionArtist.created_at,
+                CollectionArtist.updated_at,
+            )
+            .join(Artist, Artist.id == CollectionArtist.artist_id)
+            .outerjoin(ExternalSource, ExternalSource.id == Artist.external_source_id)
+            .filter(CollectionArtist.collection_id == collection_id)
+            .order_by(CollectionArtist.created_at.desc().nullslast())
+        )
+        try:
+            result = await self.db.stream(query, execution_options={"yield_per": batch_size})
+            async for batch in result.partitions():
+                yield batch
         except SQLAlchemyError as e:
-            logger.error(f"Error getting collection artists: {str(e)}", exc_info=True)
+            logger.error(f"Error streaming collection artists: {str(e)}", exc_info=True)
             raise ServerError(
                 error_code=ErrorCode.SERVER_ERROR,
                 message="Failed to get collection artists",
@@ -712,8 +632,8 @@ class CollectionRepository(TransactionalMixin):
                     select(Album, CollectionAlbum)
                     .join(CollectionAlbum, Album.id == CollectionAlbum.album_id)
                     .options(
-                        selectinload(CollectionAlbum.state_record_ref),
-                        selectinload(CollectionAlbum.state_cover_ref),
+                        *load_options(Album, LoadProfileEnum.LIST_CARD),
+                        *load_options(CollectionAlbum, LoadProfileEnum.LIST_CARD),
                     )
                     .filter(
                         CollectionAlbum.collection_id == collection_id,
@@ -727,7 +647,7 @@ class CollectionRepository(TransactionalMixin):
                 artist_query = (
                     select(Artist)
                     .join(CollectionArtist, Artist.id == CollectionArtist.artist_id)
-                    .options(selectinload(Artist.external_source))
+                    .options(*load_options(Artist, LoadProfileEnum.LIST_CARD))
                     .filter(
                         CollectionArtist.collection_id == collection_id,
                         Artist.title.ilike(f"%{query}%")
@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select, case
+from sqlalchemy import func, select, case, or_
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.album_model import Album
 from app.models.artist_model import Artist
@@ -8,9 +9,12 @@ from app.models.user_model import User
 from app.models.collection_model import Collection
 from app.models.collection_album import CollectionAlbum
 from app.models.place_model import Place
+from app.models.dashboard_snapshot_model import DashboardSnapshot
 from app.models.association_tables import CollectionArtist
+from app.core.enums import LoadProfileEnum
 from app.core.exceptions import ServerError
 from app.core.logging import logger
+from app.repositories.loading_profiles import load_options
 
 
 class DashboardRepository:
@@ -24,6 +28,7 @@ class DashboardRepository:
             # Index on updated_at DESC ensures fast query execution
             query = (
                 select(Album, User.username, CollectionAlbum.updated_at)
+                .options(*load_options(Album, LoadProfileEnum.LIST_CARD))
                 .join(CollectionAlbum, Album.id == CollectionAlbum.album_id)
                 .join(Collection, CollectionAlbum.collection_id == Collection.id)
                 .join(User, Collection.owner_id == User.id)
@@ -65,6 +70,7 @@ class DashboardRepository:
 
             query = (
                 select(Album, inner.c.username, inner.c.updated_at)
+                .options(*load_options(Album, LoadProfileEnum.LIST_CARD))
                 .join(inner, Album.id == inner.c.album_id)
                 .order_by(inner.c.updated_at.desc())
                 .limit(limit)
@@ -87,6 +93,7 @@ class DashboardRepository:
             # Index on updated_at DESC ensures fast query execution
             query = (
                 select(Artist, User.username, CollectionArtist.updated_at)
+                .options(*load_options(Artist, LoadProfileEnum.LIST_CARD))
                 .join(CollectionArtist, Artist.id == CollectionArtist.artist_id)
                 .join(Collection, CollectionArtist.collection_id == Collection.id)
                 .join(User, Collection.owner_id == User.id)
@@ -109,8 +116,7 @@ class DashboardRepository:
         try:
             # Use scalar subqueries to combine multiple counts in a single query
             albums_count_subq = (
-                select(func.count(CollectionAlbum.album_id).label('count'))
-                .join(Collection, CollectionAlbum.collection_id == Collection.id)
+                select(func.coalesce(func.sum(Collection.albums_count), 0).label('count'))
                 .filter(Collection.owner_id == user_id)
                 .scalar_subquery()
             )
@@ -190,7 +196,7 @@ class DashboardRepository:
         """Get total albums and artists counts across all collections in a single optimized query"""
         try:
             albums_count_subq = (
-                select(func.count(CollectionAlbum.album_id))
+                select(func.coalesce(func.sum(Collection.albums_count), 0))
                 .scalar_subquery()
             )
 
@@ -222,19 +228,10 @@ class DashboardRepository:
     async def get_public_collections_count(self) -> int:
         """Get count of public collections that have at least one album or artist"""
         try:
-            from sqlalchemy import distinct
-
-            has_albums = select(1).where(
-                CollectionAlbum.collection_id == Collection.id
-            ).exists()
-
-            has_artists = select(1).where(
-                CollectionArtist.collection_id == Collection.id
-            ).exists()
-
-            count_query = select(func.count(distinct(Collection.id)))
-            count_query = count_query.filter(Collection.is_public.is_(True))
-            count_query = count_query.filter(has_albums | has_artists)
+            count_query = select(func.count(Collection.id)).filter(
+                Collection.is_public.is_(True),
+                (Collection.albums_count > 0) | (Collection.artists_count > 0)
+            )
 
             result = await self.db.execute(count_query)
             count = result.scalar()
@@ -246,3 +243,46 @@ class DashboardRepository:
                 message="Failed to get public collections count",
                 details={}
             )
+
+    async def get_snapshot(self) -> Optional[DashboardSnapshot]:
+        """Get the global statistics snapshot, None if it was never created"""
+        try:
+            query = select(DashboardSnapshot).filter(DashboardSnapshot.id == DashboardSnapshot.SINGLETON_ID)
+            result = await self.db.execute(query)
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting dashboard snapshot: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to get dashboard snapshot",
+                details={}
+            )
+
+    async def claim_stale_snapshot(self, stale_before: datetime) -> Optional[DashboardSnapshot]:
+        """Lock the snapshot for a refresh if it is older than stale_before.
+
+        FOR UPDATE SKIP LOCKED: None when the snapshot is fresh, missing, or
+        already being refreshed by another worker.
+        """
+        try:
+            query = (
+                select(DashboardSnapshot)
+                .filter(
+                    DashboardSnapshot.id == DashboardSnapshot.SINGLETON_ID,
+                    or_(DashboardSnapshot.refreshed_at.is_(None), DashboardSnapshot.refreshed_at < stale_before)
+                )
+                .with_for_update(skip_locked=True)
+            )
+            result = await self.db.execute(query)
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Error claiming dashboard snapshot: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to claim dashboard snapshot",
+                details={}
+            )
+
+    async def save_snapshot(self, snapshot: DashboardSnapshot) -> None:
+        """Persist the snapshot (flushed and committed by the caller's transaction)"""
+        self.db.add(snapshot)
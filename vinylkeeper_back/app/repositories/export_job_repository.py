@@ -0,0 +1,244 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import ExportJobStatusEnum
+from app.core.exceptions import ServerError
+from app.core.logging import logger
+from app.core.transaction import TransactionalMixin
+from app.models.export_job_model import ExportJob
+
+# First key of the advisory locks used as export slots, the slot number is the second
+EXPORT_SLOT_LOCK_KEY = 0x76_6B_65_78  # "vkex"
+# First key of the advisory lock serialising job creation per user, the user id is the second
+EXPORT_USER_LOCK_KEY = 0x76_6B_65_75  # "vkeu"
+
+
+class ExportJobRepository(TransactionalMixin):
+    """
+    Export job queue.
+
+    Updates made by a runner are fenced on the job's attempts counter: once an
+    abandoned job is claimed again, the previous run can no longer report
+    progress nor complete it.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, job: ExportJob) -> ExportJob:
+        """Create a job without committing (transaction managed by service)."""
+        try:
+            await self._add_entity(job, flush=True)
+            await self._refresh_entity(job)
+            return job
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating export job: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to create export job",
+                details={}
+            )
+
+    async def get_for_user(self, job_id: uuid.UUID, user_id: int) -> Optional[ExportJob]:
+        try:
+            query = select(ExportJob).filter(ExportJob.id == job_id, ExportJob.user_id == user_id)
+            result = await self.db.execute(query)
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting export job {job_id}: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to get export job",
+                details={}
+            )
+
+    async def lock_user_jobs(self, user_id: int) -> None:
+        """Serialise job creation for the user until the end of the transaction."""
+        try:
+            await self.db.execute(select(func.pg_advisory_xact_lock(EXPORT_USER_LOCK_KEY, user_id)))
+        except SQLAlchemyError as e:
+            logger.error(f"Error locking export jobs of user {user_id}: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to lock export jobs",
+                details={}
+            )
+
+    async def count_active_for_user(self, user_id: int) -> int:
+        """Jobs of the user still pending or running."""
+        try:
+            query = select(func.count()).select_from(ExportJob).filter(
+                ExportJob.user_id == user_id,
+                ExportJob.status.in_([ExportJobStatusEnum.PENDING.value, ExportJobStatusEnum.RUNNING.value]),
+            )
+            result = await self.db.execute(query)
+            return result.scalar() or 0
+        except SQLAlchemyError as e:
+            logger.error(f"Error counting export jobs of user {user_id}: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to count export jobs",
+                details={}
+            )
+
+    async def try_acquire_slot(self, slots: int) -> Optional[int]:
+        """Take the first free of `slots` export slots, None when all are taken.
+
+        Transaction-level advisory locks: a slot is held until this session's
+        transaction ends, and released by PostgreSQL if the worker dies.
+        """
+        try:
+            for slot in range(slots):
+                result = await self.db.execute(select(func.pg_try_advisory_xact_lock(EXPORT_SLOT_LOCK_KEY, slot)))
+                if result.scalar():
+                    return slot
+            return None
+        except SQLAlchemyError as e:
+            logger.error(f"Error acquiring an export slot: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to acquire an export slot",
+                details={}
+            )
+
+    async def claim_next(self, now: datetime, stale_before: datetime, max_attempts: int) -> Optional[ExportJob]:
+        """Lock the oldest pending job, or running job abandoned since stale_before, and mark it running.
+
+        FOR UPDATE SKIP LOCKED: runners polling at the same time claim
+        different jobs. Committed by the caller's transaction.
+        """
+        try:
+            query = (
+                select(ExportJob)
+                .filter(
+                    ExportJob.attempts < max_attempts,
+                    or_(
+                        ExportJob.status == ExportJobStatusEnum.PENDING.value,
+                        and_(
+                            ExportJob.status == ExportJobStatusEnum.RUNNING.value,
+                            ExportJob.heartbeat_at < stale_before,
+                        ),
+                    ),
+                )
+                .order_by(ExportJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            result = await self.db.execute(query)
+            job = result.scalar_one_or_none()
+            if job is not None:
+                job.status = ExportJobStatusEnum.RUNNING.value
+                job.attempts += 1
+                job.rows_written = 0
+                job.started_at = now
+                job.heartbeat_at = now
+            return job
+        except SQLAlchemyError as e:
+            logger.error(f"Error claiming export job: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to claim export job",
+                details={}
+            )
+
+    async def update_progress(
+        self, job: ExportJob, rows_written: int, now: datetime, total_rows: Optional[int] = None
+    ) -> bool:
+        """Record the rows written so far; False when the job was claimed again by another runner."""
+        values = {"rows_written": rows_written, "heartbeat_at": now}
+        if total_rows is not None:
+            values["total_rows"] = total_rows
+        return await self._update_running(job, values, "update export job progress")
+
+    async def finish(self, job: ExportJob, filename: str, file_size: int, now: datetime, expires_at: datetime) -> bool:
+        return await self._update_running(job, {
+            "status": ExportJobStatusEnum.DONE.value,
+            "filename": filename,
+            "file_size": file_size,
+            "finished_at": now,
+            "heartbeat_at": now,
+            "expires_at": expires_at,
+        }, "complete export job")
+
+    async def fail(self, job: ExportJob, error: str, now: datetime, expires_at: datetime) -> bool:
+        return await self._update_running(job, {
+            "status": ExportJobStatusEnum.FAILED.value,
+            "error": error[:512],
+            "finished_at": now,
+            "expires_at": expires_at,
+        }, "fail export job")
+
+    async def _update_running(self, job: ExportJob, values: dict, action: str) -> bool:
+        try:
+            stmt = (
+                update(ExportJob)
+                .where(
+                    ExportJob.id == job.id,
+                    ExportJob.attempts == job.attempts,
+                    ExportJob.status == ExportJobStatusEnum.RUNNING.value,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.db.execute(stmt)
+            return result.rowcount == 1
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to {action} {job.id}: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message=f"Failed to {action}",
+                details={}
+            )
+
+    async def fail_abandoned(self, stale_before: datetime, max_attempts: int, now: datetime,
+                             expires_at: datetime) -> int:
+        """Give up on jobs whose every attempt was interrupted; returns how many."""
+        try:
+            stmt = (
+                update(ExportJob)
+                .where(
+                    ExportJob.status == ExportJobStatusEnum.RUNNING.value,
+                    ExportJob.heartbeat_at < stale_before,
+                    ExportJob.attempts >= max_attempts,
+                )
+                .values(
+                    status=ExportJobStatusEnum.FAILED.value,
+                    error="Export interrupted too many times",
+                    finished_at=now,
+                    expires_at=expires_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.db.execute(stmt)
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Error failing abandoned export jobs: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to fail abandoned export jobs",
+                details={}
+            )
+
+    async def delete_expired(self, now: datetime) -> List[Tuple[uuid.UUID, str]]:
+        """Delete the finished jobs past their expiry; returns their ids and formats for the file cleanup."""
+        try:
+            stmt = (
+                delete(ExportJob)
+                .where(ExportJob.expires_at < now)
+                .returning(ExportJob.id, ExportJob.format)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.db.execute(stmt)
+            return [(row.id, row.format) for row in result]
+        except SQLAlchemyError as e:
+            logger.error(f"Error deleting expired export jobs: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to delete expired export jobs",
+                details={}
+            )
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import contains_eager
 from app.models.wishlist_model import Wishlist
 from app.models.album_model import Album
 from app.models.artist_model import Artist
@@ -11,7 +12,7 @@ from app.models.reference_data.entity_types import EntityType
 from app.models.reference_data.external_sources import ExternalSource
 from app.schemas.album_schema import AlbumCreate
 from app.schemas.artist_schema import ArtistCreate
-from app.core.enums import EntityTypeEnum
+from app.core.enums import EntityTypeEnum, LoadProfileEnum
 from app.core.exceptions import (
     ValidationError,
     ServerError,
@@ -142,7 +143,9 @@ class ExternalReferenceRepository(TransactionalMixin):
 
             query = select(CollectionAlbum).filter(
                 CollectionAlbum.collection_id == collection_id
-            ).join(Album).filter(Album.external_album_id == external_id)
+            ).join(Album).filter(
+                Album.external_album_id == external_id
+            ).options(contains_eager(CollectionAlbum.album))
 
             result = await self.db.execute(query)
             return result.scalar_one_or_none()
@@ -212,9 +215,11 @@ class ExternalReferenceRepository(TransactionalMixin):
                 details={}
             )
 
-    async def find_collection_by_id(self, collection_id: int, load_relations: bool = True) -> Optional[Collection]:
-        """Find a collection by ID with optional relations loading"""
-        return await self.collection_repo.get_by_id(collection_id, load_relations=load_relations)
+    async def find_collection_by_id(
+        self, collection_id: int, profile: LoadProfileEnum = LoadProfileEnum.LIST_CARD
+    ) -> Optional[Collection]:
+        """Find a collection by ID with the relations of the given loading profile"""
+        return await self.collection_repo.get_by_id(collection_id, profile=profile)
 
     async def add_album_to_collection(
         self, collection: Collection, album: Album, album_data: Optional[dict] = None, is_new_entity: bool = False
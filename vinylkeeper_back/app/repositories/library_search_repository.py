@@ -0,0 +1,143 @@
+from typing import List
+
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Row,
+    String,
+    Text,
+    cast,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config_env import settings
+from app.core.enums import EntityTypeEnum, LibrarySourceEnum
+from app.core.exceptions import ServerError
+from app.core.logging import logger
+from app.models.album_model import Album
+from app.models.artist_model import Artist
+from app.models.association_tables import CollectionArtist
+from app.models.collection_album import CollectionAlbum
+from app.models.collection_model import Collection
+from app.models.reference_data.entity_types import EntityType
+from app.models.wishlist_model import Wishlist
+from app.utils.text_search import prefix_tsquery
+
+# Text search configuration of the title indexes: no stemming nor stop words,
+# titles are in every language. Written as constants, not parameters, so the
+# expressions below match the indexed ones (migration a9d4f6b2c8e1).
+_TS_CONFIG = literal_column("'simple'")
+_EMPTY = literal_column("''")
+
+
+def title_document(title_column):
+    """to_tsvector('simple', coalesce(title, '')), the expression under the GIN indexes."""
+    return func.to_tsvector(_TS_CONFIG, func.coalesce(title_column, _EMPTY))
+
+
+class LibrarySearchRepository:
+    """
+    Search of everything a user owns: the albums and artists of their
+    collections and their wishlist, in one statement.
+
+    A title matches when every search word starts one of its words
+    (tsvector prefix query), when it contains the term (ILIKE), or when one
+    of its words is close to the term (pg_trgm word similarity, for typos).
+    All three are served by the title indexes; the owner filter goes through
+    the collections' owner index.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(self, user_id: int, term: str, tokens: List[str], limit: int) -> List[Row]:
+        """Best hits first: rows of type, source, id, external_id, title, image_url, collection_ids, score."""
+        try:
+            # Threshold of the <% operator, for the current transaction only
+            await self.db.execute(select(func.set_config(
+                "pg_trgm.word_similarity_threshold", str(settings.LIBRARY_SEARCH_SIMILARITY_THRESHOLD), True
+            )))
+            query = func.to_tsquery(_TS_CONFIG, prefix_tsquery(tokens))
+            hits = union_all(
+                self._collection_hits(
+                    EntityTypeEnum.ALBUM, Album, Album.external_album_id, CollectionAlbum,
+                    CollectionAlbum.album_id, user_id, term, query
+                ),
+                self._collection_hits(
+                    EntityTypeEnum.ARTIST, Artist, Artist.external_artist_id, CollectionArtist,
+                    CollectionArtist.artist_id, user_id, term, query
+                ),
+                self._wishlist_hits(user_id, term, query),
+            ).subquery()
+            statement = (
+                select(hits)
+                .order_by(hits.c.score.desc(), func.length(hits.c.title), hits.c.title, hits.c.id)
+                .limit(limit)
+            )
+            return (await self.db.execute(statement)).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error searching library of user {user_id}: {str(e)}", exc_info=True)
+            raise ServerError(
+                error_code=5000,
+                message="Failed to search library",
+                details={}
+            )
+
+    def _matches(self, title_column, term: str, query):
+        return or_(
+            title_document(title_column).op("@@")(query),
+            title_column.icontains(term, autoescape=True),
+            literal(term, Text).op("<%")(title_column),
+        )
+
+    def _score(self, title_column, term: str, query):
+        # Word similarity is 1 when the term is a word of the title; the
+        # normalised cover density rank (0-1) favours titles where all
+        # words are present and close together
+        return (
+            func.word_similarity(term, title_column)
+            + func.ts_rank_cd(title_document(title_column), query, 32)
+        ).label("score")
+
+    def _collection_hits(self, entity_type, model, external_id_column, link, link_id_column, user_id, term, query):
+        """One row per album (or artist) of the user, with the collections holding it."""
+        return (
+            select(
+                literal(entity_type.value, String).label("type"),
+                literal(LibrarySourceEnum.COLLECTION.value, String).label("source"),
+                model.id.label("id"),
+                external_id_column.label("external_id"),
+                model.title.label("title"),
+                model.image_url.label("image_url"),
+                func.array_agg(link.collection_id.distinct()).label("collection_ids"),
+                self._score(model.title, term, query),
+            )
+            .join(link, link_id_column == model.id)
+            .join(Collection, Collection.id == link.collection_id)
+            .where(Collection.owner_id == user_id, self._matches(model.title, term, query))
+            .group_by(model.id)
+        )
+
+    def _wishlist_hits(self, user_id, term, query):
+        return (
+            select(
+                func.lower(EntityType.name).label("type"),
+                literal(LibrarySourceEnum.WISHLIST.value, String).label("source"),
+                Wishlist.id.label("id"),
+                Wishlist.external_id.label("external_id"),
+                Wishlist.title.label("title"),
+                Wishlist.image_url.label("image_url"),
+                cast(null(), ARRAY(Integer)).label("collection_ids"),
+                self._score(Wishlist.title, term, query),
+            )
+            .join(EntityType, EntityType.id == Wishlist.entity_type_id)
+            .where(Wishlist.user_id == user_id, self._matches(Wishlist.title, term, query))
+        )
@@ -1,7 +1,8 @@
 from typing import Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, case
+from sqlalchemy import select, func
 from sqlalchemy.exc import SQLAlchemyError
+from app.models.collection_model import Collection
 from app.models.like_model import Like
 from app.core.exceptions import ServerError
 from app.core.logging import logger
@@ -76,12 +77,11 @@ class LikeRepository(TransactionalMixin):
             )
 
     async def count_likes(self, collection_id: int) -> int:
-        """Return the total number of likes for a collection."""
+        """Return the total number of likes for a collection, read from its counter."""
         try:
-            query = select(func.count()).select_from(
-                Like).filter_by(collection_id=collection_id)
+            query = select(Collection.likes_count).filter(Collection.id == collection_id)
             result = await self.db.execute(query)
-            return result.scalar()
+            return result.scalar() or 0
         except SQLAlchemyError as e:
             logger.error(
                 f"Error counting likes for collection {collection_id}: {str(e)}")
@@ -128,23 +128,21 @@ class LikeRepository(TransactionalMixin):
             dict: {"count": int, "is_liked": bool}
         """
         try:
-            # Single query with aggregation and conditional check
+            # Counter column plus a unique-index probe for the user's like
+            is_liked = select(Like.id).filter(
+                Like.collection_id == collection_id, Like.user_id == user_id
+            ).exists()
             query = select(
-                func.count(Like.id).label("count"),
-                func.max(
-                    case(
-                        (Like.user_id == user_id, 1),
-                        else_=0
-                    )
-                ).label("is_liked")
-            ).filter(Like.collection_id == collection_id)
+                Collection.likes_count.label("count"),
+                is_liked.label("is_liked")
+            ).filter(Collection.id == collection_id)
 
             result = await self.db.execute(query)
-            row = result.one()
+            row = result.one_or_none()
 
             return {
-                "count": row.count or 0,
-                "is_liked": bool(row.is_liked) if user_id is not None else False
+                "count": row.count if row else 0,
+                "is_liked": bool(row.is_liked) if row and user_id is not None else False
             }
         except SQLAlchemyError as e:
             logger.error(
@@ -0,0 +1,83 @@
+"""
+Named eager-loading graphs for repository queries.
+
+Collection-valued relationships are declared lazy="raise" on the models:
+nothing behind them is loaded unless a query asks for it, and touching one
+that was not loaded raises instead of silently issuing SQL. Repository
+methods pick the profile matching what their caller renders:
+
+- LIST_CARD: one row of a list or grid, or an access check
+- DETAIL: a single entity page with its memberships
+- EXPORT: every row of a collection export, without back-references
+"""
+from typing import Dict, Tuple
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.core.enums import LoadProfileEnum
+from app.models.album_model import Album
+from app.models.artist_model import Artist
+from app.models.association_tables import CollectionArtist
+from app.models.collection_album import CollectionAlbum
+from app.models.collection_model import Collection
+
+LoadOptions = Tuple[LoaderOption, ...]
+
+_VINYL_STATES: LoadOptions = (
+    selectinload(CollectionAlbum.state_record_ref),
+    selectinload(CollectionAlbum.state_cover_ref),
+)
+
+_PROFILES: Dict[type, Dict[LoadProfileEnum, LoadOptions]] = {
+    Album: {
+        LoadProfileEnum.LIST_CARD: (selectinload(Album.external_source),),
+        LoadProfileEnum.DETAIL: (
+            selectinload(Album.external_source),
+            selectinload(Album.album_collections),
+            selectinload(Album.loans),
+        ),
+        LoadProfileEnum.EXPORT: (selectinload(Album.external_source),),
+    },
+    Artist: {
+        LoadProfileEnum.LIST_CARD: (selectinload(Artist.external_source),),
+        LoadProfileEnum.DETAIL: (
+            selectinload(Artist.external_source),
+            selectinload(Artist.collection_artists),
+        ),
+        LoadProfileEnum.EXPORT: (selectinload(Artist.external_source),),
+    },
+    CollectionAlbum: {
+        LoadProfileEnum.LIST_CARD: _VINYL_STATES,
+        LoadProfileEnum.DETAIL: _VINYL_STATES + (
+            selectinload(CollectionAlbum.album).selectinload(Album.external_source),
+        ),
+        LoadProfileEnum.EXPORT: _VINYL_STATES,
+    },
+    Collection: {
+        LoadProfileEnum.LIST_CARD: (selectinload(Collection.owner),),
+        LoadProfileEnum.DETAIL: (
+            selectinload(Collection.owner),
+            selectinload(Collection.mood),
+            selectinload(Collection.collection_albums).selectinload(CollectionAlbum.album),
+            selectinload(Collection.collection_albums).selectinload(CollectionAlbum.state_record_ref),
+            selectinload(Collection.collection_albums).selectinload(CollectionAlbum.state_cover_ref),
+            selectinload(Collection.collection_artists).selectinload(CollectionArtist.artist),
+        ),
+        LoadProfileEnum.EXPORT: (selectinload(Collection.owner),),
+    },
+}
+
+
+def load_options(entity: type, profile: LoadProfileEnum) -> LoadOptions:
+    """
+    Loader options for `entity` under the named profile.
+
+    Args:
+        entity: Mapped class the query selects
+        profile: Graph the caller needs
+
+    Returns:
+        LoadOptions: Options to pass to `select(...).options(*...)`
+    """
+    return _PROFILES[entity][profile]
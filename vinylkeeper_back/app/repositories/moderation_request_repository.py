@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, case
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -10,6 +10,7 @@ from app.core.enums import ModerationStatusEnum
 from app.core.exceptions import ResourceNotFoundError, ServerError
 from app.core.logging import logger
 from app.core.transaction import TransactionalMixin
+from app.utils.pagination import fetch_page_with_total
 
 
 class ModerationRequestRepository(TransactionalMixin):
@@ -46,9 +47,9 @@ class ModerationRequestRepository(TransactionalMixin):
             )
 
     async def get_requests_by_status(
-        self, status_id: int, limit: int | None = None, offset: int | None = None
-    ) -> List[ModerationRequest]:
-        """Get moderation requests by status with optional pagination (newest first)."""
+        self, status_id: int, limit: int, offset: int = 0
+    ) -> Tuple[List[ModerationRequest], int]:
+        """Get one page of moderation requests by status (newest first) and their total count."""
         try:
             query = select(ModerationRequest).filter(
                 ModerationRequest.status_id == status_id
@@ -57,14 +58,7 @@ class ModerationRequestRepository(TransactionalMixin):
                 selectinload(ModerationRequest.user),
                 selectinload(ModerationRequest.status)
             ).order_by(ModerationRequest.created_at.desc())
-
-            if offset:
-                query = query.offset(offset)
-            if limit:
-                query = query.limit(limit)
-
-            result = await self.db.execute(query)
-            return result.scalars().all()
+            return await fetch_page_with_total(self.db, query, offset, limit)
         except SQLAlchemyError as e:
             logger.error(
                 f"Error retrieving moderation requests by status {status_id}: {str(e)}")
@@ -74,22 +68,6 @@ class ModerationRequestRepository(TransactionalMixin):
                 details={}
             )
 
-    async def count_requests_by_status_id(self, status_id: int) -> int:
-        """Get count of moderation requests by status ID."""
-        try:
-            query = select(func.count(ModerationRequest.id)).filter(
-                ModerationRequest.status_id == status_id
-            )
-            result = await self.db.execute(query)
-            return result.scalar()
-        except SQLAlchemyError as e:
-            logger.error(f"Error counting moderation requests by status_id {status_id}: {str(e)}")
-            raise ServerError(
-                error_code=5000,
-                message="Failed to count moderation requests by status",
-                details={}
-            )
-
     async def get_request_by_id(self, request_id: int) -> ModerationRequest:
         """Get a moderation request by its ID."""
         try:
@@ -238,13 +216,25 @@ class ModerationRequestRepository(TransactionalMixin):
             )
 
     async def get_moderation_request_stats(self) -> dict:
-        """Get moderation request statistics."""
+        """Get moderation request statistics (total and per status) in a single query."""
         try:
+            def count_status(status: ModerationStatusEnum):
+                return func.coalesce(func.sum(case((ModerationStatus.name == status.value, 1), else_=0)), 0)
+
+            query = select(
+                func.count(ModerationRequest.id).label("total"),
+                count_status(ModerationStatusEnum.PENDING).label("pending"),
+                count_status(ModerationStatusEnum.APPROVED).label("approved"),
+                count_status(ModerationStatusEnum.REJECTED).label("rejected"),
+            ).select_from(ModerationRequest).outerjoin(
+                ModerationStatus, ModerationRequest.status_id == ModerationStatus.id
+            )
+            row = (await self.db.execute(query)).one()
             return {
-                "total": await self.get_total_moderation_request_count(),
-                "pending": await self.get_moderation_request_count_by_status(ModerationStatusEnum.PENDING.value),
-                "approved": await self.get_moderation_request_count_by_status(ModerationStatusEnum.APPROVED.value),
-                "rejected": await self.get_moderation_request_count_by_status(ModerationStatusEnum.REJECTED.value),
+                "total": row.total,
+                "pending": row.pending,
+                "approved": row.approved,
+                "rejected": row.rejected,
             }
         except SQLAlchemyError as e:
             logger.error(f"Error getting moderation request stats: {str(e)}")
@@ -1,12 +1,14 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, or_, select, func, case
+from sqlalchemy import Text, and_, or_, select, func, case, literal
 from sqlalchemy.orm import selectinload
 
+from app.core.config_env import settings
 from app.models.place_model import Place
 from app.models.place_like_model import PlaceLike
 from app.core.exceptions import ResourceNotFoundError
 from app.core.transaction import TransactionalMixin
+from app.utils.pagination import fetch_page_with_total
 
 
 class PlaceRepository(TransactionalMixin):
@@ -30,30 +32,15 @@ class PlaceRepository(TransactionalMixin):
         result = await self.db.execute(query)
         return result.scalars().all()
 
-    async def count_all_moderated_places(self) -> int:
-        """Count all moderated places."""
-        query = select(func.count(Place.id)).filter(
-            and_(Place.is_valid.is_(True), Place.is_moderated.is_(True))
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one()
-
-    async def get_all_moderated_places(self, limit: int | None = None, offset: int | None = None) -> List[Place]:
-        """Get all moderated places with optional pagination."""
+    async def get_all_moderated_places(self, limit: int, offset: int = 0) -> Tuple[List[Place], int]:
+        """Get one page of moderated places and their total count."""
         query = select(Place).options(
             selectinload(Place.place_type),
             selectinload(Place.submitted_by)
         ).filter(
             and_(Place.is_valid.is_(True), Place.is_moderated.is_(True))
         ).order_by(Place.name)
-
-        if offset is not None and offset > 0:
-            query = query.offset(offset)
-        if limit is not None:
-            query = query.limit(limit)
-
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await fetch_page_with_total(self.db, query, offset, limit)
 
     async def get_map_places(self) -> List[tuple]:
         """Get all moderated places with coordinates for map markers. Grouping by country+city is done client-side."""
@@ -199,19 +186,10 @@ class PlaceRepository(TransactionalMixin):
         result = await self.db.execute(query)
         return result.scalar()
 
-    async def count_moderated_places_by_type(self, place_type_id: int) -> int:
-        """Count all moderated places of a specific type."""
-        query = select(func.count(Place.id)).filter(
-            and_(Place.place_type_id == place_type_id,
-                 Place.is_valid.is_(True), Place.is_moderated.is_(True))
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one()
-
     async def get_moderated_places_by_type(
-        self, place_type_id: int, limit: int | None = None, offset: int | None = None
-    ) -> List[Place]:
-        """Get all moderated places of a specific type."""
+        self, place_type_id: int, limit: int, offset: int = 0
+    ) -> Tuple[List[Place], int]:
+        """Get one page of moderated places of a specific type and their total count."""
         query = select(Place).options(
             selectinload(Place.place_type),
             selectinload(Place.submitted_by)
@@ -219,33 +197,22 @@ class PlaceRepository(TransactionalMixin):
             and_(Place.place_type_id == place_type_id,
                  Place.is_valid.is_(True), Place.is_moderated.is_(True))
         ).order_by(Place.name)
-        if offset is not None and offset > 0:
-            query = query.offset(offset)
-        if limit is not None:
-            query = query.limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all()
-
-    async def count_moderated_places_by_search(self, search_term: str) -> int:
-        """Count moderated places matching a search term."""
-        query = select(func.count(Place.id)).filter(
-            and_(
-                Place.is_valid.is_(True),
-                Place.is_moderated.is_(True),
-                or_(
-                    Place.name.ilike(f"%{search_term}%"),
-                    Place.city.ilike(f"%{search_term}%"),
-                    Place.country.ilike(f"%{search_term}%")
-                )
-            )
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one()
+        return await fetch_page_with_total(self.db, query, offset, limit)
 
     async def search_moderated_places(
-        self, search_term: str, limit: int | None = None, offset: int | None = None
-    ) -> List[Place]:
-        """Search moderated places by name, city, or country."""
+        self, search_term: str, limit: int, offset: int = 0
+    ) -> Tuple[List[Place], int]:
+        """Search moderated places by name, city, or country: one page and the total count.
+
+        Matches places containing the term, or a word close enough to it
+        (pg_trgm word similarity, so typos still match), best matches first.
+        Both conditions are served by the trigram index on search_text.
+        """
+        term = search_term.strip()
+        # Threshold of the <% operator, for the current transaction only
+        await self.db.execute(select(func.set_config(
+            "pg_trgm.word_similarity_threshold", str(settings.PLACE_SEARCH_SIMILARITY_THRESHOLD), True
+        )))
         query = select(Place).options(
             selectinload(Place.place_type),
             selectinload(Place.submitted_by)
@@ -254,42 +221,20 @@ class PlaceRepository(TransactionalMixin):
                 Place.is_valid.is_(True),
                 Place.is_moderated.is_(True),
                 or_(
-                    Place.name.ilike(f"%{search_term}%"),
-                    Place.city.ilike(f"%{search_term}%"),
-                    Place.country.ilike(f"%{search_term}%")
+                    # Escaped: "%" and "_" typed by the user are matched literally
+                    Place.search_text.icontains(term, autoescape=True),
+                    literal(term, Text).op("<%")(Place.search_text)
                 )
             )
-        ).order_by(Place.name)
-        if offset is not None and offset > 0:
-            query = query.offset(offset)
-        if limit is not None:
-            query = query.limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all()
-
-    async def count_moderated_places_in_region(
-        self, min_lat: float, max_lat: float, min_lng: float, max_lng: float
-    ) -> int:
-        """Count moderated places within a geographic region."""
-        query = select(func.count(Place.id)).filter(
-            and_(
-                Place.is_valid.is_(True),
-                Place.is_moderated.is_(True),
-                Place.latitude >= min_lat,
-                Place.latitude <= max_lat,
-                Place.longitude >= min_lng,
-                Place.longitude <= max_lng
-            )
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one()
+        ).order_by(func.word_similarity(term, Place.search_text).desc(), Place.name, Place.id)
+        return await fetch_page_with_total(self.db, query, offset, limit)
 
     async def get_moderated_places_in_region(
         self,
         min_lat: float, max_lat: float, min_lng: float, max_lng: float,
-        limit: int | None = None, offset: int | None = None
-    ) -> List[Place]:
-        """Get moderated places within a geographic region."""
+        limit: int, offset: int = 0
+    ) -> Tuple[List[Place], int]:
+        """Get one page of moderated places within a geographic region and their total count."""
         query = select(Place).options(
             selectinload(Place.place_type),
             selectinload(Place.submitted_by)
@@ -303,12 +248,7 @@ class PlaceRepository(TransactionalMixin):
                 Place.longitude <= max_lng
             )
         ).order_by(Place.name)
-        if offset is not None and offset > 0:
-            query = query.offset(offset)
-        if limit is not None:
-            query = query.limit(limit)
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return await fetch_page_with_total(self.db, query, offset, limit)
 
     async def like_place(self, user_id: int, place_id: int) -> PlaceLike:
         """Like a place for a user without committing (transaction managed by service)."""
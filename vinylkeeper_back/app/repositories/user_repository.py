@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import lambda_stmt, select, update, func
+from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.user_model import User
 from app.models.moderation_request_model import ModerationRequest
@@ -11,13 +11,21 @@ from app.core.transaction import TransactionalMixin
 
 
 class UserRepository(TransactionalMixin):
+    # Single-user lookups run on every authenticated request (get_current_user),
+    # at login and on refresh. They are lambda statements: the select is built
+    # and its compiled form cached once, later calls only extract the bound
+    # value from the closure. The role is joined so the user arrives in one
+    # round-trip instead of two (User.role is lazy="selectin").
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get a user by email"""
         try:
-            result = await self.db.execute(select(User).filter(User.email == email))
+            result = await self.db.execute(lambda_stmt(
+                lambda: select(User).options(joinedload(User.role)).filter(User.email == email)
+            ))
             return result.scalar_one_or_none()
         except SQLAlchemyError as e:
             logger.error(f"Error retrieving user by email: {str(e)}")
@@ -30,9 +38,9 @@ class UserRepository(TransactionalMixin):
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get a user by id"""
         try:
-            result = await self.db.execute(
-                select(User).options(selectinload(User.role)).filter(User.id == user_id)
-            )
+            result = await self.db.execute(lambda_stmt(
+                lambda: select(User).options(joinedload(User.role)).filter(User.id == user_id)
+            ))
             return result.scalar_one_or_none()
         except SQLAlchemyError as e:
             logger.error(f"Error retrieving user {user_id}: {str(e)}")
@@ -45,7 +53,9 @@ class UserRepository(TransactionalMixin):
     async def get_user_by_uuid(self, user_uuid: str) -> Optional[User]:
         """Get a user by UUID"""
         try:
-            result = await self.db.execute(select(User).filter(User.user_uuid == user_uuid))
+            result = await self.db.execute(lambda_stmt(
+                lambda: select(User).options(joinedload(User.role)).filter(User.user_uuid == user_uuid)
+            ))
             return result.scalar_one_or_none()
         except SQLAlchemyError as e:
             logger.error(f"Error retrieving user by UUID {user_uuid}: {str(e)}")
@@ -1,13 +1,17 @@
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import Row, select, func, and_
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.wishlist_model import Wishlist
 from app.models.reference_data.entity_types import EntityType
+from app.models.reference_data.external_sources import ExternalSource
 from app.core.enums import EntityTypeEnum
 from app.core.exceptions import ServerError
 from app.core.logging import logger
 from app.core.transaction import TransactionalMixin
+from app.utils.pagination import (
+    KeysetPage, build_page, decode_cursor, fetch_page_with_total, keyset_after, keyset_order
+)
 
 
 class WishlistRepository(TransactionalMixin):
@@ -130,33 +134,41 @@ class WishlistRepository(TransactionalMixin):
 
     async def get_user_wishlist_paginated(
         self, user_id: int, page: int = 1, limit: int = 8,
-        search: Optional[str] = None, sort_order: str = "newest"
-    ) -> Tuple[List[Wishlist], int]:
-        """Get paginated wishlist items for a user with optional search and sort."""
+        search: Optional[str] = None, sort_order: str = "newest", cursor: Optional[str] = None
+    ) -> KeysetPage:
+        """Get paginated wishlist items for a user with optional search and sort.
+
+        With a cursor the page is read by keyset on (created_at, id) and the total
+        count is skipped; otherwise the page number is used and counted in the
+        same statement.
+        """
         try:
-            offset = (page - 1) * limit
+            descending = sort_order == "newest"
 
             base_filter = Wishlist.user_id == user_id
             if search and search.strip():
                 base_filter = and_(base_filter, Wishlist.title.ilike(f"%{search.strip()}%"))
 
-            order_clause = Wishlist.created_at.desc() if sort_order == "newest" else Wishlist.created_at.asc()
-
             query = (
                 select(Wishlist)
                 .filter(base_filter)
-                .order_by(order_clause)
-                .offset(offset)
-                .limit(limit)
+                .order_by(*keyset_order(Wishlist.created_at, Wishlist.id, descending))
             )
-            result = await self.db.execute(query)
-            items = result.scalars().all()
 
-            count_query = select(func.count(Wishlist.id)).filter(base_filter)
-            count_result = await self.db.execute(count_query)
-            total = count_result.scalar() or 0
+            total = None
+            if cursor:
+                query = query.filter(keyset_after(
+                    Wishlist.created_at, Wishlist.id, decode_cursor(cursor, sort_order), descending
+                ))
+                items = (await self.db.execute(query.limit(limit + 1))).scalars().all()
+            else:
+                items, total = await fetch_page_with_total(self.db, query, (page - 1) * limit, limit + 1)
 
-            return items, total
+            return build_page(
+                items, limit, sort_order,
+                lambda item: (item.created_at, item.id),
+                total
+            )
         except SQLAlchemyError as e:
             logger.error(
                 f"Error getting paginated wishlist items for user {user_id}: {str(e)}", exc_info=True)
@@ -166,24 +178,35 @@ class WishlistRepository(TransactionalMixin):
                 details={}
             )
 
-    async def get_user_wishlist_all(self, user_id: int) -> List[Wishlist]:
-        """Get all wishlist items for a user with relations loaded (for exports)."""
-        try:
-            from sqlalchemy.orm import selectinload
+    async def stream_user_wishlist_rows(self, user_id: int, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream a user's wishlist for export, newest first, in batches of column tuples.
 
-            query = (
-                select(Wishlist)
-                .options(
-                    selectinload(Wishlist.entity_type),
-                    selectinload(Wishlist.external_source),
-                )
-                .filter(Wishlist.user_id == user_id)
-                .order_by(Wishlist.created_at.desc())
+        Read through a server-side cursor, batch_size rows at a time. Each row
+        carries id, entity_type, external_id, external_source, title,
+        image_url and created_at.
+        """
+        query = (
+            select(
+                Wishlist.id,
+                EntityType.name.label("entity_type"),
+                Wishlist.external_id,
+                ExternalSource.name.label("external_source"),
+                Wishlist.title,
+                Wishlist.image_url,
+                Wishlist.created_at,
             )
-            result = await self.db.execute(query)
-            return result.scalars().all()
+            .outerjoin(EntityType, EntityType.id == Wishlist.entity_type_id)
+            .outerjoin(ExternalSource, ExternalSource.id == Wishlist.external_source_id)
+            .filter(Wishlist.user_id == user_id)
+            .order_by(Wishlist.created_at.desc())
+        )
+        try:
+            result = await self.db.stream(query, execution_options={"yield_per": batch_size})
+            async for batch in result.partitions():
+                yield batch
         except SQLAlchemyError as e:
-            logger.error(f"Error getting wishlist export data: {str(e)}", exc_info=True)
+            logger.error(f"Error streaming wishlist export data: {str(e)}", exc_info=True)
             raise ServerError(
                 error_code=5000,
                 message="Failed to get wishlist items",
@@ -193,19 +193,21 @@ class CollectionDetailResponse(BaseSchema):
 class PaginatedAlbumsResponse(BaseSchema):
     """Schema for paginated albums response."""
     items: List[CollectionAlbumResponse] = Field(default_factory=list)
-    total: int = Field(ge=0, description="Total number of albums")
-    page: int = Field(gt=0, description="Current page number")
+    total: Optional[int] = Field(None, ge=0, description="Total number of albums (omitted on cursor pages)")
+    page: Optional[int] = Field(None, gt=0, description="Current page number (omitted on cursor pages)")
     limit: int = Field(gt=0, description="Number of items per page")
-    total_pages: int = Field(ge=0, description="Total number of pages")
+    total_pages: Optional[int] = Field(None, ge=0, description="Total number of pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, if any")
 
 
 class PaginatedArtistsResponse(BaseSchema):
     """Schema for paginated artists response."""
     items: List[CollectionArtistResponse] = Field(default_factory=list)
-    total: int = Field(ge=0, description="Total number of artists")
-    page: int = Field(gt=0, description="Current page number")
+    total: Optional[int] = Field(None, ge=0, description="Total number of artists (omitted on cursor pages)")
+    page: Optional[int] = Field(None, gt=0, description="Current page number (omitted on cursor pages)")
     limit: int = Field(gt=0, description="Number of items per page")
-    total_pages: int = Field(ge=0, description="Total number of pages")
+    total_pages: Optional[int] = Field(None, ge=0, description="Total number of pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, if any")
 
 
 class CollectionSearchResponse(BaseSchema):
@@ -228,10 +230,11 @@ class PaginatedCollectionResponse(BaseSchema):
 class PaginatedCollectionListResponse(BaseSchema):
     """Schema for paginated collection list response (optimized for performance)."""
     items: List[CollectionListItemResponse] = Field(default_factory=list)
-    total: int = Field(ge=0, description="Total number of collections")
-    page: int = Field(gt=0, description="Current page number")
+    total: Optional[int] = Field(None, ge=0, description="Total number of collections (omitted on cursor pages)")
+    page: Optional[int] = Field(None, gt=0, description="Current page number (omitted on cursor pages)")
     limit: int = Field(gt=0, description="Number of items per page")
-    total_pages: int = Field(ge=0, description="Total number of pages")
+    total_pages: Optional[int] = Field(None, ge=0, description="Total number of pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, if any")
 
 
 class CollectionCreateResponse(BaseSchema):
@@ -0,0 +1,43 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.core.enums import ExportFormatEnum, ExportJobStatusEnum, ExportKindEnum
+
+
+class ExportJobCreate(BaseModel):
+    """Schema for queueing an export: the same kinds and formats as the /export endpoints."""
+    kind: ExportKindEnum
+    format: ExportFormatEnum
+    collection_id: Optional[int] = Field(None, gt=0, description="Required for the collection exports")
+
+    @model_validator(mode="after")
+    def validate_collection_id(self) -> "ExportJobCreate":
+        if self.kind == ExportKindEnum.WISHLIST:
+            if self.collection_id is not None:
+                raise ValueError("collection_id is not allowed for the wishlist export")
+        elif self.collection_id is None:
+            raise ValueError("collection_id is required for the collection exports")
+        return self
+
+
+class ExportJobResponse(BaseModel):
+    """Schema for export job data in responses."""
+    id: uuid.UUID
+    kind: ExportKindEnum
+    format: ExportFormatEnum
+    collection_id: Optional[int] = None
+    status: ExportJobStatusEnum
+    rows_written: int = Field(..., description="Rows written so far")
+    total_rows: Optional[int] = Field(None, description="Rows expected, once the job has started")
+    progress: Optional[float] = Field(None, ge=0, le=1, description="Fraction done, when total_rows is known")
+    filename: Optional[str] = None
+    file_size: Optional[int] = Field(None, description="Size in bytes of the file, once done")
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = Field(None, description="The file can be downloaded until then")
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,30 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.enums import EntityTypeEnum, LibrarySourceEnum
+
+
+class HighlightSpan(BaseModel):
+    """Part of a title matching the search, as [start, end) offsets in Unicode code points."""
+    start: int = Field(..., ge=0)
+    end: int = Field(..., ge=0)
+
+
+class LibrarySearchHit(BaseModel):
+    """An album or artist of the user's collections, or an item of their wishlist."""
+    type: EntityTypeEnum
+    source: LibrarySourceEnum
+    id: int
+    external_id: str
+    title: str
+    image_url: Optional[str] = None
+    collection_ids: List[int] = Field(default_factory=list, description="User's collections holding the item")
+    score: float = Field(..., description="Relevance, higher first")
+    highlights: List[HighlightSpan] = []
+
+
+class LibrarySearchResponse(BaseModel):
+    """Schema for the search across a user's collections and wishlist, best hits first."""
+    query: str
+    hits: List[LibrarySearchHit]
@@ -169,7 +169,8 @@ class WishlistItemListResponse(BaseSchema):
 class PaginatedWishlistResponse(BaseSchema):
     """Schema for paginated wishlist response."""
     items: List[WishlistItemListResponse] = Field(default_factory=list)
-    total: int = Field(ge=0, description="Total number of wishlist items")
-    page: int = Field(gt=0, description="Current page number")
+    total: Optional[int] = Field(None, ge=0, description="Total number of wishlist items (omitted on cursor pages)")
+    page: Optional[int] = Field(None, gt=0, description="Current page number (omitted on cursor pages)")
     limit: int = Field(gt=0, description="Number of items per page")
-    total_pages: int = Field(ge=0, description="Total number of pages")
+    total_pages: Optional[int] = Field(None, ge=0, description="Total number of pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, if any")
@@ -1,4 +1,5 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from sqlalchemy import inspect
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.repositories.collection_repository import CollectionRepository
@@ -22,6 +23,8 @@ from app.schemas.collection_album_schema import (
     CollectionAlbumCreate,
     CollectionAlbumUpdate
 )
+from app.core.enums import LoadProfileEnum
+from app.core.events import USER_COLLECTIONS_CHANGED, publish
 from app.core.exceptions import (
     AppException,
     ResourceNotFoundError,
@@ -34,6 +37,12 @@ from app.core.exceptions import (
 )
 from app.core.logging import logger
 from app.core.transaction import transaction_context
+from app.utils.pagination import KeysetPage, total_pages
+
+
+def _is_loaded(instance, relationship: str) -> bool:
+    """True when the relationship was loaded with the instance, so reading it emits no query."""
+    return relationship not in inspect(instance).unloaded
 
 
 class CollectionService:
@@ -52,7 +61,7 @@ class CollectionService:
         self.wishlist_repository = wishlist_repository
 
     async def _get_owned_collection(self, user_id: int, collection_id: int) -> Collection:
-        collection = await self.repository.get_by_id(collection_id)
+        collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.LIST_CARD)
         if not collection:
             raise ResourceNotFoundError("Collection", collection_id)
         if collection.owner_id != user_id:
@@ -93,8 +102,11 @@ class CollectionService:
             if collection_data.artist_ids:
                 await self.repository.add_artists(created_collection, collection_data.artist_ids)
 
-            created_collection = await self.repository.get_by_id(created_collection.id, load_relations=True)
-            return await self._build_collection_response(created_collection, user_id)
+            created_collection = await self.repository.get_by_id(created_collection.id, LoadProfileEnum.DETAIL)
+            response = await self._build_collection_response(created_collection, user_id)
+
+        await publish(USER_COLLECTIONS_CHANGED, user_id=user_id)
+        return response
 
     async def get_user_counts_batch(self, user_id: int) -> dict:
         """Get all user counts in a single SQL query."""
@@ -102,7 +114,7 @@ class CollectionService:
 
     async def get_collection(self, collection_id: int) -> CollectionResponse:
         """Get a collection by ID"""
-        collection = await self.repository.get_by_id(collection_id, load_relations=True)
+        collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.DETAIL)
         return await self._build_collection_response(collection)
 
     async def update_collection(
@@ -123,6 +135,8 @@ class CollectionService:
             updated_collection = await self.repository.update(collection)
             await self.repository.refresh(updated_collection)
 
+        if collection_data.is_public is not None:
+            await publish(USER_COLLECTIONS_CHANGED, user_id=user_id)
         return await self.get_collection(collection_id)
 
     async def delete_collection(self, user_id: int, collection_id: int) -> bool:
@@ -130,6 +144,7 @@ class CollectionService:
         async with transaction_context(self.repository.db):
             collection = await self._get_owned_collection(user_id, collection_id)
             await self.repository.delete(collection)
+        await publish(USER_COLLECTIONS_CHANGED, user_id=user_id)
         return True
 
     async def add_album_to_collection(
@@ -141,6 +156,7 @@ class CollectionService:
             collection_album = await self.collection_album_repository.add_album_to_collection(
                 collection_id, album_data.album_id, album_data.model_dump(exclude={'album_id'})
             )
+        await publish(USER_COLLECTIONS_CHANGED, user_id=user_id)
 
         album = await self.collection_album_repository.get_album_with_metadata(collection_id, album_data.album_id)
         return collection_mapper.album_to_collection_album_response(album, collection_album)
@@ -163,6 +179,7 @@ class CollectionService:
         async with transaction_context(self.collection_album_repository.db):
             await self._get_owned_collection(user_id, collection_id)
             await self.collection_album_repository.remove_album_from_collection(collection_id, album_id)
+        await publish(USER_COLLECTIONS_CHANGED, user_id=user_id)
         return True
 
     async def remove_artist_from_collection(self, user_id: int, collection_id: int, artist_id: int) -> bool:
@@ -170,6 +187,7 @@ class CollectionService:
         async with transaction_context(self.repository.db):
             collection = await self._get_owned_collection(user_id, collection_id)
             await self.repository.remove_artist(collection, artist_id)
+        await publish(USER_COLLECTIONS_CHANGED, user_id=user_id)
         return True
 
     async def get_user_collections(
@@ -184,9 +202,9 @@ class CollectionService:
 
             collection_ids = [collection.id for collection in collections]
 
-            likes_info = await self.repository.get_collections_likes_info_batch(user_id, collection_ids)
-            likes_counts = likes_info['counts']
-            user_likes = likes_info['user_likes']
+            user_likes = (
+                await self.repository.get_user_collections_likes(user_id, collection_ids) if user_id else {}
+            )
 
             collection_responses = []
             for collection in collections:
@@ -194,7 +212,7 @@ class CollectionService:
                     response = self._build_collection_list_item(
                         collection,
                         user_id,
-                        likes_counts.get(collection.id, 0),
+                        collection.likes_count,
                         user_likes.get(collection.id, False),
                         collection.albums_count,
                         collection.artists_count,
@@ -224,19 +242,25 @@ class CollectionService:
         limit: int = 10,
         exclude_user_id: int = None,
         user_id: int = None,
-        sort_by: str = "updated_at"
-    ) -> Tuple[List[CollectionListItemResponse], int]:
-        """Get public collections with pagination (optimized list view, lightweight response)."""
+        sort_by: str = "updated_at",
+        cursor: Optional[str] = None
+    ) -> KeysetPage:
+        """Get public collections with pagination (optimized list view, lightweight response).
+
+        Returns a KeysetPage of CollectionListItemResponse; `total` is None when a cursor is given.
+        """
         try:
-            collections, total = await self.repository.get_public_collections(page, limit, exclude_user_id, sort_by)
+            collections, total, next_cursor = await self.repository.get_public_collections(
+                page, limit, exclude_user_id, sort_by, cursor
+            )
 
             if not collections:
-                return [], 0
+                return KeysetPage([], 0 if total is not None else None)
 
             collection_ids = [collection.id for collection in collections]
-            likes_info = await self.repository.get_collections_likes_info_batch(user_id, collection_ids)
-            likes_counts = likes_info['counts']
-            user_likes = likes_info['user_likes']
+            user_likes = (
+                await self.repository.get_user_collections_likes(user_id, collection_ids) if user_id else {}
+            )
 
             collection_responses = []
             for collection in collections:
@@ -244,7 +268,7 @@ class CollectionService:
                     response = self._build_collection_list_item(
                         collection,
                         user_id,
-                        likes_counts.get(collection.id, 0),
+                        collection.likes_count,
                         user_likes.get(collection.id, False),
                         collection.albums_count,
                         collection.artists_count,
@@ -255,7 +279,7 @@ class CollectionService:
                         f"Error processing collection {collection.id}: {str(collection_error)}", exc_info=True)
                     continue
 
-            return collection_responses, total
+            return KeysetPage(collection_responses, total, next_cursor)
         except ValidationError as e:
             raise e
         except AppException:
@@ -270,7 +294,7 @@ class CollectionService:
 
     async def like_collection(self, user_id: int, collection_id: int) -> dict:
         """Like a collection"""
-        collection = await self.repository.get_by_id(collection_id)
+        collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.LIST_CARD)
         if not collection:
             raise ResourceNotFoundError("Collection", collection_id)
 
@@ -298,7 +322,7 @@ class CollectionService:
 
     async def unlike_collection(self, user_id: int, collection_id: int) -> dict:
         """Unlike a collection"""
-        collection = await self.repository.get_by_id(collection_id)
+        collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.LIST_CARD)
         if not collection:
             raise ResourceNotFoundError("Collection", collection_id)
 
@@ -318,7 +342,7 @@ class CollectionService:
     async def get_collection_by_id(self, collection_id: int, user_id: int) -> CollectionResponse:
         """Get a collection by ID with proper access control"""
         try:
-            collection = await self.repository.get_by_id(collection_id, load_relations=True)
+            collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.DETAIL)
             if not collection:
                 raise ResourceNotFoundError("Collection", collection_id)
             self._assert_collection_accessible(collection, user_id)
@@ -341,7 +365,7 @@ class CollectionService:
         Uses aggregated queries for counts and likes.
         """
         try:
-            collection = await self.repository.get_by_id(collection_id, load_relations=False, load_minimal=True)
+            collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.LIST_CARD)
             if not collection:
                 raise ResourceNotFoundError("Collection", collection_id)
 
@@ -382,18 +406,19 @@ class CollectionService:
             )
 
     async def get_collection_albums_paginated(
-        self, collection_id: int, user_id: int, page: int = 1, limit: int = 12, sort_order: str = "newest"
+        self, collection_id: int, user_id: int, page: int = 1, limit: int = 12, sort_order: str = "newest",
+        cursor: Optional[str] = None
     ) -> PaginatedAlbumsResponse:
-        """Get paginated albums from a collection"""
+        """Get paginated albums from a collection, by page number or by cursor"""
         try:
-            collection = await self.repository.get_by_id(collection_id)
+            collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.LIST_CARD)
             if not collection:
                 raise ResourceNotFoundError("Collection", collection_id)
 
             self._assert_collection_accessible(collection, user_id)
 
-            albums_data, total = await self.collection_album_repository.get_collection_albums_paginated(
-                collection_id, page, limit, sort_order
+            albums_data, total, next_cursor = await self.collection_album_repository.get_collection_albums_paginated(
+                collection_id, page, limit, sort_order, cursor
             )
 
             album_responses = [
@@ -404,9 +429,10 @@ class CollectionService:
             return PaginatedAlbumsResponse(
                 items=album_responses,
                 total=total,
-                page=page,
+                page=None if cursor else page,
                 limit=limit,
-                total_pages=(total + limit - 1) // limit,
+                total_pages=total_pages(total, limit),
+                next_cursor=next_cursor,
             )
 
         except (ResourceNotFoundError, ForbiddenError, ValidationError) as e:
@@ -423,18 +449,19 @@ class CollectionService:
             )
 
     async def get_collection_artists_paginated(
-        self, collection_id: int, user_id: int, page: int = 1, limit: int = 12, sort_order: str = "newest"
+        self, collection_id: int, user_id: int, page: int = 1, limit: int = 12, sort_order: str = "newest",
+        cursor: Optional[str] = None
     ) -> PaginatedArtistsResponse:
-        """Get paginated artists from a collection"""
+        """Get paginated artists from a collection, by page number or by cursor"""
         try:
-            collection = await self.repository.get_by_id(collection_id)
+            collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.LIST_CARD)
             if not collection:
                 raise ResourceNotFoundError("Collection", collection_id)
 
             self._assert_collection_accessible(collection, user_id)
 
-            artists_data, total = await self.repository.get_collection_artists_paginated(
-                collection_id, page, limit, sort_order
+            artists_data, total, next_cursor = await self.repository.get_collection_artists_paginated(
+                collection_id, page, limit, sort_order, cursor
             )
 
             artist_responses = [
@@ -445,9 +472,10 @@ class CollectionService:
             return PaginatedArtistsResponse(
                 items=artist_responses,
                 total=total,
-                page=page,
+                page=None if cursor else page,
                 limit=limit,
-                total_pages=(total + limit - 1) // limit,
+                total_pages=total_pages(total, limit),
+                next_cursor=next_cursor,
             )
 
         except (ResourceNotFoundError, ForbiddenError, ValidationError) as e:
@@ -468,7 +496,7 @@ class CollectionService:
     ) -> dict:
         """Search for items in a collection"""
         try:
-            collection = await self.repository.get_by_id(collection_id)
+            collection = await self.repository.get_by_id(collection_id, LoadProfileEnum.LIST_CARD)
             if not collection:
                 raise ResourceNotFoundError("Collection", collection_id)
 
@@ -526,11 +554,17 @@ class CollectionService:
     async def _build_collection_response(
         self, collection, user_id=None, likes_count=None, is_liked=None
     ) -> CollectionResponse:
-        """Build a CollectionResponse from a Collection instance using preloaded data."""
+        """
+        Build a CollectionResponse from a Collection instance using preloaded data.
+
+        Albums, artists and owner come from the relationships loaded with the
+        DETAIL profile; those not loaded are left out instead of being loaded
+        (they are lazy="raise").
+        """
         artists = []
-        if hasattr(collection, 'collection_artists') and collection.collection_artists:
+        if _is_loaded(collection, 'collection_artists'):
             for collection_artist in collection.collection_artists:
-                if hasattr(collection_artist, 'artist') and collection_artist.artist:
+                if _is_loaded(collection_artist, 'artist') and collection_artist.artist:
                     artists.append(
                         collection_mapper.artist_to_collection_artist_response(
                             collection_artist.artist, collection_artist
@@ -538,14 +572,14 @@ class CollectionService:
                     )
 
         albums = []
-        if hasattr(collection, 'collection_albums') and collection.collection_albums:
+        if _is_loaded(collection, 'collection_albums'):
             for collection_album in collection.collection_albums:
-                if hasattr(collection_album, 'album') and collection_album.album:
+                if _is_loaded(collection_album, 'album') and collection_album.album:
                     albums.append(collection_mapper.album_to_collection_album_response(
                         collection_album.album, collection_album))
 
         owner = None
-        if hasattr(collection, 'owner') and collection.owner:
+        if _is_loaded(collection, 'owner') and collection.owner:
             owner = collection_mapper.user_to_mini_response(collection.owner)
 
         if likes_count is None:
@@ -0,0 +1,65 @@
+"""
+Periodic repair of the denormalised collection counters.
+
+Database triggers keep collections.albums_count, artists_count and likes_count
+exact within each transaction. This job recomputes them from collection_album,
+collection_artist and likes to catch rows written while the triggers were
+disabled (bulk loads, manual fixes, restores).
+
+Every worker runs the job; a transaction-level advisory lock lets only one of
+them reconcile at a time, the others skip that interval.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.logging import logger
+from app.core.transaction import transaction_context
+from app.repositories.collection_repository import CollectionRepository
+
+
+class CounterReconciler:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+        self.runs = 0
+        self.skipped = 0
+        self.corrected = 0
+        self.last_run: Optional[float] = None
+
+    async def run_once(self) -> int:
+        """Reconcile every collection once and return how many were corrected.
+
+        Returns 0 without scanning when another worker is already reconciling.
+        """
+        async with self.session_factory() as db:
+            async with transaction_context(db):
+                repository = CollectionRepository(db)
+                if not await repository.try_lock_counter_reconciliation():
+                    self.skipped += 1
+                    return 0
+                corrected = await repository.reconcile_counters()
+        self.runs += 1
+        self.corrected += corrected
+        self.last_run = time.time()
+        if corrected:
+            logger.warning(f"Collection counters: corrected {corrected} drifted collections")
+        return corrected
+
+    async def run(self, interval: float) -> None:
+        """Background task started from lifespan."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Collection counters reconciliation failed: {str(e)}", exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "corrected": self.corrected,
+            "last_run": self.last_run,
+        }
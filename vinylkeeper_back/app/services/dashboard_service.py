@@ -1,118 +1,100 @@
+"""
+Dashboard statistics.
+
+Global figures (collection totals, places, latest additions) are read from a
+single-row snapshot table refreshed in the background by one worker at a time;
+only the cheap per-user counters are computed per request. Whole responses
+are cached per user and invalidated on USER_COLLECTIONS_CHANGED.
+"""
+import asyncio
 import time
-from typing import Any
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.repositories.dashboard_repository import DashboardRepository
-from app.models.user_model import User
+from app.models.dashboard_snapshot_model import DashboardSnapshot
+from app.core.principal import Principal
 from app.schemas.dashboard_schema import DashboardStatsResponse, LatestAddition
+from app.core.config_env import settings
 from app.core.exceptions import AppException, ServerError
 from app.core.logging import logger
+from app.core.transaction import transaction_context
+from app.core.ttl_cache import TTLCache
+from app.db.parallel import ParallelReader
+
+RECENT_ALBUMS_LIMIT = 12
 
-_CACHE_TTL = 30.0
-_cache: dict[int, tuple[Any, float]] = {}
+# Snapshot columns, also the keys returned by DashboardService.build_global_stats
+GLOBAL_STATS_FIELDS = (
+    "global_albums_total",
+    "global_artists_total",
+    "global_places_total",
+    "moderated_places_total",
+    "public_collections_total",
+    "latest_album",
+    "latest_artist",
+    "recent_albums",
+)
 
 
 class DashboardService:
-    def __init__(self, dashboard_repository: DashboardRepository):
+    def __init__(
+        self,
+        dashboard_repository: DashboardRepository,
+        cache: Optional[TTLCache] = None,
+        parallel_reader: Optional[ParallelReader] = None,
+    ):
         self.dashboard_repository = dashboard_repository
+        self.cache = cache
+        self.parallel_reader = parallel_reader
+
+    @staticmethod
+    def create_cache(shared_dir: Optional[Path] = None) -> TTLCache:
+        """Per-user response cache, shared by the workers when shared_dir is given."""
+        return TTLCache(
+            "dashboard",
+            settings.DASHBOARD_CACHE_MAX_ENTRIES,
+            settings.DASHBOARD_CACHE_TTL,
+            shared_dir,
+            encode=lambda response: response.model_dump(mode="json"),
+            decode=DashboardStatsResponse.model_validate,
+        )
 
-    async def get_dashboard_stats(self, user: User) -> DashboardStatsResponse:
-        cached = _cache.get(user.id)
-        if cached and time.monotonic() < cached[1]:
-            return cached[0]
+    async def get_dashboard_stats(self, user: Principal) -> DashboardStatsResponse:
+        if self.cache is not None:
+            cached = await self.cache.get(user.id)
+            if cached is not None:
+                return cached
 
+        # Taken before the read: an invalidation landing during it keeps the result out of the cache
+        loaded_at = time.time_ns()
         try:
-            user_stats = await self.dashboard_repository.get_user_stats_batch(user.id)
-            user_albums_total = user_stats['albums_total']
-            user_artists_total = user_stats['artists_total']
-            user_collections_total = user_stats['collections_total']
-            user_public_collections_total = user_stats['public_collections_total']
-
-            global_counts = await self.dashboard_repository.get_global_collections_counts()
-            global_albums_total = global_counts['albums_total']
-            global_artists_total = global_counts['artists_total']
-
-            latest_album_result = await self.dashboard_repository.get_latest_album()
-            latest_artist_result = await self.dashboard_repository.get_latest_artist()
-
-            places_counts = await self.dashboard_repository.get_places_counts_batch()
-            moderated_places_total = places_counts['moderated_total']
-            global_places_total = places_counts['global_total']
-
-            public_collections_total = await self.dashboard_repository.get_public_collections_count()
-
-            latest_album = None
-            latest_album_id = None
-            if latest_album_result:
-                album, username, updated_at = latest_album_result
-                latest_album_id = album.id
-                display_username = "You" if username == user.username else username
-                latest_album = LatestAddition(
-                    id=album.id,
-                    name=album.title,
-                    username=display_username,
-                    created_at=updated_at,
-                    type="album",
-                    image_url=album.image_url,
-                    external_id=album.external_album_id,
-                )
-
-            latest_artist = None
-            latest_artist_id = None
-            if latest_artist_result:
-                artist, username, updated_at = latest_artist_result
-                latest_artist_id = artist.id
-                display_username = "You" if username == user.username else username
-                latest_artist = LatestAddition(
-                    id=artist.id,
-                    name=artist.title,
-                    username=display_username,
-                    created_at=updated_at,
-                    type="artist",
-                    image_url=artist.image_url,
-                    external_id=artist.external_artist_id
-                )
-
-            exclude_ids = []
-            if latest_album_id:
-                exclude_ids.append(latest_album_id)
-            if latest_artist_id:
-                exclude_ids.append(latest_artist_id)
-
-            recent_albums_result = await self.dashboard_repository.get_recent_albums(
-                limit=12,
-                exclude_ids=exclude_ids if exclude_ids else None
+            user_stats, snapshot = await self._read(
+                lambda repository: repository.get_user_stats_batch(user.id),
+                DashboardRepository.get_snapshot,
             )
-
-            recent_albums = []
-            if recent_albums_result:
-                for album, username, updated_at in recent_albums_result:
-                    recent_albums.append(LatestAddition(
-                        id=album.id,
-                        name=album.title,
-                        username=username,
-                        created_at=updated_at,
-                        type="album",
-                        image_url=album.image_url,
-                        external_id=album.external_album_id,
-                    ))
+            global_stats = await self._get_global_stats(snapshot)
 
             result = DashboardStatsResponse(
-                user_albums_total=user_albums_total,
-                user_artists_total=user_artists_total,
-                user_collections_total=user_collections_total,
-                user_public_collections_total=user_public_collections_total,
-                global_albums_total=global_albums_total,
-                global_artists_total=global_artists_total,
-                global_places_total=global_places_total,
-                moderated_places_total=moderated_places_total,
-                public_collections_total=public_collections_total,
-                latest_album=latest_album,
-                latest_artist=latest_artist,
-                recent_albums=recent_albums
+                user_albums_total=user_stats['albums_total'],
+                user_artists_total=user_stats['artists_total'],
+                user_collections_total=user_stats['collections_total'],
+                user_public_collections_total=user_stats['public_collections_total'],
+                global_albums_total=global_stats['global_albums_total'],
+                global_artists_total=global_stats['global_artists_total'],
+                global_places_total=global_stats['global_places_total'],
+                moderated_places_total=global_stats['moderated_places_total'],
+                public_collections_total=global_stats['public_collections_total'],
+                latest_album=self._for_user(global_stats['latest_album'], user),
+                latest_artist=self._for_user(global_stats['latest_artist'], user),
+                recent_albums=[LatestAddition(**album) for album in global_stats['recent_albums']]
             )
-            _cache[user.id] = (result, time.monotonic() + _CACHE_TTL)
+            if self.cache is not None:
+                await self.cache.set(user.id, result, loaded_at=loaded_at)
             return result
         except AppException:
             raise
@@ -123,3 +105,166 @@ class DashboardService:
                 message="Failed to get dashboard stats",
                 details={}
             )
+
+    async def _read(self, *reads: Callable[[DashboardRepository], Awaitable[Any]]) -> List[Any]:
+        """Run independent repository reads, on separate sessions when a parallel reader is set."""
+        if self.parallel_reader is None:
+            return [await read(self.dashboard_repository) for read in reads]
+        return await self.parallel_reader.gather(
+            *(lambda db, read=read: read(DashboardRepository(db)) for read in reads),
+            fallback=self.dashboard_repository.db,
+        )
+
+    async def _get_global_stats(self, snapshot: Optional[DashboardSnapshot]) -> Dict[str, Any]:
+        """Global figures from the snapshot, computed live until its first refresh or when disabled."""
+        if settings.DASHBOARD_SNAPSHOT_INTERVAL > 0:
+            if snapshot is not None and snapshot.refreshed_at is not None:
+                return {field: getattr(snapshot, field) for field in GLOBAL_STATS_FIELDS}
+            logger.info("Dashboard snapshot not built yet, computing global stats live")
+        return await self.build_global_stats()
+
+    @staticmethod
+    def _for_user(addition: Optional[Dict[str, Any]], user: Principal) -> Optional[LatestAddition]:
+        if addition is None:
+            return None
+        latest = LatestAddition(**addition)
+        if latest.username == user.username:
+            latest.username = "You"
+        return latest
+
+    async def build_global_stats(self) -> Dict[str, Any]:
+        """Compute the global figures, JSON-ready for the snapshot."""
+        (
+            global_counts, places_counts, public_collections_total, latest_album_result, latest_artist_result
+        ) = await self._read(
+            DashboardRepository.get_global_collections_counts,
+            DashboardRepository.get_places_counts_batch,
+            DashboardRepository.get_public_collections_count,
+            DashboardRepository.get_latest_album,
+            DashboardRepository.get_latest_artist,
+        )
+
+        latest_album = None
+        exclude_ids = []
+        if latest_album_result:
+            album, username, updated_at = latest_album_result
+            exclude_ids.append(album.id)
+            latest_album = LatestAddition(
+                id=album.id,
+                name=album.title,
+                username=username,
+                created_at=updated_at,
+                type="album",
+                image_url=album.image_url,
+                external_id=album.external_album_id,
+            ).model_dump(mode="json")
+
+        latest_artist = None
+        if latest_artist_result:
+            artist, username, updated_at = latest_artist_result
+            exclude_ids.append(artist.id)
+            latest_artist = LatestAddition(
+                id=artist.id,
+                name=artist.title,
+                username=username,
+                created_at=updated_at,
+                type="artist",
+                image_url=artist.image_url,
+                external_id=artist.external_artist_id
+            ).model_dump(mode="json")
+
+        recent_albums_result = await self.dashboard_repository.get_recent_albums(
+            limit=RECENT_ALBUMS_LIMIT,
+            exclude_ids=exclude_ids if exclude_ids else None
+        )
+
+        recent_albums = []
+        for album, username, updated_at in recent_albums_result or []:
+            recent_albums.append(LatestAddition(
+                id=album.id,
+                name=album.title,
+                username=username,
+                created_at=updated_at,
+                type="album",
+                image_url=album.image_url,
+                external_id=album.external_album_id,
+            ).model_dump(mode="json"))
+
+        return {
+            "global_albums_total": global_counts['albums_total'],
+            "global_artists_total": global_counts['artists_total'],
+            "global_places_total": places_counts['global_total'],
+            "moderated_places_total": places_counts['moderated_total'],
+            "public_collections_total": public_collections_total,
+            "latest_album": latest_album,
+            "latest_artist": latest_artist,
+            "recent_albums": recent_albums,
+        }
+
+    async def refresh_snapshot(self, max_age: float) -> bool:
+        """Rebuild the snapshot if it is older than max_age seconds.
+
+        Returns False when the snapshot is fresh or another worker is
+        refreshing it, so the workers' schedules need no coordination.
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            async with transaction_context(self.dashboard_repository.db):
+                snapshot = await self.dashboard_repository.claim_stale_snapshot(now - timedelta(seconds=max_age))
+                if snapshot is None:
+                    if await self.dashboard_repository.get_snapshot() is not None:
+                        return False
+                    snapshot = DashboardSnapshot(id=DashboardSnapshot.SINGLETON_ID)
+                for field, value in (await self.build_global_stats()).items():
+                    setattr(snapshot, field, value)
+                snapshot.refreshed_at = now
+                await self.dashboard_repository.save_snapshot(snapshot)
+            return True
+        except IntegrityError:
+            # Another worker created the first snapshot concurrently
+            return False
+
+
+class DashboardSnapshotRefresher:
+    """Background task keeping the dashboard snapshot at most `interval` seconds old."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: float,
+        parallel_reader: Optional[ParallelReader] = None,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.parallel_reader = parallel_reader
+        self.refreshes = 0
+        self.skipped = 0
+        self.last_duration: Optional[float] = None
+
+    async def refresh_once(self) -> bool:
+        started = time.monotonic()
+        async with self.session_factory() as db:
+            service = DashboardService(DashboardRepository(db), parallel_reader=self.parallel_reader)
+            refreshed = await service.refresh_snapshot(self.interval)
+        if refreshed:
+            self.refreshes += 1
+            self.last_duration = time.monotonic() - started
+        else:
+            self.skipped += 1
+        return refreshed
+
+    async def run(self) -> None:
+        """Started from lifespan; the first refresh happens immediately."""
+        while True:
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                logger.error(f"Dashboard snapshot refresh failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "refreshes": self.refreshes,
+            "skipped": self.skipped,
+            "last_duration": self.last_duration,
+        }
@@ -0,0 +1,279 @@
+"""
+Background exports.
+
+POST /api/exports queues an export job; every worker runs an ExportJobRunner
+that claims queued jobs and writes their file to the spool directory, where
+GET /api/exports/{id}/download serves it (with HTTP Range support) until it
+expires. Generation no longer holds a request worker and its database
+connection for the length of the export.
+
+At most EXPORT_JOB_CONCURRENCY jobs run at once across all workers: a runner
+first takes one of that many PostgreSQL advisory locks in the session the
+rows are streamed from, and keeps it for the duration of the job.
+"""
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config_env import settings
+from app.core.enums import ExportFormatEnum, ExportJobStatusEnum, ExportKindEnum
+from app.core.exceptions import ErrorCode, ResourceNotFoundError, ValidationError
+from app.core.logging import logger
+from app.core.transaction import transaction_context
+from app.models.export_job_model import ExportJob
+from app.repositories.collection_album_repository import CollectionAlbumRepository
+from app.repositories.collection_repository import CollectionRepository
+from app.repositories.export_job_repository import ExportJobRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.wishlist_repository import WishlistRepository
+from app.schemas.export_job_schema import ExportJobCreate, ExportJobResponse
+from app.services.export_service import ExportService
+from app.services.wishlist_export_service import WishlistExportService
+from app.utils.export_writers import CSV_MEDIA_TYPE, ODS_MEDIA_TYPE, ExportStream, ProgressCallback
+
+
+def default_spool_dir() -> Path:
+    if settings.EXPORT_SPOOL_DIR:
+        return Path(settings.EXPORT_SPOOL_DIR)
+    return Path(__file__).parent.parent.parent / "cache" / "exports"
+
+
+def spool_path(spool_dir: Path, job_id: uuid.UUID, export_format: str) -> Path:
+    return spool_dir / f"{job_id}.{export_format}"
+
+
+class ExportJobService:
+    """Service queueing export jobs and serving their results to their owner."""
+
+    def __init__(
+        self,
+        export_job_repository: ExportJobRepository,
+        export_service: ExportService,
+        spool_dir: Path,
+    ) -> None:
+        self.export_job_repository = export_job_repository
+        self.export_service = export_service
+        self.spool_dir = spool_dir
+
+    async def create_job(self, data: ExportJobCreate, user_id: int) -> ExportJobResponse:
+        if data.collection_id is not None:
+            await self.export_service.get_owned_collection(data.collection_id, user_id)
+        async with transaction_context(self.export_job_repository.db):
+            # Concurrent requests of the user count one after the other
+            await self.export_job_repository.lock_user_jobs(user_id)
+            active = await self.export_job_repository.count_active_for_user(user_id)
+            if active >= settings.EXPORT_JOB_MAX_ACTIVE_PER_USER:
+                raise ValidationError(
+                    error_code=ErrorCode.INVALID_RESOURCE_STATE,
+                    message="Too many exports in progress, wait for one to finish",
+                    details={"active": active, "limit": settings.EXPORT_JOB_MAX_ACTIVE_PER_USER},
+                )
+            job = await self.export_job_repository.create(ExportJob(
+                user_id=user_id,
+                collection_id=data.collection_id,
+                kind=data.kind.value,
+                format=data.format.value,
+            ))
+        logger.info(f"Export queued: job={job.id} kind={job.kind} format={job.format} user_id={user_id}")
+        return self.to_response(job)
+
+    async def get_job(self, job_id: uuid.UUID, user_id: int) -> ExportJobResponse:
+        return self.to_response(await self._get_job(job_id, user_id))
+
+    async def download(self, job_id: uuid.UUID, user_id: int) -> FileResponse:
+        """The finished file; FileResponse answers Range and If-Range requests itself."""
+        job = await self._get_job(job_id, user_id)
+        if job.status != ExportJobStatusEnum.DONE.value:
+            raise ValidationError(
+                error_code=ErrorCode.INVALID_RESOURCE_STATE,
+                message="Export is not ready",
+                details={"job_id": str(job_id), "status": job.status},
+            )
+        path = spool_path(self.spool_dir, job.id, job.format)
+        if job.expires_at <= datetime.now(timezone.utc) or not path.is_file():
+            raise ResourceNotFoundError("Export file", job_id)
+        return FileResponse(
+            path,
+            media_type=ODS_MEDIA_TYPE if job.format == ExportFormatEnum.ODS.value else CSV_MEDIA_TYPE,
+            filename=job.filename,
+        )
+
+    async def _get_job(self, job_id: uuid.UUID, user_id: int) -> ExportJob:
+        job = await self.export_job_repository.get_for_user(job_id, user_id)
+        if job is None:
+            raise ResourceNotFoundError("Export job", job_id)
+        return job
+
+    @staticmethod
+    def to_response(job: ExportJob) -> ExportJobResponse:
+        if job.status == ExportJobStatusEnum.DONE.value:
+            progress = 1.0
+        elif job.total_rows:
+            progress = min(1.0, job.rows_written / job.total_rows)
+        else:
+            progress = None
+        return ExportJobResponse.model_validate(job).model_copy(update={"progress": progress})
+
+
+class ExportJobSupersededError(Exception):
+    """The job was claimed again by another runner while this one was running it."""
+
+
+class ExportJobRunner:
+    """Background task started from lifespan, running queued export jobs one at a time."""
+
+    # Runs started before a job is given up, counting runs interrupted by a worker shutdown
+    MAX_ATTEMPTS = 3
+    CLEANUP_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        spool_dir: Path,
+        concurrency: int,
+        poll_interval: float,
+        ttl: float,
+        stale_after: float,
+    ):
+        self.session_factory = session_factory
+        self.spool_dir = spool_dir
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.ttl = timedelta(seconds=ttl)
+        self.stale_after = stale_after
+        self.completed = 0
+        self.failed = 0
+        self.superseded = 0
+        self.saturated = 0
+        self.expired = 0
+        self.last_duration: Optional[float] = None
+
+    async def run_once(self) -> bool:
+        """Run the next queued job; False when there was none or every export slot is taken."""
+        async with self.session_factory() as stream_db:
+            if await ExportJobRepository(stream_db).try_acquire_slot(self.concurrency) is None:
+                self.saturated += 1
+                return False
+            async with self.session_factory() as db:
+                jobs = ExportJobRepository(db)
+                now = datetime.now(timezone.utc)
+                async with transaction_context(db):
+                    job = await jobs.claim_next(
+                        now, now - timedelta(seconds=self.stale_after), self.MAX_ATTEMPTS
+                    )
+                if job is None:
+                    return False
+                await self._run(job, jobs, stream_db)
+        return True
+
+    async def _run(self, job: ExportJob, jobs: ExportJobRepository, stream_db: AsyncSession) -> None:
+        started = time.monotonic()
+        final_path = spool_path(self.spool_dir, job.id, job.format)
+        part_path = final_path.with_name(f"{final_path.name}.{job.attempts}.part")
+        logger.info(f"Export job started: job={job.id} kind={job.kind} format={job.format} attempt={job.attempts}")
+
+        async def progress(rows: int) -> None:
+            async with transaction_context(jobs.db):
+                if not await jobs.update_progress(job, rows, datetime.now(timezone.utc)):
+                    raise ExportJobSupersededError(str(job.id))
+
+        try:
+            export = await self._open(job, stream_db, progress)
+            async with transaction_context(jobs.db):
+                await jobs.update_progress(job, 0, datetime.now(timezone.utc), export.total_rows)
+            # Blocking file I/O off the event loop, which keeps serving requests
+            out = await asyncio.to_thread(open, part_path, "wb")
+            try:
+                async for chunk in export.chunks:
+                    await asyncio.to_thread(out.write, chunk)
+            finally:
+                await asyncio.to_thread(out.close)
+            now = datetime.now(timezone.utc)
+            async with transaction_context(jobs.db):
+                if not await jobs.finish(job, export.filename, part_path.stat().st_size, now, now + self.ttl):
+                    raise ExportJobSupersededError(str(job.id))
+                os.replace(part_path, final_path)
+        except ExportJobSupersededError:
+            part_path.unlink(missing_ok=True)
+            self.superseded += 1
+            logger.warning(f"Export job superseded: job={job.id} attempt={job.attempts}")
+            return
+        except Exception as e:
+            part_path.unlink(missing_ok=True)
+            self.failed += 1
+            logger.error(f"Export job failed: job={job.id} error={str(e)}", exc_info=True)
+            now = datetime.now(timezone.utc)
+            async with transaction_context(jobs.db):
+                await jobs.fail(job, str(e) or type(e).__name__, now, now + self.ttl)
+            return
+        self.completed += 1
+        self.last_duration = time.monotonic() - started
+        logger.info(f"Export job done: job={job.id} duration={self.last_duration:.2f}s")
+
+    async def _open(self, job: ExportJob, stream_db: AsyncSession, progress: ProgressCallback) -> ExportStream:
+        export_format = ExportFormatEnum(job.format)
+        if job.kind == ExportKindEnum.WISHLIST.value:
+            user = await UserRepository(stream_db).get_user_by_id(job.user_id)
+            return await WishlistExportService(WishlistRepository(stream_db)).open_wishlist_export(
+                export_format, job.user_id, user.username, progress
+            )
+        service = ExportService(CollectionRepository(stream_db), CollectionAlbumRepository(stream_db))
+        return await service.open_collection_export(
+            ExportKindEnum(job.kind), export_format, job.collection_id, job.user_id, progress
+        )
+
+    async def cleanup_once(self) -> int:
+        """Drop expired jobs and their files, and give up on jobs abandoned too often; returns jobs dropped."""
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            jobs = ExportJobRepository(db)
+            async with transaction_context(db):
+                await jobs.fail_abandoned(
+                    now - timedelta(seconds=self.stale_after), self.MAX_ATTEMPTS, now, now + self.ttl
+                )
+                expired = await jobs.delete_expired(now)
+        for job_id, export_format in expired:
+            spool_path(self.spool_dir, job_id, export_format).unlink(missing_ok=True)
+        # Partial files of runs interrupted by a worker shutdown
+        cutoff = time.time() - self.stale_after
+        for part_path in self.spool_dir.glob("*.part"):
+            try:
+                if part_path.stat().st_mtime < cutoff:
+                    part_path.unlink()
+            except FileNotFoundError:
+                pass
+        self.expired += len(expired)
+        return len(expired)
+
+    async def run(self) -> None:
+        """Started from lifespan: polls for jobs while idle, cleans up every CLEANUP_INTERVAL."""
+        next_cleanup = 0.0
+        while True:
+            ran = False
+            try:
+                if time.monotonic() >= next_cleanup:
+                    next_cleanup = time.monotonic() + self.CLEANUP_INTERVAL
+                    await self.cleanup_once()
+                ran = await self.run_once()
+            except Exception as e:
+                logger.error(f"Export job runner failed: {str(e)}", exc_info=True)
+            if not ran:
+                await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "superseded": self.superseded,
+            "saturated": self.saturated,
+            "expired": self.expired,
+            "last_duration": self.last_duration,
+        }
@@ -21,7 +21,8 @@ from app.core.exceptions import (
     ForbiddenError
 )
 from app.core.logging import logger
-from app.core.enums import EntityTypeEnum
+from app.core.enums import EntityTypeEnum, LoadProfileEnum
+from app.core.events import USER_COLLECTIONS_CHANGED, publish
 from app.core.transaction import transaction_context
 from app.models.wishlist_model import Wishlist
 from app.models.artist_model import Artist
@@ -37,7 +38,7 @@ class ExternalReferenceService:
 
     async def _verify_collection_access(self, collection_id: int, user_id: int) -> Collection:
         """Verify collection exists and user has access to it"""
-        collection = await self.repository.find_collection_by_id(collection_id, load_relations=True)
+        collection = await self.repository.find_collection_by_id(collection_id, LoadProfileEnum.LIST_CARD)
         if not collection:
             raise ResourceNotFoundError("Collection", collection_id)
         if collection.owner_id != user_id:
@@ -274,6 +275,9 @@ class ExternalReferenceService:
                     )
                     is_new = existing_artist is None
 
+            if is_new:
+                await publish(USER_COLLECTIONS_CHANGED, user_id=user_id)
+
             if request.entity_type == EntityTypeEnum.ALBUM:
                 # CollectionAlbum has a composite primary key — collection_id used as surrogate id
                 item_response = CollectionItemResponse(
@@ -357,6 +361,7 @@ class ExternalReferenceService:
 
                     await self.repository.remove_artist_from_collection(collection, artist)
 
+            await publish(USER_COLLECTIONS_CHANGED, user_id=user_id)
             return True
 
         except ResourceNotFoundError:
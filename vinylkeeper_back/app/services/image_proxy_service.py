@@ -1,14 +1,104 @@
 import asyncio
 import hashlib
-import os
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
 from urllib.parse import urlparse
 import httpx
-from PIL import Image
-from io import BytesIO
-from app.core.exceptions import ValidationError, ServerError, ErrorCode
+from PIL import features
+from app.core.config_env import settings
+from app.core.exceptions import AppException, ValidationError, ServerError, ErrorCode
+from app.core.image_cache import ImageCache
 from app.core.logging import logger
+from app.core.metrics import register_metrics
+from app.core.single_flight import SingleFlight
+from app.core.transcode_pool import TranscodePool
+from app.utils.image_transcoding import VariantSpec, render_variants
+
+
+class ProxyImage(NamedTuple):
+    """A proxied variant: served from `path` when it is in the image cache, else from `data`."""
+    content_type: str
+    etag: str
+    path: Optional[Path] = None
+    data: Optional[bytes] = None
+
+
+class RenderBatcher:
+    """
+    Groups variant requests for the same source that arrive within a short
+    window, so one decode serves every pending size.
+    """
+
+    # Share of the transcoding pool in use above which the cheaper encoder effort is used
+    HIGH_LOAD = 0.5
+
+    def __init__(self, window: float = 0.005):
+        self.window = window
+        self._pending: Dict[str, List[Tuple[VariantSpec, asyncio.Future]]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.variants = 0
+        self.reduced_effort_batches = 0
+
+    async def render(self, src: str, image_data: bytes, spec: VariantSpec, pool: TranscodePool) -> bytes:
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.get(src)
+        if batch is None:
+            batch = self._pending[src] = []
+            task = asyncio.create_task(self._flush(src, image_data, pool))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        batch.append((spec, future))
+        return await future
+
+    def _encoder_effort(self, pool: TranscodePool) -> Tuple[int, int]:
+        """WEBP method and AVIF speed; trade bytes for CPU when the transcoding pool is busy."""
+        if pool.load >= self.HIGH_LOAD:
+            self.reduced_effort_batches += 1
+            return settings.IMAGE_WEBP_METHOD_UNDER_LOAD, settings.IMAGE_AVIF_SPEED_UNDER_LOAD
+        return settings.IMAGE_WEBP_METHOD, settings.IMAGE_AVIF_SPEED
+
+    async def _flush(self, src: str, image_data: bytes, pool: TranscodePool) -> None:
+        await asyncio.sleep(self.window)
+        batch = self._pending.pop(src)
+        specs = list(dict.fromkeys(spec for spec, _ in batch))
+        self.batches += 1
+        self.variants += len(specs)
+        try:
+            rendered = await pool.run(render_variants, image_data, specs, *self._encoder_effort(pool))
+            outputs = dict(zip(specs, rendered))
+        except Exception as e:
+            if not isinstance(e, AppException):
+                logger.error(f"Failed to process image: {str(e)}", exc_info=True)
+                e = ServerError(
+                    error_code=ErrorCode.SERVER_ERROR,
+                    message="Failed to process image"
+                )
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for spec, future in batch:
+            if not future.done():
+                future.set_result(outputs[spec])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "variants": self.variants,
+            "reduced_effort_batches": self.reduced_effort_batches,
+            "pending": len(self._pending),
+        }
+
+
+# Shared by every request of the worker so identical origin fetches are coalesced
+# and concurrent variants of one source are rendered from a single decode
+_origin_fetches = SingleFlight()
+_render_batcher = RenderBatcher()
+# Used when no process pool is provided (tests, scripts): same bounds, thread-backed
+_fallback_pool = TranscodePool(max_workers=0, max_queue_depth=settings.IMAGE_TRANSCODE_MAX_QUEUE)
+register_metrics("image_origin_fetches", _origin_fetches.stats)
+register_metrics("image_renders", _render_batcher.stats)
 
 
 class ImageProxyService:
@@ -17,16 +107,25 @@ class ImageProxyService:
     MAX_DIMENSION = 2048
     REQUEST_TIMEOUT = 10.0
     DEFAULT_QUALITY = 85
+    ORIGINAL_EXT = "orig"
+    # Output formats by preference; JPEG is the fallback every client can display
+    OUTPUT_FORMATS = ("avif", "webp", "jpeg")
 
-    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
-        cache_path = os.getenv("IMAGE_CACHE_DIR")
-        if cache_path:
-            self.cache_dir = Path(cache_path)
-        else:
-            self.cache_dir = Path(
-                __file__).parent.parent.parent / "cache" / "images"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        image_cache: Optional[ImageCache] = None,
+        transcode_pool: Optional[TranscodePool] = None
+    ):
+        self.image_cache = image_cache or ImageCache(self.default_cache_dir(), settings.IMAGE_CACHE_MAX_BYTES)
         self.http_client = http_client
+        self.transcode_pool = transcode_pool or _fallback_pool
+
+    @staticmethod
+    def default_cache_dir() -> Path:
+        if settings.IMAGE_CACHE_DIR:
+            return Path(settings.IMAGE_CACHE_DIR)
+        return Path(__file__).parent.parent.parent / "cache" / "images"
 
     def _validate_domain(self, url: str) -> None:
         if not url or not url.strip():
@@ -77,95 +176,135 @@ class ImageProxyService:
         key_string = f"{src}|{width}|{height}|{quality}|{format}"
         return hashlib.sha256(key_string.encode()).hexdigest()
 
-    def _get_cache_path(self, cache_key: str, format: str) -> Path:
-        return self.cache_dir / f"{cache_key}.{format.lower()}"
+    @classmethod
+    def available_formats(cls) -> Tuple[str, ...]:
+        avif = settings.IMAGE_AVIF_ENABLED and features.check("avif")
+        return tuple(f for f in cls.OUTPUT_FORMATS if f != "avif" or avif)
 
-    def _is_cached(self, cache_key: str, format: str) -> bool:
-        cache_path = self._get_cache_path(cache_key, format)
-        return cache_path.exists()
+    @classmethod
+    def negotiate_format(cls, accept_header: str | None) -> str:
+        """
+        Pick the output format from an Accept header.
 
-    def _load_from_cache(self, cache_key: str, format: str) -> bytes:
-        cache_path = self._get_cache_path(cache_key, format)
-        with open(cache_path, "rb") as f:
-            return f.read()
+        AVIF and WEBP are only sent to clients that name them explicitly
+        (wildcards do not count, so `*/*` gets JPEG). The highest q-value
+        wins and ties go to the smaller format.
 
-    def _save_to_cache(self, cache_key: str, format: str, data: bytes) -> None:
-        cache_path = self._get_cache_path(cache_key, format)
-        with open(cache_path, "wb") as f:
-            f.write(data)
+        Args:
+            accept_header: Raw Accept header, may be empty
 
-    async def _fetch_image(self, url: str) -> bytes:
-        try:
-            client_to_use = self.http_client
-            if not client_to_use:
-                # Fallback: create temporary client if shared client not available
-                async with httpx.AsyncClient(timeout=self.REQUEST_TIMEOUT) as client:
-                    response = await client.get(url)
-                    response.raise_for_status()
-
-                    content_length = response.headers.get("content-length")
-                    if content_length and int(content_length) > self.MAX_IMAGE_SIZE:
-                        raise ValidationError(
-                            error_code=ErrorCode.INVALID_INPUT,
-                            message="Image size exceeds maximum allowed size",
-                            details={"max_size": self.MAX_IMAGE_SIZE}
-                        )
-                    return response.content
-            else:
-                response = await client_to_use.get(url)
-                response.raise_for_status()
-
-                content_length = response.headers.get("content-length")
-                if content_length and int(content_length) > self.MAX_IMAGE_SIZE:
-                    raise ValidationError(
-                        error_code=ErrorCode.INVALID_INPUT,
-                        message=f"Image size exceeds maximum allowed ({self.MAX_IMAGE_SIZE} bytes)",
-                        details={"size": content_length}
-                    )
-
-                image_data = response.content
-                if len(image_data) > self.MAX_IMAGE_SIZE:
-                    raise ValidationError(
-                        error_code=ErrorCode.INVALID_INPUT,
-                        message=f"Image size exceeds maximum allowed ({self.MAX_IMAGE_SIZE} bytes)",
-                        details={"size": len(image_data)}
-                    )
-
-                return image_data
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to fetch image from {url}: {str(e)}")
-            raise ServerError(
-                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
-                message="Failed to fetch image"
+        Returns:
+            str: "avif", "webp" or "jpeg"
+        """
+        explicit: Dict[str, float] = {}
+        wildcard_q = None
+        for media_range in (accept_header or "").lower().split(","):
+            media_type, *params = [part.strip() for part in media_range.split(";")]
+            q = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip() == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            if media_type in ("image/*", "*/*"):
+                wildcard_q = q if wildcard_q is None else max(wildcard_q, q)
+            elif media_type.startswith("image/"):
+                explicit[media_type[len("image/"):]] = q
+
+        available = cls.available_formats()
+        candidates = {f: explicit[f] for f in available if f != "jpeg" and explicit.get(f, 0) > 0}
+        # JPEG is always a candidate, as a last resort when the client does not list it
+        candidates["jpeg"] = explicit.get("jpeg", wildcard_q or 0.0)
+        return max(candidates, key=lambda f: (candidates[f], -available.index(f)))
+
+    def _validate_format(self, format: str) -> None:
+        if format not in self.available_formats():
+            raise ValidationError(
+                error_code=ErrorCode.INVALID_INPUT,
+                message=f"Unsupported image format: {format}",
+                details={"format": format, "allowed_formats": list(self.available_formats())}
             )
 
-    def _process_image(
-        self,
-        image_data: bytes,
-        width: int,
-        height: int,
-        quality: int,
-        format: str
-    ) -> bytes:
+    def variant_etag(self, src: str, width: int, height: int, quality: int | None, format: str) -> str:
+        """
+        Validate the variant parameters and return its ETag, derived from the
+        cache key so it is known before fetching or rendering anything.
+
+        The tag is weak: the bytes of one variant may differ with the encoder
+        effort used under load, but the rendered image is the same.
+        """
+        quality = quality or self.DEFAULT_QUALITY
+        self._validate_domain(src)
+        self._validate_dimensions(width, height)
+        self._validate_quality(quality)
+        self._validate_format(format)
+        cache_key = self._generate_cache_key(src, width, height, quality, format)
+        return f'W/"{cache_key[:32]}"'
+
+    def _generate_original_key(self, src: str) -> str:
+        return hashlib.sha256(f"original|{src}".encode()).hexdigest()
+
+    async def _fetch_image(self, url: str, cacheable: bool = False) -> bytes:
+        """
+        Source original for `url`: from the image cache, else downloaded once.
+
+        The download is only written to the cache for cacheable requests;
+        concurrent requests share the download of the first one.
+        """
+        return await _origin_fetches.do(url, lambda: self._load_original(url, cacheable))
+
+    async def _load_original(self, url: str, cacheable: bool) -> bytes:
+        original_key = self._generate_original_key(url)
+        cached_data = await asyncio.to_thread(self.image_cache.read, original_key, self.ORIGINAL_EXT)
+        if cached_data is not None:
+            return cached_data
+
+        image_data = await self._download_image(url)
+        if not cacheable:
+            return image_data
         try:
-            image = Image.open(BytesIO(image_data))
-            image = image.convert("RGB")
+            await asyncio.to_thread(self.image_cache.write, original_key, self.ORIGINAL_EXT, image_data)
+        except OSError as e:
+            logger.warning(f"Failed to cache original image {original_key}: {str(e)}")
+        return image_data
 
-            image.thumbnail((width, height), Image.Resampling.LANCZOS)
+    def _size_exceeded(self, size: int | str) -> ValidationError:
+        return ValidationError(
+            error_code=ErrorCode.INVALID_INPUT,
+            message=f"Image size exceeds maximum allowed ({self.MAX_IMAGE_SIZE} bytes)",
+            details={"size": size, "max_size": self.MAX_IMAGE_SIZE}
+        )
 
-            output = BytesIO()
-            if format.lower() == "webp":
-                image.save(output, format="WEBP", quality=quality, method=6)
-            else:
-                image.save(output, format="JPEG",
-                           quality=quality, optimize=True)
+    async def _stream_image(self, client: httpx.AsyncClient, url: str) -> bytes:
+        """Download the body chunk by chunk, aborting as soon as the byte cap is crossed."""
+        async with client.stream("GET", url, timeout=self.REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
 
-            return output.getvalue()
-        except Exception as e:
-            logger.error(f"Failed to process image: {str(e)}", exc_info=True)
+            content_length = response.headers.get("content-length")
+            if content_length and int(content_length) > self.MAX_IMAGE_SIZE:
+                raise self._size_exceeded(content_length)
+
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes():
+                buffer.extend(chunk)
+                if len(buffer) > self.MAX_IMAGE_SIZE:
+                    raise self._size_exceeded(f">{self.MAX_IMAGE_SIZE}")
+            return bytes(buffer)
+
+    async def _download_image(self, url: str) -> bytes:
+        try:
+            if self.http_client:
+                return await self._stream_image(self.http_client, url)
+            # Fallback: create temporary client if shared client not available
+            async with httpx.AsyncClient(timeout=self.REQUEST_TIMEOUT) as client:
+                return await self._stream_image(client, url)
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch image from {url}: {str(e)}")
             raise ServerError(
-                error_code=ErrorCode.SERVER_ERROR,
-                message="Failed to process image"
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to fetch image"
             )
 
     async def get_proxy_image(
@@ -174,32 +313,29 @@ class ImageProxyService:
         width: int,
         height: int,
         quality: int | None = None,
-        accept_webp: bool = True,
+        format: str = "webp",
         cacheable: bool = False
-    ) -> Tuple[bytes, str]:
+    ) -> ProxyImage:
         quality = quality or self.DEFAULT_QUALITY
+        etag = self.variant_etag(src, width, height, quality, format)
 
-        self._validate_domain(src)
-        self._validate_dimensions(width, height)
-        self._validate_quality(quality)
-
-        format = "webp" if accept_webp else "jpeg"
+        content_type = f"image/{format}"
+        cache_key = self._generate_cache_key(src, width, height, quality, format)
 
         if cacheable:
-            cache_key = self._generate_cache_key(
-                src, width, height, quality, format)
-
-            if await asyncio.to_thread(self._is_cached, cache_key, format):
-                cached_data = await asyncio.to_thread(self._load_from_cache, cache_key, format)
-                return cached_data, f"image/{format}"
+            cached_path = await asyncio.to_thread(self.image_cache.lookup, cache_key, format)
+            if cached_path is not None:
+                return ProxyImage(content_type, etag, path=cached_path)
 
-        image_data = await self._fetch_image(src)
-        processed_data = await asyncio.to_thread(
-            self._process_image, image_data, width, height, quality, format)
+        image_data = await self._fetch_image(src, cacheable)
+        processed_data = await _render_batcher.render(
+            src, image_data, VariantSpec(width, height, quality, format), self.transcode_pool)
 
         if cacheable:
-            cache_key = self._generate_cache_key(
-                src, width, height, quality, format)
-            await asyncio.to_thread(self._save_to_cache, cache_key, format, processed_data)
+            try:
+                cached_path = await asyncio.to_thread(self.image_cache.write, cache_key, format, processed_data)
+                return ProxyImage(content_type, etag, path=cached_path)
+            except OSError as e:
+                logger.warning(f"Failed to cache image {cache_key}: {str(e)}")
 
-        return processed_data, f"image/{format}"
+        return ProxyImage(content_type, etag, data=processed_data)
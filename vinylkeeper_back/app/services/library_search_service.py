@@ -0,0 +1,36 @@
+from app.core.config_env import settings
+from app.repositories.library_search_repository import LibrarySearchRepository
+from app.schemas.library_search_schema import HighlightSpan, LibrarySearchHit, LibrarySearchResponse
+from app.utils.text_search import highlight_spans, search_tokens
+
+
+class LibrarySearchService:
+    """Service searching everything a user owns: collection albums and artists, and wishlist."""
+
+    def __init__(self, repository: LibrarySearchRepository) -> None:
+        self.repository = repository
+
+    async def search(self, term: str, user_id: int, limit: int) -> LibrarySearchResponse:
+        term = term.strip()
+        tokens = search_tokens(term)
+        if not tokens:
+            # Only punctuation: nothing a title word could start with
+            return LibrarySearchResponse(query=term, hits=[])
+        rows = await self.repository.search(user_id, term, tokens, min(limit, settings.LIBRARY_SEARCH_MAX_HITS))
+        hits = [
+            LibrarySearchHit(
+                type=row.type,
+                source=row.source,
+                id=row.id,
+                external_id=row.external_id,
+                title=row.title,
+                image_url=row.image_url,
+                collection_ids=sorted(row.collection_ids or []),
+                score=row.score,
+                highlights=[
+                    HighlightSpan(start=start, end=end) for start, end in highlight_spans(row.title, tokens)
+                ],
+            )
+            for row in rows
+        ]
+        return LibrarySearchResponse(query=term, hits=hits)
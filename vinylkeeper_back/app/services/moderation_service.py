@@ -89,10 +89,9 @@ class ModerationService:
                 )
 
             offset = (page - 1) * limit
-            requests = await self.moderation_repository.get_requests_by_status(
+            requests, total = await self.moderation_repository.get_requests_by_status(
                 pending_status.id, limit, offset
             )
-            total = await self.moderation_repository.count_requests_by_status_id(pending_status.id)
 
             return PaginatedModerationRequestResponse(
                 items=[self._create_moderation_request_response(r) for r in requests],
@@ -1,4 +1,3 @@
-import asyncio
 from typing import List, Optional
 
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
@@ -31,6 +30,7 @@ from app.utils.geocoding import geocode_city
 from app.mails.client_mail import send_mail, MailSubject
 from app.core.config_env import settings
 from app.models.user_model import User
+from app.core.principal import Principal
 from app.schemas.moderation_request_schema import ModerationRequestCreate
 
 
@@ -139,7 +139,7 @@ class PlaceService:
                 details={}
             )
 
-    async def get_place(self, place_id: int, user: Optional[User] = None) -> PublicPlaceResponse:
+    async def get_place(self, place_id: int, user: Optional[Principal] = None) -> PublicPlaceResponse:
         """Get a place by ID (only moderated places). User resolved from token (uuid) in endpoint."""
         try:
             place = await self.repository.get_moderated_place_by_id(place_id)
@@ -191,7 +191,7 @@ class PlaceService:
                 details={}
             )
 
-    async def get_places_by_location(self, country: str, city: str, user: User) -> List[PublicPlaceResponse]:
+    async def get_places_by_location(self, country: str, city: str, user: Principal) -> List[PublicPlaceResponse]:
         """Get all moderated places in the given country and city (for map popup). User resolved from token (uuid)."""
         try:
             places = await self.repository.get_places_by_location(country, city)
@@ -209,15 +209,12 @@ class PlaceService:
             )
 
     async def get_all_places(
-        self, user: Optional[User] = None, page: int = 1, limit: int = 20
+        self, user: Optional[Principal] = None, page: int = 1, limit: int = 20
     ) -> PaginatedPlaceResponse:
         """Get moderated places with pagination. User resolved from token (uuid)."""
         try:
             offset = (page - 1) * limit
-            total, places = await asyncio.gather(
-                self.repository.count_all_moderated_places(),
-                self.repository.get_all_moderated_places(limit, offset),
-            )
+            places, total = await self.repository.get_all_moderated_places(limit, offset)
             items = await self._build_public_place_responses(places, user.id if user else None)
             return PaginatedPlaceResponse(
                 items=items,
@@ -236,7 +233,7 @@ class PlaceService:
                 details={}
             )
 
-    async def update_place(self, user: User, place_id: int, place_data: PlaceUpdate) -> PlaceResponse:
+    async def update_place(self, user: Principal, place_id: int, place_data: PlaceUpdate) -> PlaceResponse:
         """Update an existing place. User resolved from token (uuid)."""
         try:
             place = await self.repository.get_place_by_id(place_id)
@@ -275,7 +272,7 @@ class PlaceService:
                 details={}
             )
 
-    async def delete_place(self, user: User, place_id: int) -> bool:
+    async def delete_place(self, user: Principal, place_id: int) -> bool:
         """Soft delete a place. User resolved from token (uuid)."""
         try:
             place = await self.repository.get_place_by_id(place_id)
@@ -301,7 +298,7 @@ class PlaceService:
                 details={}
             )
 
-    async def like_place(self, user: User, place_id: int) -> dict:
+    async def like_place(self, user: Principal, place_id: int) -> dict:
         """Like a place (idempotent). User resolved from token (uuid)."""
         try:
             place = await self.repository.get_moderated_place_by_id(place_id)
@@ -345,7 +342,7 @@ class PlaceService:
                 details={}
             )
 
-    async def unlike_place(self, user: User, place_id: int) -> dict:
+    async def unlike_place(self, user: Principal, place_id: int) -> dict:
         """Unlike a place (idempotent). User resolved from token (uuid)."""
         try:
             place = await self.repository.get_moderated_place_by_id(place_id)
@@ -380,15 +377,12 @@ class PlaceService:
             )
 
     async def search_places(
-        self, search_term: str, user: Optional[User] = None, page: int = 1, limit: int = 20
+        self, search_term: str, user: Optional[Principal] = None, page: int = 1, limit: int = 20
     ) -> PaginatedPlaceResponse:
         """Search places by name, city, or country (only moderated places). User resolved from token (uuid)."""
         try:
             offset = (page - 1) * limit
-            total, places = await asyncio.gather(
-                self.repository.count_moderated_places_by_search(search_term),
-                self.repository.search_moderated_places(search_term, limit, offset),
-            )
+            places, total = await self.repository.search_moderated_places(search_term, limit, offset)
             items = await self._build_public_place_responses(places, user.id if user else None)
             return PaginatedPlaceResponse(
                 items=items,
@@ -408,15 +402,12 @@ class PlaceService:
             )
 
     async def get_places_by_type(
-        self, place_type_id: int, user: Optional[User] = None, page: int = 1, limit: int = 20
+        self, place_type_id: int, user: Optional[Principal] = None, page: int = 1, limit: int = 20
     ) -> PaginatedPlaceResponse:
         """Get places by type (only moderated places). User resolved from token (uuid)."""
         try:
             offset = (page - 1) * limit
-            total, places = await asyncio.gather(
-                self.repository.count_moderated_places_by_type(place_type_id),
-                self.repository.get_moderated_places_by_type(place_type_id, limit, offset),
-            )
+            places, total = await self.repository.get_moderated_places_by_type(place_type_id, limit, offset)
             items = await self._build_public_place_responses(places, user.id if user else None)
             return PaginatedPlaceResponse(
                 items=items,
@@ -438,14 +429,13 @@ class PlaceService:
     async def get_places_in_region(
         self,
         min_lat: float, max_lat: float, min_lng: float, max_lng: float,
-        user: Optional[User] = None, page: int = 1, limit: int = 20
+        user: Optional[Principal] = None, page: int = 1, limit: int = 20
     ) -> PaginatedPlaceResponse:
         """Get places within a geographic region (only moderated places). User resolved from token (uuid)."""
         try:
             offset = (page - 1) * limit
-            total, places = await asyncio.gather(
-                self.repository.count_moderated_places_in_region(min_lat, max_lat, min_lng, max_lng),
-                self.repository.get_moderated_places_in_region(min_lat, max_lat, min_lng, max_lng, limit, offset),
+            places, total = await self.repository.get_moderated_places_in_region(
+                min_lat, max_lat, min_lng, max_lng, limit, offset
             )
             items = await self._build_public_place_responses(places, user.id if user else None)
             return PaginatedPlaceResponse(
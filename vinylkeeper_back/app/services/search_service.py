@@ -1,8 +1,11 @@
+import asyncio
 import re
 import string
 from typing import List, Set, Optional, Tuple, Dict, Any
 import httpx
 from app.core.config_env import settings
+from app.core.discogs_client import DiscogsClient
+from app.core.enums import RequestPriorityEnum
 from app.core.exceptions import ValidationError, ServerError, ErrorCode
 from app.core.logging import logger
 from app.schemas.request_proxy.request_proxy_schema import (
@@ -18,11 +21,18 @@ from app.schemas.request_proxy.request_proxy_schema import (
 class ImageFetcher:
     """Helper class to handle image fetching logic for both artists and releases."""
 
-    def __init__(self, token: str, base_url: str, http_client: Optional[httpx.AsyncClient] = None):
+    def __init__(
+        self,
+        token: str,
+        base_url: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discogs_client: Optional[DiscogsClient] = None
+    ):
         self.token = token
         self.base_url = base_url
         self.headers = {"Authorization": f"Discogs token={self.token}"}
         self.http_client = http_client
+        self.discogs_client = discogs_client or DiscogsClient(http_client)
 
     async def fetch_images(
         self, entity_type: str, entity_id: int, hit: Dict[str, Any], client: Optional[httpx.AsyncClient] = None
@@ -76,15 +86,9 @@ class ImageFetcher:
 
     async def _make_request(self, url: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
         """Make HTTP request with proper error handling."""
-        client_to_use = client or self.http_client
-        if not client_to_use:
-            raise ServerError(
-                error_code=ErrorCode.SERVER_ERROR,
-                message="HTTP client not available"
-            )
-        response = await client_to_use.get(url, headers=self.headers)
-        response.raise_for_status()
-        return response.json()
+        # The user is waiting on these thumbnails: queue them ahead of stale-while-revalidate refreshes
+        return await self.discogs_client.get_json(
+            url, client=client, priority=RequestPriorityEnum.INTERACTIVE)
 
 
 class SearchService:
@@ -100,12 +104,20 @@ class SearchService:
         r"\bep\b"
     ]
 
-    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        discogs_client: Optional[DiscogsClient] = None
+    ):
         self.token = settings.DISCOGS_API_KEY
         self.base_url = settings.DISCOGS_API_URL
         self.search_url = f"{self.base_url}/database/search"
-        self.http_client = http_client
-        self.image_fetcher = ImageFetcher(self.token, self.base_url, http_client)
+        self.discogs_client = discogs_client or DiscogsClient(http_client)
+        self.http_client = http_client or self.discogs_client.http_client
+        self.image_fetcher = ImageFetcher(
+            self.token, self.base_url, self.http_client, self.discogs_client)
+        self.image_concurrency = max(1, settings.DISCOGS_IMAGE_CONCURRENCY)
+        self.image_timeout = settings.DISCOGS_IMAGE_TIMEOUT
 
     @staticmethod
     def normalize(text: Optional[str]) -> str:
@@ -134,13 +146,8 @@ class SearchService:
             "per_page": 15,
         }
         try:
-            response = await client_to_use.get(
-                self.search_url,
-                params=params,
-                headers={"Authorization": f"Discogs token={self.token}"},
-            )
-            response.raise_for_status()
-            return response.json().get("results", [])
+            data = await self.discogs_client.get_json(self.search_url, params=params, client=client_to_use)
+            return data.get("results", [])
         except httpx.HTTPError as e:
             logger.error(f"Discogs API error: {str(e)}")
             raise ServerError(
@@ -168,6 +175,30 @@ class SearchService:
             discogs.artist = Artist(id="", name=artist_name, type="artist")
         return discogs
 
+    async def _resolve_images(
+        self, discogs_data: DiscogsData, hit: Dict[str, Any], semaphore: asyncio.Semaphore
+    ) -> DiscogsData:
+        """Attach pictures to a search result, falling back to the search thumb on failure or timeout."""
+        img_uri, img_thumb = None, hit.get("thumb")
+        async with semaphore:
+            try:
+                img_uri, img_thumb = await asyncio.wait_for(
+                    self.image_fetcher.fetch_images(
+                        "artist" if discogs_data.type == "artist" else "release",
+                        int(discogs_data.id),
+                        hit
+                    ),
+                    timeout=self.image_timeout
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to fetch images for {discogs_data.id}: {str(e) or type(e).__name__}")
+
+        discogs_data.picture = img_uri or img_thumb
+        if img_uri:
+            discogs_data.picture_medium = self.resize_to_medium(img_uri)
+        return discogs_data
+
     async def search_music(self, search_query: SearchQuery) -> List[DiscogsData]:
         """
         Search music via Discogs API.
@@ -205,7 +236,7 @@ class SearchService:
             if not response_data:
                 return []
 
-            results = []
+            candidates: List[Tuple[DiscogsData, Dict[str, Any]]] = []
             seen_ids: Set[int] = set()
             seen_keys: Set[Tuple[str, str]] = set()
 
@@ -225,28 +256,20 @@ class SearchService:
 
                     seen_ids.add(item.get("id"))
                     seen_keys.add(key)
-
-                    try:
-                        img_uri, img_thumb = await self.image_fetcher.fetch_images(
-                            "artist" if discogs_data.type == "artist" else "release",
-                            int(discogs_data.id),
-                            item
-                        )
-                        discogs_data.picture = img_uri or img_thumb
-                        if img_uri:
-                            discogs_data.picture_medium = self.resize_to_medium(
-                                img_uri)
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to fetch images for {discogs_data.id}: {str(e)}")
-
-                    results.append(discogs_data)
+                    candidates.append((discogs_data, item))
                 except Exception as e:
                     logger.warning(
                         f"Failed to parse search result: {str(e)}")
                     continue
 
-            return results
+            # Resolve images for all surviving hits in parallel, keeping order
+            semaphore = asyncio.Semaphore(self.image_concurrency)
+            results = await asyncio.gather(*(
+                self._resolve_images(discogs_data, item, semaphore)
+                for discogs_data, item in candidates
+            ))
+
+            return list(results)
 
         except ValidationError:
             raise
@@ -297,9 +320,7 @@ class SearchService:
             )
 
         try:
-            response = await self.http_client.get(url, headers={"Authorization": f"Discogs token={self.token}"})
-            response.raise_for_status()
-            data = response.json()
+            data = await self.discogs_client.get_json(url)
 
             if not data:
                 logger.warning(
@@ -336,12 +357,8 @@ class SearchService:
 
         # Get artist releases
         try:
-            releases_data = await self.http_client.get(
-                f"{self.base_url}/artists/{artist_id}/releases",
-                headers={"Authorization": f"Discogs token={self.token}"},
-            )
-            releases_data.raise_for_status()
-            releases_data = releases_data.json()
+            releases_data = await self.discogs_client.get_json(
+                f"{self.base_url}/artists/{artist_id}/releases")
 
             # Parse releases
             releases = []
@@ -425,9 +442,7 @@ class SearchService:
             )
 
         try:
-            response = await self.http_client.get(url, headers={"Authorization": f"Discogs token={self.token}"})
-            response.raise_for_status()
-            data = response.json()
+            data = await self.discogs_client.get_json(url)
 
             if not data:
                 logger.warning(
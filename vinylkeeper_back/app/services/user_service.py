@@ -24,6 +24,7 @@ from app.services.collection_service import CollectionService
 from app.schemas.collection_schema import CollectionCreate
 from app.core.transaction import transaction_context
 from app.core.config_env import settings
+from app.core.events import USER_CHANGED, publish
 from app.core.logging import logger
 from app.core.enums import RoleEnum
 
@@ -115,6 +116,7 @@ class UserService:
 
         async with transaction_context(self.repository.db):
             updated_user = await self.repository.update_user(user)
+        await publish(USER_CHANGED, user_uuid=str(user.user_uuid))
         return updated_user
 
     async def send_password_reset_email(self, email: str) -> None:
@@ -146,6 +148,7 @@ class UserService:
             success = await self.repository.update_user_password(user.id, hashed_password)
             if not success:
                 raise PasswordUpdateError()
+        await publish(USER_CHANGED, user_uuid=str(user.user_uuid))
 
     async def change_password(self, user: User, current_password: str, new_password: str) -> None:
         """Change user password"""
@@ -157,6 +160,7 @@ class UserService:
             success = await self.repository.update_user_password(user.id, hashed_password)
             if not success:
                 raise PasswordUpdateError()
+        await publish(USER_CHANGED, user_uuid=str(user.user_uuid))
 
     async def send_new_user_registered_email(self, user: User) -> None:
         """Send email to admin about new user registration. Skipped in dev or for admin users."""
@@ -184,6 +188,7 @@ class UserService:
         """Delete a user"""
         async with transaction_context(self.repository.db):
             result = await self.repository.delete_user(user.id)
+        await publish(USER_CHANGED, user_uuid=str(user.user_uuid))
         return result
 
     async def get_user_me(self, user: User) -> dict:
@@ -1,19 +1,16 @@
 from __future__ import annotations
 
-import csv
-import io
 from datetime import UTC, datetime
-from typing import Iterable
+from typing import AsyncIterator, Optional
 
-from fastapi.responses import Response, StreamingResponse
-from odf.opendocument import OpenDocumentSpreadsheet
-from odf.style import Style, TextProperties
-from odf.table import Table, TableCell, TableColumn, TableRow
-from odf.text import P
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
 
+from app.core.config_env import settings
+from app.core.enums import ExportFormatEnum
 from app.core.logging import logger
-from app.models.wishlist_model import Wishlist
 from app.repositories.wishlist_repository import WishlistRepository
+from app.utils.export_writers import ExportStream, ProgressCallback, RowBatch, export_stream, logged_batches
 
 
 class WishlistExportService:
@@ -23,55 +20,33 @@ class WishlistExportService:
         self.wishlist_repository = wishlist_repository
 
     async def export_my_wishlist_csv(self, user_id: int, username: str) -> StreamingResponse:
-        export_kind = "wishlist"
-        export_format = "csv"
-        logger.info(f"Export requested: kind={export_kind} format={export_format} user={username}")
-        try:
-            items = await self.wishlist_repository.get_user_wishlist_all(user_id)
-            filename = self._build_filename(username=username, suffix="wishlist.csv")
-            rows_count = len(items)
-
-            def row_iter() -> Iterable[list[str]]:
-                yield self._headers()
-                for item in items:
-                    yield self._row(item)
-
-            response = self._stream_csv(filename=filename, rows=row_iter())
-            logger.info(
-                f"Export success: kind={export_kind} format={export_format} user={username} rows={rows_count}"
-            )
-            return response
-        except Exception as e:
-            logger.error(
-                f"Export failed: kind={export_kind} format={export_format} user={username} error={str(e)}",
-                exc_info=True
-            )
-            raise
+        return self._stream_response(await self.open_wishlist_export(ExportFormatEnum.CSV, user_id, username))
+
+    async def export_my_wishlist_ods(self, user_id: int, username: str) -> StreamingResponse:
+        return self._stream_response(await self.open_wishlist_export(ExportFormatEnum.ODS, user_id, username))
+
+    async def open_wishlist_export(
+        self,
+        export_format: ExportFormatEnum,
+        user_id: int,
+        username: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> ExportStream:
+        """Return the export, its rows read as the chunks are consumed."""
+        context = f"kind=wishlist format={export_format.value} user={username}"
+        logger.info(f"Export requested: {context}")
+        return export_stream(
+            export_format,
+            filename=self._build_filename(username=username, suffix=f"wishlist.{export_format.value}"),
+            sheet_name="Wishlist",
+            headers=self._headers(),
+            batches=logged_batches(self._rows(user_id), context, progress),
+            total_rows=await self.wishlist_repository.count_user_wishlist_items(user_id),
+        )
 
-    async def export_my_wishlist_ods(self, user_id: int, username: str) -> Response:
-        export_kind = "wishlist"
-        export_format = "ods"
-        logger.info(f"Export requested: kind={export_kind} format={export_format} user={username}")
-        try:
-            items = await self.wishlist_repository.get_user_wishlist_all(user_id)
-            filename = self._build_filename(username=username, suffix="wishlist.ods")
-            headers = self._headers()
-            rows = [self._row(item) for item in items]
-            response = self._file_response(
-                filename=filename,
-                media_type="application/vnd.oasis.opendocument.spreadsheet",
-                content=self._build_ods(sheet_name="Wishlist", headers=headers, rows=rows),
-            )
-            logger.info(
-                f"Export success: kind={export_kind} format={export_format} user={username} rows={len(rows)}"
-            )
-            return response
-        except Exception as e:
-            logger.error(
-                f"Export failed: kind={export_kind} format={export_format} user={username} error={str(e)}",
-                exc_info=True
-            )
-            raise
+    async def _rows(self, user_id: int) -> AsyncIterator[RowBatch]:
+        async for batch in self.wishlist_repository.stream_user_wishlist_rows(user_id, settings.EXPORT_BATCH_SIZE):
+            yield [self._row(row) for row in batch]
 
     def _headers(self) -> list[str]:
         return [
@@ -84,80 +59,22 @@ class WishlistExportService:
             "added_at",
         ]
 
-    def _row(self, item: Wishlist) -> list[str]:
-        entity_type = item.entity_type.name.lower() if item.entity_type else ""
-        external_source = (
-            item.external_source.name if item.external_source else ""
-        )
+    def _row(self, item: Row) -> list[str]:
         return [
             str(item.id),
-            entity_type,
+            item.entity_type.lower() if item.entity_type else "",
             item.external_id or "",
-            external_source,
+            item.external_source or "",
             item.title or "",
             item.image_url or "",
             item.created_at.isoformat() if item.created_at else "",
         ]
 
-    def _stream_csv(self, filename: str, rows: Iterable[list[str]]) -> StreamingResponse:
-        def generate() -> Iterable[bytes]:
-            buffer = io.StringIO()
-            writer = csv.writer(buffer, delimiter=";", quoting=csv.QUOTE_MINIMAL)
-            first_chunk = True
-
-            for row in rows:
-                buffer.seek(0)
-                buffer.truncate(0)
-                writer.writerow(row)
-                chunk = buffer.getvalue()
-
-                if first_chunk:
-                    first_chunk = False
-                    chunk = "\ufeff" + chunk
-
-                yield chunk.encode("utf-8")
-
+    def _stream_response(self, export: ExportStream) -> StreamingResponse:
         return StreamingResponse(
-            generate(),
-            media_type="text/csv; charset=utf-8",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-        )
-
-    def _build_ods(self, sheet_name: str, headers: list[str], rows: list[list[str]]) -> bytes:
-        doc = OpenDocumentSpreadsheet()
-        header_style = Style(name="HeaderStyle", family="paragraph")
-        header_style.addElement(TextProperties(fontweight="bold"))
-        doc.styles.addElement(header_style)
-
-        table = Table(name=sheet_name)
-        for _ in headers:
-            table.addElement(TableColumn())
-
-        header_row = TableRow()
-        for header in headers:
-            cell = TableCell()
-            cell.addElement(P(stylename=header_style, text=header))
-            header_row.addElement(cell)
-        table.addElement(header_row)
-
-        for row_values in rows:
-            row = TableRow()
-            for value in row_values:
-                cell = TableCell()
-                cell.addElement(P(text=value))
-                row.addElement(cell)
-            table.addElement(row)
-
-        doc.spreadsheet.addElement(table)
-        out = io.BytesIO()
-        doc.save(out)
-        return out.getvalue()
-
-    def _file_response(self, filename: str, media_type: str, content: bytes) -> Response:
-        return Response(
-            content=content,
-            media_type=media_type,
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            export.chunks,
+            media_type=export.media_type,
+            headers={"Content-Disposition": f'attachment; filename="{export.filename}"'},
         )
 
     def _build_filename(self, username: str, suffix: str) -> str:
@@ -21,6 +21,7 @@ from app.core.exceptions import (
 from app.core.logging import logger
 from app.core.enums import EntityTypeEnum
 from app.core.transaction import transaction_context
+from app.utils.pagination import total_pages
 
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
@@ -252,14 +253,14 @@ class WishlistService:
 
     async def get_user_wishlist_paginated(
         self, user_id: int, page: int = 1, limit: int = 8,
-        search: Optional[str] = None, sort_order: str = "newest"
+        search: Optional[str] = None, sort_order: str = "newest", cursor: Optional[str] = None
     ) -> PaginatedWishlistResponse:
-        """Get paginated wishlist items for a user with optional search and sort."""
+        """Get paginated wishlist items for a user with optional search and sort, by page number or by cursor."""
         try:
             self._validate_pagination_params(page, limit)
 
-            items, total = await self.wishlist_repo.get_user_wishlist_paginated(
-                user_id, page, limit, search, sort_order
+            items, total, next_cursor = await self.wishlist_repo.get_user_wishlist_paginated(
+                user_id, page, limit, search, sort_order, cursor
             )
 
             list_responses = []
@@ -282,14 +283,13 @@ class WishlistService:
                         f"Error processing wishlist item {item.id}: {str(e)}", exc_info=True)
                     continue
 
-            total_pages = (total + limit - 1) // limit if total > 0 else 0
-
             return PaginatedWishlistResponse(
                 items=list_responses,
                 total=total,
-                page=page,
+                page=None if cursor else page,
                 limit=limit,
-                total_pages=total_pages
+                total_pages=total_pages(total, limit),
+                next_cursor=next_cursor
             )
 
         except ValidationError:
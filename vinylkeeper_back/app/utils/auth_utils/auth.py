@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
@@ -9,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.core.config_env import settings
+from app.core.principal import Principal
 from app.db.session import get_db
 from app.models.user_model import User
 from app.repositories.user_repository import UserRepository
@@ -121,22 +123,56 @@ def verify_reset_token(token: str) -> str:
         raise InvalidResetTokenError()
 
 
+def _access_token_subject(request: Request) -> str:
+    token = request.cookies.get("access_token")
+    if not token:
+        raise UnauthorizedError("No access token provided")
+    return verify_token(token, expected_type=TokenType.ACCESS)
+
+
 async def get_current_user(
     request: Request,
     db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get the current user from the access token"""
     user_repository = UserRepository(db)
-    token = request.cookies.get("access_token")
-    if not token:
-        raise UnauthorizedError("No access token provided")
-    user_uuid = verify_token(token, expected_type=TokenType.ACCESS)
+    user_uuid = _access_token_subject(request)
+    loaded_at = time.time_ns()
     user = await user_repository.get_user_by_uuid(user_uuid)
     if not user:
         raise UnauthorizedError("User not found")
+    cache = getattr(request.app.state, "principal_cache", None)
+    if cache is not None:
+        await cache.set(user_uuid, Principal.from_user(user), loaded_at=loaded_at)
     return user
 
 
+async def get_current_principal(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Get the current user's principal from the access token, from the cache when possible.
+
+    For endpoints that only need the user's id, username or role: on a cache
+    hit the database is not touched (the session is never connected).
+    """
+    user_uuid = _access_token_subject(request)
+    cache = getattr(request.app.state, "principal_cache", None)
+    if cache is not None:
+        principal = await cache.get(user_uuid)
+        if principal is not None:
+            return principal
+    # Taken before the load: a USER_CHANGED published meanwhile keeps this principal out of the cache
+    loaded_at = time.time_ns()
+    user = await UserRepository(db).get_user_by_uuid(user_uuid)
+    if not user:
+        raise UnauthorizedError("User not found")
+    principal = Principal.from_user(user)
+    if cache is not None:
+        await cache.set(user_uuid, principal, loaded_at=loaded_at)
+    return principal
+
+
 def set_token_cookie(
     response: Response,
     token: str,
@@ -0,0 +1,318 @@
+"""
+Incremental writers for the export files.
+
+Rows arrive in batches read from a server-side cursor; each batch is
+encoded and handed to the response as soon as it is read, so an export
+holds one batch in memory whatever the size of the collection.
+
+The ODS writer emits the spreadsheet zip directly, content.xml row by row,
+instead of building an odfpy document: a handful of string concatenations
+per cell rather than four Python element objects, and only the compressor
+window is kept between batches. Encoding and compression run in a thread
+so the event loop keeps serving requests during large exports.
+"""
+import asyncio
+import csv
+import io
+import re
+import struct
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, List, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from app.core.enums import ExportFormatEnum
+from app.core.logging import logger
+
+RowBatch = List[List[str]]
+
+# Called with the number of rows read so far, after each batch
+ProgressCallback = Callable[[int], Awaitable[None]]
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+ODS_MEDIA_TYPE = "application/vnd.oasis.opendocument.spreadsheet"
+
+
+@dataclass(frozen=True)
+class ExportStream:
+    """An export ready to be sent or spooled: its file name, type and bytes."""
+    filename: str
+    media_type: str
+    chunks: AsyncIterator[bytes]
+    # Expected number of data rows when known up front, for progress reporting
+    total_rows: Optional[int] = None
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    chunk = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate(0)
+    return chunk
+
+
+def _csv_batch(writer, buffer: io.StringIO, batch: RowBatch) -> bytes:
+    writer.writerows(batch)
+    return _drain(buffer)
+
+
+async def csv_chunks(headers: List[str], batches: AsyncIterator[RowBatch]) -> AsyncIterator[bytes]:
+    """
+    Encode rows as CSV, one chunk per batch, off the event loop.
+
+    ";"-separated UTF-8 with a byte order mark, so spreadsheet applications
+    detect the encoding. The header row is sent before the first batch is read.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";", quoting=csv.QUOTE_MINIMAL)
+    buffer.write("\ufeff")
+    writer.writerow(headers)
+    yield _drain(buffer)
+    async for batch in batches:
+        yield await asyncio.to_thread(_csv_batch, writer, buffer, batch)
+
+
+_ODS_MANIFEST = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">'
+    f'<manifest:file-entry manifest:full-path="/" manifest:media-type="{ODS_MEDIA_TYPE}"/>'
+    '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+    '</manifest:manifest>'
+)
+
+_ODS_CONTENT_START = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<office:document-content'
+    ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"'
+    ' xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0"'
+    ' xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"'
+    ' xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"'
+    ' xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0"'
+    ' office:version="1.2">'
+    '<office:automatic-styles>'
+    '<style:style style:name="co1" style:family="table-column">'
+    '<style:table-column-properties style:column-width="3cm"/></style:style>'
+    '<style:style style:name="P1" style:family="paragraph">'
+    '<style:text-properties fo:font-weight="bold"/></style:style>'
+    '</office:automatic-styles>'
+    '<office:body><office:spreadsheet>'
+)
+
+_ODS_CONTENT_END = '</table:table></office:spreadsheet></office:body></office:document-content>'
+
+# Characters XML 1.0 cannot carry at all
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _ods_text(value: str) -> str:
+    text = escape(_XML_INVALID.sub("", value))
+    if "\n" in text or "\t" in text:
+        text = text.replace("\n", "<text:line-break/>").replace("\t", "<text:tab/>")
+    return text
+
+
+class _ZipEntry(NamedTuple):
+    name: bytes
+    flags: int
+    method: int
+    crc: int
+    compressed_size: int
+    size: int
+    offset: int
+
+
+class _ZipStream:
+    """
+    Zip archive written front to back, returning its bytes as they are produced.
+
+    Entries added whole get complete local headers; the one streamed entry
+    is compressed as it is written and its sizes follow it in a data
+    descriptor, so nothing already returned has to be rewritten. zipfile
+    would need a seekable output to do the former. No ZIP64: entries and
+    archive are limited to 4 GiB.
+    """
+
+    _LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+    _DATA_DESCRIPTOR = struct.Struct("<IIII")
+    _CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+    _END_RECORD = struct.Struct("<IHHHHIIH")
+    _VERSION = 20
+    _DATA_DESCRIPTOR_FLAG = 0x08
+    _LIMIT = 0xFFFFFFFF
+
+    def __init__(self) -> None:
+        now = time.localtime()
+        self._time = now.tm_hour << 11 | now.tm_min << 5 | now.tm_sec // 2
+        self._date = (now.tm_year - 1980) << 9 | now.tm_mon << 5 | now.tm_mday
+        self._entries: List[_ZipEntry] = []
+        self._offset = 0
+        self._stream: Optional[Tuple[bytes, int]] = None
+        self._compressor = None
+        self._crc = 0
+        self._size = 0
+        self._compressed_size = 0
+
+    def _emit(self, data: bytes) -> bytes:
+        self._offset += len(data)
+        if self._offset > self._LIMIT:
+            raise ValueError("Export too large for a zip archive without ZIP64")
+        return data
+
+    def _local_header(self, name: bytes, flags: int, method: int, crc: int, compressed_size: int, size: int) -> bytes:
+        return self._LOCAL_HEADER.pack(
+            0x04034B50, self._VERSION, flags, method, self._time, self._date,
+            crc, compressed_size, size, len(name), 0
+        ) + name
+
+    @staticmethod
+    def _compressor_for(method: int):
+        # Raw deflate stream, as stored in zip entries
+        return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15) if method else None
+
+    def add(self, name: str, data: bytes, method: int = zipfile.ZIP_DEFLATED) -> bytes:
+        """A whole entry, sizes and CRC in its local header."""
+        encoded = name.encode("ascii")
+        compressor = self._compressor_for(method)
+        payload = compressor.compress(data) + compressor.flush() if compressor else data
+        crc = zlib.crc32(data)
+        self._entries.append(_ZipEntry(encoded, 0, method, crc, len(payload), len(data), self._offset))
+        return self._emit(self._local_header(encoded, 0, method, crc, len(payload), len(data)) + payload)
+
+    def open_stream(self, name: str) -> bytes:
+        """Start the streamed entry, deflated; write() its data, then close_stream()."""
+        encoded = name.encode("ascii")
+        self._stream = (encoded, self._offset)
+        self._compressor = self._compressor_for(zipfile.ZIP_DEFLATED)
+        self._crc = self._size = self._compressed_size = 0
+        return self._emit(self._local_header(encoded, self._DATA_DESCRIPTOR_FLAG, zipfile.ZIP_DEFLATED, 0, 0, 0))
+
+    def write(self, data: bytes) -> bytes:
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        compressed = self._compressor.compress(data)
+        self._compressed_size += len(compressed)
+        return self._emit(compressed)
+
+    def close_stream(self) -> bytes:
+        compressed = self._compressor.flush()
+        self._compressed_size += len(compressed)
+        if self._size > self._LIMIT:
+            raise ValueError("Export too large for a zip archive without ZIP64")
+        name, offset = self._stream
+        self._entries.append(_ZipEntry(
+            name, self._DATA_DESCRIPTOR_FLAG, zipfile.ZIP_DEFLATED, self._crc,
+            self._compressed_size, self._size, offset
+        ))
+        self._stream = self._compressor = None
+        return self._emit(compressed + self._DATA_DESCRIPTOR.pack(
+            0x08074B50, self._crc, self._compressed_size, self._size
+        ))
+
+    def finish(self) -> bytes:
+        """The central directory and end record."""
+        start = self._offset
+        directory = b"".join(
+            self._CENTRAL_HEADER.pack(
+                0x02014B50, self._VERSION, self._VERSION, entry.flags, entry.method, self._time, self._date,
+                entry.crc, entry.compressed_size, entry.size, len(entry.name), 0, 0, 0, 0,
+                0o600 << 16, entry.offset
+            ) + entry.name
+            for entry in self._entries
+        )
+        return self._emit(directory + self._END_RECORD.pack(
+            0x06054B50, 0, 0, len(self._entries), len(self._entries), len(directory), start, 0
+        ))
+
+
+class OdsWriter:
+    """
+    Single-sheet ODS file written incrementally.
+
+    start() returns the zip head and the header row, each write_rows() call the
+    bytes its rows compress to (possibly empty), finish() the end of the file.
+    Calls must not overlap.
+    """
+
+    def __init__(self, sheet_name: str, column_count: int) -> None:
+        self.sheet_name = sheet_name
+        self.column_count = column_count
+        self._zip = _ZipStream()
+
+    def start(self, headers: List[str]) -> bytes:
+        # The mimetype entry comes first, uncompressed and with complete sizes in
+        # its local header, so the type can be sniffed from the first bytes
+        head = self._zip.add("mimetype", ODS_MEDIA_TYPE.encode("ascii"), zipfile.ZIP_STORED)
+        head += self._zip.add("META-INF/manifest.xml", _ODS_MANIFEST.encode("utf-8"))
+        # content.xml is sent while being written
+        head += self._zip.open_stream("content.xml")
+        return head + self._zip.write((
+            _ODS_CONTENT_START
+            + f"<table:table table:name={quoteattr(self.sheet_name)}>"
+            + f'<table:table-column table:style-name="co1" table:number-columns-repeated="{self.column_count}"/>'
+            + "<table:table-row>"
+            + "".join(
+                f'<table:table-cell office:value-type="string"><text:p text:style-name="P1">{_ods_text(header)}'
+                "</text:p></table:table-cell>"
+                for header in headers
+            )
+            + "</table:table-row>"
+        ).encode("utf-8"))
+
+    def write_rows(self, rows: RowBatch) -> bytes:
+        return self._zip.write("".join(
+            "<table:table-row>"
+            + "".join(
+                f'<table:table-cell office:value-type="string"><text:p>{_ods_text(value)}</text:p></table:table-cell>'
+                for value in row
+            )
+            + "</table:table-row>"
+            for row in rows
+        ).encode("utf-8"))
+
+    def finish(self) -> bytes:
+        tail = self._zip.write(_ODS_CONTENT_END.encode("utf-8"))
+        tail += self._zip.close_stream()
+        return tail + self._zip.finish()
+
+
+async def ods_chunks(sheet_name: str, headers: List[str], batches: AsyncIterator[RowBatch]) -> AsyncIterator[bytes]:
+    """Encode rows as an ODS spreadsheet, one chunk per batch, off the event loop."""
+    writer = OdsWriter(sheet_name, len(headers))
+    yield await asyncio.to_thread(writer.start, headers)
+    async for batch in batches:
+        chunk = await asyncio.to_thread(writer.write_rows, batch)
+        if chunk:
+            yield chunk
+    yield await asyncio.to_thread(writer.finish)
+
+
+def export_stream(
+    export_format: ExportFormatEnum,
+    filename: str,
+    sheet_name: str,
+    headers: List[str],
+    batches: AsyncIterator[RowBatch],
+    total_rows: Optional[int] = None,
+) -> ExportStream:
+    """Encode the batches in the requested format; sheet_name only applies to ODS."""
+    if export_format == ExportFormatEnum.ODS:
+        return ExportStream(filename, ODS_MEDIA_TYPE, ods_chunks(sheet_name, headers, batches), total_rows)
+    return ExportStream(filename, CSV_MEDIA_TYPE, csv_chunks(headers, batches), total_rows)
+
+
+async def logged_batches(
+    batches: AsyncIterator[RowBatch], context: str, progress: Optional[ProgressCallback] = None
+) -> AsyncIterator[RowBatch]:
+    """Pass the batches through, reporting progress and logging the outcome once the last one is read."""
+    rows = 0
+    try:
+        async for batch in batches:
+            rows += len(batch)
+            yield batch
+            if progress is not None:
+                await progress(rows)
+    except Exception as e:
+        logger.error(f"Export failed: {context} error={str(e)}", exc_info=True)
+        raise
+    logger.info(f"Export success: {context} rows={rows}")
@@ -0,0 +1,67 @@
+"""
+Pure image transcoding functions.
+
+Kept free of application imports so they can run in the transcoding
+process pool, whose children only need PIL.
+"""
+from io import BytesIO
+from typing import List, NamedTuple
+
+from PIL import Image
+
+# Modes LANCZOS can resize directly; others are converted to RGB first
+RESIZABLE_MODES = ("RGB", "RGBA", "L", "LA", "CMYK")
+DEFAULT_WEBP_METHOD = 6
+DEFAULT_AVIF_SPEED = 6
+
+
+class VariantSpec(NamedTuple):
+    width: int
+    height: int
+    quality: int
+    format: str
+
+
+def render_variants(
+    image_data: bytes,
+    specs: List[VariantSpec],
+    webp_method: int = DEFAULT_WEBP_METHOD,
+    avif_speed: int = DEFAULT_AVIF_SPEED
+) -> List[bytes]:
+    """
+    Decode the source image once and encode every requested variant from it.
+
+    Args:
+        image_data: Encoded source image
+        specs: Variants to produce; format is "avif", "webp" or "jpeg"
+        webp_method: WEBP encoder effort, 0 (fast) to 6 (smallest)
+        avif_speed: AVIF encoder speed, 0 (smallest) to 10 (fast)
+    """
+    source = Image.open(BytesIO(image_data))
+    # JPEG: let libjpeg decode at a reduced scale (down to 1/8) so a
+    # thumbnail never materialises the full-resolution bitmap
+    max_width = max(spec.width for spec in specs)
+    max_height = max(spec.height for spec in specs)
+    source.draft("RGB", (max_width * 2, max_height * 2))
+    if source.mode not in RESIZABLE_MODES:
+        source = source.convert("RGB")
+    source.load()
+
+    outputs = []
+    for spec in specs:
+        image = source.copy()
+        image.thumbnail((spec.width, spec.height), Image.Resampling.LANCZOS)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        output = BytesIO()
+        format = spec.format.lower()
+        if format == "avif":
+            image.save(output, format="AVIF", quality=spec.quality, speed=avif_speed)
+        elif format == "webp":
+            image.save(output, format="WEBP", quality=spec.quality, method=webp_method)
+        else:
+            image.save(output, format="JPEG",
+                       quality=spec.quality, optimize=True)
+        outputs.append(output.getvalue())
+    return outputs
@@ -0,0 +1,167 @@
+"""
+Pagination helpers.
+
+Keyset (cursor) pagination: a cursor is an opaque URL-safe token holding the
+sort it was issued for and the (sort key, id) pair of the last row served.
+The next page is selected with a row comparison on that pair instead of an
+OFFSET, so a deep page costs the same as the first one as long as an index
+matches the ordering.
+
+Numbered pages: fetch_page_with_total returns an OFFSET page and the total
+row count in one round-trip with COUNT(*) OVER ().
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ErrorCode, ValidationError
+
+
+class Cursor(NamedTuple):
+    key: Any
+    id: int
+
+
+class KeysetPage(NamedTuple):
+    """One page of rows. `total` is None when the count was skipped."""
+    items: List[Any]
+    total: Optional[int]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(sort: str, key: Any, row_id: int) -> str:
+    """Build the opaque token pointing after the row (key, row_id)."""
+    payload = {
+        "s": sort,
+        "k": {"dt": key.isoformat()} if isinstance(key, datetime) else key,
+        "i": row_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, sort: str) -> Cursor:
+    """
+    Decode a token produced by encode_cursor.
+
+    Args:
+        token: Cursor received from the client
+        sort: Sort the current request uses; a cursor issued for another sort is rejected
+
+    Raises:
+        ValidationError: If the token is malformed or belongs to another sort
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        cursor_sort, key, row_id = payload["s"], payload["k"], payload["i"]
+        if isinstance(key, dict):
+            key = datetime.fromisoformat(key["dt"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ValidationError(ErrorCode.INVALID_INPUT, "Invalid pagination cursor")
+
+    valid_key = key is None or isinstance(key, datetime) or (isinstance(key, int) and not isinstance(key, bool))
+    if not valid_key or not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise ValidationError(ErrorCode.INVALID_INPUT, "Invalid pagination cursor")
+    if cursor_sort != sort:
+        raise ValidationError(
+            ErrorCode.INVALID_INPUT,
+            "Pagination cursor does not match the requested sort order",
+            {"cursor_sort": cursor_sort, "sort": sort}
+        )
+    return Cursor(key, row_id)
+
+
+def keyset_order(key_column, id_column, descending: bool = True) -> Tuple:
+    """ORDER BY clauses matching keyset_after; the id breaks ties so the order is total."""
+    if descending:
+        return key_column.desc().nullslast(), id_column.desc()
+    return key_column.asc().nullslast(), id_column.asc()
+
+
+def keyset_after(key_column, id_column, cursor: Cursor, descending: bool = True, nullable: bool = False):
+    """
+    Condition selecting the rows that come after `cursor` in keyset_order.
+
+    Args:
+        key_column: Sort key column or aggregate (use in HAVING for aggregates)
+        id_column: Unique tie-breaker
+        cursor: Decoded cursor of the last row served
+        descending: Direction of keyset_order
+        nullable: Whether key_column may be NULL; NULL keys sort last
+    """
+    def after(left, right):
+        return left < right if descending else left > right
+
+    if cursor.key is None:
+        return and_(key_column.is_(None), after(id_column, cursor.id))
+    condition = after(tuple_(key_column, id_column), tuple_(cursor.key, cursor.id))
+    if nullable:
+        condition = or_(condition, key_column.is_(None))
+    return condition
+
+
+def build_page(
+    rows: Sequence[Any],
+    limit: int,
+    sort: str,
+    cursor_of: Callable[[Any], Tuple[Any, int]],
+    total: Optional[int] = None,
+) -> KeysetPage:
+    """
+    Turn `limit + 1` fetched rows into a page and the cursor of the following one.
+
+    Args:
+        rows: Query result fetched with LIMIT limit + 1
+        limit: Page size
+        sort: Sort the cursor is issued for
+        cursor_of: Returns the (sort key, id) pair of a row
+        total: Total row count, if it was computed
+    """
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor(sort, *cursor_of(items[-1]))
+    return KeysetPage(items, total, next_cursor)
+
+
+def total_pages(total: Optional[int], limit: int) -> Optional[int]:
+    return None if total is None else (total + limit - 1) // limit
+
+
+async def fetch_page_with_total(
+    db: AsyncSession, statement: Select, offset: int, limit: int, scalars: bool = True
+) -> Tuple[List[Any], int]:
+    """
+    Run one OFFSET page of `statement` and count all its rows in the same query.
+
+    COUNT(*) OVER () is evaluated on the filtered (and grouped) rows before
+    LIMIT/OFFSET, so every returned row carries the total. A page past the end
+    returns no row and thus no total: only then is a separate COUNT issued (an
+    empty first page simply means zero). Not suitable for SELECT DISTINCT,
+    where the window would count rows before de-duplication.
+
+    Args:
+        db: Session to run on
+        statement: Select with its filters and ordering, without LIMIT/OFFSET
+        offset: Rows to skip
+        limit: Rows to fetch
+        scalars: Return the first column (the entity) of each row; otherwise
+            rows are returned as tuples of the selected columns
+
+    Returns:
+        (items, total)
+    """
+    windowed = statement.add_columns(func.count().over()).offset(offset or None).limit(limit)
+    rows = (await db.execute(windowed)).all()
+    if rows:
+        items = [row[0] for row in rows] if scalars else [tuple(row[:-1]) for row in rows]
+        return items, rows[0][-1]
+    if not offset:
+        return [], 0
+    count = select(func.count()).select_from(statement.order_by(None).subquery())
+    return [], (await db.execute(count)).scalar() or 0
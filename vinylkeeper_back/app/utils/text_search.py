@@ -0,0 +1,60 @@
+"""
+Text search helpers.
+
+Search terms are split into words the same way on both sides: the prefix
+tsquery sent to PostgreSQL (every word, as typed so far, must start a word
+of the title) and the highlight spans computed on the titles returned.
+Highlight offsets are positions in the title as a Python string (Unicode
+code points).
+"""
+import re
+from difflib import SequenceMatcher
+from typing import List, Tuple
+
+# Letters and digits; punctuation and "_" separate words, as in the tsvector parser
+_WORD = re.compile(r"[^\W_]+")
+
+# Minimum difflib ratio for a title word to be highlighted as a misspelt term
+_FUZZY_RATIO = 0.6
+
+
+def search_tokens(term: str) -> List[str]:
+    """Lower-cased words of a search term."""
+    return _WORD.findall(term.lower())
+
+
+def prefix_tsquery(tokens: List[str]) -> str:
+    """to_tsquery text matching titles with a word starting with each token ("dark:* & si:*")."""
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def highlight_spans(title: str, tokens: List[str]) -> List[Tuple[int, int]]:
+    """
+    (start, end) offsets of the parts of title matching the tokens, sorted.
+
+    A token found inside a word is highlighted where it occurs. When no
+    token occurs in the title (a fuzzy, misspelt match) the title words
+    closest to a token are highlighted whole.
+    """
+    if not title or not tokens:
+        return []
+    words = list(_WORD.finditer(title))
+    spans = []
+    for match in words:
+        word = match.group().lower()
+        for token in tokens:
+            position = word.find(token)
+            if position < 0:
+                continue
+            if len(word) != len(match.group()):
+                # Lower-casing changed the length: offsets inside the word would be off
+                spans.append((match.start(), match.end()))
+            else:
+                spans.append((match.start() + position, match.start() + position + len(token)))
+            break
+    if not spans:
+        for match in words:
+            word = match.group().lower()
+            if any(SequenceMatcher(None, token, word).ratio() >= _FUZZY_RATIO for token in tokens):
+                spans.append((match.start(), match.end()))
+    return spans
@@ -0,0 +1,57 @@
+"""
+Timing helpers shared by the benchmarks.
+
+Latencies are reported as median and p95 over the timed iterations, after
+one untimed warm-up call (connections, statement caches, buffers).
+"""
+import statistics
+import time
+import tracemalloc
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+UNITS = {"ms": 1_000, "us": 1_000_000}
+
+
+async def timings(
+    run: Callable[[], Awaitable[object]],
+    iterations: int,
+    after: Optional[Callable[[], Awaitable[object]]] = None,
+    unit: str = "ms",
+) -> List[float]:
+    """Durations of `iterations` calls of run; after() runs between calls, untimed."""
+    durations: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await run()
+        durations.append((time.perf_counter() - started) * UNITS[unit])
+        if after is not None:
+            await after()
+    return durations
+
+
+def summary(durations: List[float]) -> Tuple[float, float]:
+    """Median and p95 of the durations."""
+    ordered = sorted(durations)
+    return statistics.median(ordered), ordered[max(0, int(len(ordered) * 0.95) - 1)]
+
+
+async def measure(
+    label: str, iterations: int, run: Callable[[], Awaitable[object]], unit: str = "ms", width: int = 32
+) -> None:
+    """Warm up, time `iterations` calls of run and print the median and p95."""
+    await run()
+    median, p95 = summary(await timings(run, iterations, unit=unit))
+    print(f"{label:<{width}} median {median:8.2f} {unit}   p95 {p95:8.2f} {unit}")
+
+
+def measure_peak(build: Callable[..., T], *args: object) -> Tuple[float, float, T]:
+    """Wall time in seconds and peak Python memory in MiB (tracemalloc) of one build call, and its result."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, result
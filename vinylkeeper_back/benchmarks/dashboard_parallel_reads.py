@@ -0,0 +1,53 @@
+"""
+Dashboard reads: one session in sequence vs ParallelReader.
+
+Runs against the database configured for APP_ENV (read-only queries only):
+
+    APP_ENV=development python -m benchmarks.dashboard_parallel_reads --iterations 200
+
+Reports median and p95 latency of the global statistics build (five
+independent queries, then the recent albums) and of the per-request reads
+(user counters and snapshot), each in sequence and in parallel.
+"""
+import argparse
+import asyncio
+from typing import Awaitable, Callable
+
+from sqlalchemy import select
+
+from app.db.parallel import ParallelReader
+from app.db.session import AsyncSessionLocal, engine
+from app.models.user_model import User
+from app.repositories.dashboard_repository import DashboardRepository
+from app.services.dashboard_service import DashboardService
+from benchmarks._common import measure
+
+
+async def main(iterations: int, sessions: int) -> None:
+    reader = ParallelReader(AsyncSessionLocal, sessions)
+    async with AsyncSessionLocal() as db:
+        user_id = (await db.execute(select(User.id).limit(1))).scalar()
+        sequential = DashboardService(DashboardRepository(db))
+        parallel = DashboardService(DashboardRepository(db), parallel_reader=reader)
+
+        def request_reads(service: DashboardService) -> Callable[[], Awaitable[object]]:
+            return lambda: service._read(
+                lambda repository: repository.get_user_stats_batch(user_id),
+                DashboardRepository.get_snapshot,
+            )
+
+        print(f"{iterations} iterations, {sessions} parallel sessions, user {user_id}")
+        await measure("global stats, sequential", iterations, sequential.build_global_stats)
+        await measure("global stats, parallel", iterations, parallel.build_global_stats)
+        await measure("request reads, sequential", iterations, request_reads(sequential))
+        await measure("request reads, parallel", iterations, request_reads(parallel))
+    print(reader.stats())
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.sessions))
@@ -0,0 +1,102 @@
+"""
+ODS export: odfpy document vs streaming writer.
+
+No database needed, rows are synthetic collection album rows:
+
+    python -m benchmarks.ods_export --rows 10000 100000
+
+For each size, reports wall time, peak Python memory (tracemalloc) and file
+size of the former export path (every row in a list, then an odfpy
+document saved to memory) and of ods_chunks (batches of EXPORT_BATCH_SIZE
+rows, encoded and compressed as they arrive). tracemalloc slows both
+paths down; compare the numbers with each other, not with production.
+"""
+import argparse
+import asyncio
+import io
+from typing import AsyncIterator, List
+
+from odf.opendocument import OpenDocumentSpreadsheet
+from odf.style import Style, TableColumnProperties, TextProperties
+from odf.table import Table, TableCell, TableColumn, TableRow
+from odf.text import P
+
+from app.utils.export_writers import RowBatch, ods_chunks
+from benchmarks._common import measure_peak
+
+HEADERS = [
+    "collection_id", "collection_name", "album_id", "external_album_id", "external_source",
+    "artist_name", "album_title", "full_title", "state_record", "state_cover",
+    "acquisition_month_year", "added_at", "updated_at", "image_url",
+]
+BATCH_SIZE = 1000
+
+
+def make_row(i: int) -> List[str]:
+    return [
+        "1", "My crates", str(i), str(1_000_000 + i), "discogs",
+        f"Artist {i % 997}", f"Album {i}", f"Artist {i % 997} - Album {i}", "near_mint", "very_good",
+        "03/2024", "2024-03-01T12:00:00+00:00", "2024-03-02T12:00:00+00:00",
+        f"https://i.discogs.com/{i}.jpg",
+    ]
+
+
+def build_with_odfpy(rows: int) -> int:
+    """The export as it was: materialised rows, odfpy DOM, zip saved to memory."""
+    values = [make_row(i) for i in range(rows)]
+    doc = OpenDocumentSpreadsheet()
+    header_style = Style(name="HeaderStyle", family="paragraph")
+    header_style.addElement(TextProperties(fontweight="bold"))
+    doc.styles.addElement(header_style)
+    table = Table(name="Albums")
+    for _ in HEADERS:
+        col_style = Style(name="ColStyle", family="table-column")
+        col_style.addElement(TableColumnProperties(columnwidth="3cm"))
+        doc.automaticstyles.addElement(col_style)
+        table.addElement(TableColumn(stylename=col_style))
+    header_row = TableRow()
+    for header in HEADERS:
+        cell = TableCell()
+        cell.addElement(P(stylename=header_style, text=header))
+        header_row.addElement(cell)
+    table.addElement(header_row)
+    for row_values in values:
+        row = TableRow()
+        for value in row_values:
+            cell = TableCell()
+            cell.addElement(P(text=value))
+            row.addElement(cell)
+        table.addElement(row)
+    doc.spreadsheet.addElement(table)
+    out = io.BytesIO()
+    doc.save(out)
+    return len(out.getvalue())
+
+
+def build_streaming(rows: int) -> int:
+    async def batches() -> AsyncIterator[RowBatch]:
+        for start in range(0, rows, BATCH_SIZE):
+            yield [make_row(i) for i in range(start, min(rows, start + BATCH_SIZE))]
+
+    async def consume() -> int:
+        return sum([len(chunk) async for chunk in ods_chunks("Albums", HEADERS, batches())])
+
+    return asyncio.run(consume())
+
+
+def main(sizes: List[int], skip_odfpy: bool) -> None:
+    paths = [("streaming", build_streaming)]
+    if not skip_odfpy:
+        paths.insert(0, ("odfpy", build_with_odfpy))
+    for rows in sizes:
+        for label, build in paths:
+            elapsed, peak, size = measure_peak(build, rows)
+            print(f"{rows:>7} rows  {label:<10} {elapsed:8.2f} s   peak {peak:9.1f} MiB   file {size / 1024:9.0f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--skip-odfpy", action="store_true", help="only run the streaming writer")
+    args = parser.parse_args()
+    main(args.rows, args.skip_odfpy)
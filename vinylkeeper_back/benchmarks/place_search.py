@@ -0,0 +1,172 @@
+"""
+Place search: ILIKE on name, city and country vs the trigram search.
+
+Needs a PostgreSQL database with pg_trgm available (the one configured for
+APP_ENV). Places are generated in a scratch schema, dropped at the end:
+
+    APP_ENV=development python -m benchmarks.place_search --rows 100000
+
+Runs a set of search terms (whole words, prefixes, cities, misspelt words)
+twice: first with the former query, three ILIKE '%term%' OR'ed together
+with only the btree indexes in place, then with
+PlaceRepository.search_moderated_places once the GIN trigram index exists.
+Reports median and p95 latency per kind of term and the number of places
+each query finds.
+"""
+import argparse
+import asyncio
+import random
+from typing import Dict, List, Tuple
+
+from sqlalchemy import and_, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.db.session import async_database_url
+from app.models import Place, PlaceType, Role, User
+from app.models.base import Base
+from app.repositories.place_repository import PlaceRepository
+from app.utils.pagination import fetch_page_with_total
+from benchmarks._common import summary, timings
+
+SCHEMA = "bench_place_search"
+PAGE_SIZE = 20
+INSERT_BATCH = 5000
+
+ADJECTIVES = [
+    "Blue", "Golden", "Electric", "Velvet", "Silver", "Midnight", "Crystal", "Urban", "Lucky", "Vintage",
+    "Groovy", "Little", "Northern", "Magic", "Wild", "Hidden", "Rolling", "Sonic", "Royal", "Analog",
+]
+NOUNS = [
+    "Groove", "Needle", "Spin", "Sound", "Wax", "Echo", "Rhythm", "Vinyl", "Beat", "Tone",
+    "Crate", "Turntable", "Melody", "Record", "Disc", "Harmony", "Jukebox", "Stylus", "Bass", "Soul",
+]
+KINDS = ["Records", "Shop", "Market", "Corner", "Store", "Club", "House", "Exchange", "Fair", "Lounge"]
+COUNTRIES = [
+    "France", "Belgium", "Germany", "Spain", "Italy", "Portugal", "Netherlands", "Switzerland", "Austria",
+    "Denmark", "Sweden", "Norway", "Ireland", "Poland", "Czechia", "Greece", "Japan", "Canada", "Brazil",
+    "United Kingdom", "United States",
+]
+SYLLABLES = ["mar", "lon", "ber", "sai", "nt", "ville", "bourg", "ton", "ro", "ma", "li", "on", "es", "ca", "dor"]
+
+
+def make_city(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def make_places(rows: int, rng: random.Random) -> Tuple[List[dict], List[str]]:
+    cities = sorted({make_city(rng) for _ in range(2000)})
+    places = [
+        {
+            "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.choice(KINDS)}",
+            "address": f"{rng.randint(1, 200)} main street",
+            "city": rng.choice(cities),
+            "country": rng.choice(COUNTRIES),
+            "place_type_id": 1,
+            "is_valid": True,
+            "is_moderated": rng.random() < 0.9,
+        }
+        for _ in range(rows)
+    ]
+    return places, cities
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Swap two adjacent letters inside the word."""
+    i = rng.randint(1, len(word) - 3)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def search_terms(cities: List[str], rng: random.Random) -> Dict[str, List[str]]:
+    words = [word.lower() for word in NOUNS + KINDS if len(word) >= 5]
+    return {
+        "word": rng.sample(words, 5),
+        "prefix": [word[:3] for word in rng.sample(words, 5)],
+        "city": rng.sample(cities, 5),
+        "typo": [misspell(word, rng) for word in rng.sample(words, 5)],
+    }
+
+
+async def ilike_search(db: AsyncSession, term: str) -> Tuple[List[Place], int]:
+    """The place search as it was before the trigram index."""
+    query = select(Place).options(
+        selectinload(Place.place_type),
+        selectinload(Place.submitted_by)
+    ).filter(
+        and_(
+            Place.is_valid.is_(True),
+            Place.is_moderated.is_(True),
+            or_(
+                Place.name.ilike(f"%{term}%"),
+                Place.city.ilike(f"%{term}%"),
+                Place.country.ilike(f"%{term}%")
+            )
+        )
+    ).order_by(Place.name)
+    return await fetch_page_with_total(db, query, 0, PAGE_SIZE)
+
+
+async def measure_terms(label: str, sessions: async_sessionmaker, terms: Dict[str, List[str]], iterations: int,
+                        search) -> None:
+    for kind, kind_terms in terms.items():
+        durations: List[float] = []
+        found = []
+        for term in kind_terms:
+            async with sessions() as db:
+                _, total = await search(db, term)  # warm-up: statement cache, buffers
+                found.append(total)
+                durations += await timings(lambda: search(db, term), iterations, after=db.rollback)
+        median, p95 = summary(durations)
+        print(f"{label:<9} {kind:<7} median {median:8.2f} ms   p95 {p95:8.2f} ms   found {found}")
+
+
+async def main(rows: int, iterations: int, seed: int) -> None:
+    rng = random.Random(seed)
+    admin = create_async_engine(async_database_url)
+    async with admin.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    bench = create_async_engine(
+        async_database_url, connect_args={"server_settings": {"search_path": f"{SCHEMA}, public"}}
+    )
+    sessions = async_sessionmaker(bench, class_=AsyncSession, expire_on_commit=False)
+    try:
+        places, cities = make_places(rows, rng)
+        async with bench.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(
+                sync_conn, tables=[Role.__table__, User.__table__, PlaceType.__table__, Place.__table__]
+            ))
+            await conn.execute(insert(PlaceType.__table__).values(id=1, name="shop"))
+            for start in range(0, rows, INSERT_BATCH):
+                await conn.execute(insert(Place.__table__), places[start:start + INSERT_BATCH])
+        async with bench.connect() as conn:
+            await conn.execute(text("ANALYZE places"))
+            await conn.commit()
+
+        terms = search_terms(cities, rng)
+        print(f"{rows} places, {iterations} iterations per term, {PAGE_SIZE} per page")
+        await measure_terms("ilike", sessions, terms, iterations, ilike_search)
+
+        async with bench.begin() as conn:
+            await conn.execute(text(
+                "CREATE INDEX ix_places_search_text_trgm ON places USING GIN (search_text gin_trgm_ops) "
+                "WHERE is_valid IS true AND is_moderated IS true"
+            ))
+            await conn.execute(text("ANALYZE places"))
+        await measure_terms("trigram", sessions, terms, iterations,
+                            lambda db, term: PlaceRepository(db).search_moderated_places(term, PAGE_SIZE))
+    finally:
+        await bench.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await admin.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.iterations, args.seed))
@@ -0,0 +1,106 @@
+"""
+Per-query overhead of the current-user lookup, before and after statement caching.
+
+Runs against the database configured for APP_ENV (read-only queries only):
+
+    APP_ENV=development python -m benchmarks.user_lookup_statements --iterations 2000
+
+Compares the lookup as get_current_user used to issue it (a fresh select,
+role loaded by a second selectin query, no compiled or prepared statement
+cache) with UserRepository.get_user_by_uuid on the application engine
+(lambda statement, joined role, compiled and prepared statement caches).
+With --offline the same lookups run on an in-memory SQLite database, which
+isolates the Python-side construction and compilation cost.
+"""
+import argparse
+import asyncio
+import uuid
+from typing import Awaitable, Callable
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.models import Role, User
+from app.models.base import Base
+from app.repositories.user_repository import UserRepository
+from benchmarks._common import measure
+
+
+def uncached_lookup(db, user_uuid) -> Callable[[], Awaitable[object]]:
+    async def run():
+        result = await db.execute(select(User).filter(User.user_uuid == user_uuid))
+        user = result.scalar_one()
+        return user.role  # already loaded by the selectin strategy
+    return run
+
+
+def repository_lookup(db, user_uuid) -> Callable[[], Awaitable[object]]:
+    repository = UserRepository(db)
+
+    async def run():
+        return (await repository.get_user_by_uuid(user_uuid)).role
+    return run
+
+
+class SyncSessionAdapter:
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+async def offline(iterations: int) -> None:
+    engines = {
+        "before": create_engine("sqlite://", query_cache_size=0),
+        "after": create_engine("sqlite://"),
+    }
+    user_uuid = uuid.uuid4()
+    for sqlite_engine in engines.values():
+        Base.metadata.create_all(sqlite_engine)
+        with Session(sqlite_engine) as session:
+            session.add(Role(id=1, name="user"))
+            session.add(User(id=1, username="bench", email="bench@test.com", password="x",
+                             role_id=1, user_uuid=user_uuid, is_accepted_terms=True))
+            session.commit()
+
+    print(f"{iterations} iterations, in-memory SQLite")
+    with Session(engines["before"]) as session:
+        await measure("before: select + selectin, no cache", iterations,
+                      uncached_lookup(SyncSessionAdapter(session), user_uuid), unit="us", width=40)
+    with Session(engines["after"]) as session:
+        await measure("after: lambda_stmt + joined role", iterations,
+                      repository_lookup(SyncSessionAdapter(session), user_uuid), unit="us", width=40)
+    for sqlite_engine in engines.values():
+        sqlite_engine.dispose()
+
+
+async def online(iterations: int) -> None:
+    from app.db.session import AsyncSessionLocal, async_database_url, engine
+
+    uncached_engine = create_async_engine(
+        async_database_url.update_query_dict({"prepared_statement_cache_size": "0"}),
+        query_cache_size=0,
+    )
+    uncached_sessions = async_sessionmaker(uncached_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as db:
+        user_uuid = (await db.execute(select(User.user_uuid).limit(1))).scalar()
+    print(f"{iterations} iterations, user {user_uuid}")
+    async with uncached_sessions() as db:
+        await measure("before: select + selectin, no cache", iterations, uncached_lookup(db, user_uuid),
+                      unit="us", width=40)
+    async with AsyncSessionLocal() as db:
+        await measure("after: lambda_stmt + joined role", iterations, repository_lookup(db, user_uuid),
+                      unit="us", width=40)
+    await uncached_engine.dispose()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--offline", action="store_true", help="use an in-memory SQLite database")
+    args = parser.parse_args()
+    asyncio.run(offline(args.iterations) if args.offline else online(args.iterations))
@@ -65,10 +65,17 @@ if not _PRIVATE_KEY_PATH.exists() or not _PUBLIC_KEY_PATH.exists():
     )
 
 # Imports app (après les env vars et les clés)
+import uuid
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.orm import Session
 
 from app.core.security import hash_password
+from app.models import EntityType, ExternalSource, Mood, Role, User, VinylState
+from app.models.base import Base
 from app.utils.auth_utils.auth import create_token, TokenType
 
 
@@ -122,6 +129,115 @@ def make_user_repo(user: MagicMock = None) -> AsyncMock:
     return repo
 
 
+# ---------------------------------------------------------------------------
+# Base SQLite partagée : schéma complet et tables de référence, chaque
+# fichier de test ajoute ses propres lignes
+# ---------------------------------------------------------------------------
+
+class SyncResultAdapter:
+    def __init__(self, result):
+        self.result = result
+
+    async def partitions(self, size=None):
+        for partition in self.result.partitions(size):
+            yield partition
+
+
+class SyncSessionAdapter:
+    """Runs the repositories' statements on a synchronous SQLite session."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+    async def stream(self, statement, execution_options=None):
+        return SyncResultAdapter(self.session.execute(statement, execution_options=execution_options or {}))
+
+    def add(self, entity):
+        self.session.add(entity)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def refresh(self, entity):
+        self.session.refresh(entity)
+
+    async def commit(self):
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.session.close()
+
+
+class RecordingSession:
+    """Keeps the statements compiled for asyncpg; every statement returns the rows, scalars and rowcount given."""
+
+    def __init__(self, rows=(), scalars=(), rowcount=0):
+        self.rows = list(rows)
+        self.scalars = list(scalars)
+        self.rowcount = rowcount
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(
+            dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}
+        )))
+        result = MagicMock()
+        result.all.return_value = self.rows
+        result.scalars.return_value.all.return_value = self.scalars
+        result.rowcount = self.rowcount
+        return result
+
+
+def add_user(session: Session, user_id: int, username: str, role_id: int = 1) -> None:
+    session.add(User(
+        id=user_id, username=username, email=f"{username}@test.com", password="x",
+        role_id=role_id, user_uuid=uuid.uuid4(), is_accepted_terms=True,
+    ))
+
+
+@pytest.fixture
+def sqlite_url():
+    return "sqlite://"
+
+
+@pytest.fixture
+def sqlite_engine(sqlite_url):
+    """Schéma complet, tables de référence, alice (id 1) et bob (id 2) avec le rôle user."""
+    engine = create_engine(sqlite_url)
+
+    @event.listens_for(engine, "connect")
+    def set_wal(dbapi_connection, _):
+        # sans effet en mémoire ; sur fichier, un curseur ouvert ne bloque pas les écritures
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            ExternalSource(id=1, name="discogs"),
+            EntityType(id=1, name="ALBUM"),
+            Role(id=1, name="user"),
+            Role(id=2, name="admin"),
+            Mood(id=1, name="chill"),
+            VinylState(id=1, name="mint"),
+            VinylState(id=2, name="good"),
+        ])
+        session.flush()
+        add_user(session, 1, "alice")
+        add_user(session, 2, "bob")
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
 # ---------------------------------------------------------------------------
 # Fixtures pytest partagées
 # ---------------------------------------------------------------------------
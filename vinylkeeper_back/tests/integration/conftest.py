@@ -5,7 +5,7 @@ from email_validator import EmailNotValidError
 
 from app.main import app
 from app.deps.deps import get_user_service
-from app.utils.auth_utils.auth import get_current_user, create_token, TokenType
+from app.utils.auth_utils.auth import get_current_principal, get_current_user, create_token, TokenType
 from tests.conftest import make_user
 
 
@@ -90,6 +90,7 @@ async def auth_client(mock_user):
 
     app.dependency_overrides[get_user_service] = lambda: mock_service
     app.dependency_overrides[get_current_user] = override_current_user
+    app.dependency_overrides[get_current_principal] = override_current_user
 
     with patch("app.core.lifespan.check_reference_data_exists", new_callable=AsyncMock, return_value=True):
         async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 from app.main import app
 from app.deps.deps import get_collection_service
-from app.utils.auth_utils.auth import get_current_user
+from app.utils.auth_utils.auth import get_current_principal, get_current_user
 from app.schemas.collection_schema import CollectionSearchResponse
 from app.core.exceptions import (
     DuplicateCollectionNameError,
@@ -46,6 +46,7 @@ async def coll_client(mock_user, mock_collection_service):
         return mock_user
 
     app.dependency_overrides[get_current_user] = override_current_user
+    app.dependency_overrides[get_current_principal] = override_current_user
     app.dependency_overrides[get_collection_service] = lambda: mock_collection_service
 
     from unittest.mock import patch
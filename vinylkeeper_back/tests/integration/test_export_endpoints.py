@@ -0,0 +1,123 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.responses import FileResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.deps.deps import get_export_job_service
+from app.utils.auth_utils.auth import get_current_principal, get_current_user, create_token, TokenType
+from app.core.exceptions import ForbiddenError
+from app.schemas.export_job_schema import ExportJobResponse
+
+
+# ---------------------------------------------------------------------------
+# Shared fixtures
+# ---------------------------------------------------------------------------
+
+def _make_job_response(**overrides) -> ExportJobResponse:
+    fields = dict(
+        id=uuid.uuid4(), kind="collection_albums", format="ods", collection_id=3, status="pending",
+        rows_written=0, total_rows=None, progress=None, filename=None, file_size=None, error=None,
+        created_at=datetime.now(timezone.utc), finished_at=None, expires_at=None,
+    )
+    fields.update(overrides)
+    return ExportJobResponse(**fields)
+
+
+@pytest.fixture
+async def export_client(mock_user):
+    service = MagicMock()
+
+    async def override_current_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = override_current_user
+    app.dependency_overrides[get_current_principal] = override_current_user
+    app.dependency_overrides[get_export_job_service] = lambda: service
+
+    with patch("app.core.lifespan.check_reference_data_exists", new_callable=AsyncMock, return_value=True):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            c.cookies.set("access_token", create_token(str(mock_user.user_uuid), TokenType.ACCESS))
+            yield c, service, mock_user
+
+    app.dependency_overrides.clear()
+
+
+# ---------------------------------------------------------------------------
+# POST /api/exports
+# ---------------------------------------------------------------------------
+
+class TestCreateExportJob:
+    async def test_job_is_accepted(self, export_client):
+        client, service, user = export_client
+        job = _make_job_response()
+        service.create_job = AsyncMock(return_value=job)
+
+        resp = await client.post("/api/exports", json={
+            "kind": "collection_albums", "format": "ods", "collection_id": 3,
+        })
+
+        assert resp.status_code == 202
+        assert resp.json()["id"] == str(job.id)
+        assert resp.json()["status"] == "pending"
+        data, user_id = service.create_job.call_args.args
+        assert (data.kind.value, data.format.value, data.collection_id, user_id) == (
+            "collection_albums", "ods", 3, user.id
+        )
+
+    async def test_unknown_kind_returns_422(self, export_client):
+        client, _, _ = export_client
+
+        resp = await client.post("/api/exports", json={"kind": "places", "format": "csv"})
+
+        assert resp.status_code == 422
+
+    async def test_collection_of_another_user_returns_403(self, export_client):
+        client, service, _ = export_client
+        service.create_job = AsyncMock(side_effect=ForbiddenError(
+            error_code=4003, message="You can only export your own collections"
+        ))
+
+        resp = await client.post("/api/exports", json={
+            "kind": "collection_artists", "format": "csv", "collection_id": 3,
+        })
+
+        assert resp.status_code == 403
+
+
+# ---------------------------------------------------------------------------
+# GET /api/exports/{job_id} and /download
+# ---------------------------------------------------------------------------
+
+class TestExportJobDownload:
+    async def test_status_reports_progress(self, export_client):
+        client, service, _ = export_client
+        job = _make_job_response(status="running", rows_written=500, total_rows=2000, progress=0.25)
+        service.get_job = AsyncMock(return_value=job)
+
+        resp = await client.get(f"/api/exports/{job.id}")
+
+        assert resp.status_code == 200
+        assert resp.json()["progress"] == 0.25
+
+    async def test_download_resumes_from_a_byte_offset(self, export_client, tmp_path):
+        client, service, _ = export_client
+        path = tmp_path / "export.csv"
+        path.write_bytes(b"header\nrow 1\nrow 2\n")
+        service.download = AsyncMock(return_value=FileResponse(path, filename="crates_albums.csv"))
+
+        resp = await client.get(f"/api/exports/{uuid.uuid4()}/download", headers={"Range": "bytes=7-"})
+
+        assert resp.status_code == 206
+        assert resp.content == b"row 1\nrow 2\n"
+        assert resp.headers["accept-ranges"] == "bytes"
+
+    async def test_invalid_job_id_returns_422(self, export_client):
+        client, _, _ = export_client
+
+        resp = await client.get("/api/exports/not-a-uuid/download")
+
+        assert resp.status_code == 422
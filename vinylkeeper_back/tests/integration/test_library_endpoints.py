@@ -0,0 +1,61 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.deps.deps import get_library_search_service
+from app.utils.auth_utils.auth import get_current_principal, get_current_user, create_token, TokenType
+from app.schemas.library_search_schema import LibrarySearchHit, LibrarySearchResponse
+
+
+# ---------------------------------------------------------------------------
+# Shared fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+async def library_client(mock_user):
+    service = MagicMock()
+
+    async def override_current_user():
+        return mock_user
+
+    app.dependency_overrides[get_current_user] = override_current_user
+    app.dependency_overrides[get_current_principal] = override_current_user
+    app.dependency_overrides[get_library_search_service] = lambda: service
+
+    with patch("app.core.lifespan.check_reference_data_exists", new_callable=AsyncMock, return_value=True):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            c.cookies.set("access_token", create_token(str(mock_user.user_uuid), TokenType.ACCESS))
+            yield c, service, mock_user
+
+    app.dependency_overrides.clear()
+
+
+# ---------------------------------------------------------------------------
+# GET /api/library/search
+# ---------------------------------------------------------------------------
+
+class TestSearchLibrary:
+    async def test_returns_ranked_hits(self, library_client):
+        client, service, user = library_client
+        service.search = AsyncMock(return_value=LibrarySearchResponse(query="moon", hits=[
+            LibrarySearchHit(type="album", source="collection", id=7, external_id="123",
+                             title="The Dark Side of the Moon", collection_ids=[2], score=1.4,
+                             highlights=[{"start": 21, "end": 25}]),
+        ]))
+
+        resp = await client.get("/api/library/search", params={"q": "moon", "limit": 10})
+
+        assert resp.status_code == 200
+        service.search.assert_awaited_once_with("moon", user.id, 10)
+        hit = resp.json()["hits"][0]
+        assert (hit["type"], hit["source"], hit["highlights"]) == ("album", "collection", [{"start": 21, "end": 25}])
+
+    async def test_empty_term_and_large_limit_are_rejected(self, library_client):
+        client, service, _ = library_client
+        service.search = AsyncMock()
+
+        assert (await client.get("/api/library/search", params={"q": ""})).status_code == 422
+        assert (await client.get("/api/library/search", params={"q": "moon", "limit": 500})).status_code == 422
+        service.search.assert_not_called()
@@ -6,7 +6,7 @@ from httpx import AsyncClient, ASGITransport
 
 from app.main import app
 from app.deps.deps import get_place_service
-from app.utils.auth_utils.auth import get_current_user, create_token, TokenType
+from app.utils.auth_utils.auth import get_current_principal, get_current_user, create_token, TokenType
 from app.core.exceptions import (
     ForbiddenError,
     ResourceNotFoundError,
@@ -112,6 +112,7 @@ async def place_client(mock_user, mock_place_service):
         return mock_user
 
     app.dependency_overrides[get_current_user] = override_current_user
+    app.dependency_overrides[get_current_principal] = override_current_user
     app.dependency_overrides[get_place_service] = lambda: mock_place_service
 
     with patch("app.core.lifespan.check_reference_data_exists", new_callable=AsyncMock, return_value=True):
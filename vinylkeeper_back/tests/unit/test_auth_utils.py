@@ -10,6 +10,7 @@ from app.utils.auth_utils.auth import (
     TokenType,
     create_reset_token,
     create_token,
+    get_current_principal,
     get_current_user,
     set_token_cookie,
     verify_access_token,
@@ -18,6 +19,7 @@ from app.utils.auth_utils.auth import (
     verify_token,
 )
 from app.core.exceptions import RefreshTokenNotFoundError, InvalidResetTokenError, UnauthorizedError
+from app.core.principal import Principal, create_principal_cache
 
 
 # ---------------------------------------------------------------------------
@@ -27,6 +29,7 @@ from app.core.exceptions import RefreshTokenNotFoundError, InvalidResetTokenErro
 def make_request(cookies: dict) -> MagicMock:
     request = MagicMock()
     request.cookies.get = lambda key, default=None: cookies.get(key, default)
+    request.app.state.principal_cache = None
     return request
 
 
@@ -227,3 +230,90 @@ class TestGetCurrentUser:
         request = make_request({"access_token": token})
         with pytest.raises(UnauthorizedError, match="Invalid token type"):
             await get_current_user(request, db=AsyncMock())
+
+
+# ---------------------------------------------------------------------------
+# get_current_principal
+# ---------------------------------------------------------------------------
+
+
+class TestGetCurrentPrincipal:
+    async def test_cache_miss_loads_user_once(self, regular_user):
+        request = make_request({"access_token": create_token(str(regular_user.user_uuid), TokenType.ACCESS)})
+        request.app.state.principal_cache = create_principal_cache()
+        mock_repo = AsyncMock()
+        mock_repo.get_user_by_uuid = AsyncMock(return_value=regular_user)
+
+        with patch("app.utils.auth_utils.auth.UserRepository", return_value=mock_repo):
+            first = await get_current_principal(request, db=AsyncMock())
+            second = await get_current_principal(request, db=AsyncMock())
+
+        assert first == second
+        assert first.id == regular_user.id
+        assert first.role == "user"
+        mock_repo.get_user_by_uuid.assert_awaited_once()
+
+    async def test_get_current_user_seeds_cache(self, admin_user):
+        request = make_request({"access_token": create_token(str(admin_user.user_uuid), TokenType.ACCESS)})
+        request.app.state.principal_cache = create_principal_cache()
+        mock_repo = AsyncMock()
+        mock_repo.get_user_by_uuid = AsyncMock(return_value=admin_user)
+
+        with patch("app.utils.auth_utils.auth.UserRepository", return_value=mock_repo):
+            await get_current_user(request, db=AsyncMock())
+            principal = await get_current_principal(request, db=AsyncMock())
+
+        assert principal.is_admin
+        mock_repo.get_user_by_uuid.assert_awaited_once()
+
+    async def test_invalidated_principal_is_reloaded(self, regular_user):
+        user_uuid = str(regular_user.user_uuid)
+        request = make_request({"access_token": create_token(user_uuid, TokenType.ACCESS)})
+        cache = request.app.state.principal_cache = create_principal_cache()
+        await cache.set(user_uuid, Principal(1, user_uuid, "stale", "user", False))
+        mock_repo = AsyncMock()
+        mock_repo.get_user_by_uuid = AsyncMock(return_value=regular_user)
+
+        await cache.invalidate(user_uuid)
+        with patch("app.utils.auth_utils.auth.UserRepository", return_value=mock_repo):
+            principal = await get_current_principal(request, db=AsyncMock())
+
+        assert principal.username == regular_user.username
+        mock_repo.get_user_by_uuid.assert_awaited_once()
+
+    async def test_change_published_during_the_load_is_not_undone(self, regular_user, tmp_path):
+        user_uuid = str(regular_user.user_uuid)
+        regular_user.username = "before"
+        request = make_request({"access_token": create_token(user_uuid, TokenType.ACCESS)})
+        # Two workers sharing the cache directory
+        cache = request.app.state.principal_cache = create_principal_cache(tmp_path)
+        other_worker = create_principal_cache(tmp_path)
+
+        async def load_then_user_changes(uuid):
+            # The user is renamed and USER_CHANGED reaches the other worker after the row was read
+            await other_worker.invalidate(uuid)
+            return regular_user
+
+        mock_repo = AsyncMock()
+        mock_repo.get_user_by_uuid = AsyncMock(side_effect=load_then_user_changes)
+
+        with patch("app.utils.auth_utils.auth.UserRepository", return_value=mock_repo):
+            await get_current_principal(request, db=AsyncMock())
+            await get_current_principal(request, db=AsyncMock())
+
+        # The principal read before the change was not cached: the next request loads again
+        assert mock_repo.get_user_by_uuid.await_count == 2
+        assert await other_worker.get(user_uuid) is None
+        assert cache.stats()["stale_writes"] == 2
+
+    async def test_user_not_in_db_raises(self, regular_user):
+        request = make_request({"access_token": create_token(str(regular_user.user_uuid), TokenType.ACCESS)})
+        mock_repo = AsyncMock()
+        mock_repo.get_user_by_uuid = AsyncMock(return_value=None)
+
+        with patch("app.utils.auth_utils.auth.UserRepository", return_value=mock_repo):
+            with pytest.raises(UnauthorizedError, match="User not found"):
+                await get_current_principal(request, db=AsyncMock())
+
+    def test_admin_requires_superuser(self, admin_user_not_superuser):
+        assert not Principal.from_user(admin_user_not_superuser).is_admin
@@ -0,0 +1,166 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Album, Artist, Collection, CollectionAlbum, CollectionArtist, Like
+from app.repositories.collection_repository import COUNTER_RECONCILE_LOCK_KEY, CollectionRepository
+from app.services.counter_reconciler import CounterReconciler
+from tests.conftest import RecordingSession, SyncSessionAdapter, add_user
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+# ---------------------------------------------------------------------------
+# Base SQLite : pas de triggers ici, les compteurs sont posés à la main
+# pour simuler une dérive
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        add_user(session, 3, "carol")
+        for i in range(1, 4):
+            session.add(Album(id=i, external_album_id=str(i), external_source_id=1, title=f"album {i}"))
+            session.add(Artist(id=i, external_artist_id=str(i), external_source_id=1, title=f"artist {i}"))
+        session.flush()
+        # collection 1: 2 albums, 1 artist, 2 likes — counters correct
+        # collection 2: 1 album, 3 likes — counters drifted
+        # collection 3: empty — counters drifted
+        session.add_all([
+            Collection(id=1, name="one", owner_id=1, is_public=True, updated_at=T0,
+                       albums_count=2, artists_count=1, likes_count=2),
+            Collection(id=2, name="two", owner_id=2, is_public=True, updated_at=T0,
+                       albums_count=0, artists_count=0, likes_count=1),
+            Collection(id=3, name="three", owner_id=3, is_public=True, updated_at=T0,
+                       albums_count=4, artists_count=0, likes_count=0),
+        ])
+        session.flush()
+        session.add_all([
+            CollectionAlbum(collection_id=1, album_id=1),
+            CollectionAlbum(collection_id=1, album_id=2),
+            CollectionArtist(collection_id=1, artist_id=1),
+            CollectionAlbum(collection_id=2, album_id=3),
+            Like(user_id=2, collection_id=1),
+            Like(user_id=3, collection_id=1),
+            Like(user_id=1, collection_id=2),
+            Like(user_id=2, collection_id=2),
+            Like(user_id=3, collection_id=2),
+        ])
+        session.commit()
+        yield session
+
+
+def counters(session):
+    session.expire_all()
+    rows = session.execute(select(
+        Collection.id, Collection.albums_count, Collection.artists_count, Collection.likes_count, Collection.updated_at
+    ).order_by(Collection.id)).all()
+    return [tuple(row) for row in rows]
+
+
+async def test_reconcile_repairs_only_drifted_collections(session):
+    repository = CollectionRepository(SyncSessionAdapter(session))
+
+    corrected = await repository.reconcile_counters()
+
+    assert corrected == 2
+    assert counters(session) == [
+        (1, 2, 1, 2, T0),
+        (2, 1, 0, 3, T0),
+        (3, 0, 0, 0, T0),
+    ]
+    assert await repository.reconcile_counters() == 0
+
+
+async def test_public_listing_filters_and_sorts_on_counters(session):
+    repository = CollectionRepository(SyncSessionAdapter(session))
+    await repository.reconcile_counters()
+
+    page = await repository.get_public_collections(page=1, limit=1, sort_by="likes_count")
+
+    # collection 3 has no album nor artist
+    assert page.total == 2
+    assert [collection.id for collection in page.items] == [2]
+
+    following = await repository.get_public_collections(limit=1, sort_by="likes_count", cursor=page.next_cursor)
+
+    assert [collection.id for collection in following.items] == [1]
+    assert following.total is None
+    assert following.next_cursor is None
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL : les collections dérivées sont verrouillées avant le recomptage
+# ---------------------------------------------------------------------------
+
+async def test_reconcile_recounts_under_a_row_lock():
+    db = RecordingSession(scalars=[2, 3], rowcount=2)
+
+    assert await CollectionRepository(db).reconcile_counters() == 2
+
+    find, lock, update = db.statements
+    assert "FOR UPDATE" not in find
+    assert lock.endswith("WHERE collections.id IN (2, 3) ORDER BY collections.id FOR UPDATE")
+    # The drift condition is evaluated again once the rows are locked
+    assert update.startswith("UPDATE collections SET")
+    assert "WHERE collections.id IN (2, 3) AND (collections.albums_count != (SELECT count(*)" in update
+
+
+async def test_reconcile_without_drift_locks_nothing():
+    db = RecordingSession()
+
+    assert await CollectionRepository(db).reconcile_counters() == 0
+    assert len(db.statements) == 1
+
+
+async def test_lock_is_transaction_scoped():
+    db = RecordingSession()
+
+    await CollectionRepository(db).try_lock_counter_reconciliation()
+
+    assert db.statements == [
+        f"SELECT pg_try_advisory_xact_lock({COUNTER_RECONCILE_LOCK_KEY}) AS pg_try_advisory_xact_lock_1"
+    ]
+
+
+# ---------------------------------------------------------------------------
+# CounterReconciler : un seul worker à la fois
+# ---------------------------------------------------------------------------
+
+def reconciler_with(locked: bool):
+    db = MagicMock()
+    db.flush = AsyncMock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    repository = MagicMock()
+    repository.try_lock_counter_reconciliation = AsyncMock(return_value=locked)
+    repository.reconcile_counters = AsyncMock(return_value=3)
+    return CounterReconciler(session_factory), repository
+
+
+async def test_reconciler_skips_while_another_worker_holds_the_lock():
+    reconciler, repository = reconciler_with(locked=False)
+
+    with patch("app.services.counter_reconciler.CollectionRepository", return_value=repository):
+        assert await reconciler.run_once() == 0
+
+    repository.reconcile_counters.assert_not_called()
+    assert reconciler.stats()["skipped"] == 1
+
+
+async def test_reconciler_runs_with_the_lock():
+    reconciler, repository = reconciler_with(locked=True)
+
+    with patch("app.services.counter_reconciler.CollectionRepository", return_value=repository):
+        assert await reconciler.run_once() == 3
+
+    assert (reconciler.runs, reconciler.corrected) == (1, 3)
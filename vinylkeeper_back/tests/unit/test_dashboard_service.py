@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models import DashboardSnapshot, User
+from app.repositories.dashboard_repository import DashboardRepository
+from app.core.events import USER_COLLECTIONS_CHANGED, publish, subscribe, unsubscribe
+from app.services.dashboard_service import DashboardService
+from tests.conftest import SyncSessionAdapter
+
+LATEST_ALBUM = {
+    "id": 7, "name": "Blue Train", "username": "alice", "created_at": "2026-10-01T12:00:00Z",
+    "type": "album", "image_url": None, "external_id": "123",
+}
+
+GLOBAL_STATS = {
+    "global_albums_total": 40,
+    "global_artists_total": 12,
+    "global_places_total": 5,
+    "moderated_places_total": 3,
+    "public_collections_total": 8,
+    "latest_album": LATEST_ALBUM,
+    "latest_artist": None,
+    "recent_albums": [dict(LATEST_ALBUM, id=8, name="Kind of Blue")],
+}
+
+
+# ---------------------------------------------------------------------------
+# Base SQLite sans ligne de snapshot ; les statistiques globales sont simulées
+# (DISTINCT ON n'existe pas sous SQLite)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        yield session
+
+
+@pytest.fixture
+def service(session):
+    service = DashboardService(DashboardRepository(SyncSessionAdapter(session)))
+    with patch.object(service, "build_global_stats", new_callable=AsyncMock, return_value=GLOBAL_STATS):
+        yield service
+
+
+async def test_refresh_creates_snapshot_read_by_requests(service, session):
+    assert await service.refresh_snapshot(max_age=60) is True
+    service.build_global_stats.reset_mock()
+
+    alice = session.get(User, 1)
+    stats = await service.get_dashboard_stats(alice)
+
+    service.build_global_stats.assert_not_awaited()
+    assert stats.global_albums_total == 40
+    assert stats.public_collections_total == 8
+    assert stats.latest_album.username == "You"
+    assert stats.recent_albums[0].name == "Kind of Blue"
+    assert stats.user_collections_total == 0
+
+    bob = session.get(User, 2)
+    assert (await service.get_dashboard_stats(bob)).latest_album.username == "alice"
+
+
+async def test_fresh_snapshot_is_not_rebuilt(service, session):
+    await service.refresh_snapshot(max_age=60)
+    service.build_global_stats.reset_mock()
+
+    assert await service.refresh_snapshot(max_age=60) is False
+    service.build_global_stats.assert_not_awaited()
+
+    session.execute(update(DashboardSnapshot).values(
+        refreshed_at=datetime.now(timezone.utc) - timedelta(seconds=120)))
+
+    assert await service.refresh_snapshot(max_age=60) is True
+    service.build_global_stats.assert_awaited_once()
+
+
+async def test_stats_computed_live_until_first_refresh(service, session):
+    # Row created by the migration, never refreshed
+    session.add(DashboardSnapshot(id=DashboardSnapshot.SINGLETON_ID))
+    session.commit()
+
+    stats = await service.get_dashboard_stats(session.get(User, 2))
+
+    service.build_global_stats.assert_awaited_once()
+    assert stats.global_artists_total == 12
+
+
+async def test_cached_response_dropped_when_user_collections_change(service, session, tmp_path):
+    service.cache = DashboardService.create_cache(tmp_path)
+    await service.refresh_snapshot(max_age=60)
+    alice = session.get(User, 1)
+    await service.get_dashboard_stats(alice)
+    repository = service.dashboard_repository
+    repository.get_user_stats_batch = AsyncMock(wraps=repository.get_user_stats_batch)
+
+    await service.get_dashboard_stats(alice)
+    repository.get_user_stats_batch.assert_not_awaited()
+
+    async def invalidate(user_id):
+        await service.cache.invalidate(user_id)
+
+    subscribe(USER_COLLECTIONS_CHANGED, invalidate)
+    try:
+        await publish(USER_COLLECTIONS_CHANGED, user_id=alice.id)
+    finally:
+        unsubscribe(USER_COLLECTIONS_CHANGED, invalidate)
+
+    await service.get_dashboard_stats(alice)
+    repository.get_user_stats_batch.assert_awaited_once()
+
+
+async def test_response_loaded_during_an_invalidation_is_not_cached(service, session, tmp_path):
+    service.cache = DashboardService.create_cache(tmp_path)
+    await service.refresh_snapshot(max_age=60)
+    alice = session.get(User, 1)
+    repository = service.dashboard_repository
+    read_user_stats = repository.get_user_stats_batch
+
+    async def invalidated_mid_load(user_id):
+        stats = await read_user_stats(user_id)
+        await service.cache.invalidate(user_id)
+        return stats
+
+    repository.get_user_stats_batch = invalidated_mid_load
+    await service.get_dashboard_stats(alice)
+
+    assert await service.cache.get(alice.id) is None
+    assert await DashboardService.create_cache(tmp_path).get(alice.id) is None
@@ -0,0 +1,168 @@
+import asyncio
+import fcntl
+import os
+
+import httpx
+import pytest
+
+from app.core.discogs_client import DiscogsClient
+from app.core.response_cache import ResponseCache
+
+BASE_URL = "https://api.discogs.com"
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, status_code: int = 200):
+        self.calls: list[str] = []
+        self.status_code = status_code
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        return httpx.Response(self.status_code, json={"id": len(self.calls), "path": request.url.path})
+
+
+def make_client(transport: httpx.AsyncBaseTransport, cache_dir, max_entries: int = 16) -> DiscogsClient:
+    http_client = httpx.AsyncClient(transport=transport)
+    return DiscogsClient(http_client, ResponseCache(cache_dir, max_entries))
+
+
+async def test_release_lookup_is_served_from_cache(tmp_path):
+    transport = CountingTransport()
+    client = make_client(transport, tmp_path)
+
+    first = await client.get_json(f"{BASE_URL}/releases/42")
+    second = await client.get_json(f"{BASE_URL}/releases/42")
+
+    assert first == second
+    assert transport.calls == ["/releases/42"]
+
+
+async def test_disk_tier_is_shared_between_workers(tmp_path):
+    transport = CountingTransport()
+    worker_a = make_client(transport, tmp_path)
+    worker_b = make_client(transport, tmp_path)
+
+    await worker_a.get_json(f"{BASE_URL}/artists/7")
+    data = await worker_b.get_json(f"{BASE_URL}/artists/7")
+
+    assert data["path"] == "/artists/7"
+    assert transport.calls == ["/artists/7"]
+
+
+async def test_search_requests_are_not_cached(tmp_path):
+    transport = CountingTransport()
+    client = make_client(transport, tmp_path)
+
+    await client.get_json(f"{BASE_URL}/database/search", params={"q": "abba"})
+    await client.get_json(f"{BASE_URL}/database/search", params={"q": "abba"})
+
+    assert len(transport.calls) == 2
+
+
+async def test_error_responses_are_not_cached(tmp_path):
+    transport = CountingTransport(status_code=404)
+    client = make_client(transport, tmp_path)
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_json(f"{BASE_URL}/releases/1")
+
+    assert len(transport.calls) == 2
+
+
+async def test_stale_entry_is_served_while_revalidating(tmp_path):
+    transport = CountingTransport()
+    client = make_client(transport, tmp_path)
+    url = f"{BASE_URL}/releases/5"
+    await client.cache.set(url, {"id": "stale"}, ttl=-1, stale_ttl=60)
+
+    data = await client.get_json(url)
+    assert data == {"id": "stale"}
+
+    await asyncio.gather(*client._background_tasks)
+    refreshed = await client.get_json(url)
+
+    assert refreshed["id"] == 1
+    assert transport.calls == ["/releases/5"]
+
+
+class BlockingTransport(CountingTransport):
+    """Holds the first request until `release` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.calls:
+            self.calls.append(request.url.path)
+            await self.release.wait()
+            return httpx.Response(200, json={"id": "revalidated"})
+        return await super().handle_async_request(request)
+
+
+async def test_expired_entry_does_not_wait_on_a_running_revalidation(tmp_path):
+    transport = BlockingTransport()
+    client = make_client(transport, tmp_path)
+    url = f"{BASE_URL}/releases/5"
+    await client.cache.set(url, {"id": "stale"}, ttl=-1, stale_ttl=60)
+    await client.get_json(url)
+    await asyncio.sleep(0.01)
+    # The entry is past its stale window while the revalidation is still held
+    await client.cache.set(url, {"id": "stale"}, ttl=-1, stale_ttl=-1)
+
+    data = await asyncio.wait_for(client.get_json(url), timeout=1)
+
+    assert data["id"] == 2
+    assert transport.calls == ["/releases/5", "/releases/5"]
+    transport.release.set()
+    await asyncio.gather(*client._background_tasks)
+
+
+async def test_memory_tier_is_bounded(tmp_path):
+    cache = ResponseCache(tmp_path, max_entries=2)
+    for i in range(3):
+        await cache.set(f"key-{i}", i, ttl=60)
+
+    assert list(cache._memory) == ["key-1", "key-2"]
+    # Evicted entries are still available from disk
+    entry = await cache.get("key-0")
+    assert entry.value == 0
+
+
+async def test_expired_disk_entries_are_dropped(tmp_path):
+    cache = ResponseCache(tmp_path)
+    await cache.set("key", "value", ttl=-1, stale_ttl=0)
+    cache._memory.clear()
+
+    assert await cache.get("key") is None
+    assert not any(tmp_path.rglob("*.json"))
+
+
+async def test_janitor_drops_expired_files_then_the_closest_to_expiry(tmp_path):
+    cache = ResponseCache(tmp_path, max_disk_bytes=0)
+    await cache.set("expired", "x", ttl=-1)
+    await cache.set("short", "x" * 100, ttl=60)
+    await cache.set("long", "x" * 100, ttl=3600)
+    # Room for one of the two remaining files, under the low watermark too
+    cache.max_disk_bytes = cache._path_for("long").stat().st_size * 3 // 2
+
+    cache.run_maintenance()
+
+    assert not cache._path_for("expired").exists()
+    assert not cache._path_for("short").exists()
+    assert cache._path_for("long").exists()
+    assert (cache.expired, cache.evictions) == (1, 1)
+
+
+async def test_janitor_skips_when_another_worker_holds_the_lock(tmp_path):
+    cache = ResponseCache(tmp_path)
+    await cache.set("expired", "x", ttl=-1)
+    lock_fd = os.open(tmp_path / ResponseCache.JANITOR_LOCK_FILENAME, os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        cache.run_maintenance()
+    finally:
+        os.close(lock_fd)
+
+    assert cache._path_for("expired").exists()
@@ -15,6 +15,7 @@ from app.core.exceptions import (
     RefreshTokenNotFoundError,
     ResourceNotFoundError,
     ServerError,
+    ServiceUnavailableError,
     TermsNotAcceptedError,
     UnauthorizedError,
     ValidationError,
@@ -217,6 +218,12 @@ class TestServerErrors:
         assert body["code"] == ErrorCode.DATABASE_ERROR
         assert body["details"]["table"] == "users"
 
+    async def test_service_unavailable_sets_retry_after(self):
+        resp = await call(make_app_raising(lambda: ServiceUnavailableError("busy", retry_after=3)))
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "3"
+        assert resp.json()["code"] == ErrorCode.SERVICE_UNAVAILABLE
+
 
 # ---------------------------------------------------------------------------
 # Pydantic RequestValidationError → 422
@@ -0,0 +1,319 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.enums import ExportFormatEnum, ExportJobStatusEnum, ExportKindEnum
+from app.core.exceptions import ValidationError
+from app.models import Album, Collection, CollectionAlbum, ExportJob, Wishlist
+from app.repositories.collection_album_repository import CollectionAlbumRepository
+from app.repositories.collection_repository import CollectionRepository
+from app.repositories.export_job_repository import ExportJobRepository
+from app.schemas.export_job_schema import ExportJobCreate
+from app.services.export_job_service import ExportJobRunner, ExportJobService, spool_path
+from app.services.export_service import ExportService
+from tests.conftest import SyncSessionAdapter
+
+ALBUMS = 7
+
+
+# ---------------------------------------------------------------------------
+# Base SQLite sur fichier (WAL : le curseur d'export et les mises à jour de
+# progression utilisent deux connexions) : alice possède une collection de
+# 7 albums et une wishlist de 2 items, bob ne possède rien
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'vk.db'}"
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        session.add(Collection(id=1, name="My crates", owner_id=1, mood_id=1, albums_count=ALBUMS))
+        for i in range(1, ALBUMS + 1):
+            session.add(Album(id=i, external_album_id=str(i), external_source_id=1, title=f"Artist {i} - Album {i}"))
+        for i in range(1, 3):
+            session.add(Wishlist(user_id=1, external_id=str(i), entity_type_id=1, external_source_id=1,
+                                 title=f"Wish {i}"))
+        session.flush()
+        for i in range(1, ALBUMS + 1):
+            session.add(CollectionAlbum(collection_id=1, album_id=i, state_record=1))
+        session.commit()
+    with patch("app.services.export_service.settings.EXPORT_BATCH_SIZE", 3), \
+            patch("app.services.wishlist_export_service.settings.EXPORT_BATCH_SIZE", 3):
+        yield sqlite_engine
+
+
+@pytest.fixture
+def session_factory(engine):
+    return lambda: SyncSessionAdapter(Session(engine, expire_on_commit=False))
+
+
+@pytest.fixture
+def runner(session_factory, tmp_path):
+    runner = ExportJobRunner(
+        session_factory, tmp_path / "exports", concurrency=2, poll_interval=0.01, ttl=3600, stale_after=300
+    )
+    with patch.object(ExportJobRepository, "try_acquire_slot", AsyncMock(return_value=0)):
+        yield runner
+
+
+def make_service(session_factory, tmp_path):
+    db = session_factory()
+    return ExportJobService(
+        ExportJobRepository(db),
+        ExportService(CollectionRepository(db), CollectionAlbumRepository(db)),
+        tmp_path / "exports",
+    )
+
+
+def get_job(engine, job_id) -> ExportJob:
+    with Session(engine) as session:
+        return session.execute(select(ExportJob).filter(ExportJob.id == job_id)).scalar_one()
+
+
+async def queue(session_factory, tmp_path, kind=ExportKindEnum.COLLECTION_ALBUMS, fmt=ExportFormatEnum.CSV,
+                collection_id=1, user_id=1):
+    service = make_service(session_factory, tmp_path)
+    # pg_advisory_xact_lock does not exist in SQLite
+    with patch.object(ExportJobRepository, "lock_user_jobs", AsyncMock()):
+        return await service.create_job(ExportJobCreate(kind=kind, format=fmt, collection_id=collection_id), user_id)
+
+
+# ---------------------------------------------------------------------------
+# File d'attente
+# ---------------------------------------------------------------------------
+
+async def test_job_is_queued_pending(session_factory, tmp_path):
+    job = await queue(session_factory, tmp_path)
+
+    assert job.status == ExportJobStatusEnum.PENDING
+    assert job.rows_written == 0
+    assert job.progress is None
+
+
+async def test_active_jobs_per_user_are_limited(session_factory, tmp_path):
+    with patch("app.services.export_job_service.settings.EXPORT_JOB_MAX_ACTIVE_PER_USER", 2):
+        await queue(session_factory, tmp_path)
+        await queue(session_factory, tmp_path, fmt=ExportFormatEnum.ODS)
+        with pytest.raises(ValidationError):
+            await queue(session_factory, tmp_path, kind=ExportKindEnum.WISHLIST, collection_id=None)
+
+
+async def test_active_jobs_are_counted_under_the_user_lock(tmp_path):
+    repository = MagicMock()
+    repository.db = AsyncMock()
+    repository.lock_user_jobs = AsyncMock()
+    repository.count_active_for_user = AsyncMock(return_value=0)
+
+    async def create(job):
+        job.id, job.status, job.rows_written, job.created_at = uuid.uuid4(), "pending", 0, datetime.now(timezone.utc)
+        return job
+
+    repository.create = AsyncMock(side_effect=create)
+    service = ExportJobService(repository, MagicMock(), tmp_path)
+
+    await service.create_job(ExportJobCreate(kind=ExportKindEnum.WISHLIST, format=ExportFormatEnum.CSV), 7)
+
+    assert [call[0] for call in repository.mock_calls[:3]] == ["lock_user_jobs", "count_active_for_user", "create"]
+    repository.lock_user_jobs.assert_awaited_once_with(7)
+
+
+def test_collection_id_must_match_the_kind():
+    with pytest.raises(PydanticValidationError):
+        ExportJobCreate(kind=ExportKindEnum.COLLECTION_ARTISTS, format=ExportFormatEnum.CSV)
+    with pytest.raises(PydanticValidationError):
+        ExportJobCreate(kind=ExportKindEnum.WISHLIST, format=ExportFormatEnum.CSV, collection_id=1)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+async def test_runner_writes_the_file_and_reports_progress(engine, session_factory, tmp_path, runner):
+    queued = await queue(session_factory, tmp_path)
+
+    assert await runner.run_once() is True
+
+    job = get_job(engine, queued.id)
+    assert job.status == ExportJobStatusEnum.DONE.value
+    assert job.attempts == 1
+    assert (job.rows_written, job.total_rows) == (ALBUMS, ALBUMS)
+    assert job.filename.endswith("albums.csv")
+    path = spool_path(tmp_path / "exports", job.id, "csv")
+    assert path.stat().st_size == job.file_size
+    assert path.read_text(encoding="utf-8-sig").count("\n") == 1 + ALBUMS
+    assert list((tmp_path / "exports").glob("*.part")) == []
+    assert runner.stats()["completed"] == 1
+
+
+async def test_runner_exports_the_wishlist_as_ods(engine, session_factory, tmp_path, runner):
+    queued = await queue(session_factory, tmp_path, kind=ExportKindEnum.WISHLIST, fmt=ExportFormatEnum.ODS,
+                         collection_id=None)
+
+    await runner.run_once()
+
+    job = get_job(engine, queued.id)
+    assert job.status == ExportJobStatusEnum.DONE.value
+    assert (job.rows_written, job.total_rows) == (2, 2)
+    assert spool_path(tmp_path / "exports", job.id, "ods").read_bytes()[30:38] == b"mimetype"
+
+
+async def test_runner_waits_when_every_slot_is_taken(engine, session_factory, tmp_path, runner):
+    queued = await queue(session_factory, tmp_path)
+
+    with patch.object(ExportJobRepository, "try_acquire_slot", AsyncMock(return_value=None)):
+        assert await runner.run_once() is False
+
+    assert get_job(engine, queued.id).status == ExportJobStatusEnum.PENDING.value
+    assert runner.stats()["saturated"] == 1
+
+
+async def test_runner_returns_false_on_empty_queue(runner):
+    assert await runner.run_once() is False
+
+
+async def test_failed_export_is_recorded(engine, session_factory, tmp_path, runner):
+    queued = await queue(session_factory, tmp_path)
+    with Session(engine) as session:
+        session.execute(update(Collection).values(owner_id=2))
+        session.commit()
+
+    await runner.run_once()
+
+    job = get_job(engine, queued.id)
+    assert job.status == ExportJobStatusEnum.FAILED.value
+    assert job.error == "You can only export your own collections"
+    assert job.expires_at is not None
+    assert list((tmp_path / "exports").iterdir()) == []
+
+
+async def test_abandoned_job_is_claimed_again_and_the_old_run_superseded(engine, session_factory, tmp_path, runner):
+    queued = await queue(session_factory, tmp_path)
+    async with session_factory() as db:
+        first_run = await ExportJobRepository(db).claim_next(
+            datetime.now(timezone.utc), datetime.now(timezone.utc) - timedelta(seconds=300), 3
+        )
+        await db.commit()
+    with Session(engine) as session:
+        session.execute(update(ExportJob).values(heartbeat_at=datetime.now(timezone.utc) - timedelta(hours=1)))
+        session.commit()
+
+    await runner.run_once()
+    assert get_job(engine, queued.id).attempts == 2
+
+    async with session_factory() as stream_db, session_factory() as db:
+        await runner._run(first_run, ExportJobRepository(db), stream_db)
+
+    job = get_job(engine, queued.id)
+    assert job.status == ExportJobStatusEnum.DONE.value
+    assert job.attempts == 2
+    assert runner.stats()["superseded"] == 1
+    assert sorted(p.name for p in (tmp_path / "exports").iterdir()) == [f"{job.id}.csv"]
+
+
+async def test_cleanup_drops_expired_jobs_and_their_files(engine, session_factory, tmp_path, runner):
+    queued = await queue(session_factory, tmp_path)
+    await runner.run_once()
+    path = spool_path(tmp_path / "exports", queued.id, "csv")
+    assert path.exists()
+
+    assert await runner.cleanup_once() == 0
+    with Session(engine) as session:
+        session.execute(update(ExportJob).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        session.commit()
+    assert await runner.cleanup_once() == 1
+
+    assert not path.exists()
+    with Session(engine) as session:
+        assert session.execute(select(ExportJob)).first() is None
+
+
+async def test_cleanup_gives_up_on_jobs_interrupted_too_often(engine, session_factory, tmp_path, runner):
+    queued = await queue(session_factory, tmp_path)
+    with Session(engine) as session:
+        session.execute(update(ExportJob).values(
+            status=ExportJobStatusEnum.RUNNING.value, attempts=ExportJobRunner.MAX_ATTEMPTS,
+            heartbeat_at=datetime.now(timezone.utc) - timedelta(hours=1),
+        ))
+        session.commit()
+
+    await runner.cleanup_once()
+
+    job = get_job(engine, queued.id)
+    assert job.status == ExportJobStatusEnum.FAILED.value
+    assert job.error == "Export interrupted too many times"
+
+
+# ---------------------------------------------------------------------------
+# Téléchargement
+# ---------------------------------------------------------------------------
+
+def finished_job(**overrides):
+    fields = dict(
+        id=uuid.uuid4(), user_id=1, collection_id=1, kind="collection_albums", format="csv",
+        status=ExportJobStatusEnum.DONE.value, rows_written=3, total_rows=3, filename="crates_albums.csv",
+        file_size=10, error=None, created_at=datetime.now(timezone.utc), finished_at=datetime.now(timezone.utc),
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def download_service(job, spool_dir):
+    repository = MagicMock()
+    repository.get_for_user = AsyncMock(return_value=job)
+    return ExportJobService(repository, MagicMock(), spool_dir)
+
+
+async def send(response, headers):
+    scope = {
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+    }
+    messages = []
+
+    async def receive():
+        await asyncio.Event().wait()  # the client stays connected
+
+    async def capture(message):
+        messages.append(message)
+
+    await response(scope, receive, capture)
+    start = messages[0]
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], dict((k.decode(), v.decode()) for k, v in start["headers"]), body
+
+
+async def test_download_serves_byte_ranges(tmp_path):
+    job = finished_job()
+    spool_path(tmp_path, job.id, "csv").write_bytes(b"0123456789")
+    response = await download_service(job, tmp_path).download(job.id, user_id=1)
+
+    status, headers, body = await send(response, {"range": "bytes=4-"})
+
+    assert status == 206
+    assert body == b"456789"
+    assert headers["content-range"] == "bytes 4-9/10"
+    assert 'filename="crates_albums.csv"' in headers["content-disposition"]
+
+
+async def test_download_of_unfinished_job_is_refused(tmp_path):
+    job = finished_job(status=ExportJobStatusEnum.RUNNING.value, expires_at=None)
+
+    with pytest.raises(ValidationError):
+        await download_service(job, tmp_path).download(job.id, user_id=1)
+
+
+def test_progress_is_reported_as_a_fraction():
+    job = finished_job(status=ExportJobStatusEnum.RUNNING.value, rows_written=3, total_rows=12)
+
+    assert ExportJobService.to_response(job).progress == 0.25
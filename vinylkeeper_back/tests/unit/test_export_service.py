@@ -0,0 +1,121 @@
+import csv
+import io
+from unittest.mock import patch
+
+import pytest
+from odf import teletype
+from odf.opendocument import load
+from odf.table import TableCell, TableRow
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ForbiddenError
+from app.models import Album, Artist, Collection, CollectionAlbum, CollectionArtist, Wishlist
+from app.repositories.collection_album_repository import CollectionAlbumRepository
+from app.repositories.collection_repository import CollectionRepository
+from app.repositories.wishlist_repository import WishlistRepository
+from app.services.export_service import ExportService
+from app.services.wishlist_export_service import WishlistExportService
+from tests.conftest import SyncSessionAdapter
+
+ALBUMS = 7
+BATCH_SIZE = 3
+
+
+# ---------------------------------------------------------------------------
+# Base SQLite : une collection de 7 albums et 2 artistes, une wishlist de 7 items,
+# lus par lots de 3
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        session.add(Collection(id=1, name="My crates", owner_id=1, mood_id=1))
+        for i in range(1, ALBUMS + 1):
+            session.add(Album(id=i, external_album_id=str(i), external_source_id=1, title=f"Artist {i} - Album {i}"))
+            session.add(Wishlist(user_id=1, external_id=str(i), entity_type_id=1, external_source_id=1,
+                                 title=f"Wish {i}"))
+        for i in range(1, 3):
+            session.add(Artist(id=i, external_artist_id=str(i), external_source_id=1, title=f"Artist {i}"))
+        session.flush()
+        for i in range(1, ALBUMS + 1):
+            session.add(CollectionAlbum(collection_id=1, album_id=i, state_record=1,
+                                        state_cover=2 if i == 1 else None))
+        for i in range(1, 3):
+            session.add(CollectionArtist(collection_id=1, artist_id=i))
+        session.commit()
+        with patch("app.services.export_service.settings.EXPORT_BATCH_SIZE", BATCH_SIZE):
+            yield session
+
+
+@pytest.fixture
+def export_service(session):
+    db = SyncSessionAdapter(session)
+    return ExportService(CollectionRepository(db), CollectionAlbumRepository(db))
+
+
+async def read_csv(response):
+    chunks = [chunk async for chunk in response.body_iterator]
+    text = b"".join(chunks).decode("utf-8")
+    assert text.startswith("\ufeff")
+    return chunks, list(csv.reader(io.StringIO(text[1:]), delimiter=";"))
+
+
+def read_ods(data):
+    document = load(io.BytesIO(data))
+    return [
+        [teletype.extractText(cell) for cell in row.getElementsByType(TableCell)]
+        for row in document.spreadsheet.getElementsByType(TableRow)
+    ]
+
+
+async def test_album_csv_is_streamed_one_chunk_per_batch(export_service):
+    response = await export_service.export_collection_albums_csv(1, user_id=1)
+    chunks, rows = await read_csv(response)
+
+    # header, then ceil(7 / 3) batches
+    assert len(chunks) == 1 + 3
+    assert rows[0] == export_service._album_csv_headers()
+    assert len(rows) == 1 + ALBUMS
+    first = dict(zip(rows[0], next(row for row in rows[1:] if row[2] == "1")))
+    assert first["collection_name"] == "My crates"
+    assert first["external_source"] == "discogs"
+    assert first["artist_name"] == "Artist 1"
+    assert first["album_title"] == "Album 1"
+    assert first["state_record"] == "mint"
+    assert first["state_cover"] == "good"
+    assert response.headers["content-disposition"].endswith('albums.csv"')
+
+
+async def test_artist_csv_rows(export_service):
+    response = await export_service.export_collection_artists_csv(1, user_id=1)
+    _, rows = await read_csv(response)
+
+    assert sorted(row[5] for row in rows[1:]) == ["Artist 1", "Artist 2"]
+    assert {row[4] for row in rows[1:]} == {"discogs"}
+
+
+async def test_album_ods_is_streamed_and_readable(export_service):
+    response = await export_service.export_collection_albums_ods(1, user_id=1)
+    data = b"".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "application/vnd.oasis.opendocument.spreadsheet"
+    rows = read_ods(data)
+    assert rows[0] == export_service._album_csv_headers()
+    assert len(rows) == 1 + ALBUMS
+    assert {row[6] for row in rows[1:]} == {f"Album {i}" for i in range(1, ALBUMS + 1)}
+
+
+async def test_export_of_another_users_collection_is_refused(export_service):
+    with pytest.raises(ForbiddenError):
+        await export_service.export_collection_albums_csv(1, user_id=2)
+
+
+async def test_wishlist_csv_is_streamed(session):
+    service = WishlistExportService(WishlistRepository(SyncSessionAdapter(session)))
+    response = await service.export_my_wishlist_csv(1, "alice")
+    chunks, rows = await read_csv(response)
+
+    assert len(chunks) == 1 + 3
+    assert len(rows) == 1 + ALBUMS
+    assert {row[1] for row in rows[1:]} == {"album"}
+    assert {row[3] for row in rows[1:]} == {"discogs"}
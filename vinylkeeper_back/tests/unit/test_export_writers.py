@@ -0,0 +1,63 @@
+import io
+import zipfile
+
+from odf import teletype
+from odf.opendocument import load
+from odf.table import Table, TableCell, TableRow
+
+from app.utils.export_writers import ODS_MEDIA_TYPE, ods_chunks
+
+
+async def batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def write_ods(sheet_name, headers, *row_batches):
+    return [chunk async for chunk in ods_chunks(sheet_name, headers, batches(*row_batches))]
+
+
+async def test_mimetype_entry_is_first_stored_and_complete():
+    data = b"".join(await write_ods("Albums", ["title"], [["a"]]))
+
+    assert data[30:38] == b"mimetype"
+    assert data[38:38 + len(ODS_MEDIA_TYPE)] == ODS_MEDIA_TYPE.encode()
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    mimetype = archive.infolist()[0]
+    assert mimetype.compress_type == zipfile.ZIP_STORED
+    assert not mimetype.flag_bits & 0x08  # sizes in the local header, no data descriptor
+    content = archive.getinfo("content.xml")
+    assert content.compress_type == zipfile.ZIP_DEFLATED
+    assert content.flag_bits & 0x08  # streamed: sizes in a data descriptor after the data
+
+
+async def test_cells_are_escaped_and_readable_by_odfpy():
+    data = b"".join(await write_ods(
+        'Sheet "1" & <co>',
+        ["name", "notes"],
+        [["AC/DC", "Back <in> Black & Blue"], ["tab\there", "two\nlines"]],
+        [["control\x01char", ""]],
+    ))
+
+    document = load(io.BytesIO(data))
+    assert document.spreadsheet.getElementsByType(Table)[0].getAttribute("name") == 'Sheet "1" & <co>'
+    rows = [
+        [teletype.extractText(cell) for cell in row.getElementsByType(TableCell)]
+        for row in document.spreadsheet.getElementsByType(TableRow)
+    ]
+    assert rows == [
+        ["name", "notes"],
+        ["AC/DC", "Back <in> Black & Blue"],
+        ["tab\there", "two\nlines"],
+        ["controlchar", ""],
+    ]
+
+
+async def test_output_is_sent_while_rows_are_written():
+    many = [[f"value {i}-{j}" for j in range(10)] for i in range(2000)]
+
+    chunks = await write_ods("Albums", ["c"] * 10, *([many] * 20))
+
+    assert len(chunks) > 2
+    assert max(len(chunk) for chunk in chunks) < sum(len(chunk) for chunk in chunks) / 2
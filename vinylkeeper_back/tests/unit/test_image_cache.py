@@ -0,0 +1,75 @@
+import time
+
+from app.core.image_cache import ImageCache
+
+KEY_A = "a" * 64
+KEY_B = "b" * 64
+KEY_C = "c" * 64
+
+
+def test_entries_are_sharded_by_key_prefix(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=1024)
+
+    path = cache.write(KEY_A, "webp", b"data")
+
+    assert path == tmp_path / "aa" / "aa" / f"{KEY_A}.webp"
+    assert cache.read(KEY_A, "webp") == b"data"
+    assert not list(path.parent.glob("*.tmp"))
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=1024)
+    cache.write(KEY_A, "webp", b"data")
+
+    cache.read(KEY_A, "webp")
+    cache.read(KEY_B, "webp")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes"] == 4
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=250)
+    cache.write(KEY_A, "webp", b"a" * 100)
+    cache.write(KEY_B, "webp", b"b" * 100)
+    time.sleep(0.01)
+    cache.read(KEY_A, "webp")
+    cache.write(KEY_C, "webp", b"c" * 100)
+
+    evicted = cache.evict()
+
+    assert evicted == 1
+    assert cache.read(KEY_B, "webp") is None
+    assert cache.read(KEY_A, "webp") is not None
+    assert cache.read(KEY_C, "webp") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_under_budget_is_left_alone(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=1024)
+    cache.write(KEY_A, "webp", b"a" * 100)
+
+    assert cache.evict() == 0
+
+
+def test_legacy_flat_files_are_adopted_into_shards(tmp_path):
+    (tmp_path / f"{KEY_A}.jpeg").write_bytes(b"legacy")
+    cache = ImageCache(tmp_path, max_bytes=1024)
+
+    cache.run_maintenance(reindex=True)
+
+    assert not (tmp_path / f"{KEY_A}.jpeg").exists()
+    assert cache.read(KEY_A, "jpeg") == b"legacy"
+    assert cache.total_bytes() == 6
+
+
+def test_index_is_shared_between_workers(tmp_path):
+    worker_a = ImageCache(tmp_path, max_bytes=150)
+    worker_b = ImageCache(tmp_path, max_bytes=150)
+    worker_a.write(KEY_A, "webp", b"a" * 100)
+    worker_b.write(KEY_B, "webp", b"b" * 100)
+
+    assert worker_a.total_bytes() == 200
+    assert worker_a.evict() == 1
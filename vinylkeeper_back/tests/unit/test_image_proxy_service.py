@@ -0,0 +1,281 @@
+import asyncio
+from io import BytesIO
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from PIL import Image
+
+from app.core.exceptions import ServerError, ValidationError
+from app.core.handlers import register_exception_handlers
+from app.core.image_cache import ImageCache
+from app.endpoints import images
+from app.services import image_proxy_service
+from app.services.image_proxy_service import ImageProxyService
+from app.utils.image_transcoding import VariantSpec, render_variants
+
+SRC = "https://i.discogs.com/cover.jpg"
+
+
+class ChunkedBody(httpx.AsyncByteStream):
+    """Streams `count` chunks without announcing a Content-Length."""
+
+    def __init__(self, chunk: bytes, count: int):
+        self.chunk = chunk
+        self.count = count
+        self.sent = 0
+
+    async def __aiter__(self):
+        for _ in range(self.count):
+            self.sent += 1
+            yield self.chunk
+
+
+def make_jpeg(size: tuple[int, int] = (1200, 1200)) -> bytes:
+    output = BytesIO()
+    Image.new("RGB", size, (180, 40, 40)).save(output, format="JPEG")
+    return output.getvalue()
+
+
+def make_service(handler, tmp_path) -> ImageProxyService:
+    return ImageProxyService(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ImageCache(tmp_path, max_bytes=10 * 1024 * 1024),
+    )
+
+
+async def test_stream_aborts_once_size_cap_is_crossed(tmp_path):
+    body = ChunkedBody(b"x" * 1024 * 1024, count=50)
+    service = make_service(lambda request: httpx.Response(200, stream=body), tmp_path)
+
+    with pytest.raises(ValidationError):
+        await service._fetch_image(SRC)
+
+    assert body.sent <= service.MAX_IMAGE_SIZE // len(body.chunk) + 1
+
+
+async def test_declared_content_length_is_rejected_before_download(tmp_path):
+    body = ChunkedBody(b"x", count=1)
+    service = make_service(
+        lambda request: httpx.Response(
+            200, stream=body, headers={"content-length": str(ImageProxyService.MAX_IMAGE_SIZE + 1)}),
+        tmp_path,
+    )
+
+    with pytest.raises(ValidationError):
+        await service._fetch_image(SRC)
+
+    assert body.sent == 0
+
+
+async def test_small_image_is_downloaded_in_full(tmp_path):
+    data = make_jpeg()
+    service = make_service(lambda request: httpx.Response(200, content=data), tmp_path)
+
+    assert await service._fetch_image(SRC) == data
+
+
+async def test_origin_error_raises_server_error(tmp_path):
+    service = make_service(lambda request: httpx.Response(404), tmp_path)
+
+    with pytest.raises(ServerError):
+        await service._fetch_image(SRC)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("image/avif,image/webp,image/apng,image/*,*/*;q=0.8", "avif"),
+    ("image/webp,*/*", "webp"),
+    ("image/avif;q=0.5,image/webp;q=0.9", "webp"),
+    ("image/jpeg,image/webp;q=0.5", "jpeg"),
+    ("image/avif;q=0,image/webp;q=0", "jpeg"),
+    ("*/*", "jpeg"),
+    ("", "jpeg"),
+])
+def test_output_format_is_negotiated_from_accept(accept, expected):
+    counted_before = dict(images._negotiated_formats)
+
+    assert ImageProxyService.negotiate_format(accept) == expected
+    # Only proxy requests are counted
+    assert images._negotiated_formats == counted_before
+
+
+def test_avif_is_skipped_when_disabled(monkeypatch):
+    monkeypatch.setattr(image_proxy_service.settings, "IMAGE_AVIF_ENABLED", False)
+
+    assert ImageProxyService.negotiate_format("image/avif,image/webp") == "webp"
+
+
+def render(image_data: bytes, width: int, height: int, quality: int, format: str) -> bytes:
+    return render_variants(image_data, [VariantSpec(width, height, quality, format)])[0]
+
+
+def test_avif_variant_is_encoded():
+    output = render(make_jpeg(), 150, 150, 60, "avif")
+
+    result = Image.open(BytesIO(output))
+    assert result.format == "AVIF"
+    assert result.size == (150, 150)
+
+
+def test_jpeg_thumbnail_is_decoded_at_reduced_scale():
+    decoded_sizes = []
+    original_thumbnail = Image.Image.thumbnail
+
+    def spy_thumbnail(image, *args, **kwargs):
+        decoded_sizes.append(image.size)
+        return original_thumbnail(image, *args, **kwargs)
+
+    with patch.object(Image.Image, "thumbnail", spy_thumbnail):
+        output = render(make_jpeg((3000, 3000)), 150, 150, 80, "jpeg")
+
+    result = Image.open(BytesIO(output))
+    assert result.size == (150, 150)
+    # Draft mode decodes at 1/8 scale instead of the full 3000x3000 bitmap
+    assert decoded_sizes == [(375, 375)]
+
+
+@pytest.mark.parametrize("mode", ["P", "RGBA", "L", "CMYK"])
+def test_non_rgb_sources_are_converted(mode):
+    source = BytesIO()
+    image = Image.new(mode, (400, 200))
+    image.save(source, format="JPEG" if mode in ("L", "CMYK") else "PNG")
+
+    output = render(source.getvalue(), 100, 100, 80, "webp")
+
+    result = Image.open(BytesIO(output))
+    assert result.format == "WEBP"
+    assert result.size == (100, 50)
+
+
+def counting_handler(data: bytes, calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        return httpx.Response(200, content=data)
+    return handler
+
+
+async def test_variants_are_derived_from_one_cached_original(tmp_path):
+    calls = []
+    service = make_service(counting_handler(make_jpeg(), calls), tmp_path)
+
+    small = await service.get_proxy_image(SRC, 150, 150, cacheable=True)
+    large = await service.get_proxy_image(SRC, 600, 600, cacheable=True)
+
+    assert calls == [SRC]
+    assert Image.open(small.path).size == (150, 150)
+    assert Image.open(large.path).size == (600, 600)
+
+
+async def test_uncacheable_variant_does_not_fill_the_cache(tmp_path):
+    calls = []
+    service = make_service(counting_handler(make_jpeg(), calls), tmp_path)
+
+    image = await service.get_proxy_image(SRC, 150, 150, cacheable=False)
+
+    assert image.data is not None
+    assert service.image_cache.writes == 0
+    assert not any(path.is_file() and not path.name.startswith(ImageCache.INDEX_FILENAME)
+                   for path in tmp_path.rglob("*"))
+
+
+async def test_concurrent_variants_share_one_decode(tmp_path):
+    calls = []
+    service = make_service(counting_handler(make_jpeg(), calls), tmp_path)
+    batcher = image_proxy_service._render_batcher
+    batches_before = batcher.batches
+
+    results = await asyncio.gather(*(
+        service.get_proxy_image(SRC, size, size) for size in (150, 300, 600, 300)
+    ))
+
+    assert calls == [SRC]
+    assert batcher.batches == batches_before + 1
+    assert [Image.open(BytesIO(image.data)).size for image in results] == [
+        (150, 150), (300, 300), (600, 600), (300, 300)
+    ]
+
+
+async def test_undecodable_original_raises_server_error(tmp_path):
+    service = make_service(lambda request: httpx.Response(200, content=b"not an image"), tmp_path)
+
+    with pytest.raises(ServerError):
+        await service.get_proxy_image(SRC, 150, 150)
+
+
+# ---------------------------------------------------------------------------
+# /proxy endpoint: conditional requests
+# ---------------------------------------------------------------------------
+
+def make_client(service: ImageProxyService) -> httpx.AsyncClient:
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(images.router)
+    app.dependency_overrides[images.get_image_proxy_service] = lambda: service
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+PROXY_PARAMS = {"src": SRC, "w": 150, "h": 150, "cache": "true"}
+WEBP = {"accept": "image/webp"}
+
+
+async def test_etag_is_stable_across_responses(tmp_path):
+    service = make_service(counting_handler(make_jpeg(), []), tmp_path)
+    async with make_client(service) as client:
+        first = await client.get("/proxy", params=PROXY_PARAMS, headers=WEBP)
+        second = await client.get("/proxy", params=PROXY_PARAMS, headers=WEBP)
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.headers["content-type"] == "image/webp"
+    assert first.content == second.content
+
+
+async def test_matching_if_none_match_returns_304_without_fetching(tmp_path):
+    calls = []
+    service = make_service(counting_handler(make_jpeg(), calls), tmp_path)
+    etag = service.variant_etag(SRC, 150, 150, 85, "webp")
+
+    async with make_client(service) as client:
+        response = await client.get(
+            "/proxy", params=PROXY_PARAMS, headers={**WEBP, "if-none-match": f'"other", {etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert calls == []
+
+
+async def test_etag_differs_per_negotiated_format(tmp_path):
+    service = make_service(counting_handler(make_jpeg(), []), tmp_path)
+    async with make_client(service) as client:
+        webp = await client.get("/proxy", params=PROXY_PARAMS, headers=WEBP)
+        jpeg = await client.get(
+            "/proxy", params=PROXY_PARAMS, headers={"accept": "image/jpeg", "if-none-match": webp.headers["etag"]})
+
+    assert jpeg.status_code == 200
+    assert jpeg.headers["content-type"] == "image/jpeg"
+    assert jpeg.headers["etag"] != webp.headers["etag"]
+
+
+async def test_avif_clients_get_avif_and_format_mix_is_counted(tmp_path):
+    service = make_service(counting_handler(make_jpeg(), []), tmp_path)
+    avif_before = images._negotiated_formats["avif"]
+
+    async with make_client(service) as client:
+        response = await client.get("/proxy", params=PROXY_PARAMS, headers={"accept": "image/avif,image/webp"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/avif"
+    assert response.headers["vary"] == "Accept"
+    assert images._negotiated_formats["avif"] == avif_before + 1
+
+
+async def test_uncached_variant_is_sent_from_memory(tmp_path):
+    service = make_service(counting_handler(make_jpeg(), []), tmp_path)
+    async with make_client(service) as client:
+        response = await client.get("/proxy", params={**PROXY_PARAMS, "cache": "false"}, headers=WEBP)
+
+    assert response.status_code == 200
+    assert Image.open(BytesIO(response.content)).size == (150, 150)
+    assert int(response.headers["content-length"]) == len(response.content)
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.repositories.library_search_repository import LibrarySearchRepository
+from app.services.library_search_service import LibrarySearchService
+from tests.conftest import RecordingSession
+
+
+def _row(**overrides):
+    fields = dict(
+        type="album", source="collection", id=7, external_id="123", title="The Dark Side of the Moon",
+        image_url=None, collection_ids=[4, 2], score=1.4,
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+# ---------------------------------------------------------------------------
+# LibrarySearchRepository : une requête sur les collections et la wishlist
+# ---------------------------------------------------------------------------
+
+async def test_search_unions_owned_albums_artists_and_wishlist():
+    db = RecordingSession(rows=[_row()])
+
+    with patch("app.repositories.library_search_repository.settings.LIBRARY_SEARCH_SIMILARITY_THRESHOLD", 0.4):
+        rows = await LibrarySearchRepository(db).search(5, "dark si", ["dark", "si"], 20)
+
+    assert rows == db.rows
+    set_threshold, search = db.statements
+    assert "set_config('pg_trgm.word_similarity_threshold', '0.4', true)" in set_threshold
+    assert search.count("UNION ALL") == 2
+    assert search.count("collections.owner_id = 5") == 2
+    assert "wishlist.user_id = 5" in search
+    for table in ("albums", "artists", "wishlist"):
+        # Same expression as the GIN indexes of migration a9d4f6b2c8e1
+        assert (f"to_tsvector('simple', coalesce({table}.title, '')) "
+                f"@@ to_tsquery('simple', 'dark:* & si:*')") in search
+        assert f"{table}.title ILIKE '%' || 'dark si' || '%' ESCAPE '/'" in search
+        assert f"'dark si' <% {table}.title" in search
+    assert search.endswith("ORDER BY anon_1.score DESC, length(anon_1.title), anon_1.title, anon_1.id \n LIMIT 20")
+
+
+async def test_search_term_wildcards_are_matched_literally():
+    db = RecordingSession()
+
+    await LibrarySearchRepository(db).search(5, "100%_pure", ["100", "pure"], 20)
+
+    for table in ("albums", "artists", "wishlist"):
+        assert f"{table}.title ILIKE '%' || '100/%/_pure' || '%' ESCAPE '/'" in db.statements[1]
+
+
+# ---------------------------------------------------------------------------
+# LibrarySearchService
+# ---------------------------------------------------------------------------
+
+async def test_hits_are_typed_and_highlighted():
+    repository = MagicMock()
+    repository.search = AsyncMock(return_value=[
+        _row(),
+        _row(type="artist", source="wishlist", id=3, title="Darkside", collection_ids=None, score=0.9),
+    ])
+
+    response = await LibrarySearchService(repository).search(" Dark si ", user_id=5, limit=20)
+
+    repository.search.assert_awaited_once_with(5, "Dark si", ["dark", "si"], 20)
+    assert response.query == "Dark si"
+    album, artist = response.hits
+    assert (album.type, album.source, album.collection_ids) == ("album", "collection", [2, 4])
+    assert [(span.start, span.end) for span in album.highlights] == [(4, 8), (9, 11)]
+    assert (artist.type, artist.source, artist.collection_ids) == ("artist", "wishlist", [])
+    assert [(span.start, span.end) for span in artist.highlights] == [(0, 4)]
+
+
+async def test_punctuation_only_term_does_not_query():
+    repository = MagicMock()
+    repository.search = AsyncMock()
+
+    response = await LibrarySearchService(repository).search("!!", user_id=5, limit=20)
+
+    assert response.hits == []
+    repository.search.assert_not_called()
+
+
+async def test_limit_is_capped():
+    repository = MagicMock()
+    repository.search = AsyncMock(return_value=[])
+
+    with patch("app.services.library_search_service.settings.LIBRARY_SEARCH_MAX_HITS", 10):
+        await LibrarySearchService(repository).search("moon", user_id=5, limit=50)
+
+    assert repository.search.await_args.args[3] == 10
@@ -0,0 +1,195 @@
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from app.core.enums import LoadProfileEnum
+from app.models import Album, Artist, Collection, CollectionAlbum, CollectionArtist, Loan, Mood
+from app.repositories.loading_profiles import load_options
+from app.services.collection_service import CollectionService
+from tests.conftest import add_user
+
+
+# ---------------------------------------------------------------------------
+# Base SQLite en mémoire : les profils de chargement sont indépendants du SGBD,
+# seul le nombre de requêtes émises nous intéresse
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def seed(session: Session, collections: int) -> None:
+    """Every collection holds every album and artist; every album is on loan."""
+    for i in range(3, collections + 1):
+        add_user(session, i, f"user{i}")
+    for i in range(1, 6):
+        session.add(Album(id=i, external_album_id=str(i), external_source_id=1, title=f"album {i}"))
+        session.add(Artist(id=i, external_artist_id=str(i), external_source_id=1, title=f"artist {i}"))
+    session.flush()
+    for c in range(1, collections + 1):
+        session.add(Collection(id=c, name=f"collection {c}", owner_id=c, mood_id=1))
+    session.flush()
+    for c in range(1, collections + 1):
+        for a in range(1, 6):
+            session.add(CollectionAlbum(collection_id=c, album_id=a, state_record=1, state_cover=2))
+            session.add(CollectionArtist(collection_id=c, artist_id=a))
+            session.add(Loan(user_id=c, album_id=a, borrower_name=f"friend {c}"))
+    session.commit()
+
+
+@pytest.fixture(params=[2, 20], ids=["small", "large"])
+def engine(request, sqlite_engine):
+    """Same assertions against a small and a large graph: counts must not grow with data."""
+    with Session(sqlite_engine) as session:
+        seed(session, collections=request.param)
+    return sqlite_engine
+
+
+def run(engine, statement):
+    session = Session(engine)
+    with count_queries(engine) as statements:
+        rows = session.execute(statement).unique().all()
+    return session, rows, len(statements)
+
+
+# ---------------------------------------------------------------------------
+# Albums
+# ---------------------------------------------------------------------------
+
+def test_album_list_card_loads_only_external_source(engine):
+    session, rows, queries = run(
+        engine, select(Album).options(*load_options(Album, LoadProfileEnum.LIST_CARD)))
+
+    assert queries == 2
+    assert len(rows) == 5
+    album = rows[0][0]
+    assert album.external_source.name == "discogs"
+    with pytest.raises(InvalidRequestError):
+        album.loans
+    with pytest.raises(InvalidRequestError):
+        album.album_collections
+    session.close()
+
+
+def test_album_detail_loads_memberships_and_loans(engine):
+    session, rows, queries = run(
+        engine, select(Album).where(Album.id == 1).options(*load_options(Album, LoadProfileEnum.DETAIL)))
+
+    # albums, external source, collection_album, vinyl states x2, loans, borrowers, roles
+    assert queries == 8
+    album = rows[0][0]
+    assert len(album.album_collections) == len(album.loans)
+    session.close()
+
+
+def test_collection_albums_page_does_not_reach_collections(engine):
+    statement = (
+        select(Album, CollectionAlbum)
+        .join(CollectionAlbum, Album.id == CollectionAlbum.album_id)
+        .where(CollectionAlbum.collection_id == 1)
+        .options(
+            *load_options(Album, LoadProfileEnum.LIST_CARD),
+            *load_options(CollectionAlbum, LoadProfileEnum.LIST_CARD),
+        )
+    )
+    session, rows, queries = run(engine, statement)
+
+    # rows, external source, vinyl states x2
+    assert queries == 4
+    collection_album = rows[0][1]
+    assert collection_album.state_record_ref.name == "mint"
+    with pytest.raises(InvalidRequestError):
+        collection_album.collection
+    session.close()
+
+
+# ---------------------------------------------------------------------------
+# Artists
+# ---------------------------------------------------------------------------
+
+def test_artist_list_card_does_not_load_collections(engine):
+    session, rows, queries = run(
+        engine, select(Artist).options(*load_options(Artist, LoadProfileEnum.LIST_CARD)))
+
+    assert queries == 2
+    artist = rows[0][0]
+    with pytest.raises(InvalidRequestError):
+        artist.collections
+    with pytest.raises(InvalidRequestError):
+        artist.collection_artists
+    session.close()
+
+
+# ---------------------------------------------------------------------------
+# Collections
+# ---------------------------------------------------------------------------
+
+def test_collection_list_card_loads_owner_only(engine):
+    session, rows, queries = run(
+        engine, select(Collection).options(*load_options(Collection, LoadProfileEnum.LIST_CARD)))
+
+    # collections, owners, roles, moods
+    assert queries == 4
+    collection = rows[0][0]
+    assert collection.owner.username == "alice"
+    with pytest.raises(InvalidRequestError):
+        collection.collection_albums
+    session.close()
+
+
+def test_collection_detail_loads_a_bounded_graph(engine):
+    session, rows, queries = run(
+        engine,
+        select(Collection).where(Collection.id == 1).options(
+            *load_options(Collection, LoadProfileEnum.DETAIL)),
+    )
+
+    # collection, owner, role, mood, collection_album, album, album source,
+    # vinyl states x2, collection_artist, artist, artist source
+    assert queries == 12
+    collection = rows[0][0]
+    assert len(collection.collection_albums) == 5
+    assert all(ca.album is not None for ca in collection.collection_albums)
+    assert all(ca.artist is not None for ca in collection.collection_artists)
+    session.close()
+
+
+def test_reference_data_does_not_load_back_references(engine):
+    session, rows, queries = run(engine, select(Mood))
+
+    assert queries == 1
+    with pytest.raises(InvalidRequestError):
+        rows[0][0].collections
+    session.close()
+
+
+async def test_collection_response_leaves_out_relationships_not_loaded(engine):
+    like_repository = MagicMock()
+    like_repository.count_likes = AsyncMock(return_value=0)
+    service = CollectionService(MagicMock(), like_repository, MagicMock(), MagicMock())
+
+    responses = {}
+    for profile in (LoadProfileEnum.LIST_CARD, LoadProfileEnum.DETAIL):
+        session, rows, _ = run(
+            engine, select(Collection).where(Collection.id == 1).options(*load_options(Collection, profile)))
+        responses[profile] = await service._build_collection_response(rows[0][0])
+        session.close()
+
+    list_card, detail = responses[LoadProfileEnum.LIST_CARD], responses[LoadProfileEnum.DETAIL]
+    assert (list_card.albums, list_card.artists) == ([], [])
+    assert list_card.owner.username == "alice"
+    assert (len(detail.albums), len(detail.artists)) == (5, 5)
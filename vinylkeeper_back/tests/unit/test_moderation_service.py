@@ -176,8 +176,7 @@ class TestGetPendingModerationRequests:
     async def test_success_returns_list(self):
         service, mod_repo, _ = make_service()
         mod_repo.get_moderation_status_by_name = AsyncMock(return_value=make_status(status_id=1))
-        mod_repo.get_requests_by_status = AsyncMock(return_value=[])
-        mod_repo.count_requests_by_status_id = AsyncMock(return_value=0)
+        mod_repo.get_requests_by_status = AsyncMock(return_value=([], 0))
 
         result = await service.get_pending_moderation_requests(page=1, limit=10)
 
@@ -186,3 +185,14 @@ class TestGetPendingModerationRequests:
         assert result.page == 1
         assert result.total_pages == 1
         mod_repo.get_requests_by_status.assert_awaited_once_with(1, 10, 0)
+
+    async def test_total_comes_with_the_page(self):
+        service, mod_repo, _ = make_service()
+        mod_repo.get_moderation_status_by_name = AsyncMock(return_value=make_status(status_id=1))
+        mod_repo.get_requests_by_status = AsyncMock(return_value=([], 25))
+
+        result = await service.get_pending_moderation_requests(page=3, limit=10)
+
+        assert result.total == 25
+        assert result.total_pages == 3
+        mod_repo.get_requests_by_status.assert_awaited_once_with(1, 10, 20)
@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ValidationError
+from app.models import Album, Collection, CollectionAlbum, Like
+from app.utils.pagination import (
+    build_page, decode_cursor, encode_cursor, fetch_page_with_total, keyset_after, keyset_order
+)
+from tests.conftest import add_user
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+# ---------------------------------------------------------------------------
+# Cursors
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("key", [T0, 42, None])
+def test_cursor_round_trip(key):
+    cursor = decode_cursor(encode_cursor("newest", key, 7), "newest")
+
+    assert cursor.key == key
+    assert cursor.id == 7
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", "bnVsbA", encode_cursor("newest", "text", 1)])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(ValidationError):
+        decode_cursor(token, "newest")
+
+
+def test_cursor_issued_for_another_sort_is_rejected():
+    with pytest.raises(ValidationError):
+        decode_cursor(encode_cursor("newest", T0, 1), "oldest")
+
+
+# ---------------------------------------------------------------------------
+# Parcours complet sur SQLite : chaque ligne exactement une fois, dans l'ordre
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def session(sqlite_engine):
+    with Session(sqlite_engine) as session:
+        add_user(session, 3, "carol")
+        for i in range(1, 10):
+            session.add(Album(id=i, external_album_id=str(i), external_source_id=1, title=f"album {i}"))
+        session.flush()
+        for i in range(1, 8):
+            session.add(Collection(id=i, name=f"collection {i}", owner_id=1, created_at=T0))
+        session.flush()
+        # Ties on created_at and legacy rows without a timestamp
+        offsets = [0, 0, 0, 1, 2, 2, None, None, 3]
+        for album_id, offset in enumerate(offsets, start=1):
+            session.add(CollectionAlbum(
+                collection_id=1, album_id=album_id,
+                created_at=None if offset is None else T0 + timedelta(days=offset),
+            ))
+        # Likes per collection: ties at 2 and 0
+        for collection_id, likes in {1: 2, 2: 3, 3: 2, 4: 0, 5: 1, 6: 0, 7: 2}.items():
+            for user_id in range(1, likes + 1):
+                session.add(Like(user_id=user_id, collection_id=collection_id))
+        session.commit()
+        yield session
+
+
+def walk(session, statement, key_column, id_column, cursor_of, descending, nullable=False, having=False):
+    """Follow next_cursor until exhausted, three rows at a time."""
+    sort = "newest" if descending else "oldest"
+    statement = statement.order_by(*keyset_order(key_column, id_column, descending)).limit(4)
+    seen, cursor, pages = [], None, 0
+    while True:
+        page_statement = statement
+        if cursor:
+            condition = keyset_after(key_column, id_column, decode_cursor(cursor, sort), descending, nullable)
+            page_statement = statement.having(condition) if having else statement.filter(condition)
+        page = build_page(session.execute(page_statement).all(), 3, sort, cursor_of)
+        seen.extend(page.items)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            return seen, pages
+
+
+@pytest.mark.parametrize("descending", [True, False], ids=["newest", "oldest"])
+def test_keyset_walk_matches_full_ordering_with_ties_and_nulls(session, descending):
+    statement = select(CollectionAlbum).filter(CollectionAlbum.collection_id == 1)
+    expected = session.execute(
+        statement.order_by(*keyset_order(CollectionAlbum.created_at, CollectionAlbum.album_id, descending))
+    ).scalars().all()
+
+    rows, pages = walk(
+        session, statement, CollectionAlbum.created_at, CollectionAlbum.album_id,
+        lambda row: (row[0].created_at, row[0].album_id), descending, nullable=True,
+    )
+
+    assert [row[0].album_id for row in rows] == [item.album_id for item in expected]
+    assert pages == 3
+    # NULL timestamps always come last
+    assert [row[0].created_at for row in rows[-2:]] == [None, None]
+
+
+def test_keyset_walk_on_aggregate_uses_having(session):
+    likes = func.count(Like.id)
+    statement = (
+        select(Collection.id, likes.label("likes_count"))
+        .outerjoin(Like, Like.collection_id == Collection.id)
+        .group_by(Collection.id)
+    )
+
+    rows, _ = walk(
+        session, statement, likes, Collection.id,
+        lambda row: (row.likes_count, row.id), descending=True, having=True,
+    )
+
+    assert [(row.id, row.likes_count) for row in rows] == [
+        (2, 3), (7, 2), (3, 2), (1, 2), (5, 1), (6, 0), (4, 0)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Pages numérotées : page et total en une seule requête
+# ---------------------------------------------------------------------------
+
+class CountingSession:
+    """Async facade over the SQLite session counting executed statements."""
+
+    def __init__(self, session):
+        self.session = session
+        self.statements = 0
+
+    async def execute(self, statement):
+        self.statements += 1
+        return self.session.execute(statement)
+
+
+async def test_page_and_total_in_one_statement(session):
+    db = CountingSession(session)
+    statement = select(Collection).order_by(Collection.id)
+
+    items, total = await fetch_page_with_total(db, statement, offset=3, limit=2)
+
+    assert [collection.id for collection in items] == [4, 5]
+    assert total == 7
+    assert db.statements == 1
+
+
+async def test_rows_keep_selected_columns_without_total(session):
+    statement = (
+        select(Collection.id, func.count(Like.id))
+        .outerjoin(Like, Like.collection_id == Collection.id)
+        .group_by(Collection.id)
+        .order_by(Collection.id)
+    )
+
+    rows, total = await fetch_page_with_total(CountingSession(session), statement, offset=0, limit=2, scalars=False)
+
+    # COUNT(*) OVER () counts groups, not joined rows
+    assert rows == [(1, 2), (2, 3)]
+    assert total == 7
+
+
+async def test_empty_first_page_needs_no_count(session):
+    db = CountingSession(session)
+    statement = select(Collection).filter(Collection.owner_id == 2)
+
+    assert await fetch_page_with_total(db, statement, offset=0, limit=5) == ([], 0)
+    assert db.statements == 1
+
+
+async def test_page_past_the_end_falls_back_to_count(session):
+    db = CountingSession(session)
+    statement = select(Collection).order_by(Collection.id)
+
+    items, total = await fetch_page_with_total(db, statement, offset=20, limit=5)
+
+    assert items == []
+    assert total == 7
+    assert db.statements == 2
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from app.db.parallel import ParallelReader
+
+
+class FakeSessionFactory:
+    """Hands out numbered sessions and tracks how many are open at once."""
+
+    def __init__(self):
+        self.opened = 0
+        self.open_now = 0
+        self.max_open = 0
+
+    def __call__(self):
+        factory = self
+
+        class Session:
+            async def __aenter__(self):
+                factory.opened += 1
+                factory.open_now += 1
+                factory.max_open = max(factory.max_open, factory.open_now)
+                self.number = factory.opened
+                return self
+
+            async def __aexit__(self, *exc):
+                factory.open_now -= 1
+
+        return Session()
+
+
+def slow_read(result, delay=0.02):
+    async def read(session):
+        await asyncio.sleep(delay)
+        return result, session
+    return read
+
+
+async def test_reads_run_concurrently_on_separate_sessions():
+    factory = FakeSessionFactory()
+    reader = ParallelReader(factory, max_sessions=4)
+
+    results = await reader.gather(*(slow_read(i) for i in range(4)))
+
+    assert [value for value, _ in results] == [0, 1, 2, 3]
+    assert len({session.number for _, session in results}) == 4
+    assert factory.max_open == 4
+    assert reader.stats()["parallel_reads"] == 4
+
+
+async def test_sessions_are_bounded_by_slots():
+    factory = FakeSessionFactory()
+    reader = ParallelReader(factory, max_sessions=2)
+
+    await reader.gather(*(slow_read(i) for i in range(5)))
+
+    assert factory.max_open == 2
+    assert factory.opened == 5
+
+
+async def test_busy_slots_fall_back_to_caller_session():
+    factory = FakeSessionFactory()
+    reader = ParallelReader(factory, max_sessions=2)
+    caller_session = object()
+
+    results = await reader.gather(*(slow_read(i) for i in range(4)), fallback=caller_session)
+
+    assert [value for value, _ in results] == [0, 1, 2, 3]
+    assert [session for _, session in results][2:] == [caller_session, caller_session]
+    assert factory.opened == 2
+    assert reader.stats()["fallback_reads"] == 2
+
+
+async def test_failing_read_releases_its_session():
+    factory = FakeSessionFactory()
+    reader = ParallelReader(factory, max_sessions=2)
+
+    async def failing(session):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await reader.gather(slow_read(1, delay=0), failing)
+
+    assert factory.open_now == 0
+    assert reader.stats()["in_use"] == 0
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.models import Place, PlaceType
+from app.models.base import Base
+from app.repositories.place_repository import PlaceRepository
+from tests.conftest import RecordingSession
+
+
+# ---------------------------------------------------------------------------
+# search_moderated_places : index trigramme sur search_text
+# ---------------------------------------------------------------------------
+
+async def test_search_sets_the_threshold_then_ranks_by_word_similarity():
+    db = RecordingSession()
+
+    with patch("app.repositories.place_repository.settings.PLACE_SEARCH_SIMILARITY_THRESHOLD", 0.4):
+        items, total = await PlaceRepository(db).search_moderated_places("  recrods ", limit=20)
+
+    assert (items, total) == ([], 0)
+    set_threshold, search = db.statements
+    assert "set_config('pg_trgm.word_similarity_threshold', '0.4', true)" in set_threshold
+    assert "places.search_text ILIKE '%' || 'recrods' || '%' ESCAPE '/'" in search
+    assert "'recrods' <% places.search_text" in search
+    assert "places.is_valid IS true AND places.is_moderated IS true" in search
+    assert "ORDER BY word_similarity('recrods', places.search_text) DESC, places.name, places.id" in search
+
+
+async def test_search_term_wildcards_are_matched_literally():
+    db = RecordingSession()
+
+    await PlaceRepository(db).search_moderated_places("50%_off", limit=20)
+
+    assert "places.search_text ILIKE '%' || '50/%/_off' || '%' ESCAPE '/'" in db.statements[1]
+
+
+def test_search_text_is_generated_from_name_city_and_country():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(PlaceType(id=1, name="shop"))
+        session.add(Place(id=1, name="Groove Records", address="1 rue", city="Lyon", country="France",
+                          place_type_id=1))
+        session.commit()
+
+        assert session.execute(select(Place.search_text)).scalar_one() == "Groove Records Lyon France"
+    engine.dispose()
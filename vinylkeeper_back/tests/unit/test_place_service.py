@@ -352,8 +352,7 @@ class TestCreateModerationRequest:
 class TestGetAllPlaces:
     async def test_returns_paginated_response(self):
         service, repo, *_ = make_service()
-        repo.count_all_moderated_places = AsyncMock(return_value=2)
-        repo.get_all_moderated_places = AsyncMock(return_value=[])
+        repo.get_all_moderated_places = AsyncMock(return_value=([], 2))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -367,8 +366,7 @@ class TestGetAllPlaces:
 
     async def test_offset_calculated_from_page(self):
         service, repo, *_ = make_service()
-        repo.count_all_moderated_places = AsyncMock(return_value=100)
-        repo.get_all_moderated_places = AsyncMock(return_value=[])
+        repo.get_all_moderated_places = AsyncMock(return_value=([], 100))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -378,8 +376,7 @@ class TestGetAllPlaces:
 
     async def test_total_pages_ceiling_division(self):
         service, repo, *_ = make_service()
-        repo.count_all_moderated_places = AsyncMock(return_value=21)
-        repo.get_all_moderated_places = AsyncMock(return_value=[])
+        repo.get_all_moderated_places = AsyncMock(return_value=([], 21))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -389,8 +386,7 @@ class TestGetAllPlaces:
 
     async def test_empty_result_returns_page_one(self):
         service, repo, *_ = make_service()
-        repo.count_all_moderated_places = AsyncMock(return_value=0)
-        repo.get_all_moderated_places = AsyncMock(return_value=[])
+        repo.get_all_moderated_places = AsyncMock(return_value=([], 0))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -404,8 +400,7 @@ class TestGetAllPlaces:
 class TestSearchPlaces:
     async def test_returns_paginated_response(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_by_search = AsyncMock(return_value=3)
-        repo.search_moderated_places = AsyncMock(return_value=[])
+        repo.search_moderated_places = AsyncMock(return_value=([], 3))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -417,8 +412,7 @@ class TestSearchPlaces:
 
     async def test_offset_calculated_from_page(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_by_search = AsyncMock(return_value=50)
-        repo.search_moderated_places = AsyncMock(return_value=[])
+        repo.search_moderated_places = AsyncMock(return_value=([], 50))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -428,8 +422,7 @@ class TestSearchPlaces:
 
     async def test_total_pages_ceiling_division(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_by_search = AsyncMock(return_value=11)
-        repo.search_moderated_places = AsyncMock(return_value=[])
+        repo.search_moderated_places = AsyncMock(return_value=([], 11))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -441,8 +434,7 @@ class TestSearchPlaces:
 class TestGetPlacesByType:
     async def test_returns_paginated_response(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_by_type = AsyncMock(return_value=5)
-        repo.get_moderated_places_by_type = AsyncMock(return_value=[])
+        repo.get_moderated_places_by_type = AsyncMock(return_value=([], 5))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -453,8 +445,7 @@ class TestGetPlacesByType:
 
     async def test_offset_calculated_from_page(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_by_type = AsyncMock(return_value=30)
-        repo.get_moderated_places_by_type = AsyncMock(return_value=[])
+        repo.get_moderated_places_by_type = AsyncMock(return_value=([], 30))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -464,8 +455,7 @@ class TestGetPlacesByType:
 
     async def test_total_pages_exact_division(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_by_type = AsyncMock(return_value=20)
-        repo.get_moderated_places_by_type = AsyncMock(return_value=[])
+        repo.get_moderated_places_by_type = AsyncMock(return_value=([], 20))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -477,8 +467,7 @@ class TestGetPlacesByType:
 class TestGetPlacesInRegion:
     async def test_returns_paginated_response(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_in_region = AsyncMock(return_value=4)
-        repo.get_moderated_places_in_region = AsyncMock(return_value=[])
+        repo.get_moderated_places_in_region = AsyncMock(return_value=([], 4))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -490,8 +479,7 @@ class TestGetPlacesInRegion:
 
     async def test_offset_calculated_from_page(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_in_region = AsyncMock(return_value=40)
-        repo.get_moderated_places_in_region = AsyncMock(return_value=[])
+        repo.get_moderated_places_in_region = AsyncMock(return_value=([], 40))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -501,8 +489,7 @@ class TestGetPlacesInRegion:
 
     async def test_total_pages_ceiling_division(self):
         service, repo, *_ = make_service()
-        repo.count_moderated_places_in_region = AsyncMock(return_value=41)
-        repo.get_moderated_places_in_region = AsyncMock(return_value=[])
+        repo.get_moderated_places_in_region = AsyncMock(return_value=([], 41))
         user = make_user()
 
         with patch.object(service, "_build_public_place_responses", new_callable=AsyncMock, return_value=[]):
@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.discogs_client import DiscogsClient
+from app.core.enums import RequestPriorityEnum
+from app.core.rate_limiter import RequestScheduler, SharedTokenBucket
+
+
+def test_budget_is_shared_between_bucket_instances(tmp_path):
+    state = tmp_path / "ratelimit.state"
+    worker_a = SharedTokenBucket(state, capacity=2)
+    worker_b = SharedTokenBucket(state, capacity=2)
+
+    assert worker_a.try_acquire() == 0
+    assert worker_b.try_acquire() == 0
+    assert worker_a.try_acquire() > 0
+
+
+def test_remaining_header_drains_the_budget(tmp_path):
+    bucket = SharedTokenBucket(tmp_path / "ratelimit.state", capacity=60)
+
+    bucket.observe(limit=60, remaining=0)
+
+    assert bucket.try_acquire() > 0
+
+
+def test_limit_header_updates_capacity(tmp_path):
+    bucket = SharedTokenBucket(tmp_path / "ratelimit.state", capacity=60)
+
+    bucket.observe(limit=25, remaining=None)
+
+    with bucket._locked_state() as state:
+        assert state["capacity"] == 25
+        assert state["tokens"] <= 25
+
+
+def test_block_for_stops_dispatching(tmp_path):
+    bucket = SharedTokenBucket(tmp_path / "ratelimit.state", capacity=60)
+
+    bucket.block_for(30)
+
+    assert bucket.try_acquire() > 29
+
+
+async def test_interactive_requests_are_dispatched_first(tmp_path):
+    bucket = SharedTokenBucket(tmp_path / "ratelimit.state", capacity=1, window=0.1)
+    assert bucket.try_acquire() == 0
+    scheduler = RequestScheduler(bucket)
+    order: list[str] = []
+
+    async def request(name: str, priority: RequestPriorityEnum):
+        await scheduler.acquire(priority)
+        order.append(name)
+
+    background = asyncio.create_task(request("background", RequestPriorityEnum.BACKGROUND))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(request("interactive", RequestPriorityEnum.INTERACTIVE))
+    await asyncio.wait_for(asyncio.gather(background, interactive), timeout=2)
+    await scheduler.aclose()
+
+    assert order == ["interactive", "background"]
+
+
+async def test_client_retries_rate_limited_requests(tmp_path):
+    responses = iter([
+        httpx.Response(429, headers={"X-Discogs-Ratelimit": "60", "X-Discogs-Ratelimit-Remaining": "0"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"results": []}, headers={"X-Discogs-Ratelimit-Remaining": "59"}),
+    ])
+    transport = httpx.MockTransport(lambda request: next(responses))
+    scheduler = RequestScheduler(SharedTokenBucket(tmp_path / "ratelimit.state", capacity=600, window=1.0))
+    client = DiscogsClient(httpx.AsyncClient(transport=transport), scheduler=scheduler)
+    client.BACKOFF_BASE = 0.01
+    client.BACKOFF_MAX = 0.05
+
+    data = await asyncio.wait_for(
+        client.get_json("https://api.discogs.com/database/search", params={"q": "x"}), timeout=5)
+    await client.aclose()
+
+    assert data == {"results": []}
+
+
+async def test_client_gives_up_after_max_retries(tmp_path):
+    transport = httpx.MockTransport(lambda request: httpx.Response(502))
+    client = DiscogsClient(httpx.AsyncClient(transport=transport))
+    client.BACKOFF_BASE = 0.001
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_json("https://api.discogs.com/database/search", params={"q": "x"})
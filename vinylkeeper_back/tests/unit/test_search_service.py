@@ -0,0 +1,141 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+
+from app.core.enums import RequestPriorityEnum
+from app.schemas.request_proxy.request_proxy_schema import SearchQuery
+from app.services.search_service import SearchService
+
+
+ROUND_TRIP = 0.2
+
+
+def make_hits(count: int) -> list[dict]:
+    return [
+        {
+            "id": 1000 + i,
+            "title": f"Artist {i} - Album {i}",
+            "format": ["Vinyl", "LP"],
+            "thumb": f"https://i.discogs.com/thumb-{i}.jpg",
+            "cover_image": f"https://i.discogs.com/cover-{i}.jpg",
+        }
+        for i in range(count)
+    ]
+
+
+def make_transport(hits: list[dict], failing_ids: frozenset = frozenset(), slow_ids: frozenset = frozenset()):
+    """Mocked Discogs API: search is instant, every release lookup costs one round-trip."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/database/search":
+            return httpx.Response(200, json={"results": hits})
+
+        release_id = int(request.url.path.rsplit("/", 1)[-1])
+        await asyncio.sleep(ROUND_TRIP * (10 if release_id in slow_ids else 1))
+        if release_id in failing_ids:
+            return httpx.Response(404)
+        return httpx.Response(200, json={
+            "images": [{
+                "type": "primary",
+                "uri": f"https://i.discogs.com/h:600/w:600/full-{release_id}.jpg",
+                "uri150": f"https://i.discogs.com/uri150-{release_id}.jpg",
+            }]
+        })
+
+    return httpx.MockTransport(handler)
+
+
+async def make_service(transport: httpx.MockTransport, concurrency: int = 10, timeout: float = 5.0):
+    client = httpx.AsyncClient(transport=transport, base_url="https://api.discogs.com")
+    service = SearchService(client)
+    service.image_concurrency = concurrency
+    service.image_timeout = timeout
+    return service, client
+
+
+async def test_images_are_resolved_concurrently():
+    hits = make_hits(10)
+    service, client = await make_service(make_transport(hits))
+
+    async with client:
+        start = time.perf_counter()
+        results = await service.search_music(SearchQuery(query="album", is_artist=False))
+        elapsed = time.perf_counter() - start
+
+    assert len(results) == 10
+    # Sequential resolution would take ~10 round-trips
+    assert elapsed < ROUND_TRIP * 3
+
+
+async def test_results_keep_search_order():
+    hits = make_hits(5)
+    service, client = await make_service(make_transport(hits))
+
+    async with client:
+        results = await service.search_music(SearchQuery(query="album", is_artist=False))
+
+    assert [r.id for r in results] == [str(h["id"]) for h in hits]
+    assert results[0].picture == "https://i.discogs.com/h:600/w:600/full-1000.jpg"
+    assert results[0].picture_medium == "https://i.discogs.com/h:300/w:300/full-1000.jpg"
+
+
+async def test_concurrency_is_bounded_by_semaphore():
+    hits = make_hits(4)
+    service, client = await make_service(make_transport(hits), concurrency=2)
+
+    async with client:
+        start = time.perf_counter()
+        results = await service.search_music(SearchQuery(query="album", is_artist=False))
+        elapsed = time.perf_counter() - start
+
+    assert len(results) == 4
+    assert elapsed >= ROUND_TRIP * 2
+
+
+async def test_failed_or_slow_lookup_falls_back_to_thumb():
+    hits = make_hits(3)
+    transport = make_transport(hits, failing_ids=frozenset({1001}), slow_ids=frozenset({1002}))
+    service, client = await make_service(transport, timeout=ROUND_TRIP * 2)
+
+    async with client:
+        results = await service.search_music(SearchQuery(query="album", is_artist=False))
+
+    assert results[0].picture == "https://i.discogs.com/h:600/w:600/full-1000.jpg"
+    assert results[1].picture == "https://i.discogs.com/cover-1.jpg"
+    assert results[2].picture == "https://i.discogs.com/thumb-2.jpg"
+    assert results[2].picture_medium is None
+
+
+async def test_duplicates_and_non_vinyl_are_filtered_before_fan_out():
+    hits = make_hits(3)
+    hits[1]["title"] = hits[0]["title"]
+    hits[2]["format"] = ["CD"]
+    requested: list[str] = []
+    inner = make_transport(hits)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        return await inner.handle_async_request(request)
+
+    service, client = await make_service(httpx.MockTransport(handler))
+
+    async with client:
+        results = await service.search_music(SearchQuery(query="album", is_artist=False))
+
+    assert [r.id for r in results] == ["1000"]
+    assert requested == ["/database/search", "/releases/1000"]
+
+
+async def test_image_lookups_are_queued_as_interactive():
+    hits = make_hits(3)
+    service, client = await make_service(make_transport(hits))
+
+    async with client:
+        with patch.object(service.discogs_client, "get_json", wraps=service.discogs_client.get_json) as get_json:
+            await service.search_music(SearchQuery(query="album", is_artist=False))
+
+    lookups = [call for call in get_json.call_args_list if "/releases/" in call.args[0]]
+    assert len(lookups) == 3
+    assert {call.kwargs["priority"] for call in lookups} == {RequestPriorityEnum.INTERACTIVE}
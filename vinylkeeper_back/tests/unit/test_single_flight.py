@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.discogs_client import DiscogsClient
+from app.core.single_flight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(group.do("key", work) for _ in range(5)))
+
+    assert calls == 1
+    assert all(r == {"value": 42} for r in results)
+    assert group.stats() == {"issued": 1, "coalesced": 4, "in_flight": 0}
+
+
+async def test_sequential_calls_are_not_coalesced():
+    group = SingleFlight()
+
+    async def work():
+        return 1
+
+    await group.do("key", work)
+    await group.do("key", work)
+
+    assert group.issued == 2
+    assert group.coalesced == 0
+
+
+async def test_errors_are_shared_with_every_waiter():
+    group = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(group.do("key", work) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert group.issued == 1
+
+
+async def test_cancelled_caller_does_not_abort_shared_call():
+    group = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    leader = asyncio.create_task(group.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(group.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_identical_discogs_lookups_issue_one_request():
+    calls: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"id": 1})
+
+    client = DiscogsClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    await asyncio.gather(*(client.get_json("https://api.discogs.com/releases/1") for _ in range(10)))
+
+    assert calls == ["/releases/1"]
+    assert client.single_flight.coalesced == 9
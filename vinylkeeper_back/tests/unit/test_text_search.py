@@ -0,0 +1,46 @@
+from app.utils.text_search import highlight_spans, prefix_tsquery, search_tokens
+
+
+# ---------------------------------------------------------------------------
+# search_tokens / prefix_tsquery
+# ---------------------------------------------------------------------------
+
+def test_tokens_are_lower_cased_words_without_punctuation():
+    assert search_tokens("  Dark SIDE-of_the moon! ") == ["dark", "side", "of", "the", "moon"]
+
+
+def test_tokens_of_punctuation_only_is_empty():
+    assert search_tokens("&|:*!") == []
+
+
+def test_prefix_tsquery_requires_every_token_as_a_prefix():
+    assert prefix_tsquery(["dark", "si"]) == "dark:* & si:*"
+
+
+# ---------------------------------------------------------------------------
+# highlight_spans
+# ---------------------------------------------------------------------------
+
+def test_highlights_every_occurrence_of_the_tokens():
+    title = "The Dark Side of the Moon"
+    assert highlight_spans(title, ["dark", "si"]) == [(4, 8), (9, 11)]
+    assert [title[start:end] for start, end in highlight_spans(title, ["the"])] == ["The", "the"]
+
+
+def test_offsets_are_code_points_of_the_title():
+    title = "Björk – Homogénic"
+    assert [title[start:end] for start, end in highlight_spans(title, ["génic"])] == ["génic"]
+
+
+def test_whole_word_when_lower_casing_changes_its_length():
+    # "İ".lower() is two code points
+    assert highlight_spans("İstanbul Blues", ["stan"]) == [(0, 8)]
+
+
+def test_misspelt_term_highlights_the_closest_words():
+    assert highlight_spans("Led Zeppelin IV", ["zepelin"]) == [(4, 12)]
+
+
+def test_no_highlight_without_a_close_word():
+    assert highlight_spans("Abbey Road", ["zeppelin"]) == []
+    assert highlight_spans(None, ["road"]) == []
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.transcode_pool import TranscodePool
+from app.services.image_proxy_service import RenderBatcher
+from app.utils.image_transcoding import VariantSpec, render_variants
+
+
+def make_jpeg(size: tuple[int, int] = (800, 800)) -> bytes:
+    output = BytesIO()
+    Image.new("RGB", size, (40, 120, 180)).save(output, format="JPEG")
+    return output.getvalue()
+
+
+async def test_full_pool_rejects_new_jobs_with_retry_after():
+    pool = TranscodePool(max_workers=0, max_queue_depth=1)
+    release = threading.Event()
+    running = [asyncio.create_task(pool.run(release.wait, 5)) for _ in range(pool.capacity)]
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        await pool.run(release.wait, 5)
+
+    release.set()
+    await asyncio.gather(*running)
+    assert exc_info.value.headers == {"Retry-After": str(pool.RETRY_AFTER)}
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["completed"] == pool.capacity
+    assert pool.load == 0
+
+
+async def test_render_runs_in_worker_process():
+    pool = TranscodePool(max_workers=1, max_queue_depth=1)
+    try:
+        outputs = await pool.run(render_variants, make_jpeg(), [VariantSpec(100, 100, 80, "webp")])
+    finally:
+        pool.shutdown()
+
+    result = Image.open(BytesIO(outputs[0]))
+    assert result.format == "WEBP"
+    assert result.size == (100, 100)
+
+
+async def test_busy_pool_lowers_encoder_effort(monkeypatch):
+    pool = TranscodePool(max_workers=0, max_queue_depth=1)
+    batcher = RenderBatcher(window=0)
+    methods = []
+
+    def record_method(image_data, specs, webp_method, avif_speed):
+        methods.append((webp_method, avif_speed))
+        return render_variants(image_data, specs, webp_method, avif_speed)
+
+    monkeypatch.setattr("app.services.image_proxy_service.render_variants", record_method)
+    spec = VariantSpec(100, 100, 80, "webp")
+
+    await batcher.render("idle", make_jpeg(), spec, pool)
+    pool._in_flight = 1
+    await batcher.render("busy", make_jpeg(), spec, pool)
+
+    (idle_method, idle_speed), (busy_method, busy_speed) = methods
+    # Lower WEBP method and higher AVIF speed both mean less CPU per image
+    assert busy_method < idle_method
+    assert busy_speed > idle_speed
+    assert batcher.stats()["reduced_effort_batches"] == 1
+
+
+async def test_cancelled_job_keeps_its_slot_until_it_finishes():
+    pool = TranscodePool(max_workers=0, max_queue_depth=0)
+    release = threading.Event()
+    caller = asyncio.create_task(pool.run(release.wait, 5))
+    await asyncio.sleep(0.05)
+
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    # The job is still running in its thread
+    assert pool.stats()["in_flight"] == 1
+    with pytest.raises(ServiceUnavailableError):
+        await pool.run(release.wait, 5)
+
+    release.set()
+    for _ in range(100):
+        if pool.load == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert pool.load == 0
+    assert pool.stats()["completed"] == 1
@@ -0,0 +1,209 @@
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch("app.core.ttl_cache.time.time", clock):
+        yield clock
+
+
+# ---------------------------------------------------------------------------
+# Tier mémoire seul
+# ---------------------------------------------------------------------------
+
+async def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache("test", max_entries=2, ttl=60)
+    await cache.set(1, "one")
+    await cache.set(2, "two")
+    await cache.get(1)
+
+    await cache.set(3, "three")
+
+    assert await cache.get(2) is None
+    assert await cache.get(1) == "one"
+    assert await cache.get(3) == "three"
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+async def test_entry_expires_after_ttl(clock):
+    cache = TTLCache("test", max_entries=8, ttl=30)
+    await cache.set("key", "value")
+    await cache.set("short", "value", ttl=5)
+
+    clock.now += 10
+    assert await cache.get("short") is None
+    assert await cache.get("key") == "value"
+
+    clock.now += 30
+    assert await cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+async def test_invalidate_drops_entry():
+    cache = TTLCache("test", max_entries=8, ttl=60)
+    await cache.set(1, "value")
+
+    await cache.invalidate(1)
+
+    assert await cache.get(1) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Tier partagé : deux instances sur le même répertoire simulent deux workers
+# ---------------------------------------------------------------------------
+
+def make_workers(tmp_path, **kwargs):
+    return [
+        TTLCache("shared", ttl=60, shared_dir=tmp_path, encode=sorted, decode=set, **kwargs)
+        for _ in range(2)
+    ]
+
+
+async def test_value_computed_by_one_worker_is_reused_by_another(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=8)
+
+    await first.set(1, {"b", "a"})
+
+    assert await second.get(1) == {"a", "b"}
+    assert await second.get(1) == {"a", "b"}
+    assert second.stats()["shared_hits"] == 1
+    assert second.stats()["hits"] == 1
+
+
+async def test_invalidation_reaches_every_worker(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=8)
+    await first.set(1, {"a"})
+    assert await second.get(1) == {"a"}
+
+    await first.invalidate(1)
+
+    assert await second.get(1) is None
+    assert await first.get(1) is None
+
+
+async def test_overwrite_replaces_other_workers_memory_copy(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=8)
+    await first.set(1, {"a"})
+    assert await second.get(1) == {"a"}
+
+    await first.set(1, {"b"})
+
+    assert await second.get(1) == {"b"}
+
+
+async def test_shared_tier_is_trimmed_to_max_entries(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=4)
+    first.TRIM_EVERY = 1
+
+    for key in range(10):
+        await first.set(key, {"x"})
+
+    found = [key for key in range(10) if await second.get(key) is not None]
+    assert found == [6, 7, 8, 9]
+
+
+def failing(cache, operation, times):
+    """Make `operation` raise `times` times, then run it."""
+    real = getattr(cache, operation)
+    calls = []
+
+    def run(*args):
+        calls.append(args)
+        if len(calls) <= times:
+            raise sqlite3.OperationalError("database is locked")
+        return real(*args)
+
+    return patch.object(cache, operation, side_effect=run), calls
+
+
+async def test_failed_reads_are_misses(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=8)
+    await first.set(1, {"a"})
+    failed_get, _ = failing(second, "_shared_get", times=1)
+
+    with failed_get:
+        assert await second.get(1) is None
+    assert await second.get(1) == {"a"}
+
+
+async def test_failed_invalidation_is_retried(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=8)
+    first.INVALIDATE_RETRY_DELAY = 0
+    await first.set(1, {"a"})
+    assert await second.get(1) == {"a"}
+    failed_delete, calls = failing(first, "_shared_delete", times=2)
+
+    with failed_delete:
+        await first.invalidate(1)
+
+    assert len(calls) == 3
+    assert await second.get(1) is None
+    assert first.stats()["pending_invalidations"] == 0
+
+
+async def test_invalidation_still_failing_is_written_on_next_access(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=8)
+    first.INVALIDATE_RETRY_DELAY = 0
+    await first.set(1, {"a"})
+    await first.set(2, {"b"})
+    failed_delete, _ = failing(first, "_shared_delete", times=first.INVALIDATE_ATTEMPTS + 1)
+
+    with failed_delete:
+        await first.invalidate(1)
+        assert first.stats()["pending_invalidations"] == 1
+        # Pending in this worker: its shared row is not trusted
+        assert await first.get(1) is None
+        assert await second.get(1) == {"a"}
+
+    assert await first.get(2) == {"b"}
+    assert first.stats()["pending_invalidations"] == 0
+    assert await second.get(1) is None
+
+
+async def test_set_after_an_invalidation_is_dropped(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=8)
+    loaded_at = time.time_ns()
+    await second.invalidate(1)
+
+    assert not await first.set(1, {"old"}, loaded_at=loaded_at)
+    assert await first.get(1) is None
+    assert await second.get(1) is None
+    # A load started after the invalidation is stored
+    assert await first.set(1, {"new"}, loaded_at=time.time_ns())
+    assert await second.get(1) == {"new"}
+
+
+async def test_set_after_an_invalidation_is_dropped_without_shared_tier():
+    cache = TTLCache("test", max_entries=8, ttl=60)
+    loaded_at = time.time_ns()
+    await cache.invalidate(1)
+
+    assert not await cache.set(1, "old", loaded_at=loaded_at)
+    assert await cache.get(1) is None
+    assert cache.stats()["stale_writes"] == 1
+
+
+async def test_unconditional_set_after_an_invalidation_is_stored(tmp_path):
+    first, second = make_workers(tmp_path, max_entries=8)
+    await first.set(1, {"old"})
+    await first.invalidate(1)
+
+    assert await first.set(1, {"new"})
+    assert await second.get(1) == {"new"}
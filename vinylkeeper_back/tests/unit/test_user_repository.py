@@ -0,0 +1,61 @@
+import uuid
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.models import User
+from app.repositories.user_repository import UserRepository
+from tests.conftest import SyncSessionAdapter
+
+
+# ---------------------------------------------------------------------------
+# Base SQLite avec deux utilisateurs et leurs rôles ; compte les requêtes émises
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def engine(sqlite_engine):
+    sqlite_engine.statements = []
+    event.listen(sqlite_engine, "before_cursor_execute", lambda *args: sqlite_engine.statements.append(args[2]))
+    return sqlite_engine
+
+
+@pytest.fixture
+def users(engine):
+    with Session(engine) as session:
+        session.execute(update(User).where(User.username == "bob").values(role_id=2))
+        session.commit()
+        return {user.username: (user.id, user.user_uuid) for user in session.query(User)}
+
+
+@pytest.fixture
+def repository(engine, users):
+    with Session(engine) as session:
+        yield UserRepository(SyncSessionAdapter(session))
+
+
+async def test_cached_lookups_bind_each_call_argument(repository, users):
+    for username, (user_id, user_uuid) in users.items():
+        assert (await repository.get_user_by_uuid(user_uuid)).username == username
+        assert (await repository.get_user_by_id(user_id)).username == username
+        assert (await repository.get_user_by_email(f"{username}@test.com")).username == username
+
+    assert await repository.get_user_by_uuid(uuid.uuid4()) is None
+    assert await repository.get_user_by_email("nobody@test.com") is None
+
+
+async def test_user_and_role_loaded_in_one_statement(repository, users, engine):
+    engine.statements.clear()
+
+    user = await repository.get_user_by_uuid(users["bob"][1])
+
+    assert user.role.name == "admin"
+    assert len(engine.statements) == 1
+
+
+def test_engine_sizes_statement_caches():
+    from app.core.config_env import settings
+    from app.db.session import engine
+
+    assert engine.url.query["prepared_statement_cache_size"] == str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)
+    assert engine.sync_engine._compiled_cache.capacity == settings.DB_QUERY_CACHE_SIZE
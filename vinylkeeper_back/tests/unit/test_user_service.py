@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from app.core.events import USER_CHANGED
 from app.services.user_service import UserService
 from app.schemas.user_schema import UserCreate
 from app.core.exceptions import (
@@ -200,6 +201,12 @@ class TestChangePassword:
         with pytest.raises(PasswordUpdateError):
             await service.change_password(regular_user, "correct_password", "NewPass1")
 
+    async def test_cached_principal_is_invalidated(self, regular_user):
+        service, _, _ = make_service(regular_user)
+        with patch("app.services.user_service.publish", new_callable=AsyncMock) as publish:
+            await service.change_password(regular_user, "correct_password", "NewPass1")
+        publish.assert_awaited_once_with(USER_CHANGED, user_uuid=str(regular_user.user_uuid))
+
 
 # ---------------------------------------------------------------------------
 # get_user_me()
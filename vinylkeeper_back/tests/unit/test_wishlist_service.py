@@ -6,6 +6,7 @@ from app.services.wishlist_service import WishlistService
 from app.schemas.external_reference_schema import AddToWishlistRequest
 from app.core.enums import EntityTypeEnum
 from app.core.exceptions import ResourceNotFoundError, ValidationError, ServerError
+from app.utils.pagination import KeysetPage
 
 
 # ---------------------------------------------------------------------------
@@ -203,7 +204,7 @@ class TestGetUserWishlistPaginated:
     async def test_entity_type_id_1_maps_to_album(self):
         service, wishlist_repo, _ = make_service()
         item = make_wishlist_item(entity_type_id=1)
-        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=([item], 1))
+        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=KeysetPage([item], 1))
 
         result = await service.get_user_wishlist_paginated(user_id=1, page=1, limit=10)
 
@@ -212,7 +213,7 @@ class TestGetUserWishlistPaginated:
     async def test_entity_type_id_2_maps_to_artist(self):
         service, wishlist_repo, _ = make_service()
         item = make_wishlist_item(entity_type_id=2)
-        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=([item], 1))
+        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=KeysetPage([item], 1))
 
         result = await service.get_user_wishlist_paginated(user_id=1, page=1, limit=10)
 
@@ -221,7 +222,7 @@ class TestGetUserWishlistPaginated:
     async def test_unknown_entity_type_id_maps_to_unknown(self):
         service, wishlist_repo, _ = make_service()
         item = make_wishlist_item(entity_type_id=99)
-        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=([item], 1))
+        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=KeysetPage([item], 1))
 
         result = await service.get_user_wishlist_paginated(user_id=1, page=1, limit=10)
 
@@ -230,7 +231,7 @@ class TestGetUserWishlistPaginated:
     async def test_total_pages_calculation(self):
         service, wishlist_repo, _ = make_service()
         items = [make_wishlist_item(item_id=i) for i in range(1, 4)]
-        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=(items, 25))
+        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=KeysetPage(items, 25))
 
         result = await service.get_user_wishlist_paginated(user_id=1, page=1, limit=10)
 
@@ -239,12 +240,25 @@ class TestGetUserWishlistPaginated:
 
     async def test_empty_list_returns_zero_total_pages(self):
         service, wishlist_repo, _ = make_service()
-        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=([], 0))
+        wishlist_repo.get_user_wishlist_paginated = AsyncMock(return_value=KeysetPage([], 0))
 
         result = await service.get_user_wishlist_paginated(user_id=1, page=1, limit=10)
 
         assert result.total_pages == 0
 
+    async def test_cursor_page_omits_page_number_and_totals(self):
+        service, wishlist_repo, _ = make_service()
+        wishlist_repo.get_user_wishlist_paginated = AsyncMock(
+            return_value=KeysetPage([make_wishlist_item()], None, "next-token"))
+
+        result = await service.get_user_wishlist_paginated(user_id=1, page=1, limit=10, cursor="token")
+
+        assert result.page is None
+        assert result.total is None
+        assert result.total_pages is None
+        assert result.next_cursor == "next-token"
+        wishlist_repo.get_user_wishlist_paginated.assert_awaited_once_with(1, 1, 10, None, "newest", "token")
+
 
 # ---------------------------------------------------------------------------
 # get_wishlist_item_detail